@@ -10,6 +10,8 @@ from .routes.recordings import recordings_blueprint
 from .routes.batches import batches_blueprint
 from .routes.receivers import receivers_blueprint
 from .routes.logs import logs_blueprint
+from .routes.tiles import tiles_blueprint
+from .routes.spectrograms import spectrograms_blueprint
 
 from .core.logs import configure_root_logger, ProcessType
 
@@ -23,6 +25,8 @@ def make_app() -> flask.Flask:
     app.register_blueprint(batches_blueprint)
     app.register_blueprint(logs_blueprint)
     app.register_blueprint(receivers_blueprint)
+    app.register_blueprint(tiles_blueprint)
+    app.register_blueprint(spectrograms_blueprint)
 
     return app
 
@@ -4,18 +4,93 @@
 
 """IO operations on batched data files."""
 
-from ._base import Base, BatchFile, parse_batch_file_name, parse_batch_file_path
-from ._batches import Batches
+from ._base import (
+    Base,
+    BatchFile,
+    SpectrogramFile,
+    parse_batch_file_name,
+    parse_batch_file_path,
+)
+from ._batches import (
+    Batches,
+    filter_batches_in_range,
+    scan_dir,
+    archive_batch_files,
+    ARCHIVE_EXTENSIONS,
+)
+from ._archive import (
+    ArchiveMember,
+    get_archive_file_name,
+    parse_archive_file_name,
+    read_archive_index,
+    write_archive,
+)
 from ._iq_stream import IQMetadata, IQStreamBatch, IQStreamBatchExtension
+from ._iq_slice import (
+    IQSegment,
+    get_iq_segments,
+    iter_iq_segments,
+    get_raw_byte_range,
+    make_sigmf_meta,
+)
+from ._partitions import find_batches, partition_batch, migrate_batch_files
+from ._retention import (
+    RetentionPolicy,
+    RetentionReason,
+    RetentionFile,
+    RetentionReport,
+    plan_retention,
+    apply_retention,
+    sweep_retention,
+)
+from ._iqz import (
+    IQZCodec,
+    IQZIndex,
+    iter_iqz,
+    read_iqz,
+    read_iqz_index,
+    write_iqz,
+)
 
 __all__ = [
     "Base",
     "BatchFile",
+    "SpectrogramFile",
     "parse_batch_file_name",
     "parse_batch_file_path",
     "Batches",
+    "filter_batches_in_range",
+    "scan_dir",
+    "archive_batch_files",
+    "ARCHIVE_EXTENSIONS",
+    "ArchiveMember",
+    "get_archive_file_name",
+    "parse_archive_file_name",
+    "read_archive_index",
+    "write_archive",
     "CallistoBatch",
     "IQMetadata",
     "IQStreamBatch",
     "IQStreamBatchExtension",
+    "IQSegment",
+    "get_iq_segments",
+    "iter_iq_segments",
+    "get_raw_byte_range",
+    "make_sigmf_meta",
+    "IQZCodec",
+    "IQZIndex",
+    "iter_iqz",
+    "read_iqz",
+    "read_iqz_index",
+    "write_iqz",
+    "find_batches",
+    "partition_batch",
+    "migrate_batch_files",
+    "RetentionPolicy",
+    "RetentionReason",
+    "RetentionFile",
+    "RetentionReport",
+    "plan_retention",
+    "apply_retention",
+    "sweep_retention",
 ]
@@ -0,0 +1,174 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Pack the batch files for a day into a single, uncompressed archive.
+
+Archives are ordinary ZIP files, where every member is stored without compression. So, the
+contents of each member are contiguous in the archive, and can be read (or memory-mapped) in
+place. The byte offset and size of each member is recorded in an index member, and the archive
+comment locates the index, so the archive can be read without parsing the central directory.
+
+An archive is stored in the directory for its day, named `<tag>.zip`.
+"""
+
+import os
+import json
+import struct
+import typing
+import zipfile
+import functools
+import dataclasses
+
+ARCHIVE_EXTENSION = "zip"
+
+# The name of the member storing the byte offset and size of every other member.
+_INDEX_MEMBER_NAME = "index.json"
+
+# The end of central directory record, which is followed by the archive comment.
+_END_RECORD_SIGNATURE = b"PK\x05\x06"
+_END_RECORD_FORMAT = "<4s4H2LH"
+_END_RECORD_SIZE = struct.calcsize(_END_RECORD_FORMAT)
+_MAX_COMMENT_SIZE = 0xFFFF
+
+
+@dataclasses.dataclass(frozen=True)
+class ArchiveMember:
+    """The location of a batch file packed in an archive.
+
+    :ivar archive_path: The path to the archive.
+    :ivar offset: The offset of the first byte of the file's contents in the archive.
+    :ivar size: The size of the file's contents, in bytes.
+    """
+
+    archive_path: str
+    offset: int
+    size: int
+
+    def read_bytes(self) -> bytes:
+        """Read the contents of the packed file."""
+        with open(self.archive_path, "rb") as f:
+            f.seek(self.offset)
+            return f.read(self.size)
+
+
+def _read_bytes(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+def get_archive_file_name(tag: str) -> str:
+    """Get the file name of the archive for a tag."""
+    return f"{tag}.{ARCHIVE_EXTENSION}"
+
+
+def parse_archive_file_name(file_name: str) -> typing.Optional[str]:
+    """Get the tag of an archive from its file name, or None if it is not the name of an archive.
+
+    Unlike batch files, archive file names do not contain an underscore.
+    """
+    tag, extension = os.path.splitext(file_name)
+    if extension != f".{ARCHIVE_EXTENSION}" or "_" in tag or not tag:
+        return None
+    return tag
+
+
+def _read_end_record_comment(archive_path: str) -> bytes:
+    """Read the archive comment, by searching backwards for the end of central directory record."""
+    with open(archive_path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        tail_size = min(file_size, _END_RECORD_SIZE + _MAX_COMMENT_SIZE)
+        f.seek(file_size - tail_size)
+        tail = f.read(tail_size)
+
+    position = tail.rfind(_END_RECORD_SIGNATURE)
+    if position < 0:
+        raise ValueError(f"'{archive_path}' is not a ZIP file")
+    *_, comment_size = struct.unpack_from(_END_RECORD_FORMAT, tail, position)
+    start = position + _END_RECORD_SIZE
+    return tail[start : start + comment_size]
+
+
+@functools.lru_cache(maxsize=256)
+def _read_archive_index(
+    archive_path: str, mtime_ns: int, file_size: int
+) -> dict[str, tuple[int, int]]:
+    # The modification time and size are only used to invalidate the cache.
+    try:
+        index_offset, index_size = json.loads(_read_end_record_comment(archive_path))
+    except (json.JSONDecodeError, TypeError, ValueError):
+        raise ValueError(f"'{archive_path}' is missing an index")
+    index = json.loads(
+        ArchiveMember(archive_path, index_offset, index_size).read_bytes()
+    )
+    return {name: (offset, size) for name, (offset, size) in index.items()}
+
+
+def read_archive_index(archive_path: str) -> dict[str, ArchiveMember]:
+    """Read where each batch file is packed in an archive, without reading any of their contents.
+
+    The index is cached until the archive is modified.
+
+    :param archive_path: The path to the archive.
+    :raises ValueError: If the file is not an archive created by `write_archive`.
+    :return: The location of each packed batch file, by file name.
+    """
+    stat = os.stat(archive_path)
+    index = _read_archive_index(archive_path, stat.st_mtime_ns, stat.st_size)
+    return {
+        name: ArchiveMember(archive_path, offset, size)
+        for name, (offset, size) in index.items()
+    }
+
+
+def write_archive(
+    archive_path: str,
+    file_paths: list[str],
+    members: typing.Optional[dict[str, ArchiveMember]] = None,
+) -> dict[str, ArchiveMember]:
+    """Pack files into an uncompressed archive, with an index of where each is stored.
+
+    The archive is first written to a temporary file, which then replaces any existing archive.
+
+    :param archive_path: The path to the archive.
+    :param file_paths: The files to pack, which are stored under their file names.
+    :param members: Optionally, also pack these files from another archive, defaults to None.
+    Any with the same name as one of `file_paths` are ignored.
+    :return: The location of each packed file, by file name.
+    """
+    file_names = {os.path.basename(file_path) for file_path in file_paths}
+    sources: list[tuple[str, typing.Callable[[], bytes]]] = [
+        (name, member.read_bytes)
+        for name, member in (members or {}).items()
+        if name not in file_names
+    ]
+    sources += [
+        (os.path.basename(file_path), functools.partial(_read_bytes, file_path))
+        for file_path in file_paths
+    ]
+    sources.sort(key=lambda source: source[0])
+
+    temp_archive_path = f"{archive_path}.tmp"
+    index: dict[str, tuple[int, int]] = {}
+    with zipfile.ZipFile(
+        temp_archive_path, "w", compression=zipfile.ZIP_STORED
+    ) as archive:
+
+        def write_member(name: str, data: bytes) -> tuple[int, int]:
+            archive.writestr(name, data)
+            # Stored members are written directly after their local header.
+            assert archive.fp is not None
+            return archive.fp.tell() - len(data), len(data)
+
+        for name, read in sources:
+            index[name] = write_member(name, read())
+        index_location = write_member(
+            _INDEX_MEMBER_NAME, json.dumps(index).encode("utf-8")
+        )
+        archive.comment = json.dumps(index_location).encode("utf-8")
+    os.replace(temp_archive_path, archive_path)
+    return {
+        name: ArchiveMember(archive_path, offset, size)
+        for name, (offset, size) in index.items()
+    }
@@ -6,12 +6,17 @@ import datetime
 import typing
 import functools
 import abc
+import base64
 import dataclasses
 import os
 
+import numpy as np
+import numpy.typing as npt
+
 import spectre_server.core.io
 import spectre_server.core.config
 import spectre_server.core.spectrograms
+from ._archive import ArchiveMember
 
 
 def parse_batch_file_path(absolute_file_path: str) -> tuple[str, str, str, str]:
@@ -50,6 +55,10 @@ class BatchFile(spectre_server.core.io.Base[T]):
         """
         super().__init__(file_path)
         self._start_time, self._tag, _ = parse_batch_file_name(self.file_name)
+        self._archive_member: typing.Optional[ArchiveMember] = None
+        # The outcome of the last directory scan, if the file has been scanned.
+        self._is_scanned = False
+        self._scanned_num_bytes: typing.Optional[int] = None
 
     @property
     def start_time(self) -> str:
@@ -68,6 +77,108 @@ class BatchFile(spectre_server.core.io.Base[T]):
             self.start_time, spectre_server.core.config.TimeFormat.DATETIME
         )
 
+    @property
+    def archive_member(self) -> typing.Optional[ArchiveMember]:
+        """Where the file is packed in an archive, if it has been archived."""
+        return self._archive_member
+
+    @archive_member.setter
+    def archive_member(self, archive_member: typing.Optional[ArchiveMember]) -> None:
+        self._archive_member = archive_member
+
+    def record_scan(self, num_bytes: typing.Optional[int]) -> None:
+        """Record whether the file was found by a directory scan, so that checking whether it exists
+        doesn't touch the file system again.
+
+        The scan is forgotten once the file is deleted through this object.
+
+        :param num_bytes: The size of the file in bytes, or None if the scan didn't find it.
+        """
+        self._is_scanned = True
+        self._scanned_num_bytes = num_bytes
+
+    def forget_scan(self) -> None:
+        """Check the file system directly from now on, for example after the file has been created."""
+        self._is_scanned = False
+        self._scanned_num_bytes = None
+
+    @property
+    def _exists_on_disk(self) -> bool:
+        if self._is_scanned:
+            return self._scanned_num_bytes is not None
+        return super().exists
+
+    @property
+    def is_archived(self) -> bool:
+        """Return True if the contents of the file are only available from an archive."""
+        return self._archive_member is not None and not self._exists_on_disk
+
+    @property
+    def exists(self) -> bool:
+        """Check if the file exists in the filesystem, either on its own or in an archive."""
+        return self._exists_on_disk or self._archive_member is not None
+
+    @property
+    def num_bytes(self) -> int:
+        """The size of the file's contents in bytes, wherever they are stored."""
+        if self.is_archived:
+            assert self._archive_member is not None
+            return self._archive_member.size
+        if self._scanned_num_bytes is not None:
+            return self._scanned_num_bytes
+        return os.path.getsize(self.file_path)
+
+    @property
+    def location(self) -> tuple[str, int, typing.Optional[int]]:
+        """Where the contents of the file are stored.
+
+        :return: The path to the file storing the contents, the offset of the first byte, and
+        the number of bytes. If the number of bytes is None, the contents run to the end of the file.
+        """
+        if self.is_archived:
+            assert self._archive_member is not None
+            return (
+                self._archive_member.archive_path,
+                self._archive_member.offset,
+                self._archive_member.size,
+            )
+        return self.file_path, 0, None
+
+    def read_bytes(self) -> bytes:
+        """Read the raw contents of the file, wherever they are stored."""
+        file_path, offset, num_bytes = self.location
+        with open(file_path, "rb") as f:
+            f.seek(offset)
+            return f.read(-1 if num_bytes is None else num_bytes)
+
+    def _read_array(self, dtype: npt.DTypeLike) -> npt.NDArray:
+        """Read the contents of the file as a flat array, wherever they are stored."""
+        file_path, offset, num_bytes = self.location
+        count = -1 if num_bytes is None else num_bytes // np.dtype(dtype).itemsize
+        return np.fromfile(file_path, dtype=dtype, count=count, offset=offset)
+
+    def delete(self, ignore_if_missing: bool = False) -> None:
+        """Delete the file from the filesystem.
+
+        :param ignore_if_missing: If True, skips deletion if the file does not exist, defaults to False.
+        :raises FileNotFoundError: If the file is missing and `ignore_if_missing` is False.
+        :raises PermissionError: If the file has been archived. Delete the whole archive instead.
+        """
+        if self.is_archived:
+            raise PermissionError(
+                f"{self.file_name} is archived in {self.location[0]}, and cannot be deleted on its own."
+            )
+        super().delete(ignore_if_missing)
+        self.record_scan(None)
+
+
+class SpectrogramFile(
+    BatchFile[spectre_server.core.spectrograms.Spectrogram],
+    spectre_server.core.spectrograms.SpectrogramReader,
+):
+    """An abstract base class for batch files storing spectrogram data, parts of which can be
+    read without reading the whole file."""
+
 
 @dataclasses.dataclass(frozen=True)
 class _Extension:
@@ -78,9 +189,7 @@ class _PngFile(BatchFile[str]):
     """Stores an image in the PNG file format."""
 
     def read(self) -> str:
-        return spectre_server.core.io.read_file(
-            self.file_path, spectre_server.core.io.FileFormat.PNG
-        )
+        return base64.b64encode(self.read_bytes()).decode("ascii")
 
 
 class Base(abc.ABC):
@@ -109,9 +218,7 @@ class Base(abc.ABC):
 
     @property
     @abc.abstractmethod
-    def spectrogram_file(
-        self,
-    ) -> BatchFile[spectre_server.core.spectrograms.Spectrogram]:
+    def spectrogram_file(self) -> SpectrogramFile:
         """Indicate the file in the batch storing spectrogram data."""
 
     @property
@@ -171,6 +278,19 @@ class Base(abc.ABC):
                 f"A batch file with extension '{extension}' is not implemented for this batch."
             )
 
+    def relocate_file(self, extension: str, dir_path: str) -> BatchFile:
+        """Look for a batch file in another directory, such as when only some of the files in the
+        batch have been moved into its partition.
+
+        :param extension: The file extension of the batch file.
+        :param dir_path: The directory containing the batch file.
+        :return: The relocated batch file.
+        """
+        batch_file = self.get_file(extension)
+        relocated_file = type(batch_file)(os.path.join(dir_path, batch_file.file_name))
+        self._batch_files[extension] = relocated_file
+        return relocated_file
+
     def delete_file(self, extension: str) -> None:
         """Delete a file from the batch, according to the file extension.
 
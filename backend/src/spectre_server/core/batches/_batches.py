@@ -8,30 +8,68 @@ import collections
 import datetime
 
 import spectre_server.core.config
+import spectre_server.core.io
 import spectre_server.core.spectrograms
 from ._base import Base, parse_batch_file_name
+from ._archive import (
+    get_archive_file_name,
+    parse_archive_file_name,
+    read_archive_index,
+    write_archive,
+)
 
 T = typing.TypeVar("T", bound=Base)
 
 
+def scan_dir(dir_path: str, recursive: bool = True) -> dict[str, int]:
+    """Find every file in a directory, with a single pass over each directory.
+
+    :param dir_path: The directory to scan. If it doesn't exist, nothing is found.
+    :param recursive: If False, ignore files in any subdirectories. Defaults to True.
+    :return: The size of each file in bytes, by file path.
+    """
+    file_sizes = {}
+    dir_paths = [dir_path]
+    while dir_paths:
+        try:
+            entries = os.scandir(dir_paths.pop())
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if recursive:
+                            dir_paths.append(entry.path)
+                    elif entry.is_file():
+                        file_sizes[entry.path] = entry.stat().st_size
+                except FileNotFoundError:
+                    # The file was deleted while we were looking.
+                    continue
+    return file_sizes
+
+
 class Batches(typing.Generic[T]):
     def __init__(
         self,
         tag: str,
         batch_cls: typing.Type[T],
         batches_dir_path: typing.Optional[str] = None,
+        recursive: bool = True,
     ) -> None:
         """A simple interface to read batched filesystem data.
 
         :param batch_cls: The `Base` subclass used to read batch files under that tag.
         :param tag: The data tag.
         :param batches_dir_path: Optionally override the directory containing the batched files.
+        :param recursive: If False, ignore batch files in any subdirectories. Defaults to True.
         """
         self.__batch_cls = batch_cls
         self.__tag = tag
         self.__batches_dir_path = (
             batches_dir_path or spectre_server.core.config.paths.get_batches_dir_path()
         )
+        self.__recursive = recursive
         self.__batch_map: dict[str, T] = collections.OrderedDict()
         self.__update()
 
@@ -39,17 +77,53 @@ class Batches(typing.Generic[T]):
         """Perform a fresh search of all files with `tag` in the batch name."""
         self.__batch_map.clear()
 
-        paths = []
-        for root, _, files in os.walk(self.__batches_dir_path):
-            for file in files:
-                paths.append(os.path.join(root, file))
+        # Every file found by the scan is recorded, so whether each batch file exists is
+        # answered without touching the file system again.
+        file_sizes = scan_dir(self.__batches_dir_path, self.__recursive)
 
-        for path in paths:
-            start_time, tag, _ = parse_batch_file_name(os.path.basename(path))
-            if not self.__tag is None and tag == self.__tag:
+        archive_paths = []
+        for path in file_sizes:
+            file_name = os.path.basename(path)
+            if parse_archive_file_name(file_name) == self.__tag:
+                archive_paths.append(path)
+                continue
+            try:
+                start_time, tag, extension = parse_batch_file_name(file_name)
+            except ValueError:
+                # Ignore anything which isn't a batch file, such as a partially written temporary file.
+                continue
+            if self.__tag is None or tag != self.__tag:
+                continue
+            dir_path = os.path.dirname(path)
+            if start_time not in self.__batch_map:
                 self.__batch_map[start_time] = self.__batch_cls(
-                    os.path.dirname(path), start_time, tag
+                    dir_path, start_time, tag
                 )
+                continue
+            # The files in a batch can be split across directories while it's being moved into its partition.
+            batch = self.__batch_map[start_time]
+            if (
+                extension in batch.extensions
+                and os.path.dirname(batch.get_file(extension).file_path) != dir_path
+            ):
+                batch.relocate_file(extension, dir_path)
+
+        # Batch files packed in an archive are read through its index.
+        for archive_path in archive_paths:
+            for file_name, member in read_archive_index(archive_path).items():
+                start_time, tag, extension = parse_batch_file_name(file_name)
+                if start_time not in self.__batch_map:
+                    self.__batch_map[start_time] = self.__batch_cls(
+                        os.path.dirname(archive_path), start_time, tag
+                    )
+                batch = self.__batch_map[start_time]
+                if extension in batch.extensions:
+                    batch.get_file(extension).archive_member = member
+
+        for batch in self.__batch_map.values():
+            for extension in batch.extensions:
+                batch_file = batch.get_file(extension)
+                batch_file.record_scan(file_sizes.get(batch_file.file_path))
 
         self.__batch_map = collections.OrderedDict(sorted(self.__batch_map.items()))
 
@@ -88,24 +162,37 @@ class Batches(typing.Generic[T]):
             )
 
     def get_spectrogram(
-        self, start_datetime: datetime.datetime, end_datetime: datetime.datetime
+        self,
+        start_datetime: datetime.datetime,
+        end_datetime: datetime.datetime,
+        max_workers: typing.Optional[int] = None,
     ) -> spectre_server.core.spectrograms.Spectrogram:
         """
         Retrieve a spectrogram spanning the specified time range.
 
+        Batch files are read concurrently, but are always stitched together in time order.
+
         :param start_datetime: The start time of the range (inclusive).
         :param end_datetime: The end time of the range (inclusive).
+        :param max_workers: Optionally override the number of threads used to read the batch files, defaults to None.
+        If None, the number is taken from the `SPECTRE_MAX_IO_WORKERS` environment variable.
         :raises FileNotFoundError: If no spectrogram data is available within the specified time range.
         :raise ValueError: If the start time is not less than the end time.
         :return: A spectrogram created by stitching together data from all matching batches.
         """
         self.__validate_range(start_datetime, end_datetime)
-        batches_in_range = self.get_batches_in_range(start_datetime, end_datetime)
-        spectrograms = [
-            batch.read_spectrogram()
-            for batch in batches_in_range
+        batches_in_range = [
+            batch
+            for batch in self.get_batches_in_range(start_datetime, end_datetime)
             if batch.spectrogram_file.exists
         ]
+        spectrograms = list(
+            spectre_server.core.io.imap_ordered(
+                lambda batch: batch.read_spectrogram(),
+                batches_in_range,
+                max_workers=max_workers,
+            )
+        )
 
         if not spectrograms:
             raise FileNotFoundError(
@@ -117,6 +204,39 @@ class Batches(typing.Generic[T]):
             end_datetime,
         )
 
+    def get_lazy_spectrogram(
+        self,
+        start_datetime: datetime.datetime,
+        end_datetime: datetime.datetime,
+        max_workers: typing.Optional[int] = None,
+    ) -> spectre_server.core.spectrograms.LazySpectrogram:
+        """
+        Retrieve a lazily-read view of the spectrogram spanning the specified time range.
+
+        Unlike `get_spectrogram`, the batch files are not joined in memory. The dynamic spectra
+        are only read as they are needed, so long time ranges can be cut or chopped cheaply.
+
+        :param start_datetime: The start time of the range (inclusive).
+        :param end_datetime: The end time of the range (inclusive).
+        :param max_workers: Optionally override the number of threads used to read the batch files, defaults to None.
+        :raises FileNotFoundError: If no spectrogram data is available within the specified time range.
+        :raise ValueError: If the start time is not less than the end time.
+        :return: A view over the data from all matching batches.
+        """
+        self.__validate_range(start_datetime, end_datetime)
+        sources = [
+            batch.spectrogram_file
+            for batch in self.get_batches_in_range(start_datetime, end_datetime)
+            if batch.spectrogram_file.exists
+        ]
+        if not sources:
+            raise FileNotFoundError(
+                f"No spectrogram data found for the time range {start_datetime} to {end_datetime}."
+            )
+        return spectre_server.core.spectrograms.LazySpectrogram(
+            sources, max_workers=max_workers
+        ).time_chop(start_datetime, end_datetime)
+
     def get_batches_in_range(
         self, start_datetime: datetime.datetime, end_datetime: datetime.datetime
     ) -> list[T]:
@@ -132,21 +252,115 @@ class Batches(typing.Generic[T]):
         :return: A list of batches that fall within the specified time range.
         """
         self.__validate_range(start_datetime, end_datetime)
-        filtered_batches = []
-        batch_datetimes = [
-            datetime.datetime.strptime(
-                t, spectre_server.core.config.TimeFormat.DATETIME
-            )
-            for t in self.__batch_map.keys()
-        ]
-        for idx, batch in enumerate(self):
-            this_start = batch_datetimes[idx]
-            next_start = (
-                batch_datetimes[idx + 1]
-                if idx + 1 < len(batch_datetimes)
-                else datetime.datetime.max
+        return filter_batches_in_range(list(self), start_datetime, end_datetime)
+
+
+def filter_batches_in_range(
+    batches: typing.Sequence[T],
+    start_datetime: datetime.datetime,
+    end_datetime: datetime.datetime,
+) -> list[T]:
+    """Filter batches, ordered by start time, to those which overlap with the input time range.
+
+    Unlike `Batches.get_batches_in_range`, the batches can be collected from more than one
+    directory, such as over many days.
+
+    The end time of each batch is assumed to be upper bounded by the start time of the next,
+    since they cannot overlap. The final batch is treated as ending at `datetime.max`
+    since there is no batch after it to provide that upper bound.
+
+    :param batches: The batches to filter, in order of their start time.
+    :param start_datetime: The start time of the range (inclusive).
+    :param end_datetime: The end time of the range (inclusive).
+    :return: A list of batches that fall within the specified time range.
+    """
+    filtered_batches = []
+    batch_datetimes = [
+        datetime.datetime.strptime(
+            batch.start_time, spectre_server.core.config.TimeFormat.DATETIME
+        )
+        for batch in batches
+    ]
+    for idx, batch in enumerate(batches):
+        this_start = batch_datetimes[idx]
+        next_start = (
+            batch_datetimes[idx + 1]
+            if idx + 1 < len(batch_datetimes)
+            else datetime.datetime.max
+        )
+        if start_datetime < next_start and this_start <= end_datetime:
+            filtered_batches.append(batch)
+
+    return filtered_batches
+
+
+# Only the small files produced for each batch are archived. The I/Q samples are read in place.
+ARCHIVE_EXTENSIONS = ("fits", "png", "hdr")
+
+
+def archive_batch_files(
+    tag: str,
+    year: int,
+    month: int,
+    day: int,
+    extensions: typing.Optional[list[str]] = None,
+    dry_run: bool = False,
+) -> list[str]:
+    """Pack the batch files for a completed day into a single uncompressed archive, then delete them.
+
+    The archive is stored in the directory for the day, and is read transparently by `Batches`. If an
+    archive already exists for the day, the batch files are added to it.
+
+    :param tag: Only archive batch files with this tag.
+    :param year: The year of the day.
+    :param month: The month of the day.
+    :param day: The day of the month.
+    :param extensions: Only archive batch files with these extensions. Defaults to None, in which case
+    `.fits`, `.png` and `.hdr` files are archived.
+    :param dry_run: If True, report which files would be archived without actually archiving them. Defaults to False.
+    :raises ValueError: If the day has not yet completed, or an extension cannot be archived.
+    :return: The file paths of the archived batch files, as they were before being archived.
+    """
+    extensions = list(extensions or ARCHIVE_EXTENSIONS)
+    for extension in extensions:
+        if extension not in ARCHIVE_EXTENSIONS:
+            raise ValueError(
+                f"Batch files with extension '{extension}' cannot be archived. "
+                f"Expected one of {ARCHIVE_EXTENSIONS}"
             )
-            if start_datetime < next_start and this_start <= end_datetime:
-                filtered_batches.append(batch)
 
-        return filtered_batches
+    # Batch files are named after their start time in UTC.
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    if datetime.date(year, month, day) >= today:
+        raise ValueError(
+            f"Only completed days can be archived. Got {year:04}-{month:02}-{day:02}"
+        )
+
+    day_dir_path = spectre_server.core.config.paths.get_batches_dir_path(
+        year, month, day
+    )
+    file_paths = []
+    for root, _, file_names in os.walk(day_dir_path):
+        for file_name in file_names:
+            try:
+                _, file_tag, extension = parse_batch_file_name(file_name)
+            except ValueError:
+                continue
+            if file_tag == tag and extension in extensions:
+                file_paths.append(os.path.join(root, file_name))
+    file_paths.sort(key=os.path.basename)
+
+    if dry_run or not file_paths:
+        return file_paths
+
+    archive_path = os.path.join(day_dir_path, get_archive_file_name(tag))
+    members = read_archive_index(archive_path) if os.path.exists(archive_path) else None
+    write_archive(archive_path, file_paths, members)
+    for file_path in file_paths:
+        os.remove(file_path)
+
+    # Remove any partitions left empty.
+    for dir_path in {os.path.dirname(file_path) for file_path in file_paths}:
+        if dir_path != day_dir_path and not os.listdir(dir_path):
+            os.rmdir(dir_path)
+    return file_paths
@@ -0,0 +1,226 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Extract the I/Q samples over a time range, which can span many batches."""
+
+import sys
+import math
+import typing
+import datetime
+import dataclasses
+import collections.abc
+
+import numpy as np
+import numpy.typing as npt
+
+import spectre_server.core.config
+
+from ._iq_stream import IQStreamBatch, IQStreamBatchExtension
+
+# The SigMF datatype of the stitched samples, which are always single-precision complex floats.
+_SIGMF_DATATYPE = "cf32_le"
+_SIGMF_VERSION = "1.0.0"
+
+
+@dataclasses.dataclass(frozen=True)
+class IQSegment:
+    """A contiguous range of I/Q samples from a single batch.
+
+    :ivar batch: The batch containing the samples.
+    :ivar start: The index of the first sample in the batch.
+    :ivar stop: The index after the last sample in the batch.
+    :ivar start_datetime: The time of the first sample.
+    """
+
+    batch: IQStreamBatch
+    start: int
+    stop: int
+    start_datetime: datetime.datetime
+
+    @property
+    def num_samples(self) -> int:
+        """The number of samples in the segment."""
+        return self.stop - self.start
+
+
+def _get_sample_index(
+    at_datetime: datetime.datetime,
+    batch_start_datetime: datetime.datetime,
+    sample_rate: float,
+) -> int:
+    """Get the index of the first sample at or after a time, relative to the start of a batch."""
+    # Use integer microseconds, to avoid rounding errors accumulating over long batches.
+    elapsed_us = (at_datetime - batch_start_datetime) // datetime.timedelta(
+        microseconds=1
+    )
+    return math.ceil(elapsed_us * sample_rate / 1e6 - 1e-9)
+
+
+def get_iq_segments(
+    batches: collections.abc.Iterable[IQStreamBatch],
+    extension: str,
+    sample_rate: float,
+    start_datetime: datetime.datetime,
+    end_datetime: datetime.datetime,
+) -> list[IQSegment]:
+    """Find the I/Q samples in the time range `[start_datetime, end_datetime)`.
+
+    Each batch is assumed to contain samples captured at a constant sample rate, from the start
+    time of the batch. Batches without any I/Q samples are skipped.
+
+    :param batches: The batches to look through, in order of their start time.
+    :param extension: The output type of the raw samples.
+    :param sample_rate: The sample rate of the receiver, in Hz.
+    :param start_datetime: The start of the time range (inclusive).
+    :param end_datetime: The end of the time range (exclusive).
+    :raises ValueError: If the time range is empty.
+    :return: The samples in each batch within the time range, in order.
+    """
+    if end_datetime <= start_datetime:
+        raise ValueError(
+            f"The end time {end_datetime} must be after the start time {start_datetime}"
+        )
+
+    segments = []
+    for batch in batches:
+        if not batch.has_iq(extension):
+            continue
+        num_samples = batch.get_num_iq_samples(extension)
+        start = max(
+            _get_sample_index(start_datetime, batch.start_datetime, sample_rate), 0
+        )
+        stop = min(
+            _get_sample_index(end_datetime, batch.start_datetime, sample_rate),
+            num_samples,
+        )
+        if start < stop:
+            segments.append(
+                IQSegment(
+                    batch,
+                    start,
+                    stop,
+                    batch.start_datetime
+                    + datetime.timedelta(seconds=start / sample_rate),
+                )
+            )
+    return segments
+
+
+def iter_iq_segments(
+    segments: collections.abc.Iterable[IQSegment], extension: str
+) -> collections.abc.Iterator[npt.NDArray[np.complex64]]:
+    """Iterate over the I/Q samples in each segment, in chunks.
+
+    :param segments: The segments to read, in order.
+    :param extension: The output type of the raw samples.
+    :return: An iterator over 64-bit complex IQ samples, stitched across the segments.
+    """
+    for segment in segments:
+        yield from segment.batch.iter_iq_samples(extension, segment.start, segment.stop)
+
+
+def get_raw_byte_range(
+    segment: IQSegment, extension: str
+) -> typing.Optional[tuple[str, int, int]]:
+    """Locate the bytes of a segment in its raw file, if they can be served without conversion.
+
+    This is only possible for raw `fc32` samples, which are already single-precision complex floats.
+
+    :param segment: The segment to locate.
+    :param extension: The output type of the raw samples.
+    :return: The file path, the byte offset and the number of bytes, or None if the samples must be converted.
+    """
+    if (
+        extension != IQStreamBatchExtension.FC32
+        or not segment.batch.fc32_file.exists
+        or sys.byteorder != "little"
+    ):
+        return None
+    sample_size = np.dtype(np.complex64).itemsize
+    return (
+        segment.batch.fc32_file.file_path,
+        segment.start * sample_size,
+        segment.num_samples * sample_size,
+    )
+
+
+def _format_sigmf_datetime(dt: datetime.datetime) -> str:
+    return dt.strftime(spectre_server.core.config.TimeFormat.DATETIME)
+
+
+def make_sigmf_meta(
+    segments: collections.abc.Sequence[IQSegment],
+    sample_rate: float,
+    center_frequency: typing.Optional[float] = None,
+    description: str = "",
+) -> dict[str, typing.Any]:
+    """Describe the stitched I/Q samples from each segment in the SigMF metadata format.
+
+    A new capture starts wherever there is a gap in time between consecutive segments. For swept
+    data, where the batches have a `.hdr` file, a new capture also starts at each step, recording
+    the center frequency of that step.
+
+    :param segments: The segments which were stitched together, in order.
+    :param sample_rate: The sample rate of the receiver, in Hz.
+    :param center_frequency: The center frequency of the receiver in Hz, if it is fixed.
+    :param description: A description of the recording.
+    :return: The contents of the `.sigmf-meta` file.
+    """
+    captures: list[dict[str, typing.Any]] = []
+    sample_start = 0
+    expected_datetime: typing.Optional[datetime.datetime] = None
+    sample_period = datetime.timedelta(seconds=1 / sample_rate)
+    for segment in segments:
+        is_contiguous = expected_datetime is not None and abs(
+            segment.start_datetime - expected_datetime
+        ) <= max(sample_period, datetime.timedelta(microseconds=1))
+
+        if segment.batch.hdr_file.exists:
+            # Start a new capture at every step overlapping the segment.
+            iq_metadata = segment.batch.hdr_file.read()
+            step_offsets = np.concatenate([[0], np.cumsum(iq_metadata.num_samples)])
+            for step, step_center_frequency in enumerate(
+                iq_metadata.center_frequencies
+            ):
+                step_start = max(int(step_offsets[step]), segment.start)
+                step_stop = min(int(step_offsets[step + 1]), segment.stop)
+                if step_start >= step_stop:
+                    continue
+                capture: dict[str, typing.Any] = {
+                    "core:sample_start": sample_start + step_start - segment.start,
+                    "core:frequency": float(step_center_frequency),
+                }
+                if not is_contiguous:
+                    capture["core:datetime"] = _format_sigmf_datetime(
+                        segment.batch.start_datetime
+                        + datetime.timedelta(seconds=step_start / sample_rate)
+                    )
+                    is_contiguous = True
+                captures.append(capture)
+        elif not is_contiguous:
+            capture = {
+                "core:sample_start": sample_start,
+                "core:datetime": _format_sigmf_datetime(segment.start_datetime),
+            }
+            if center_frequency is not None:
+                capture["core:frequency"] = center_frequency
+            captures.append(capture)
+
+        sample_start += segment.num_samples
+        expected_datetime = segment.start_datetime + datetime.timedelta(
+            seconds=segment.num_samples / sample_rate
+        )
+
+    return {
+        "global": {
+            "core:datatype": _SIGMF_DATATYPE,
+            "core:sample_rate": sample_rate,
+            "core:version": _SIGMF_VERSION,
+            "core:num_channels": 1,
+            "core:recorder": "spectre",
+            "core:description": description,
+        },
+        "captures": captures,
+        "annotations": [],
+    }
@@ -5,15 +5,25 @@
 import datetime
 import dataclasses
 import typing
+import collections.abc
 
 import numpy as np
 import numpy.typing as npt
-import astropy.io
 
 import spectre_server.core.config
 import spectre_server.core.spectrograms
 
-from ._base import Base, BatchFile
+from ._base import Base, BatchFile, SpectrogramFile
+from ._iqz import (
+    IQZCodec,
+    IQZIndex,
+    iter_iqz,
+    read_iqz,
+    read_iqz_index,
+    write_iqz,
+    iter_raw_iq,
+    get_num_raw_iq_samples,
+)
 
 
 @dataclasses.dataclass(frozen=True)
@@ -26,6 +36,7 @@ class IQStreamBatchExtension:
     :ivar SC8: Corresponds to the `.sc8` file extension.
     :ivar SC16: Corresponds to the `.sc16` file extension.
     :ivar HDR: Corresponds to the `.hdr` file extension.
+    :ivar IQZ: Corresponds to the `.iqz` file extension.
     """
 
     FITS: str = "fits"
@@ -34,6 +45,7 @@ class IQStreamBatchExtension:
     SC8: str = "sc8"
     SC16: str = "sc16"
     HDR: str = "hdr"
+    IQZ: str = "iqz"
 
 
 class _Fc32File(BatchFile[npt.NDArray[np.complex64]]):
@@ -42,7 +54,7 @@ class _Fc32File(BatchFile[npt.NDArray[np.complex64]]):
 
         :return: 64-bit complex IQ samples.
         """
-        return np.fromfile(self.file_path, dtype=np.complex64)
+        return self._read_array(np.complex64)
 
 
 class _Fc64File(BatchFile[npt.NDArray[np.complex64]]):
@@ -52,7 +64,7 @@ class _Fc64File(BatchFile[npt.NDArray[np.complex64]]):
 
         :return: 64-bit complex IQ samples.
         """
-        return np.fromfile(self.file_path, dtype=np.complex128).astype(np.complex64)
+        return self._read_array(np.complex128).astype(np.complex64)
 
 
 class _Sc8File(BatchFile[npt.NDArray[np.complex64]]):
@@ -62,7 +74,7 @@ class _Sc8File(BatchFile[npt.NDArray[np.complex64]]):
 
         :return: 64-bit complex IQ samples.
         """
-        data = np.fromfile(self.file_path, dtype=np.int8)
+        data = self._read_array(np.int8)
         return (data[0::2] + 1j * data[1::2]).astype(np.complex64)
 
 
@@ -73,10 +85,45 @@ class _Sc16File(BatchFile[npt.NDArray[np.complex64]]):
 
         :return: 64-bit complex IQ samples.
         """
-        data = np.fromfile(self.file_path, dtype=np.int16)
+        data = self._read_array(np.int16)
         return (data[0::2] + 1j * data[1::2]).astype(np.complex64)
 
 
+class _IqzFile(BatchFile[npt.NDArray[np.complex64]]):
+    def read(self) -> npt.NDArray[np.complex64]:
+        """Read all the I/Q samples in the block-compressed I/Q file.
+
+        :return: 64-bit complex IQ samples.
+        """
+        return read_iqz(self.file_path)
+
+    def read_index(self) -> IQZIndex:
+        """Read the index of the file, without decompressing any samples."""
+        return read_iqz_index(self.file_path)
+
+    def read_samples(
+        self, start: int = 0, stop: typing.Optional[int] = None
+    ) -> npt.NDArray[np.complex64]:
+        """Read a contiguous range of I/Q samples, decompressing only the blocks which contain them.
+
+        :param start: The index of the first sample.
+        :param stop: The index after the last sample, defaults to the end of the file.
+        :return: 64-bit complex IQ samples.
+        """
+        return read_iqz(self.file_path, start, stop)
+
+    def iter_samples(
+        self, start: int = 0, stop: typing.Optional[int] = None
+    ) -> collections.abc.Iterator[npt.NDArray[np.complex64]]:
+        """Iterate over a contiguous range of I/Q samples, one compressed block at a time.
+
+        :param start: The index of the first sample.
+        :param stop: The index after the last sample, defaults to the end of the file.
+        :return: An iterator over 64-bit complex IQ samples.
+        """
+        return iter_iqz(self.file_path, start, stop)
+
+
 @dataclasses.dataclass
 class IQMetadata:
     """Stores metadata produced by the batched file sink block.
@@ -96,39 +143,120 @@ class _HdrFile(BatchFile[IQMetadata]):
 
         :return: A container for the metadata
         """
-        data = np.fromfile(self.file_path, dtype=np.float32)
+        data = self._read_array(np.float32)
         return IQMetadata(data[0::2], data[1::2].astype(np.int32))
 
 
-class _FitsFile(BatchFile[spectre_server.core.spectrograms.Spectrogram]):
-    def read(self) -> spectre_server.core.spectrograms.Spectrogram:
-        """Read the FITS file and create a spectrogram."""
-        with astropy.io.fits.open(self.file_path, mode="readonly") as hdulist:
-            primary_hdu = hdulist["PRIMARY"]
-            dynamic_spectra = primary_hdu.data
-            bunit = primary_hdu.header["BUNIT"]
-
-            date_obs = primary_hdu.header["DATE-OBS"]
-            time_obs = primary_hdu.header["TIME-OBS"]
-            spectrogram_start_datetime = datetime.datetime.strptime(
-                f"{date_obs}T{time_obs}Z",
-                spectre_server.core.config.TimeFormat.DATETIME,
-            )
+class _FitsFile(SpectrogramFile):
+    def __read(
+        self, time_slice: slice = slice(None)
+    ) -> spectre_server.core.spectrograms.Spectrogram:
+        file_path, offset, num_bytes = self.location
+        fits_contents = spectre_server.core.spectrograms.read_fits(
+            file_path, time_slice, offset, num_bytes
+        )
+        dynamic_spectra = fits_contents.dynamic_spectra
+        times = fits_contents.times
+        frequencies = fits_contents.frequencies * 1e6  # Convert to Hz
+        spectrogram_start_datetime = self.__get_start_datetime(fits_contents.header)
 
-            bintable_hdu = hdulist[1]
-            times = bintable_hdu.data["TIME"][0]
-            frequencies = bintable_hdu.data["FREQUENCY"][0] * 1e6  # Convert to Hz
+        # If only part of the file was read, translate such that the first spectrum is at t=0 [s].
+        if times[0] != 0:
+            spectrogram_start_datetime += datetime.timedelta(seconds=float(times[0]))
+            times = times - times[0]
 
         # bunit is interpreted as a SpectrumUnit.
-        spectrum_unit = spectre_server.core.spectrograms.SpectrumUnit(bunit)
+        spectrum_unit = spectre_server.core.spectrograms.SpectrumUnit(
+            fits_contents.header["BUNIT"]
+        )
         return spectre_server.core.spectrograms.Spectrogram(
             dynamic_spectra,
-            times,
+            times.astype(np.float32),
             frequencies,
             spectrum_unit,
             spectrogram_start_datetime,
         )
 
+    @staticmethod
+    def __get_start_datetime(
+        header: dict[str, str | int | float | bool],
+    ) -> datetime.datetime:
+        date_obs = header["DATE-OBS"]
+        time_obs = header["TIME-OBS"]
+        return datetime.datetime.strptime(
+            f"{date_obs}T{time_obs}Z",
+            spectre_server.core.config.TimeFormat.DATETIME,
+        )
+
+    def read(self) -> spectre_server.core.spectrograms.Spectrogram:
+        """Read the FITS file and create a spectrogram."""
+        return self.__read()
+
+    def read_time_range(
+        self, start_datetime: datetime.datetime, end_datetime: datetime.datetime
+    ) -> spectre_server.core.spectrograms.Spectrogram:
+        """Read only the spectrums in the FITS file within a time range.
+
+        If the dynamic spectra are tile-compressed, only the tiles overlapping the time range
+        are decompressed.
+
+        :param start_datetime: The start of the time range (inclusive).
+        :param end_datetime: The end of the time range (inclusive).
+        :raises ValueError: If none of the spectrums in the file are within the time range.
+        :return: A spectrogram containing only the spectrums within the time range.
+        """
+        header, times, _ = spectre_server.core.spectrograms.read_fits_axes(
+            *self.location
+        )
+        file_start_datetime = self.__get_start_datetime(header)
+        start_index, end_index = np.searchsorted(
+            times,
+            [
+                (start_datetime - file_start_datetime).total_seconds(),
+                (end_datetime - file_start_datetime).total_seconds(),
+            ],
+            side="left",
+        )
+        # Include any spectrum at exactly the end of the time range.
+        if (
+            end_index < len(times)
+            and times[end_index] == (end_datetime - file_start_datetime).total_seconds()
+        ):
+            end_index += 1
+        if start_index >= end_index:
+            raise ValueError(
+                f"No spectrums in {self.file_name} are between {start_datetime} and {end_datetime}"
+            )
+        return self.__read(slice(start_index, end_index))
+
+    def read_axes(self) -> spectre_server.core.spectrograms.SpectrogramAxes:
+        """Read the datetimes and frequencies of each spectrum from the FITS file, without reading
+        the dynamic spectra."""
+        header, times, frequencies = spectre_server.core.spectrograms.read_fits_axes(
+            *self.location
+        )
+        start_datetime = np.datetime64(self.__get_start_datetime(header))
+        return spectre_server.core.spectrograms.SpectrogramAxes(
+            # As for the spectrogram, so that the datetimes are identical.
+            start_datetime + (1e6 * times.astype(np.float32)).astype("timedelta64[us]"),
+            frequencies * 1e6,  # Convert to Hz
+            spectre_server.core.spectrograms.SpectrumUnit(header["BUNIT"]),
+        )
+
+    def read_block(
+        self, rows: slice | npt.NDArray[np.intp], time_slice: slice
+    ) -> npt.NDArray[np.float32]:
+        """Read a block of the dynamic spectra from the FITS file.
+
+        If the dynamic spectra are uncompressed, they're memory-mapped so only the block is read from disk.
+        Otherwise, only the tiles overlapping the time slice are decompressed.
+        """
+        file_path, offset, num_bytes = self.location
+        fits_contents = spectre_server.core.spectrograms.read_fits(
+            file_path, time_slice, offset, num_bytes
+        )
+        return np.array(fits_contents.dynamic_spectra[rows])
+
 
 class IQStreamBatch(Base):
 
@@ -142,6 +270,7 @@ class IQStreamBatch(Base):
         - `.sc8`
         - `.sc16`
         - `.hdr`
+        - `.iqz`
 
         :param start_time: The start time of the batch.
         :param tag: The batch name tag.
@@ -154,6 +283,7 @@ class IQStreamBatch(Base):
         self.add_file(_Sc8File, IQStreamBatchExtension.SC8)
         self.add_file(_Sc16File, IQStreamBatchExtension.SC16)
         self.add_file(_HdrFile, IQStreamBatchExtension.HDR)
+        self.add_file(_IqzFile, IQStreamBatchExtension.IQZ)
 
     @property
     def fits_file(self) -> _FitsFile:
@@ -185,45 +315,134 @@ class IQStreamBatch(Base):
         """The batch file corresponding to the `.hdr` extension."""
         return typing.cast(_HdrFile, self.get_file(IQStreamBatchExtension.HDR))
 
+    @property
+    def iqz_file(self) -> _IqzFile:
+        """The batch file corresponding to the `.iqz` extension."""
+        return typing.cast(_IqzFile, self.get_file(IQStreamBatchExtension.IQZ))
+
     @property
     def spectrogram_file(self) -> _FitsFile:
         return self.fits_file
 
-    def read_iq(self, extension: str) -> npt.NDArray[np.complex64]:
-        """Read I/Q samples from the batch."""
+    def __get_raw_iq_file(self, extension: str) -> BatchFile[npt.NDArray[np.complex64]]:
         if extension == IQStreamBatchExtension.FC32:
-            return self.fc32_file.read()
+            return self.fc32_file
         elif extension == IQStreamBatchExtension.FC64:
-            return self.fc64_file.read()
+            return self.fc64_file
         elif extension == IQStreamBatchExtension.SC8:
-            return self.sc8_file.read()
+            return self.sc8_file
         elif extension == IQStreamBatchExtension.SC16:
-            return self.sc16_file.read()
+            return self.sc16_file
         else:
             raise ValueError(f"Unsupported output type: {extension}")
 
+    def __get_iq_file(self, extension: str) -> BatchFile[npt.NDArray[np.complex64]]:
+        """Get the file holding the I/Q samples, which is the block-compressed I/Q file if
+        the raw samples have been compressed."""
+        raw_iq_file = self.__get_raw_iq_file(extension)
+        if not raw_iq_file.exists and self.iqz_file.exists:
+            return self.iqz_file
+        return raw_iq_file
+
+    def has_iq(self, extension: str) -> bool:
+        """Check whether the batch contains I/Q samples, either raw or block-compressed."""
+        return self.__get_raw_iq_file(extension).exists or self.iqz_file.exists
+
+    def get_num_iq_samples(self, extension: str) -> int:
+        """Get the number of I/Q samples in the batch, without reading them."""
+        iq_file = self.__get_iq_file(extension)
+        if isinstance(iq_file, _IqzFile):
+            return iq_file.read_index().num_samples
+        return get_num_raw_iq_samples(iq_file.file_path, extension)
+
+    def read_iq(self, extension: str) -> npt.NDArray[np.complex64]:
+        """Read I/Q samples from the batch.
+
+        If the raw samples have been compressed, they are read from the block-compressed I/Q file.
+        """
+        return self.__get_iq_file(extension).read()
+
     def cached_read_iq(self, extension: str) -> npt.NDArray[np.complex64]:
         """Read I/Q samples from the batch."""
-        if extension == IQStreamBatchExtension.FC32:
-            return self.fc32_file.cached_read()
-        elif extension == IQStreamBatchExtension.FC64:
-            return self.fc64_file.cached_read()
-        elif extension == IQStreamBatchExtension.SC8:
-            return self.sc8_file.cached_read()
-        elif extension == IQStreamBatchExtension.SC16:
-            return self.sc16_file.cached_read()
-        else:
-            raise ValueError(f"Unsupported output type: {extension}")
+        return self.__get_iq_file(extension).cached_read()
+
+    def read_iq_samples(
+        self, extension: str, start: int = 0, stop: typing.Optional[int] = None
+    ) -> npt.NDArray[np.complex64]:
+        """Read a contiguous range of I/Q samples from the batch.
+
+        If the raw samples have been compressed, only the blocks containing the range are decompressed.
+        Otherwise, only the range is read from the raw file.
+
+        :param extension: The output type of the raw samples.
+        :param start: The index of the first sample.
+        :param stop: The index after the last sample, defaults to the last sample in the batch.
+        :return: 64-bit complex IQ samples.
+        """
+        return np.concatenate(
+            [
+                np.empty(0, dtype=np.complex64),
+                *self.iter_iq_samples(extension, start, stop),
+            ]
+        )
+
+    def iter_iq_samples(
+        self,
+        extension: str,
+        start: int = 0,
+        stop: typing.Optional[int] = None,
+        chunk_num_samples: int = 1 << 16,
+    ) -> collections.abc.Iterator[npt.NDArray[np.complex64]]:
+        """Iterate over a contiguous range of I/Q samples from the batch, in chunks.
+
+        :param extension: The output type of the raw samples.
+        :param start: The index of the first sample.
+        :param stop: The index after the last sample, defaults to the last sample in the batch.
+        :param chunk_num_samples: The number of samples in each chunk read from a raw file. Chunks read
+        from a block-compressed I/Q file are instead aligned with its blocks.
+        :return: An iterator over 64-bit complex IQ samples.
+        """
+        iq_file = self.__get_iq_file(extension)
+        if isinstance(iq_file, _IqzFile):
+            yield from iq_file.iter_samples(start, stop)
+            return
+
+        yield from iter_raw_iq(
+            iq_file.file_path, extension, start, stop, chunk_num_samples
+        )
 
     def delete_iq(self, extension: str) -> None:
-        """Delete I/Q samples from the batch."""
-        if extension == IQStreamBatchExtension.FC32:
-            self.fc32_file.delete()
-        elif extension == IQStreamBatchExtension.FC64:
-            self.fc64_file.delete()
-        elif extension == IQStreamBatchExtension.SC8:
-            self.sc8_file.delete()
-        elif extension == IQStreamBatchExtension.SC16:
-            self.sc16_file.delete()
-        else:
-            raise ValueError(f"Unsupported output type: {extension}")
+        """Delete I/Q samples from the batch, including any block-compressed I/Q file."""
+        self.__get_raw_iq_file(extension).delete(ignore_if_missing=self.iqz_file.exists)
+        self.iqz_file.delete(ignore_if_missing=True)
+
+    def compress_iq(
+        self,
+        extension: str,
+        codec: IQZCodec = IQZCodec.ZLIB,
+        shuffle: bool = True,
+        delete_raw: bool = True,
+    ) -> IQZIndex:
+        """Losslessly compress the raw I/Q samples in the batch into a block-compressed I/Q file.
+
+        :param extension: The output type of the raw samples.
+        :param codec: The compression applied to each block, defaults to zlib.
+        :param shuffle: If True, shuffle the bytes in each block before compression. Defaults to True.
+        :param delete_raw: If True, delete the raw samples once they've been compressed. Defaults to True.
+        :raises FileNotFoundError: If the raw samples do not exist.
+        :return: The index of the block-compressed I/Q file.
+        """
+        raw_iq_file = self.__get_raw_iq_file(extension)
+        if not raw_iq_file.exists:
+            raise FileNotFoundError(f"{raw_iq_file.file_name} does not exist.")
+        index = write_iqz(
+            raw_iq_file.file_path,
+            self.iqz_file.file_path,
+            extension,
+            codec=codec,
+            shuffle=shuffle,
+        )
+        self.iqz_file.forget_scan()
+        if delete_raw:
+            raw_iq_file.delete()
+        return index
@@ -0,0 +1,360 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""A block-compressed container for I/Q samples, with a seek index.
+
+Each file has the following layout, with all integers little-endian:
+
+- A 32-byte header, containing the magic bytes, the output type of the raw samples, the codec,
+  whether the bytes are shuffled, the number of samples per block and the total number of samples.
+- The compressed blocks, one after the other. Each block contains the raw bytes of (at most)
+  a fixed number of samples.
+- The index, containing the offset and compressed size of each block.
+- A 16-byte footer, containing the offset of the index and the magic bytes.
+
+The raw bytes are stored exactly, so compression is lossless. Samples can be read without
+decompressing any blocks which don't overlap them.
+"""
+
+import os
+import enum
+import zlib
+import lzma
+import struct
+import typing
+import dataclasses
+import collections.abc
+
+import numpy as np
+import numpy.typing as npt
+
+_MAGIC = b"SPECTIQZ"
+_VERSION = 1
+_HEADER = struct.Struct("<8s4sBBBxIQ")
+_FOOTER = struct.Struct("<Q8s")
+_INDEX_DTYPE = np.dtype([("offset", "<u8"), ("size", "<u4")])
+
+# 65536 samples, which is 512 KiB of raw `fc32` samples per block.
+_BLOCK_NUM_SAMPLES = 1 << 16
+
+# The data type of the real and imaginary components of each sample, for each output type.
+_COMPONENT_DTYPES: dict[str, np.dtype] = {
+    "fc32": np.dtype("<f4"),
+    "fc64": np.dtype("<f8"),
+    "sc8": np.dtype("i1"),
+    "sc16": np.dtype("<i2"),
+}
+
+
+class IQZCodec(enum.Enum):
+    """The compression applied to each block of samples.
+
+    :ivar ZLIB: Fast, with a modest compression ratio.
+    :ivar LZMA: Slow, with a better compression ratio.
+    """
+
+    ZLIB = "zlib"
+    LZMA = "lzma"
+
+
+_CODEC_IDS = {IQZCodec.ZLIB: 0, IQZCodec.LZMA: 1}
+
+
+@dataclasses.dataclass(frozen=True)
+class IQZIndex:
+    """Describes how the samples in a block-compressed I/Q file are stored.
+
+    :ivar output_type: The type of the raw samples.
+    :ivar codec: The compression applied to each block.
+    :ivar shuffle: Whether the bytes in each block were shuffled before compression.
+    :ivar block_num_samples: The number of samples in every block, except possibly the last.
+    :ivar num_samples: The total number of samples.
+    :ivar offsets: The offset of each block, in bytes from the start of the file.
+    :ivar sizes: The compressed size of each block, in bytes.
+    """
+
+    output_type: str
+    codec: IQZCodec
+    shuffle: bool
+    block_num_samples: int
+    num_samples: int
+    offsets: npt.NDArray[np.uint64]
+    sizes: npt.NDArray[np.uint32]
+
+    @property
+    def num_blocks(self) -> int:
+        """The number of blocks."""
+        return len(self.offsets)
+
+
+def _get_component_dtype(output_type: str) -> np.dtype:
+    if output_type not in _COMPONENT_DTYPES:
+        raise ValueError(
+            f"Unsupported output type '{output_type}'. Expected one of {list(_COMPONENT_DTYPES)}"
+        )
+    return _COMPONENT_DTYPES[output_type]
+
+
+def _shuffle(data: bytes, itemsize: int) -> bytes:
+    """Group the first byte of every component, then the second, and so on.
+
+    Neighbouring samples tend to share their high bytes, so this gives long runs which compress well.
+    """
+    if itemsize == 1:
+        return data
+    return np.frombuffer(data, np.uint8).reshape(-1, itemsize).T.tobytes()
+
+
+def _unshuffle(data: bytes, itemsize: int) -> bytes:
+    """Invert `_shuffle`."""
+    if itemsize == 1:
+        return data
+    return np.frombuffer(data, np.uint8).reshape(itemsize, -1).T.tobytes()
+
+
+def _compress(data: bytes, codec: IQZCodec, level: int) -> bytes:
+    if codec == IQZCodec.ZLIB:
+        return zlib.compress(data, level)
+    return lzma.compress(data, preset=level)
+
+
+def _decompress(data: bytes, codec: IQZCodec) -> bytes:
+    if codec == IQZCodec.ZLIB:
+        return zlib.decompress(data)
+    return lzma.decompress(data)
+
+
+def _to_complex64(
+    components: npt.NDArray[np.generic], output_type: str
+) -> npt.NDArray[np.complex64]:
+    """Convert interleaved real and imaginary components to 64-bit complex samples."""
+    if output_type == "fc32":
+        return components.astype(np.float32).view(np.complex64)
+    if output_type == "fc64":
+        return components.view(np.complex128).astype(np.complex64)
+    samples = np.empty(len(components) // 2, dtype=np.complex64)
+    samples.real = components[0::2]
+    samples.imag = components[1::2]
+    return samples
+
+
+def get_num_raw_iq_samples(file_path: str, output_type: str) -> int:
+    """Get the number of samples in a file of raw, interleaved I/Q samples."""
+    component_dtype = _get_component_dtype(output_type)
+    return os.path.getsize(file_path) // (2 * component_dtype.itemsize)
+
+
+def iter_raw_iq(
+    file_path: str,
+    output_type: str,
+    start: int = 0,
+    stop: typing.Optional[int] = None,
+    chunk_num_samples: int = _BLOCK_NUM_SAMPLES,
+) -> collections.abc.Iterator[npt.NDArray[np.complex64]]:
+    """Iterate over samples in a file of raw, interleaved I/Q samples, in chunks.
+
+    The file is memory-mapped, so only the requested samples are read.
+
+    :param file_path: The file containing the raw samples.
+    :param output_type: The type of the raw samples.
+    :param start: The index of the first sample, defaults to the first sample in the file.
+    :param stop: The index after the last sample, defaults to the end of the file.
+    :param chunk_num_samples: The number of samples in each chunk.
+    :return: An iterator over the requested samples, converted to 64-bit complex samples.
+    """
+    component_dtype = _get_component_dtype(output_type)
+    num_samples = get_num_raw_iq_samples(file_path, output_type)
+    start, stop, _ = slice(start, stop).indices(num_samples)
+    if start >= stop:
+        return
+    components = np.memmap(
+        file_path, dtype=component_dtype, mode="r", shape=(2 * num_samples,)
+    )
+    for chunk_start in range(start, stop, chunk_num_samples):
+        chunk_stop = min(chunk_start + chunk_num_samples, stop)
+        yield _to_complex64(
+            np.array(components[2 * chunk_start : 2 * chunk_stop]), output_type
+        )
+
+
+def write_iqz(
+    src_file_path: str,
+    dst_file_path: str,
+    output_type: str,
+    codec: IQZCodec = IQZCodec.ZLIB,
+    shuffle: bool = True,
+    level: int = 6,
+    block_num_samples: int = _BLOCK_NUM_SAMPLES,
+) -> IQZIndex:
+    """Compress a file of raw, interleaved I/Q samples into a block-compressed I/Q file.
+
+    The source file is read one block at a time. The destination file is written to a
+    temporary file first, so that it never exists partially written.
+
+    :param src_file_path: The file containing the raw samples.
+    :param dst_file_path: Write the block-compressed file here, overwriting any existing file.
+    :param output_type: The type of the raw samples.
+    :param codec: The compression applied to each block, defaults to zlib.
+    :param shuffle: If True, shuffle the bytes in each block before compression. Defaults to True.
+    :param level: The compression level, from 0 to 9. Defaults to 6.
+    :param block_num_samples: The number of samples in each block.
+    :raises ValueError: If the output type is unsupported, or the source file doesn't contain a
+    whole number of samples.
+    :return: The index of the written file.
+    """
+    component_dtype = _get_component_dtype(output_type)
+    sample_size = 2 * component_dtype.itemsize
+    if block_num_samples <= 0:
+        raise ValueError(
+            f"The number of samples per block must be positive, got {block_num_samples}"
+        )
+    src_size = os.path.getsize(src_file_path)
+    if src_size % sample_size:
+        raise ValueError(
+            f"{src_file_path} does not contain a whole number of {output_type} samples"
+        )
+    num_samples = src_size // sample_size
+
+    offsets, sizes = [], []
+    tmp_file_path = f"{dst_file_path}.tmp"
+    try:
+        with open(src_file_path, "rb") as src, open(tmp_file_path, "wb") as dst:
+            dst.write(
+                _HEADER.pack(
+                    _MAGIC,
+                    output_type.encode("ascii"),
+                    _VERSION,
+                    _CODEC_IDS[codec],
+                    shuffle,
+                    block_num_samples,
+                    num_samples,
+                )
+            )
+            while data := src.read(block_num_samples * sample_size):
+                if shuffle:
+                    data = _shuffle(data, component_dtype.itemsize)
+                compressed = _compress(data, codec, level)
+                offsets.append(dst.tell())
+                sizes.append(len(compressed))
+                dst.write(compressed)
+
+            index_offset = dst.tell()
+            index = np.empty(len(offsets), dtype=_INDEX_DTYPE)
+            index["offset"] = offsets
+            index["size"] = sizes
+            dst.write(index.tobytes())
+            dst.write(_FOOTER.pack(index_offset, _MAGIC))
+        os.replace(tmp_file_path, dst_file_path)
+    except BaseException:
+        if os.path.exists(tmp_file_path):
+            os.remove(tmp_file_path)
+        raise
+
+    return IQZIndex(
+        output_type,
+        codec,
+        shuffle,
+        block_num_samples,
+        num_samples,
+        index["offset"].copy(),
+        index["size"].copy(),
+    )
+
+
+def _read_index(f: typing.BinaryIO) -> IQZIndex:
+    header = f.read(_HEADER.size)
+    if len(header) != _HEADER.size:
+        raise ValueError("Unexpected end of file in header")
+    (
+        magic,
+        output_type,
+        version,
+        codec_id,
+        shuffle,
+        block_num_samples,
+        num_samples,
+    ) = _HEADER.unpack(header)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a block-compressed I/Q file, or an unsupported version")
+
+    file_size = f.seek(0, os.SEEK_END)
+    f.seek(max(file_size - _FOOTER.size, 0))
+    footer = f.read(_FOOTER.size)
+    index_offset, magic = _FOOTER.unpack(footer.rjust(_FOOTER.size, b"\x00"))
+    if magic != _MAGIC:
+        raise ValueError("The file is truncated, or was not completely written")
+    f.seek(index_offset)
+    index = np.frombuffer(
+        f.read(file_size - _FOOTER.size - index_offset), dtype=_INDEX_DTYPE
+    )
+
+    codecs = {v: k for k, v in _CODEC_IDS.items()}
+    return IQZIndex(
+        output_type.rstrip(b"\x00").decode("ascii"),
+        codecs[codec_id],
+        bool(shuffle),
+        block_num_samples,
+        num_samples,
+        index["offset"],
+        index["size"],
+    )
+
+
+def read_iqz_index(file_path: str) -> IQZIndex:
+    """Read the index of a block-compressed I/Q file, without decompressing any blocks.
+
+    :param file_path: The path of the block-compressed I/Q file.
+    :raises ValueError: If the file is not a (complete) block-compressed I/Q file.
+    :return: The index of the file.
+    """
+    with open(file_path, "rb") as f:
+        return _read_index(f)
+
+
+def iter_iqz(
+    file_path: str, start: int = 0, stop: typing.Optional[int] = None
+) -> collections.abc.Iterator[npt.NDArray[np.complex64]]:
+    """Iterate over samples in a block-compressed I/Q file, one block at a time.
+
+    Only the blocks overlapping the requested samples are decompressed.
+
+    :param file_path: The path of the block-compressed I/Q file.
+    :param start: The index of the first sample, defaults to the first sample in the file.
+    :param stop: The index after the last sample, defaults to the end of the file.
+    :return: An iterator over the requested samples, converted to 64-bit complex samples.
+    """
+    with open(file_path, "rb") as f:
+        index = _read_index(f)
+        start, stop, _ = slice(start, stop).indices(index.num_samples)
+        if start >= stop:
+            return
+        component_dtype = _get_component_dtype(index.output_type)
+        for block in range(
+            start // index.block_num_samples,
+            (stop - 1) // index.block_num_samples + 1,
+        ):
+            f.seek(int(index.offsets[block]))
+            data = _decompress(f.read(int(index.sizes[block])), index.codec)
+            if index.shuffle:
+                data = _unshuffle(data, component_dtype.itemsize)
+            samples = _to_complex64(
+                np.frombuffer(data, dtype=component_dtype), index.output_type
+            )
+            block_start = block * index.block_num_samples
+            yield samples[
+                max(start - block_start, 0) : min(stop - block_start, len(samples))
+            ]
+
+
+def read_iqz(
+    file_path: str, start: int = 0, stop: typing.Optional[int] = None
+) -> npt.NDArray[np.complex64]:
+    """Read samples from a block-compressed I/Q file. See `iter_iqz` for each argument.
+
+    :return: The requested samples, converted to 64-bit complex samples.
+    """
+    chunks = list(iter_iqz(file_path, start, stop))
+    if not chunks:
+        return np.empty(0, dtype=np.complex64)
+    return np.concatenate(chunks)
@@ -0,0 +1,216 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Partition the batch files for each day into subdirectories, such as one per hour.
+
+The receivers always write batch files into the directory for their day. Once a batch
+has been post-processed, its files are moved into the partition for its start time.
+"""
+
+import os
+import typing
+import logging
+import datetime
+import collections
+
+import spectre_server.core.config
+from ._base import Base, parse_batch_file_name
+from ._batches import Batches
+
+_LOGGER = logging.getLogger(__name__)
+
+T = typing.TypeVar("T", bound=Base)
+
+# The number of directories below the batches directory, for the year, month and day.
+_NUM_DATE_DIRS = 3
+
+# The newest batch for each tag is still being written, and the one before it may still be
+# queued for post-processing.
+_NUM_PENDING_BATCHES = 2
+
+
+def _get_partition_dir_path(start_datetime: datetime.datetime) -> str:
+    """Get the directory for batch files starting at this time, which is the day if they are not partitioned."""
+    return spectre_server.core.config.paths.get_batches_dir_path(
+        start_datetime.year,
+        start_datetime.month,
+        start_datetime.day,
+        start_datetime.hour,
+        start_datetime.minute,
+    )
+
+
+def _floor_to_partition(
+    dt: datetime.datetime, partition_minutes: int
+) -> datetime.datetime:
+    minute_of_day = dt.hour * 60 + dt.minute
+    return datetime.datetime.combine(dt.date(), datetime.time()) + datetime.timedelta(
+        minutes=minute_of_day - minute_of_day % partition_minutes
+    )
+
+
+def partition_batch(batch: Base) -> list[str]:
+    """Move the files in a batch into the partition for its start time.
+
+    Does nothing if batch files are not partitioned within each day.
+
+    :param batch: The batch to move.
+    :return: The new file paths of the moved batch files.
+    """
+    if not spectre_server.core.config.paths.get_batches_partition_minutes():
+        return []
+
+    partition_dir_path = _get_partition_dir_path(batch.start_datetime)
+    moved_file_paths = []
+    for extension in batch.extensions:
+        batch_file = batch.get_file(extension)
+        if (
+            not batch_file.exists
+            or os.path.dirname(batch_file.file_path) == partition_dir_path
+        ):
+            continue
+        os.makedirs(partition_dir_path, exist_ok=True)
+        moved_file_path = os.path.join(partition_dir_path, batch_file.file_name)
+        os.replace(batch_file.file_path, moved_file_path)
+        moved_file_paths.append(moved_file_path)
+    return moved_file_paths
+
+
+def _get_dir_paths(
+    start_datetime: datetime.datetime, end_datetime: datetime.datetime
+) -> list[tuple[str, bool]]:
+    """Get the directories which may contain batches overlapping with a time range, and whether
+    they should be searched recursively."""
+    paths = spectre_server.core.config.paths
+    partition_minutes = paths.get_batches_partition_minutes()
+    if not partition_minutes:
+        # Start from the day before, in case a batch from that day runs past midnight.
+        lower_datetime = start_datetime - datetime.timedelta(days=1)
+    else:
+        # Start from the partition before, in case a batch from that partition runs past its end.
+        lower_datetime = start_datetime - datetime.timedelta(minutes=partition_minutes)
+
+    dir_paths = []
+    day = lower_datetime.date()
+    while day <= end_datetime.date():
+        day_dir_path = paths.get_batches_dir_path(day.year, day.month, day.day)
+        if not os.path.isdir(day_dir_path):
+            day += datetime.timedelta(days=1)
+            continue
+
+        if not partition_minutes:
+            dir_paths.append((day_dir_path, True))
+            day += datetime.timedelta(days=1)
+            continue
+
+        partition_start = _floor_to_partition(
+            max(lower_datetime, datetime.datetime.combine(day, datetime.time())),
+            partition_minutes,
+        )
+        while partition_start.date() == day and partition_start <= end_datetime:
+            dir_paths.append((_get_partition_dir_path(partition_start), True))
+            partition_start += datetime.timedelta(minutes=partition_minutes)
+
+        # Batch files which haven't been moved into their partition yet.
+        dir_paths.append((day_dir_path, False))
+        day += datetime.timedelta(days=1)
+    return dir_paths
+
+
+def find_batches(
+    tag: str,
+    batch_cls: typing.Type[T],
+    start_datetime: datetime.datetime,
+    end_datetime: datetime.datetime,
+) -> list[T]:
+    """Find the batches which may overlap with a time range, which can span many days.
+
+    Only the directories which could contain those batches are searched. This includes the batch
+    immediately before the time range, so the result should be filtered with `filter_batches_in_range`.
+
+    :param tag: The data tag.
+    :param batch_cls: The `Base` subclass used to read batch files under that tag.
+    :param start_datetime: The start of the time range.
+    :param end_datetime: The end of the time range.
+    :return: The batches, in order of their start time.
+    """
+    batches: dict[str, T] = {}
+    for dir_path, recursive in _get_dir_paths(start_datetime, end_datetime):
+        for batch in Batches(tag, batch_cls, dir_path, recursive=recursive):
+            # If a batch is being moved into its partition, prefer the partition, but keep
+            # any files which are yet to be moved.
+            partitioned_batch = batches.setdefault(batch.start_time, batch)
+            if partitioned_batch is batch:
+                continue
+            for extension in batch.extensions:
+                batch_file = batch.get_file(extension)
+                if (
+                    batch_file.exists
+                    and not batch_file.is_archived
+                    and not partitioned_batch.has_file(extension)
+                ):
+                    relocated_file = partitioned_batch.relocate_file(
+                        extension, os.path.dirname(batch_file.file_path)
+                    )
+                    relocated_file.record_scan(batch_file.num_bytes)
+    return [batches[start_time] for start_time in sorted(batches)]
+
+
+def migrate_batch_files(dry_run: bool = False) -> list[tuple[str, str]]:
+    """Move existing batch files into the directories they belong in, under the current partitioning.
+
+    Use this after changing `SPECTRE_BATCHES_PARTITION_MINUTES`. If batch files are no longer partitioned,
+    they are moved back into the directory for their day. Only batch files grouped by date are moved, and
+    the two newest batches for each tag are left alone, since they may still be in use. Any partitions left
+    empty are removed.
+
+    :param dry_run: If True, report which files would be moved without actually moving them. Defaults to False.
+    :return: The original and new file paths of each moved batch file.
+    """
+    batches_dir_path = spectre_server.core.config.paths.get_batches_dir_path()
+
+    files = []
+    start_datetimes: dict[str, set[datetime.datetime]] = collections.defaultdict(set)
+    for root, _, file_names in os.walk(batches_dir_path):
+        num_dirs = len(os.path.relpath(root, batches_dir_path).split(os.sep))
+        if num_dirs not in (_NUM_DATE_DIRS, _NUM_DATE_DIRS + 1):
+            continue
+        for file_name in file_names:
+            try:
+                start_time, tag, _ = parse_batch_file_name(file_name)
+                start_datetime = datetime.datetime.strptime(
+                    start_time, spectre_server.core.config.TimeFormat.DATETIME
+                )
+            except ValueError:
+                continue
+            files.append((os.path.join(root, file_name), tag, start_datetime))
+            start_datetimes[tag].add(start_datetime)
+
+    pending = {
+        (tag, start_datetime)
+        for tag, datetimes in start_datetimes.items()
+        for start_datetime in sorted(datetimes)[-_NUM_PENDING_BATCHES:]
+    }
+
+    moves = []
+    for file_path, tag, start_datetime in sorted(files):
+        if (tag, start_datetime) in pending:
+            continue
+        dir_path = _get_partition_dir_path(start_datetime)
+        if os.path.dirname(file_path) != dir_path:
+            moves.append(
+                (file_path, os.path.join(dir_path, os.path.basename(file_path)))
+            )
+
+    if not dry_run:
+        for file_path, moved_file_path in moves:
+            os.makedirs(os.path.dirname(moved_file_path), exist_ok=True)
+            os.replace(file_path, moved_file_path)
+
+        for dir_path in {os.path.dirname(file_path) for file_path, _ in moves}:
+            num_dirs = len(os.path.relpath(dir_path, batches_dir_path).split(os.sep))
+            if num_dirs > _NUM_DATE_DIRS and not os.listdir(dir_path):
+                os.rmdir(dir_path)
+        _LOGGER.info(f"Moved {len(moves)} batch files")
+    return moves
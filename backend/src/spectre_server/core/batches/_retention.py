@@ -0,0 +1,357 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Delete old batch files according to retention policies, to keep the disk from filling up.
+
+Archives are kept or deleted whole, so they're treated as a single file with the `zip` extension, which
+started with the newest batch packed inside.
+"""
+
+import os
+import time
+import shutil
+import typing
+import logging
+import datetime
+import dataclasses
+import collections
+
+import spectre_server.core.io
+import spectre_server.core.config
+from ._base import parse_batch_file_name
+from ._archive import ARCHIVE_EXTENSION, parse_archive_file_name, read_archive_index
+
+_LOGGER = logging.getLogger(__name__)
+
+# Batches are post-processed once the next batch is created, so the newest batch for each tag
+# is still being written, and the one before it may still be queued for post-processing.
+_NUM_PENDING_BATCHES = 2
+
+
+class RetentionReason:
+    """Why a file was selected for deletion."""
+
+    MAX_AGE = "max_age"
+    MAX_BYTES = "max_bytes"
+    MIN_FREE_BYTES = "min_free_bytes"
+
+
+@dataclasses.dataclass(frozen=True)
+class RetentionPolicy:
+    """Limits on the batch files kept for a tag.
+
+    :ivar tag: The tag of the batch files the policy applies to.
+    :ivar extensions: Only apply the policy to batch files with these extensions. If empty, apply it to any extension.
+    Archives have the extension `zip`.
+    :ivar max_age: Delete batch files which started more than this many seconds ago.
+    :ivar max_bytes: Delete the oldest batch files until those remaining take up at most this many bytes.
+    :ivar min_free_bytes: Delete the oldest batch files until at least this many bytes are free on the disk.
+    """
+
+    tag: str
+    extensions: tuple[str, ...] = ()
+    max_age: typing.Optional[float] = None
+    max_bytes: typing.Optional[int] = None
+    min_free_bytes: typing.Optional[int] = None
+
+    def __post_init__(self) -> None:
+        # Accept any sequence of extensions, such as a list parsed from JSON.
+        object.__setattr__(self, "extensions", tuple(self.extensions))
+        for name in ("max_age", "max_bytes", "min_free_bytes"):
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                raise ValueError(f"Expected {name} to be non-negative, but got {value}")
+
+    def applies_to(self, tag: str, extension: str) -> bool:
+        """Return True if the policy applies to batch files with this tag and extension."""
+        return tag == self.tag and (not self.extensions or extension in self.extensions)
+
+
+@dataclasses.dataclass(frozen=True)
+class RetentionFile:
+    """A batch file, or an archive of batch files, found in the file system.
+
+    :ivar file_path: The absolute path to the file.
+    :ivar tag: The tag of the batch.
+    :ivar extension: The file extension.
+    :ivar start_datetime: The start time of the batch.
+    :ivar num_bytes: The size of the file, in bytes.
+    :ivar reason: Why the file was selected for deletion, if it was.
+    """
+
+    file_path: str
+    tag: str
+    extension: str
+    start_datetime: datetime.datetime
+    num_bytes: int
+    reason: typing.Optional[str] = None
+
+
+@dataclasses.dataclass
+class RetentionReport:
+    """The outcome of a single retention sweep.
+
+    :ivar files: The batch files selected for deletion, oldest first.
+    :ivar num_files_scanned: How many batch files were found.
+    :ivar num_bytes_scanned: The total size of the batch files found, in bytes.
+    :ivar num_files_protected: How many batch files matched a policy, but were kept since they may still be in use.
+    :ivar free_bytes: The free space on the disk before the sweep, in bytes.
+    :ivar dry_run: If True, the files were not actually deleted.
+    :ivar num_files_deleted: How many of the selected files were deleted.
+    :ivar elapsed_seconds: How long the sweep took, in seconds.
+    """
+
+    files: list[RetentionFile]
+    num_files_scanned: int
+    num_bytes_scanned: int
+    num_files_protected: int
+    free_bytes: int
+    dry_run: bool = True
+    num_files_deleted: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def num_bytes(self) -> int:
+        """The total size of the batch files selected for deletion, in bytes."""
+        return sum(f.num_bytes for f in self.files)
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        """Summarise the report, including the metrics of the sweep, in a JSON serialisable form."""
+        reasons = collections.Counter(f.reason for f in self.files)
+        return {
+            "dry_run": self.dry_run,
+            "file_paths": [f.file_path for f in self.files],
+            "num_files": len(self.files),
+            "num_bytes": self.num_bytes,
+            "num_files_deleted": self.num_files_deleted,
+            "num_files_scanned": self.num_files_scanned,
+            "num_bytes_scanned": self.num_bytes_scanned,
+            "num_files_protected": self.num_files_protected,
+            "free_bytes": self.free_bytes,
+            "reasons": dict(reasons),
+            "elapsed_seconds": self.elapsed_seconds,
+        }
+
+
+def _parse_start_datetime(file_name: str) -> datetime.datetime:
+    start_time, _, _ = parse_batch_file_name(file_name)
+    return datetime.datetime.strptime(
+        start_time, spectre_server.core.config.TimeFormat.DATETIME
+    )
+
+
+def _get_archive_start_datetime(archive_path: str) -> datetime.datetime:
+    """Get the start time of the newest batch packed in an archive.
+
+    :raises ValueError: If the archive can't be read, or contains no batch files.
+    """
+    start_datetimes = []
+    for file_name in read_archive_index(archive_path):
+        try:
+            start_datetimes.append(_parse_start_datetime(file_name))
+        except ValueError:
+            continue
+    return max(start_datetimes)
+
+
+def _scan_batch_files(
+    batches_dir_path: str,
+) -> tuple[list[RetentionFile], dict[str, float]]:
+    """Find every batch file and archive under the directory, with the last modification time of each."""
+    files, mtimes = [], {}
+    for root, _, file_names in os.walk(batches_dir_path):
+        for file_name in file_names:
+            file_path = os.path.join(root, file_name)
+            archive_tag = parse_archive_file_name(file_name)
+            try:
+                if archive_tag is not None:
+                    tag, extension = archive_tag, ARCHIVE_EXTENSION
+                    start_datetime = _get_archive_start_datetime(file_path)
+                else:
+                    _, tag, extension = parse_batch_file_name(file_name)
+                    start_datetime = _parse_start_datetime(file_name)
+            except ValueError:
+                # Ignore anything which isn't a batch file, such as a partially written temporary file.
+                continue
+            except FileNotFoundError:
+                # The archive was deleted while we were looking.
+                continue
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                # The file was deleted while we were looking.
+                continue
+            files.append(
+                RetentionFile(file_path, tag, extension, start_datetime, stat.st_size)
+            )
+            mtimes[file_path] = stat.st_mtime
+    files.sort(key=lambda f: (f.start_datetime, f.file_path))
+    return files, mtimes
+
+
+def _get_pending_start_datetimes(
+    files: list[RetentionFile],
+) -> set[tuple[str, datetime.datetime]]:
+    """Find the batches which may still be being written, or waiting to be post-processed."""
+    start_datetimes: dict[str, set[datetime.datetime]] = collections.defaultdict(set)
+    for f in files:
+        # Only completed days are archived.
+        if f.extension != ARCHIVE_EXTENSION:
+            start_datetimes[f.tag].add(f.start_datetime)
+    return {
+        (tag, start_datetime)
+        for tag, datetimes in start_datetimes.items()
+        for start_datetime in sorted(datetimes)[-_NUM_PENDING_BATCHES:]
+    }
+
+
+def plan_retention(
+    policies: list[RetentionPolicy],
+    batches_dir_path: typing.Optional[str] = None,
+    now: typing.Optional[datetime.datetime] = None,
+    grace_period: float = 60,
+    free_bytes: typing.Optional[int] = None,
+) -> RetentionReport:
+    """Select the batch files to delete under the retention policies, oldest first, without deleting anything.
+
+    The policies are applied in order. For each, batch files older than `max_age` are selected first, then the
+    oldest files until those remaining fit in `max_bytes`, then the oldest files until `min_free_bytes` would be free
+    on the disk.
+
+    The two newest batches for each tag are never selected, since they may still be being written or waiting to be
+    post-processed. Neither are files modified within the grace period.
+
+    :param policies: The retention policies.
+    :param batches_dir_path: Optionally override the directory containing the batch files, defaults to None.
+    :param now: Optionally override the current time, defaults to None.
+    :param grace_period: Never select files modified within this many seconds. Defaults to 60.
+    :param free_bytes: Optionally override the free space on the disk in bytes, defaults to None.
+    :return: A report of the files to delete.
+    """
+    batches_dir_path = (
+        batches_dir_path or spectre_server.core.config.paths.get_batches_dir_path()
+    )
+    # Batch start times are naive, but in UTC.
+    now = now or datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    if free_bytes is None:
+        free_bytes = shutil.disk_usage(batches_dir_path).free
+
+    files, mtimes = _scan_batch_files(batches_dir_path)
+    pending = _get_pending_start_datetimes(files)
+    min_mtime = time.time() - grace_period
+
+    def is_protected(f: RetentionFile) -> bool:
+        return (f.tag, f.start_datetime) in pending or mtimes[f.file_path] > min_mtime
+
+    selected: dict[str, RetentionFile] = {}
+    protected: set[str] = set()
+    for policy in policies:
+        matching = [f for f in files if policy.applies_to(f.tag, f.extension)]
+        candidates = []
+        for f in matching:
+            if f.file_path in selected:
+                continue
+            if is_protected(f):
+                protected.add(f.file_path)
+            else:
+                candidates.append(f)
+
+        def select(f: RetentionFile, reason: str) -> None:
+            selected[f.file_path] = dataclasses.replace(f, reason=reason)
+
+        if policy.max_age is not None:
+            min_start_datetime = now - datetime.timedelta(seconds=policy.max_age)
+            for f in candidates:
+                if f.start_datetime < min_start_datetime:
+                    select(f, RetentionReason.MAX_AGE)
+
+        if policy.max_bytes is not None:
+            total_bytes = sum(
+                f.num_bytes for f in matching if f.file_path not in selected
+            )
+            for f in candidates:
+                if total_bytes <= policy.max_bytes:
+                    break
+                if f.file_path not in selected:
+                    select(f, RetentionReason.MAX_BYTES)
+                    total_bytes -= f.num_bytes
+
+        if policy.min_free_bytes is not None:
+            expected_free_bytes = free_bytes + sum(
+                f.num_bytes for f in selected.values()
+            )
+            for f in candidates:
+                if expected_free_bytes >= policy.min_free_bytes:
+                    break
+                if f.file_path not in selected:
+                    select(f, RetentionReason.MIN_FREE_BYTES)
+                    expected_free_bytes += f.num_bytes
+
+    return RetentionReport(
+        files=sorted(selected.values(), key=lambda f: (f.start_datetime, f.file_path)),
+        num_files_scanned=len(files),
+        num_bytes_scanned=sum(f.num_bytes for f in files),
+        num_files_protected=len(protected - selected.keys()),
+        free_bytes=free_bytes,
+    )
+
+
+def _delete(file_path: str) -> bool:
+    try:
+        os.remove(file_path)
+        return True
+    except FileNotFoundError:
+        # Someone else got there first.
+        return False
+
+
+def apply_retention(
+    report: RetentionReport, max_workers: typing.Optional[int] = None
+) -> RetentionReport:
+    """Delete the files selected by a retention sweep, oldest first.
+
+    Files are deleted concurrently, and any which no longer exist are skipped.
+
+    :param report: The report returned by `plan_retention`.
+    :param max_workers: Optionally override the number of threads used to delete the files, defaults to None.
+    :return: The same report, updated with the number of files which were deleted.
+    """
+    report.num_files_deleted = sum(
+        spectre_server.core.io.imap_ordered(
+            _delete, [f.file_path for f in report.files], max_workers=max_workers
+        )
+    )
+    report.dry_run = False
+    return report
+
+
+def sweep_retention(
+    policies: list[RetentionPolicy],
+    batches_dir_path: typing.Optional[str] = None,
+    grace_period: float = 60,
+    dry_run: bool = False,
+    max_workers: typing.Optional[int] = None,
+) -> RetentionReport:
+    """Select, then delete, the batch files under the retention policies.
+
+    :param policies: The retention policies.
+    :param batches_dir_path: Optionally override the directory containing the batch files, defaults to None.
+    :param grace_period: Never delete files modified within this many seconds. Defaults to 60.
+    :param dry_run: If True, report which files would be deleted without actually deleting them. Defaults to False.
+    :param max_workers: Optionally override the number of threads used to delete the files, defaults to None.
+    :return: A report of the sweep.
+    """
+    start = time.perf_counter()
+    report = plan_retention(policies, batches_dir_path, grace_period=grace_period)
+    if not dry_run:
+        apply_retention(report, max_workers=max_workers)
+    report.elapsed_seconds = time.perf_counter() - start
+
+    _LOGGER.info(
+        f"Retention sweep {'(dry run) ' if dry_run else ''}selected {len(report.files)} files "
+        f"({report.num_bytes} bytes), deleted {report.num_files_deleted}, "
+        f"kept {report.num_files_protected} files which may still be in use, "
+        f"in {report.elapsed_seconds:.3f} s"
+    )
+    return report
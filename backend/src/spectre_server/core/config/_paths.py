@@ -10,6 +10,14 @@ from typing import Optional, Dict
 
 DEFAULT_SPECTRE_DATA_DIR_PATH = pathlib.Path(os.curdir) / ".spectre_data"
 
+# By default, batch files are not partitioned within each day.
+DEFAULT_BATCHES_PARTITION_MINUTES = 0
+
+# By default, rendered plots are cached until they take up 256 MiB.
+DEFAULT_PLOT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_MINUTES_PER_HOUR = 60
+_MINUTES_PER_DAY = 1440
+
 
 class Paths:
     def __init__(self, env: Optional[Dict[str, str]] = None):
@@ -45,21 +53,93 @@ class Paths:
         self.__mkdir(pathlib.Path(self.get_logs_dir_path()))
         self.__mkdir(pathlib.Path(self.get_configs_dir_path()))
 
+    def get_batches_partition_minutes(self) -> int:
+        """Get how many minutes of batch files are grouped together in each subdirectory of a day.
+
+        For example, 60 groups the batch files for each hour of the day together. This keeps the number
+        of files in each directory manageable when the batches are short.
+
+        :return: The value stored in the `SPECTRE_BATCHES_PARTITION_MINUTES` environment variable, or the default.
+        If zero, batch files are not partitioned within each day.
+        :raises ValueError: If the partitions do not evenly divide an hour, or a day into whole hours.
+        """
+        partition_minutes = int(
+            self._env.get(
+                "SPECTRE_BATCHES_PARTITION_MINUTES", DEFAULT_BATCHES_PARTITION_MINUTES
+            )
+        )
+        if partition_minutes == 0:
+            return partition_minutes
+
+        divides_hour = (
+            0 < partition_minutes <= _MINUTES_PER_HOUR
+            and _MINUTES_PER_HOUR % partition_minutes == 0
+        )
+        divides_day = (
+            partition_minutes % _MINUTES_PER_HOUR == 0
+            and _MINUTES_PER_DAY % partition_minutes == 0
+        )
+        if not (divides_hour or divides_day):
+            raise ValueError(
+                f"The batch partitions must evenly divide an hour, or a day into whole hours. "
+                f"Got {partition_minutes} minutes"
+            )
+        return partition_minutes
+
+    def get_batches_partition_name(self, hour: int, minute: int = 0) -> str:
+        """Get the name of the subdirectory of a day, containing the batch files which start at a time of day.
+
+        Partitions spanning whole hours are named by the hour they start, `HH`. Otherwise, they are named by
+        the hour and minute they start, `HHMM`.
+
+        :param hour: The hour of the day.
+        :param minute: The minute of the hour. Defaults to 0.
+        :raises ValueError: If batch files are not partitioned within each day.
+        :return: The name of the partition.
+        """
+        partition_minutes = self.get_batches_partition_minutes()
+        if partition_minutes == 0:
+            raise ValueError("Batch files are not partitioned within each day")
+
+        minute_of_day = hour * _MINUTES_PER_HOUR + minute
+        partition_start = minute_of_day - minute_of_day % partition_minutes
+        partition_hour, partition_minute = divmod(partition_start, _MINUTES_PER_HOUR)
+        if partition_minutes % _MINUTES_PER_HOUR == 0:
+            return f"{partition_hour:02}"
+        return f"{partition_hour:02}{partition_minute:02}"
+
     def get_batches_dir_path(
         self,
         year: Optional[int] = None,
         month: Optional[int] = None,
         day: Optional[int] = None,
+        hour: Optional[int] = None,
+        minute: int = 0,
     ) -> str:
-        """Get the directory for batched data files, optionally with a date-based subdirectory."""
-        return str(
-            self.__get_date_based_dir_path(
-                pathlib.Path(self.get_spectre_data_dir_path()) / "batches",
-                year,
-                month,
-                day,
-            )
+        """Get the directory for batched data files, optionally with a date-based subdirectory.
+
+        If an hour is specified, and batch files are partitioned within each day, get the
+        partition containing the batch files which start at that time of day.
+
+        :param year: The year, defaults to None.
+        :param month: The month, defaults to None.
+        :param day: The day, defaults to None.
+        :param hour: The hour of the day, defaults to None.
+        :param minute: The minute of the hour, only used if an hour is specified. Defaults to 0.
+        :raises ValueError: If an hour is specified without a day.
+        """
+        if hour is not None and not day:
+            raise ValueError("An hour requires a day, a month and a year")
+
+        dir_path = self.__get_date_based_dir_path(
+            pathlib.Path(self.get_spectre_data_dir_path()) / "batches",
+            year,
+            month,
+            day,
         )
+        if hour is not None and self.get_batches_partition_minutes():
+            dir_path /= self.get_batches_partition_name(hour, minute)
+        return str(dir_path)
 
     def get_logs_dir_path(
         self,
@@ -81,6 +161,39 @@ class Paths:
         """Get the directory for configuration files."""
         return str(pathlib.Path(self.get_spectre_data_dir_path()) / "configs")
 
+    def get_plot_cache_dir_path(self) -> str:
+        """Get the directory for cached plots."""
+        return str(pathlib.Path(self.get_spectre_data_dir_path()) / "cache" / "plots")
+
+    def get_jobs_dir_path(self) -> str:
+        """Get the directory for the status of background jobs."""
+        return str(pathlib.Path(self.get_spectre_data_dir_path()) / "jobs")
+
+    def get_tiles_dir_path(self, tag: Optional[str] = None) -> str:
+        """Get the directory for rendered tiles, optionally for a specific tag."""
+        tiles_dir_path = (
+            pathlib.Path(self.get_spectre_data_dir_path()) / "cache" / "tiles"
+        )
+        if tag is not None:
+            tiles_dir_path /= tag
+        return str(tiles_dir_path)
+
+    def get_plot_cache_max_bytes(self) -> int:
+        """Get the maximum disk space taken up by cached plots, in bytes.
+
+        :return: The value stored in the `SPECTRE_PLOT_CACHE_MAX_BYTES` environment variable, or the default.
+        If zero, plots are not cached.
+        :raises ValueError: If the value is negative.
+        """
+        max_bytes = int(
+            self._env.get("SPECTRE_PLOT_CACHE_MAX_BYTES", DEFAULT_PLOT_CACHE_MAX_BYTES)
+        )
+        if max_bytes < 0:
+            raise ValueError(
+                f"The plot cache size must be non-negative. Got {max_bytes} bytes"
+            )
+        return max_bytes
+
     def __get_date_based_dir_path(
         self,
         base_dir: pathlib.Path,
@@ -5,6 +5,7 @@
 """Real-time, extensible post-processing of SDR data into spectrograms."""
 
 from ._base import Base
+from ._quicklooks import QuicklookRenderer
 from ._fixed_center_frequency import FixedCenterFrequency, FixedCenterFrequencyModel
 from ._swept_center_frequency import SweptCenterFrequency, SweptCenterFrequencyModel
 
@@ -21,6 +22,7 @@ from ._stfft import (
 
 __all__ = [
     "Base",
+    "QuicklookRenderer",
     "FixedCenterFrequency",
     "FixedCenterFrequencyModel",
     "SweptCenterFrequency",
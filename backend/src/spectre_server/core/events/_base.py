@@ -5,6 +5,9 @@
 import logging
 import typing
 import abc
+import queue
+import threading
+import concurrent.futures
 
 import pydantic
 import watchdog.events
@@ -12,9 +15,20 @@ import watchdog.events
 import spectre_server.core.spectrograms
 import spectre_server.core.batches
 import spectre_server.core.fields
+import spectre_server.core.config
+
+from ._quicklooks import QuicklookRenderer
 
 _LOGGER = logging.getLogger(__name__)
 
+# The maximum number of spectrograms waiting to be written to the file system, before
+# post processing blocks until one has been written.
+_MAX_PENDING_FLUSHES = 2
+
+# The maximum number of writes waiting to run on the I/Q writer, before any more I/Q samples
+# are left uncompressed.
+_MAX_PENDING_COMPRESSIONS = 1
+
 
 class BaseModel(pydantic.BaseModel):
     model_config = pydantic.ConfigDict(
@@ -28,6 +42,124 @@ class BaseModel(pydantic.BaseModel):
     obs_alt: spectre_server.core.fields.Field.obs_alt = 0.0
     obs_lat: spectre_server.core.fields.Field.obs_lat = 0.0
     obs_lon: spectre_server.core.fields.Field.obs_lon = 0.0
+    fits_compression: spectre_server.core.fields.Field.fits_compression = (
+        spectre_server.core.spectrograms.FitsCompression.NONE.value
+    )
+    fits_quantisation_bits: spectre_server.core.fields.Field.fits_quantisation_bits = 0
+    rolling_background_window: (
+        spectre_server.core.fields.Field.rolling_background_window
+    ) = 0.0
+    quicklook: spectre_server.core.fields.Field.quicklook = False
+
+    @pydantic.model_validator(mode="after")
+    def validate_fits_storage(self, info: pydantic.ValidationInfo):
+        if info.context and info.context.get("skip", False):
+            return self
+        options = [c.value for c in spectre_server.core.spectrograms.FitsCompression]
+        if self.fits_compression not in options:
+            raise ValueError(
+                f"FITS compression must be one of {options}. Got {self.fits_compression}."
+            )
+        if self.fits_quantisation_bits not in [0, 8, 16]:
+            raise ValueError(
+                f"FITS quantisation bits must be one of [0, 8, 16]. Got {self.fits_quantisation_bits}."
+            )
+        is_rice = (
+            self.fits_compression
+            == spectre_server.core.spectrograms.FitsCompression.RICE.value
+        )
+        if is_rice and not self.fits_quantisation_bits:
+            raise ValueError(
+                "RICE compression is lossy for unquantised spectrograms. Either use 'gzip', or set the FITS quantisation bits."
+            )
+        return self
+
+
+# If the signal is kept, it is left uncompressed.
+IQ_COMPRESSION_NONE = "none"
+
+
+def validate_iq_compression(iq_compression: str) -> None:
+    """Check the I/Q compression is either `IQ_COMPRESSION_NONE`, or a block-compressed I/Q codec.
+
+    :raises ValueError: If the I/Q compression is unrecognised.
+    """
+    options = [
+        IQ_COMPRESSION_NONE,
+        *[codec.value for codec in spectre_server.core.batches.IQZCodec],
+    ]
+    if iq_compression not in options:
+        raise ValueError(
+            f"I/Q compression must be one of {options}. Got {iq_compression}."
+        )
+
+
+class _BackgroundWriter:
+    def __init__(self, name: str, max_pending: int = 0) -> None:
+        """Run file system writes in order, on a single background thread.
+
+        :param name: The name of the thread.
+        :param max_pending: The maximum number of writes waiting to run. Once reached,
+        submitting another write blocks until one has completed. Defaults to 0, for no maximum.
+        """
+        self.__name = name
+        self.__queue: queue.Queue[
+            typing.Optional[
+                tuple[typing.Callable[[], object], concurrent.futures.Future[None]]
+            ]
+        ] = queue.Queue(maxsize=max_pending)
+        self.__thread: typing.Optional[threading.Thread] = None
+
+    @property
+    def num_pending(self) -> int:
+        """The number of writes waiting to run, not including any write which is running."""
+        return self.__queue.qsize()
+
+    def __run(self) -> None:
+        while True:
+            item = self.__queue.get()
+            try:
+                if item is None:
+                    return
+                write, future = item
+                if future.set_running_or_notify_cancel():
+                    try:
+                        write()
+                        future.set_result(None)
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                self.__queue.task_done()
+
+    def submit(
+        self, write: typing.Callable[[], object]
+    ) -> concurrent.futures.Future[None]:
+        """Queue a write, blocking if there are too many writes pending.
+
+        :param write: Performs the write.
+        :return: A future which completes once the write has run.
+        """
+        # Start the thread lazily, so that handlers which never write don't hold one.
+        if self.__thread is None:
+            self.__thread = threading.Thread(
+                target=self.__run, name=self.__name, daemon=True
+            )
+            self.__thread.start()
+        future: concurrent.futures.Future[None] = concurrent.futures.Future()
+        self.__queue.put((write, future))
+        return future
+
+    def wait(self) -> None:
+        """Block until all the queued writes have run."""
+        if self.__thread is not None:
+            self.__queue.join()
+
+    def close(self) -> None:
+        """Wait for all the queued writes to run, then stop the thread."""
+        if self.__thread is not None:
+            self.__queue.put(None)
+            self.__thread.join()
+            self.__thread = None
 
 
 B = typing.TypeVar("B", bound=spectre_server.core.batches.Base)
@@ -44,6 +176,7 @@ class Base(abc.ABC, typing.Generic[M, B], watchdog.events.FileSystemEventHandler
         cached_spectrogram: typing.Optional[
             spectre_server.core.spectrograms.Spectrogram
         ] = None,
+        quicklook_renderer: typing.Optional[QuicklookRenderer] = None,
     ) -> None:
         """An abstract interface enabling event-driven file processing.
 
@@ -52,12 +185,25 @@ class Base(abc.ABC, typing.Generic[M, B], watchdog.events.FileSystemEventHandler
         :param batch_cls: The batch used to read data files.
         :param queued_file: Optionally override the queued file, defaults to None
         :param cached_spectrogram: Optionally override the cached spectrogram, defaults to None
+        :param quicklook_renderer: If the model enables quicklooks, where each flushed spectrogram is sent
+        to be rendered. Defaults to None.
         """
         self._tag = tag
         self.__batch_cls = batch_cls
         self.__model = model
         self.__queued_file = queued_file
         self.__cached_spectrogram = cached_spectrogram
+        self.__quicklook_renderer = quicklook_renderer
+        # Spectrograms are written to the file system in the background, so that processing the
+        # next batch is never blocked on disk writes.
+        self.__writer = _BackgroundWriter("spectrogram-writer", _MAX_PENDING_FLUSHES)
+        # I/Q samples are compressed (then moved into their partition) on a separate thread, so
+        # that a slow codec never holds up flushing the spectrograms.
+        self.__iq_writer = _BackgroundWriter("iq-writer")
+        self.__write_error: typing.Optional[BaseException] = None
+        # The most recently processed batch, which is moved into its partition once the next batch
+        # is processed, since it may still be read while processing the next.
+        self.__processed_batch: typing.Optional[B] = None
 
     @abc.abstractmethod
     def process(self, batch: B) -> spectre_server.core.spectrograms.Spectrogram:
@@ -102,6 +248,10 @@ class Base(abc.ABC, typing.Generic[M, B], watchdog.events.FileSystemEventHandler
             return
 
         _LOGGER.info(f"Noticed {absolute_file_path}")
+
+        # Report any error from writing a previous spectrogram to the file system.
+        self.__raise_if_write_failed()
+
         # If there exists a queued file, try and process it
         if self.__queued_file is not None:
             try:
@@ -111,10 +261,11 @@ class Base(abc.ABC, typing.Generic[M, B], watchdog.events.FileSystemEventHandler
                         self.__queued_file
                     )
                 )
-                spectrogram = self.process(
-                    self.__batch_cls(batches_dir_path, start_time, tag)
-                )
+                batch = self.__batch_cls(batches_dir_path, start_time, tag)
+                spectrogram = self.process(batch)
                 self.__cache_spectrogram(spectrogram)
+                self.__partition_processed_batch()
+                self.__processed_batch = batch
             except Exception:
                 _LOGGER.error(
                     f"An error has occured while processing {self.__queued_file}",
@@ -122,6 +273,8 @@ class Base(abc.ABC, typing.Generic[M, B], watchdog.events.FileSystemEventHandler
                 )
                 # Flush any internally stored spectrogram on error to avoid lost data
                 self.__flush_cache()
+                self.__writer.wait()
+                self.__iq_writer.wait()
                 # re-raise the exception to the main thread
                 raise
 
@@ -129,6 +282,22 @@ class Base(abc.ABC, typing.Generic[M, B], watchdog.events.FileSystemEventHandler
         _LOGGER.info(f"Queueing {absolute_file_path} for post processing")
         self.__queued_file = absolute_file_path
 
+    def __partition_processed_batch(self) -> None:
+        """Move the files in the most recently processed batch into its partition, in the background."""
+        if (
+            self.__processed_batch is None
+            or not spectre_server.core.config.paths.get_batches_partition_minutes()
+        ):
+            return
+        batch = self.__processed_batch
+        # Moved after any compression of the same batch, which runs on the same thread.
+        self.__submit(
+            self.__iq_writer,
+            lambda: spectre_server.core.batches.partition_batch(batch),
+            f"moving batch '{batch.name}' into its partition",
+        )
+        self.__processed_batch = None
+
     def __cache_spectrogram(
         self, spectrogram: spectre_server.core.spectrograms.Spectrogram
     ) -> None:
@@ -146,19 +315,103 @@ class Base(abc.ABC, typing.Generic[M, B], watchdog.events.FileSystemEventHandler
 
     def __flush_cache(self) -> None:
         if self.__cached_spectrogram:
-            _LOGGER.info(
-                f"Flushing spectrogram to file with start time "
-                f"'{self.__cached_spectrogram.format_start_time()}'"
-            )
-            self.__cached_spectrogram.save(
-                self._tag,
-                self.__model.origin,
-                self.__model.instrument,
-                self.__model.telescope,
-                self.__model.object,
-                self.__model.obs_alt,
-                self.__model.obs_lat,
-                self.__model.obs_lon,
+            spectrogram = self.__cached_spectrogram
+            start_time = spectrogram.format_start_time()
+            _LOGGER.info(f"Flushing spectrogram to file with start time '{start_time}'")
+            if self.__model.rolling_background_window:
+                spectrogram.set_rolling_background(
+                    self.__model.rolling_background_window
+                )
+            self._write_in_background(
+                lambda: spectrogram.save(
+                    self._tag,
+                    self.__model.origin,
+                    self.__model.instrument,
+                    self.__model.telescope,
+                    self.__model.object,
+                    self.__model.obs_alt,
+                    self.__model.obs_lat,
+                    self.__model.obs_lon,
+                    compression=spectre_server.core.spectrograms.FitsCompression(
+                        self.__model.fits_compression
+                    ),
+                    quantisation_bits=self.__model.fits_quantisation_bits,
+                ),
+                f"flushing the spectrogram with start time '{start_time}'",
             )
-            _LOGGER.info("Flush successful, resetting spectrogram cache")
+            if self.__model.quicklook and self.__quicklook_renderer is not None:
+                self.__quicklook_renderer.submit(spectrogram, self._tag)
+            _LOGGER.info("Resetting spectrogram cache")
             self.__cached_spectrogram = None  # reset the cache
+
+    def _write_in_background(
+        self, write: typing.Callable[[], object], description: str
+    ) -> None:
+        """Write to the file system on a background thread, in order with the spectrograms being flushed.
+
+        Any error is raised in the main thread, when the next file is noticed.
+
+        :param write: Performs the write.
+        :param description: Describes the write, for logging.
+        """
+        self.__submit(self.__writer, write, description)
+
+    def _compress_in_background(
+        self, compress: typing.Callable[[], object], description: str
+    ) -> bool:
+        """Compress I/Q samples on a background thread, separate from the spectrograms being flushed.
+
+        If the compression is falling behind, the I/Q samples are left uncompressed rather than
+        holding up post processing. Any error is raised in the main thread, when the next file is noticed.
+
+        :param compress: Performs the compression.
+        :param description: Describes the compression, for logging.
+        :return: Whether the compression was queued.
+        """
+        if self.__iq_writer.num_pending >= _MAX_PENDING_COMPRESSIONS:
+            _LOGGER.warning(
+                f"Skipped {description}, since too many I/Q writes are waiting to run"
+            )
+            return False
+        self.__submit(self.__iq_writer, compress, description)
+        return True
+
+    def __submit(
+        self,
+        writer: _BackgroundWriter,
+        write: typing.Callable[[], object],
+        description: str,
+    ) -> None:
+        future = writer.submit(write)
+        future.add_done_callback(lambda future: self.__on_written(description, future))
+
+    def __on_written(
+        self, description: str, future: concurrent.futures.Future[None]
+    ) -> None:
+        """Report back once a background write has completed."""
+        error = future.exception()
+        if error is None:
+            _LOGGER.info(f"Finished {description}")
+        else:
+            _LOGGER.error(
+                f"An error has occured while {description}",
+                exc_info=error,
+            )
+            # Keep the first error, to be raised in the main thread.
+            if self.__write_error is None:
+                self.__write_error = error
+
+    def __raise_if_write_failed(self) -> None:
+        if self.__write_error is not None:
+            error, self.__write_error = self.__write_error, None
+            raise error
+
+    def close(self) -> None:
+        """Wait for any spectrograms (or other files) still being written to the file system.
+
+        :raises Exception: Any error raised while writing in the background, which has not yet been reported.
+        """
+        self.__partition_processed_batch()
+        self.__writer.close()
+        self.__iq_writer.close()
+        self.__raise_if_write_failed()
@@ -6,12 +6,14 @@ import logging
 import typing
 
 import numpy as np
+import pydantic
 
 import spectre_server.core.batches
 import spectre_server.core.spectrograms
 import spectre_server.core.fields
 
-from ._base import Base, BaseModel
+from ._base import Base, BaseModel, IQ_COMPRESSION_NONE, validate_iq_compression
+from ._quicklooks import QuicklookRenderer
 from ._stfft import (
     get_buffer,
     get_window,
@@ -40,6 +42,16 @@ class FixedCenterFrequencyModel(BaseModel):
     output_type: spectre_server.core.fields.Field.output_type = (
         spectre_server.core.fields.OutputType.FC32
     )
+    iq_compression: spectre_server.core.fields.Field.iq_compression = (
+        IQ_COMPRESSION_NONE
+    )
+
+    @pydantic.model_validator(mode="after")
+    def validate_iq_storage(self, info: pydantic.ValidationInfo):
+        if info.context and info.context.get("skip", False):
+            return self
+        validate_iq_compression(self.iq_compression)
+        return self
 
 
 class FixedCenterFrequency(
@@ -50,8 +62,9 @@ class FixedCenterFrequency(
         tag: str,
         model: FixedCenterFrequencyModel,
         batch_cls: typing.Type[spectre_server.core.batches.IQStreamBatch],
+        quicklook_renderer: typing.Optional[QuicklookRenderer] = None,
     ) -> None:
-        super().__init__(tag, model, batch_cls)
+        super().__init__(tag, model, batch_cls, quicklook_renderer=quicklook_renderer)
         self.__model = model
 
         # Make the window.
@@ -133,5 +146,12 @@ class FixedCenterFrequency(
         if not self.__model.keep_signal:
             _LOGGER.info(f"Deleting the I/Q samples")
             batch.delete_iq(self.__output_type)
+        elif self.__model.iq_compression != IQ_COMPRESSION_NONE:
+            _LOGGER.info(f"Compressing the I/Q samples")
+            codec = spectre_server.core.batches.IQZCodec(self.__model.iq_compression)
+            self._compress_in_background(
+                lambda: batch.compress_iq(self.__output_type, codec),
+                f"compressing the I/Q samples from batch '{batch.name}'",
+            )
 
         return spectrogram
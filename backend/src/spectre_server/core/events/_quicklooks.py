@@ -0,0 +1,80 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import queue
+import logging
+import multiprocessing
+
+import spectre_server.core.spectrograms
+import spectre_server.core.plotting
+
+_LOGGER = logging.getLogger(__name__)
+
+# The maximum number of spectrograms waiting to be rendered, before any more are dropped.
+_MAX_PENDING_QUICKLOOKS = 2
+
+# Render quicklooks at the lowest scheduling priority, so they never compete with recording.
+_QUICKLOOK_NICENESS = 19
+
+
+class QuicklookRenderer:
+    def __init__(self, max_pending: int = _MAX_PENDING_QUICKLOOKS) -> None:
+        """Render a quicklook of each flushed spectrogram in a separate, low priority process.
+
+        Spectrograms are submitted by the post processing, and rendered by another process calling
+        `run`. If the renderer falls behind, spectrograms are dropped rather than holding up the
+        post processing.
+
+        :param max_pending: The maximum number of spectrograms waiting to be rendered. Once reached,
+        any more spectrograms submitted are dropped. Defaults to 2.
+        """
+        self._queue: multiprocessing.Queue[
+            tuple[spectre_server.core.spectrograms.Spectrogram, str]
+        ] = multiprocessing.Queue(maxsize=max_pending)
+
+    def submit(
+        self, spectrogram: spectre_server.core.spectrograms.Spectrogram, tag: str
+    ) -> bool:
+        """Queue a spectrogram to be rendered, without blocking.
+
+        :param spectrogram: The spectrogram to render.
+        :param tag: The tag of the batch file storing the spectrogram.
+        :return: Whether the spectrogram was queued. If False, it was dropped since too many
+        spectrograms are already waiting to be rendered.
+        """
+        try:
+            self._queue.put_nowait((spectrogram, tag))
+        except queue.Full:
+            _LOGGER.warning(
+                f"Dropping the quicklook for the spectrogram with start time "
+                f"'{spectrogram.format_start_time()}', since too many are waiting to be rendered"
+            )
+            return False
+        return True
+
+    def render_next(self) -> None:
+        """Render the next spectrogram in the queue, then save it as a batch file alongside the spectrogram.
+
+        Blocks until a spectrogram has been queued.
+        """
+        spectrogram, tag = self._queue.get()
+        start_time = spectrogram.format_start_time()
+        try:
+            file_path = spectre_server.core.plotting.save_quicklook(
+                spectrogram, tag, title=tag
+            )
+            _LOGGER.info(f"Rendered the quicklook {file_path}")
+        except Exception:
+            # Leave the spectrogram without a quicklook, rather than stopping the renderer.
+            _LOGGER.error(
+                f"An error has occured while rendering the quicklook for the spectrogram with start time '{start_time}'",
+                exc_info=True,
+            )
+
+    def run(self) -> None:
+        """Render spectrograms as they are queued, at a low scheduling priority, until the process is killed."""
+        os.nice(_QUICKLOOK_NICENESS)
+        while True:
+            self.render_next()
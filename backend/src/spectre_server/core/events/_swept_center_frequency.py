@@ -9,13 +9,15 @@ import datetime
 import numpy as np
 import numpy.typing as npt
 import pyfftw
+import pydantic
 
 import spectre_server.core.batches
 import spectre_server.core.exceptions
 import spectre_server.core.spectrograms
 import spectre_server.core.fields
 
-from ._base import Base, BaseModel
+from ._base import Base, BaseModel, IQ_COMPRESSION_NONE, validate_iq_compression
+from ._quicklooks import QuicklookRenderer
 from ._stfft import (
     get_buffer,
     get_window,
@@ -374,6 +376,16 @@ class SweptCenterFrequencyModel(BaseModel):
     output_type: spectre_server.core.fields.Field.output_type = (
         spectre_server.core.fields.OutputType.FC32
     )
+    iq_compression: spectre_server.core.fields.Field.iq_compression = (
+        IQ_COMPRESSION_NONE
+    )
+
+    @pydantic.model_validator(mode="after")
+    def validate_iq_storage(self, info: pydantic.ValidationInfo):
+        if info.context and info.context.get("skip", False):
+            return self
+        validate_iq_compression(self.iq_compression)
+        return self
 
 
 class SweptCenterFrequency(
@@ -384,8 +396,9 @@ class SweptCenterFrequency(
         tag: str,
         model: SweptCenterFrequencyModel,
         batch_cls: typing.Type[spectre_server.core.batches.IQStreamBatch],
+        quicklook_renderer: typing.Optional[QuicklookRenderer] = None,
     ) -> None:
-        super().__init__(tag, model, batch_cls)
+        super().__init__(tag, model, batch_cls, quicklook_renderer=quicklook_renderer)
         self.__model = model
         self.__window = get_window(self.__model.window_type, self.__model.window_size)
 
@@ -408,6 +421,14 @@ class SweptCenterFrequency(
     def _watch_extension(self) -> str:
         return self.__output_type
 
+    def __compress_iq(self, batch: spectre_server.core.batches.IQStreamBatch) -> None:
+        _LOGGER.info(f"Compressing the I/Q samples from batch '{batch.name}'")
+        codec = spectre_server.core.batches.IQZCodec(self.__model.iq_compression)
+        self._compress_in_background(
+            lambda: batch.compress_iq(self.__output_type, codec),
+            f"compressing the I/Q samples from batch '{batch.name}'",
+        )
+
     def process(
         self, batch: spectre_server.core.batches.IQStreamBatch
     ) -> spectre_server.core.spectrograms.Spectrogram:
@@ -494,6 +515,8 @@ class SweptCenterFrequency(
 
                 _LOGGER.info(f"Deleting metadata from the previous batch")
                 self.__previous_batch.hdr_file.delete()
+            elif self.__model.iq_compression != IQ_COMPRESSION_NONE:
+                self.__compress_iq(self.__previous_batch)
 
         # Assign the current batch to be used as the previous batch at the next call of this method.
         self.__previous_batch = batch
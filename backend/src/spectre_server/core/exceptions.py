@@ -41,3 +41,6 @@ class ReceiverNotFoundError(KeyError): ...
 
 
 class InvalidSweepMetadataError(ValueError): ...
+
+
+class UnsupportedFitsLayoutError(ValueError): ...
@@ -173,6 +173,39 @@ class Field:
             description="Corresponds to the FITS keyword OBS_LON.",
         ),
     ]
+    fits_compression = typing.Annotated[
+        str,
+        pydantic.Field(
+            ...,
+            validate_default=True,
+            description="How spectrograms are compressed when saved to batch files. One of 'none', 'gzip' or 'rice'. RICE compression requires quantisation.",
+        ),
+    ]
+    fits_quantisation_bits = typing.Annotated[
+        int,
+        pydantic.Field(
+            ...,
+            validate_default=True,
+            description="If 8 or 16, save spectrograms in decibels above the background, quantised to integers with this many bits. 0 for no quantisation.",
+        ),
+    ]
+    rolling_background_window = typing.Annotated[
+        float,
+        pydantic.Field(
+            ...,
+            validate_default=True,
+            ge=0,
+            description="If positive, quantised spectrograms are saved in decibels above a running median background over a window of this many seconds, rather than the mean spectrum. 0 for the mean spectrum.",
+        ),
+    ]
+    quicklook = typing.Annotated[
+        bool,
+        pydantic.Field(
+            ...,
+            validate_default=True,
+            description="If True, render a quicklook of each spectrogram as it is saved, in a separate low priority process. Quicklooks are dropped if rendering falls behind.",
+        ),
+    ]
     keep_signal = typing.Annotated[
         bool,
         pydantic.Field(
@@ -181,6 +214,14 @@ class Field:
             description="If True, keep the signal after creating the spectrogram. Otherwise, it is deleted from the file system.",
         ),
     ]
+    iq_compression = typing.Annotated[
+        str,
+        pydantic.Field(
+            ...,
+            validate_default=True,
+            description="If the signal is kept, losslessly compress it in the background once it has been processed. One of 'none', 'zlib' or 'lzma'.",
+        ),
+    ]
     frequency_hop = typing.Annotated[
         float,
         pydantic.Field(
@@ -5,5 +5,6 @@
 """Basic file io for common file formats."""
 
 from ._files import Base, FileFormat, read_file
+from ._concurrent import imap_ordered, get_max_io_workers
 
-__all__ = ["Base", "FileFormat", "read_file"]
+__all__ = ["Base", "FileFormat", "read_file", "imap_ordered", "get_max_io_workers"]
@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import itertools
+import collections
+import concurrent.futures
+import typing
+
+T = typing.TypeVar("T")
+R = typing.TypeVar("R")
+
+DEFAULT_MAX_IO_WORKERS = 4
+
+
+def get_max_io_workers() -> int:
+    """Get the number of threads used to read files concurrently.
+
+    :return: The value stored in the `SPECTRE_MAX_IO_WORKERS` environment variable, or the default.
+    :raises ValueError: If the environment variable is not a positive integer.
+    """
+    max_io_workers = int(
+        os.environ.get("SPECTRE_MAX_IO_WORKERS", DEFAULT_MAX_IO_WORKERS)
+    )
+    if max_io_workers < 1:
+        raise ValueError(
+            f"The maximum number of IO workers must be at least one. Got {max_io_workers}"
+        )
+    return max_io_workers
+
+
+def imap_ordered(
+    func: typing.Callable[[T], R],
+    items: typing.Iterable[T],
+    max_workers: typing.Optional[int] = None,
+) -> typing.Iterator[R]:
+    """Lazily apply `func` to each item using a pool of threads, yielding results in the same
+    order as the input.
+
+    At most `2 * max_workers` calls are in flight at once, so that reading many files does not
+    hold all of their contents in memory before they are consumed. Any exception raised by
+    `func` is re-raised when the corresponding result is reached.
+
+    :param func: The callable to apply, typically some blocking file read.
+    :param items: The inputs to `func`.
+    :param max_workers: Optionally override the number of threads, defaults to None. If None, use `get_max_io_workers`.
+    :raises ValueError: If `max_workers` is less than one.
+    :return: An iterator over the results, ordered as the inputs.
+    """
+    if max_workers is None:
+        max_workers = get_max_io_workers()
+    elif max_workers < 1:
+        raise ValueError(
+            f"The maximum number of IO workers must be at least one. Got {max_workers}"
+        )
+    # Validate the arguments when called, rather than when the results are first consumed.
+    return _imap_ordered(func, items, max_workers)
+
+
+def _imap_ordered(
+    func: typing.Callable[[T], R],
+    items: typing.Iterable[T],
+    max_workers: int,
+) -> typing.Iterator[R]:
+    # Nothing to gain from a pool, so avoid the overhead of creating one.
+    if max_workers == 1:
+        yield from map(func, items)
+        return
+
+    items_iter = iter(items)
+    in_flight: collections.deque[concurrent.futures.Future[R]] = collections.deque()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for item in itertools.islice(items_iter, 2 * max_workers):
+            in_flight.append(executor.submit(func, item))
+
+        while in_flight:
+            result = in_flight.popleft().result()
+            # Top up the window before handing back the result.
+            for item in itertools.islice(items_iter, 1):
+                in_flight.append(executor.submit(func, item))
+            yield result
+    finally:
+        # If the caller stops early, or an error is raised, don't wait on reads nobody wants.
+        executor.shutdown(wait=True, cancel_futures=True)
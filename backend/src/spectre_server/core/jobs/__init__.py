@@ -7,5 +7,18 @@
 from ._jobs import Job, start_job
 from ._workers import Worker, make_worker
 from ._duration import Duration
+from ._registry import JobRegistry, JobState, JobStatus
+from ._supervisor import submit_job, supervise
 
-__all__ = ["Job", "Worker", "make_worker", "start_job", "Duration"]
+__all__ = [
+    "Job",
+    "Worker",
+    "make_worker",
+    "start_job",
+    "Duration",
+    "JobRegistry",
+    "JobState",
+    "JobStatus",
+    "submit_job",
+    "supervise",
+]
@@ -0,0 +1,22 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Supervise a submitted job, until it finishes.
+
+Usage: `python -m spectre_server.core.jobs <jobs_dir_path> <job_id>`
+"""
+
+import sys
+
+import spectre_server.core.logs
+import spectre_server.core.jobs
+
+if __name__ == "__main__":
+    jobs_dir_path, job_id = sys.argv[1:]
+    spectre_server.core.logs.configure_root_logger(
+        spectre_server.core.logs.ProcessType.WORKER
+    )
+    spectre_server.core.jobs.supervise(
+        spectre_server.core.jobs.JobRegistry(jobs_dir_path), job_id
+    )
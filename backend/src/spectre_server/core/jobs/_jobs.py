@@ -4,6 +4,7 @@
 
 import logging
 import time
+import typing
 
 from ._workers import Worker
 from ._duration import Duration
@@ -19,6 +20,18 @@ class Job:
         :param workers: A list of `Worker` instances to manage as part of the job.
         """
         self._workers = workers
+        self._num_restarts = 0
+        self._stop_requested = False
+
+    @property
+    def workers(self) -> list[Worker]:
+        """The workers managed as part of the job."""
+        return self._workers
+
+    @property
+    def num_restarts(self) -> int:
+        """The number of times the workers have been restarted."""
+        return self._num_restarts
 
     @property
     def workers_are_alive(self) -> bool:
@@ -51,9 +64,21 @@ class Job:
         """Tell each worker to restart its process."""
         for worker in self._workers:
             worker.restart()
+        self._num_restarts += 1
+
+    def stop(self) -> None:
+        """Ask the job to stop being monitored early, as if its duration had elapsed.
+
+        Intended to be called from `on_poll` while the job is being monitored.
+        """
+        self._stop_requested = True
 
     def monitor(
-        self, duration: float, force_restart: bool = False, max_restarts: int = 5
+        self,
+        duration: float,
+        force_restart: bool = False,
+        max_restarts: int = 5,
+        on_poll: typing.Optional[typing.Callable[["Job"], None]] = None,
     ) -> None:
         """
         Monitor the workers during execution and handle unexpected exits.
@@ -67,6 +92,7 @@ class Job:
         :param force_restart: Whether to restart all workers if one dies unexpectedly.
         :param max_restarts: Maximum number of times workers can be restarted before giving up and killing all workers.
         Only applies when force_restart is True. Defaults to 5.
+        :param on_poll: If specified, called with the job each time the workers are checked.
         :raises RuntimeError: If a worker exits and `force_restart` is False.
         """
         _LOGGER.info("Monitoring workers...")
@@ -75,7 +101,7 @@ class Job:
         restarts_remaining = max_restarts
         try:
             # Check that the elapsed time since the job started is within the total runtime configured by the user.
-            while time.time() - start_time < duration:
+            while not self._stop_requested and time.time() - start_time < duration:
                 for worker in self._workers:
                     if not worker.is_alive:
                         error_message = (
@@ -100,6 +126,8 @@ class Job:
                         else:
                             self.kill()
                             raise RuntimeError(error_message)
+                if on_poll is not None:
+                    on_poll(self)
                 time.sleep(Duration.ONE_DECISECOND)  # Poll every 0.1 seconds
 
             # If the jobs total runtime has elapsed, kill all the workers
@@ -116,6 +144,7 @@ def start_job(
     duration: float,
     force_restart: bool = False,
     max_restarts: int = 5,
+    on_poll: typing.Optional[typing.Callable[[Job], None]] = None,
 ) -> None:
     """Create and run a job with the specified workers.
 
@@ -127,7 +156,8 @@ def start_job(
     :param force_restart: Whether to restart all workers if one dies unexpectedly.
     :param max_restarts: Maximum number of times workers can be restarted before giving up and killing all workers.
     Only applies when force_restart is True. Defaults to 5.
+    :param on_poll: If specified, called with the job each time the workers are checked.
     """
     job = Job(workers)
     job.start()
-    job.monitor(duration, force_restart, max_restarts)
+    job.monitor(duration, force_restart, max_restarts, on_poll)
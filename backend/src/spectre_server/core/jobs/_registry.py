@@ -0,0 +1,233 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Keep track of jobs running in the background, so they can be queried from any process.
+
+The status of each job is kept in a JSON file, so that every server process sees the same jobs.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import enum
+import typing
+import datetime
+import dataclasses
+
+import spectre_server.core.config
+
+# Once a job hasn't reported for this many seconds, assume its supervisor has died.
+_LOST_AFTER = 30
+
+_JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+_CANCEL_EXTENSION = "cancel"
+
+
+class JobState(enum.Enum):
+    """The state of a job running in the background.
+
+    :ivar PENDING: The job has been submitted, but its supervisor has not yet started.
+    :ivar RUNNING: The workers are being monitored by the supervisor.
+    :ivar COMPLETED: The job ran for its full duration.
+    :ivar FAILED: The job stopped due to an error.
+    :ivar CANCELLED: The job was cancelled before it ran for its full duration.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether a job in this state has stopped."""
+        return self in (JobState.COMPLETED, JobState.FAILED, JobState.CANCELLED)
+
+
+def _format_time(timestamp: float) -> str:
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).strftime(
+        spectre_server.core.config.TimeFormat.DATETIME
+    )
+
+
+def _parse_time(formatted_time: str) -> float:
+    return (
+        datetime.datetime.strptime(
+            formatted_time, spectre_server.core.config.TimeFormat.DATETIME
+        )
+        .replace(tzinfo=datetime.timezone.utc)
+        .timestamp()
+    )
+
+
+@dataclasses.dataclass
+class JobStatus:
+    """The status of a job running in the background.
+
+    :ivar job_id: Uniquely identifies the job.
+    :ivar target: The function run by the job, as `<module>:<function>`.
+    :ivar kwargs: The keyword arguments the function is called with.
+    :ivar state: The state of the job.
+    :ivar created_at: When the job was submitted, as a Unix timestamp.
+    :ivar updated_at: When the job last reported its status, as a Unix timestamp.
+    :ivar supervisor_pid: The process ID of the supervisor, once it has started.
+    :ivar workers: The name of each worker, and whether it was alive when the job last reported.
+    :ivar num_restarts: The number of times the workers have been restarted.
+    :ivar error: Why the job failed, if it has.
+    """
+
+    job_id: str
+    target: str
+    kwargs: dict[str, typing.Any]
+    state: JobState
+    created_at: float
+    updated_at: float
+    supervisor_pid: typing.Optional[int] = None
+    workers: list[tuple[str, bool]] = dataclasses.field(default_factory=list)
+    num_restarts: int = 0
+    error: typing.Optional[str] = None
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        """Convert the status to a JSON serialisable dictionary."""
+        return {
+            "job_id": self.job_id,
+            "target": self.target,
+            "kwargs": self.kwargs,
+            "state": self.state.value,
+            "created_at": _format_time(self.created_at),
+            "updated_at": _format_time(self.updated_at),
+            "supervisor_pid": self.supervisor_pid,
+            "workers": [
+                {"name": name, "is_alive": is_alive} for name, is_alive in self.workers
+            ],
+            "num_restarts": self.num_restarts,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict[str, typing.Any]) -> "JobStatus":
+        """Create a status from a dictionary, as returned by `to_dict`."""
+        return cls(
+            job_id=d["job_id"],
+            target=d["target"],
+            kwargs=d["kwargs"],
+            state=JobState(d["state"]),
+            created_at=_parse_time(d["created_at"]),
+            updated_at=_parse_time(d["updated_at"]),
+            supervisor_pid=d["supervisor_pid"],
+            workers=[(worker["name"], worker["is_alive"]) for worker in d["workers"]],
+            num_restarts=d["num_restarts"],
+            error=d["error"],
+        )
+
+
+class JobRegistry:
+    def __init__(self, dir_path: typing.Optional[str] = None) -> None:
+        """The status of every job, each kept in a JSON file.
+
+        :param dir_path: The directory containing the status files. Defaults to the jobs directory
+        in the Spectre data directory.
+        """
+        self._dir_path = (
+            dir_path or spectre_server.core.config.paths.get_jobs_dir_path()
+        )
+
+    @property
+    def dir_path(self) -> str:
+        """The directory containing the status files."""
+        return self._dir_path
+
+    def _get_file_path(self, job_id: str, extension: str = "json") -> str:
+        if not _JOB_ID_PATTERN.match(job_id):
+            raise ValueError(f"'{job_id}' is not a valid job ID")
+        return os.path.join(self._dir_path, f"{job_id}.{extension}")
+
+    def create(self, target: str, kwargs: dict[str, typing.Any]) -> JobStatus:
+        """Register a new job, which is pending until its supervisor starts.
+
+        :param target: The function run by the job, as `<module>:<function>`.
+        :param kwargs: The keyword arguments the function is called with. Must be JSON serialisable.
+        :return: The status of the new job.
+        """
+        now = time.time()
+        status = JobStatus(
+            job_id=uuid.uuid4().hex,
+            target=target,
+            kwargs=kwargs,
+            state=JobState.PENDING,
+            created_at=now,
+            updated_at=now,
+        )
+        self.write(status)
+        return status
+
+    def write(self, status: JobStatus) -> None:
+        """Write the status of a job, replacing any existing status atomically.
+
+        :param status: The status to write.
+        """
+        os.makedirs(self._dir_path, exist_ok=True)
+        file_path = self._get_file_path(status.job_id)
+        temp_file_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(temp_file_path, "w") as f:
+            json.dump(status.to_dict(), f)
+        os.replace(temp_file_path, file_path)
+
+    def read(self, job_id: str) -> JobStatus:
+        """Read the status of a job.
+
+        If an unfinished job hasn't reported for a while, its supervisor is assumed to have died, and
+        the job is reported as failed.
+
+        :param job_id: Uniquely identifies the job.
+        :raises FileNotFoundError: If no job exists with the ID.
+        :return: The status of the job.
+        """
+        file_path = self._get_file_path(job_id)
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"No job exists with ID '{job_id}'")
+        with open(file_path, "r") as f:
+            status = JobStatus.from_dict(json.load(f))
+
+        if (
+            not status.state.is_finished
+            and time.time() - status.updated_at > _LOST_AFTER
+        ):
+            status.state = JobState.FAILED
+            status.error = (
+                f"The job has not reported its status for over {_LOST_AFTER} seconds"
+            )
+        return status
+
+    def list(self) -> list[JobStatus]:
+        """Read the status of every job, from the oldest to the most recently submitted."""
+        if not os.path.exists(self._dir_path):
+            return []
+        statuses = []
+        for file_name in os.listdir(self._dir_path):
+            job_id, extension = os.path.splitext(file_name)
+            if extension == ".json" and _JOB_ID_PATTERN.match(job_id):
+                statuses.append(self.read(job_id))
+        return sorted(statuses, key=lambda status: status.created_at)
+
+    def request_cancel(self, job_id: str) -> None:
+        """Ask the supervisor of a job to stop it, the next time it reports.
+
+        :param job_id: Uniquely identifies the job.
+        :raises FileNotFoundError: If no job exists with the ID.
+        """
+        # Check the job exists.
+        self.read(job_id)
+        with open(self._get_file_path(job_id, _CANCEL_EXTENSION), "w"):
+            pass
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        """Check whether a job has been asked to stop.
+
+        :param job_id: Uniquely identifies the job.
+        """
+        return os.path.exists(self._get_file_path(job_id, _CANCEL_EXTENSION))
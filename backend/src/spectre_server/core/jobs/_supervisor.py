@@ -0,0 +1,151 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Run jobs in the background, each supervised by a process detached from the one which submitted it."""
+
+import os
+import sys
+import time
+import types
+import signal
+import typing
+import logging
+import importlib
+import subprocess
+
+from ._jobs import Job
+from ._registry import JobRegistry, JobState, JobStatus
+from ._duration import Duration
+
+_LOGGER = logging.getLogger(__name__)
+
+# How often a running job reports its status, in seconds.
+_REPORT_INTERVAL = Duration.ONE_SECOND
+
+
+class _Reporter:
+    def __init__(self, registry: JobRegistry, status: JobStatus) -> None:
+        """Report the status of a job as it's monitored, and stop it if it's been cancelled.
+
+        :param registry: The registry to report the status to.
+        :param status: The status of the job, which is updated in place.
+        """
+        self._registry = registry
+        self._status = status
+        self._job: typing.Optional[Job] = None
+        self._last_report_time = 0.0
+        self.cancelled = False
+
+    def __call__(self, job: Job) -> None:
+        """Called each time the workers are checked. Reports at most once a second, unless the workers
+        have been restarted since the last report."""
+        self._job = job
+        now = time.time()
+        if (
+            now - self._last_report_time < _REPORT_INTERVAL
+            and job.num_restarts == self._status.num_restarts
+        ):
+            return
+
+        if not self.cancelled and self._registry.is_cancel_requested(
+            self._status.job_id
+        ):
+            _LOGGER.info(f"Cancelling the job '{self._status.job_id}'")
+            self.cancelled = True
+            job.stop()
+
+        self.report()
+        self._last_report_time = now
+
+    def report(self) -> None:
+        """Write the status of the job, as of now."""
+        if self._job is not None:
+            self._status.workers = [
+                (worker.name, worker.is_alive) for worker in self._job.workers
+            ]
+            self._status.num_restarts = self._job.num_restarts
+        self._status.updated_at = time.time()
+        self._registry.write(self._status)
+
+
+def _import_target(target: str) -> typing.Callable[..., typing.Any]:
+    module_name, function_name = target.split(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def supervise(registry: JobRegistry, job_id: str) -> JobStatus:
+    """Run a pending job to completion, reporting its status as it runs.
+
+    The function run by the job is called with its keyword arguments, and `on_poll`, which must be passed on
+    to `Job.monitor`. On `SIGTERM`, the job is cancelled.
+
+    :param registry: The registry of the job.
+    :param job_id: Uniquely identifies the job.
+    :return: The status of the job, once it has finished.
+    """
+    status = registry.read(job_id)
+    status.state = JobState.RUNNING
+    status.supervisor_pid = os.getpid()
+    reporter = _Reporter(registry, status)
+    reporter.report()
+
+    def _handle_sigterm(signum: int, frame: typing.Optional[types.FrameType]) -> None:
+        # The workers are killed by `Job.monitor` on a keyboard interrupt.
+        reporter.cancelled = True
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _handle_sigterm)
+
+    try:
+        # The job may have been cancelled before its supervisor started.
+        if registry.is_cancel_requested(job_id):
+            raise KeyboardInterrupt
+        target = _import_target(status.target)
+        target(**status.kwargs, on_poll=reporter)
+    except KeyboardInterrupt:
+        reporter.cancelled = True
+    except Exception as e:
+        _LOGGER.error(f"The job '{job_id}' has failed", exc_info=True)
+        status.state = JobState.FAILED
+        status.error = str(e)
+
+    if status.state == JobState.RUNNING:
+        status.state = JobState.CANCELLED if reporter.cancelled else JobState.COMPLETED
+    reporter.report()
+    _LOGGER.info(f"The job '{job_id}' has finished, with state '{status.state.value}'")
+    return status
+
+
+def submit_job(
+    target: str,
+    kwargs: dict[str, typing.Any],
+    registry: typing.Optional[JobRegistry] = None,
+) -> JobStatus:
+    """Run a function in the background, returning as soon as the job is registered.
+
+    The job is supervised in a new process, in its own session, so it outlives the process which submitted it.
+
+    :param target: The function to run, as `<module>:<function>`. It must accept the keyword argument
+    `on_poll`, and pass it on to `Job.monitor`.
+    :param kwargs: The keyword arguments the function is called with. Must be JSON serialisable.
+    :param registry: The registry to track the job in. Defaults to the registry in the Spectre data directory.
+    :return: The status of the job, which is pending.
+    """
+    registry = registry or JobRegistry()
+    status = registry.create(target, kwargs)
+    subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "spectre_server.core.jobs",
+            registry.dir_path,
+            status.job_id,
+        ],
+        start_new_session=True,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    _LOGGER.info(f"Submitted the job '{status.job_id}' to run '{target}'")
+    return status
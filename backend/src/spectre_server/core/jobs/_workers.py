@@ -69,6 +69,8 @@ class Worker:
             raise RuntimeError("Cannot kill a process which is not alive.")
 
         self._process.kill()
+        # Wait for the process to exit, so it's no longer alive once this returns.
+        self._process.join()
 
     def restart(self) -> None:
         """Restart the worker process.
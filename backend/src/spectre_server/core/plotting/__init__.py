@@ -13,6 +13,20 @@ from ._panels import (
     IntegralOverFrequencyPanel,
 )
 from ._panel_names import PanelName
+from ._decimate import Reducer, get_block_size, reduce_blocks
+from ._render_cache import RenderCache, get_file_stamp
+from ._raster import get_lut, apply_lut, encode_png, write_png
+from ._canvas import RasterCanvas, RasterScale, get_frequency_band
+from ._tiles import (
+    TILE_SIZE,
+    MAX_ZOOM,
+    Tile,
+    TileCanvas,
+    TileState,
+    make_empty_tile,
+)
+from ._quicklook import render_quicklook, save_quicklook, get_plot_file_path
+from ._figure_pool import FigurePool
 from ._panel_stack import PanelStack
 
 __all__ = [
@@ -21,7 +35,29 @@ __all__ = [
     "BasePanel",
     "PanelFormat",
     "PanelStack",
+    "FigurePool",
     "PanelName",
+    "Reducer",
+    "get_block_size",
+    "reduce_blocks",
+    "RenderCache",
+    "get_file_stamp",
+    "get_lut",
+    "apply_lut",
+    "encode_png",
+    "write_png",
+    "TILE_SIZE",
+    "MAX_ZOOM",
+    "RasterCanvas",
+    "RasterScale",
+    "Tile",
+    "TileCanvas",
+    "TileState",
+    "make_empty_tile",
+    "render_quicklook",
+    "save_quicklook",
+    "get_plot_file_path",
+    "get_frequency_band",
     "SpectrogramPanel",
     "FrequencyCutsPanel",
     "TimeCutsPanel",
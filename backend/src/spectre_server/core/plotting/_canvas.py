@@ -0,0 +1,277 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Reduce spectrogram data onto a grid of pixels, spanning fixed ranges of time and frequency."""
+
+import enum
+import typing
+import datetime
+
+import numpy as np
+import numpy.typing as npt
+
+import spectre_server.core.spectrograms
+from ._decimate import Reducer
+
+
+class RasterScale(enum.Enum):
+    """How spectrogram data is scaled before being mapped to colours.
+
+    The scaling doesn't depend on the rest of the data drawn, so neighbouring tiles match.
+
+    :ivar DBB: Decibels above the background, where the background is the mean spectrum of each spectrogram drawn.
+    :ivar DB: Decibels, relative to a value of one.
+    """
+
+    DBB = "dBb"
+    DB = "dB"
+
+
+def get_frequency_band(
+    spectrogram: spectre_server.core.spectrograms.Spectrogram,
+) -> tuple[float, float]:
+    """Get the band spanned by the spectral components of a spectrogram, from the lower edge of the
+    first to the upper edge of the last."""
+    frequencies = spectrogram.frequencies
+    half_width = (
+        spectrogram.frequency_resolution / 2 if spectrogram.num_frequencies > 1 else 0.5
+    )
+    return float(frequencies[0] - half_width), float(frequencies[-1] + half_width)
+
+
+def _scale(
+    spectrogram: spectre_server.core.spectrograms.Spectrogram, scale: RasterScale
+) -> npt.NDArray[np.float32]:
+    if scale == RasterScale.DBB:
+        return spectrogram.compute_dynamic_spectra_dBb()
+    if (
+        spectrogram.spectrum_unit
+        == spectre_server.core.spectrograms.SpectrumUnit.DECIBELS_ABOVE_BACKGROUND
+    ):
+        raise ValueError(
+            "Spectrograms stored in decibels above the background cannot be scaled to decibels"
+        )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (10 * np.log10(spectrogram.dynamic_spectra)).astype(np.float32)
+
+
+def _reduce_ranges(
+    values: npt.NDArray,
+    starts: npt.NDArray[np.intp],
+    ends: npt.NDArray[np.intp],
+    axis: int,
+    ufunc: np.ufunc,
+) -> npt.NDArray:
+    """Reduce each range of values `[starts[i], ends[i])` along an axis, where every range is non-empty."""
+    if len(starts) == 0:
+        shape = list(values.shape)
+        shape[axis] = 0
+        return np.empty(shape, dtype=values.dtype)
+    # Pad the values, so the end of the last range is a valid index.
+    pad_shape = list(values.shape)
+    pad_shape[axis] = 1
+    padded = np.concatenate([values, np.zeros(pad_shape, values.dtype)], axis=axis)
+    # Interleave the starts and ends, then keep only the reductions between each start and end.
+    indices = np.stack([starts, ends], axis=-1).ravel()
+    reduced = ufunc.reduceat(padded, indices, axis=axis)
+    return np.take(reduced, np.arange(0, len(indices), 2), axis=axis)
+
+
+class RasterCanvas:
+    def __init__(
+        self,
+        start_datetime: datetime.datetime,
+        duration: float,
+        frequency_range: tuple[float, float],
+        width: int,
+        height: int,
+        scale: RasterScale = RasterScale.DBB,
+        reducer: Reducer = Reducer.MEAN,
+        start_column: int = 0,
+    ) -> None:
+        """Draw spectrograms onto a grid of pixels, one at a time.
+
+        Each pixel reduces the values of every spectral component and spectrum it covers. Where
+        spectrums or spectral components are wider than a pixel, they are repeated over the pixels
+        they cover. Pixels with no data are missing.
+
+        :param start_datetime: The time at the left edge of the canvas.
+        :param duration: The time spanned by the canvas, in seconds.
+        :param frequency_range: The frequencies at the bottom and top edges of the canvas, in Hz.
+        :param width: The number of columns of pixels, spanning time.
+        :param height: The number of rows of pixels, spanning frequency.
+        :param scale: How the spectrogram data is scaled, defaults to `RasterScale.DBB`.
+        :param reducer: How values sharing a pixel are reduced, defaults to `Reducer.MEAN`.
+        :param start_column: Only draw columns of pixels from this one onwards. Defaults to 0.
+        """
+        self._start_datetime = start_datetime
+        self._scale = scale
+        self._reducer = reducer
+        self._start_column = start_column
+        self._width = width
+
+        self._row_edges = np.linspace(*frequency_range, height + 1)
+        self._column_edges = np.linspace(0, duration, width + 1)
+
+        shape = (height, width)
+        if reducer == Reducer.MAX:
+            self._maxes = np.full(shape, np.nan)
+        else:
+            self._sums = np.zeros(shape)
+            self._counts = np.zeros(shape)
+        # The values of pixels between spectrums, repeated from the spectrum before.
+        self._held = np.full(shape, np.nan)
+
+    def _get_rows(
+        self, frequencies: npt.NDArray[np.float32], frequency_resolution: float
+    ) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+        """Find the spectral components covered by each row of pixels, or the nearest one if none are."""
+        starts = np.searchsorted(frequencies, self._row_edges[:-1])
+        ends = np.searchsorted(frequencies, self._row_edges[1:])
+        centres = (self._row_edges[:-1] + self._row_edges[1:]) / 2
+        nearest = np.clip(
+            np.searchsorted(frequencies, centres) - 1, 0, len(frequencies) - 1
+        )
+        is_closer = (nearest + 1 < len(frequencies)) & (
+            np.abs(frequencies[np.minimum(nearest + 1, len(frequencies) - 1)] - centres)
+            < np.abs(frequencies[nearest] - centres)
+        )
+        nearest = nearest + is_closer
+        is_empty = starts == ends
+        starts = np.where(is_empty, nearest, starts)
+        ends = np.where(is_empty, nearest + 1, ends)
+        is_covered = ~is_empty | (
+            np.abs(frequencies[nearest] - centres) <= frequency_resolution / 2
+        )
+        rows = np.flatnonzero(is_covered)
+        return rows, starts[rows], ends[rows]
+
+    def draw(self, spectrogram: spectre_server.core.spectrograms.Spectrogram) -> None:
+        """Draw a spectrogram onto the canvas.
+
+        Spectrograms must not overlap in time. The frequency band must be the same for
+        every spectrogram drawn onto a canvas.
+
+        :param spectrogram: The spectrogram, with its start time set.
+        """
+        frequency_resolution = (
+            spectrogram.frequency_resolution if spectrogram.num_frequencies > 1 else 0
+        )
+        rows, row_starts, row_ends = self._get_rows(
+            spectrogram.frequencies, frequency_resolution
+        )
+        if len(rows) == 0:
+            return
+
+        # Get the time of each spectrum, relative to the left edge of the canvas.
+        offset = (
+            spectrogram.start_datetime - np.datetime64(self._start_datetime, "us")
+        ) / np.timedelta64(1, "s")
+        times = spectrogram.times.astype(np.float64) + offset
+        column_starts = np.searchsorted(times, self._column_edges[:-1])
+        column_ends = np.searchsorted(times, self._column_edges[1:])
+        is_drawn = np.arange(self._width) >= self._start_column
+        filled = np.flatnonzero(is_drawn & (column_ends > column_starts))
+
+        # Repeat the last spectrum before each empty column, if it's still in effect.
+        held = np.array([], dtype=np.intp)
+        if spectrogram.num_times > 1:
+            previous = column_starts - 1
+            is_held = (
+                is_drawn
+                & (column_ends == column_starts)
+                & (previous >= 0)
+                & (
+                    times[np.maximum(previous, 0)] + spectrogram.time_resolution
+                    > self._column_edges[:-1]
+                )
+            )
+            held = np.flatnonzero(is_held)
+        if len(filled) == 0 and len(held) == 0:
+            return
+
+        # Only scale the spectral components which are drawn.
+        lower, upper = row_starts.min(), row_ends.max()
+        values = _scale(spectrogram, self._scale)[lower:upper]
+        row_starts, row_ends = row_starts - lower, row_ends - lower
+
+        # Reduce over time first, since there are usually many more spectrums than columns.
+        # The spectrums in consecutive filled columns are contiguous, so each column
+        # reduces from its first spectrum up to the first spectrum of the next.
+        ufunc = np.fmax if self._reducer == Reducer.MAX else np.add
+        by_column = []
+        if len(filled):
+            in_columns = values[:, : column_ends[filled[-1]]]
+            if self._reducer == Reducer.MAX:
+                by_column.append(
+                    np.fmax.reduceat(in_columns, column_starts[filled], axis=1)
+                )
+            else:
+                is_valid = ~np.isnan(in_columns)
+                by_column += [
+                    np.add.reduceat(
+                        np.where(is_valid, in_columns, 0),
+                        column_starts[filled],
+                        axis=1,
+                        dtype=np.float64,
+                    ),
+                    np.add.reduceat(
+                        is_valid, column_starts[filled], axis=1, dtype=np.float64
+                    ),
+                ]
+        held_spectra = values[:, column_starts[held] - 1]
+        if self._reducer == Reducer.MAX:
+            by_column = [np.concatenate(by_column + [held_spectra], axis=1)]
+        else:
+            is_valid = ~np.isnan(held_spectra)
+            by_column = [
+                np.concatenate(
+                    by_column[:1]
+                    + [np.where(is_valid, held_spectra, 0).astype(np.float64)],
+                    axis=1,
+                ),
+                np.concatenate(
+                    by_column[1:] + [is_valid.astype(np.float64)],
+                    axis=1,
+                ),
+            ]
+
+        # Then reduce over frequency.
+        by_pixel = [
+            _reduce_ranges(a, row_starts, row_ends, 0, ufunc) for a in by_column
+        ]
+        num_filled = len(filled)
+        filled_pixels = np.ix_(rows, filled)
+        if self._reducer == Reducer.MAX:
+            self._maxes[filled_pixels] = np.fmax(
+                self._maxes[filled_pixels], by_pixel[0][:, :num_filled]
+            )
+            self._held[np.ix_(rows, held)] = by_pixel[0][:, num_filled:]
+        else:
+            self._sums[filled_pixels] += by_pixel[0][:, :num_filled]
+            self._counts[filled_pixels] += by_pixel[1][:, :num_filled]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                self._held[np.ix_(rows, held)] = (
+                    by_pixel[0][:, num_filled:] / by_pixel[1][:, num_filled:]
+                )
+
+    def get_values(
+        self, previous_values: typing.Optional[npt.NDArray[np.float32]] = None
+    ) -> npt.NDArray[np.float32]:
+        """Get the value of each pixel, where the first row is the top of the canvas.
+
+        :param previous_values: Optionally, take the columns before the start column from these values, defaults to None.
+        :return: The values, with missing pixels set to NaN.
+        """
+        if self._reducer == Reducer.MAX:
+            values = self._maxes
+        else:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                values = self._sums / self._counts
+        values = np.where(np.isnan(values), self._held, values)
+        # Rows are ordered by increasing frequency, but images are drawn from the top.
+        values = values[::-1].astype(np.float32)
+        if previous_values is not None:
+            values[:, : self._start_column] = previous_values[:, : self._start_column]
+        return values
@@ -0,0 +1,116 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Reduce a spectrogram to the resolution it will be rendered at."""
+
+import enum
+import math
+import typing
+
+import numpy as np
+import numpy.typing as npt
+
+
+class Reducer(enum.Enum):
+    """How the values in each block are reduced to a single pixel.
+
+    :ivar MEAN: Average over the block, ignoring missing values.
+    :ivar MAX: Take the maximum over the block, ignoring missing values. This preserves
+    short-lived bursts, which averaging would wash out.
+    """
+
+    MEAN = "mean"
+    MAX = "max"
+
+
+def get_block_size(num_values: int, num_pixels: int) -> int:
+    """Get the smallest number of consecutive values per block, such that there is at most
+    one block per pixel."""
+    return max(1, math.ceil(num_values / max(num_pixels, 1)))
+
+
+def reduce_blocks(
+    values: npt.NDArray,
+    block_size: int,
+    axis: int = 0,
+    reducer: Reducer = Reducer.MEAN,
+) -> npt.NDArray:
+    """Reduce each block of consecutive values along an axis to a single value.
+
+    The final block is shorter if the number of values is not a multiple of the block size.
+
+    :param values: The values to reduce.
+    :param block_size: The number of consecutive values in each block.
+    :param axis: The axis to reduce along, defaults to 0.
+    :param reducer: How to reduce the values in each block, defaults to `Reducer.MEAN`.
+    :return: The reduced values, where blocks with no valid values are NaN.
+    """
+    if block_size <= 1:
+        return values
+
+    starts = np.arange(0, values.shape[axis], block_size)
+    if reducer == Reducer.MAX:
+        # Unlike `np.maximum`, `np.fmax` ignores NaNs unless every value is NaN.
+        return np.fmax.reduceat(values, starts, axis=axis)
+
+    is_valid = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(is_valid, values, 0), starts, axis=axis)
+    counts = np.add.reduceat(is_valid, starts, axis=axis)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (sums / counts).astype(np.result_type(values.dtype, np.float32))
+
+
+def is_uniform(values: npt.NDArray, rtol: float = 1e-3) -> bool:
+    """Check whether consecutive values are evenly spaced."""
+    if len(values) < 2:
+        return True
+    steps = np.diff(values.astype(np.float64))
+    return bool(np.allclose(steps, steps[0], rtol=rtol, atol=0))
+
+
+def get_edges(centres: npt.NDArray) -> tuple[float, float]:
+    """Get the outer edges of the cells centred on each value, matching `pcolormesh`."""
+    if len(centres) < 2:
+        return float(centres[0]) - 0.5, float(centres[0]) + 0.5
+    return (
+        float(centres[0] - (centres[1] - centres[0]) / 2),
+        float(centres[-1] + (centres[-1] - centres[-2]) / 2),
+    )
+
+
+def decimate(
+    times: npt.NDArray[np.float32],
+    frequencies: npt.NDArray[np.float32],
+    dynamic_spectra: npt.NDArray[np.float32],
+    max_num_times: int,
+    max_num_frequencies: int,
+    reducer: Reducer = Reducer.MEAN,
+) -> tuple[npt.NDArray[np.float32], npt.NDArray[np.float32], npt.NDArray[np.float32]]:
+    """Reduce a spectrogram so it has at most one spectrum per horizontal pixel, and at most
+    one spectral component per vertical pixel.
+
+    :param times: The times assigned to each spectrum.
+    :param frequencies: The frequencies assigned to each spectral component.
+    :param dynamic_spectra: The dynamic spectra, with shape (frequencies, times).
+    :param max_num_times: The maximum number of spectrums to keep.
+    :param max_num_frequencies: The maximum number of spectral components to keep.
+    :param reducer: How to reduce the dynamic spectra in each block, defaults to `Reducer.MEAN`.
+    The times and frequencies are always averaged.
+    :return: The times, frequencies and dynamic spectra at the reduced resolution.
+    """
+    time_block_size = get_block_size(len(times), max_num_times)
+    frequency_block_size = get_block_size(len(frequencies), max_num_frequencies)
+    dynamic_spectra = reduce_blocks(
+        dynamic_spectra, frequency_block_size, axis=0, reducer=reducer
+    )
+    dynamic_spectra = reduce_blocks(
+        dynamic_spectra, time_block_size, axis=1, reducer=reducer
+    )
+    return (
+        typing.cast(npt.NDArray[np.float32], reduce_blocks(times, time_block_size)),
+        typing.cast(
+            npt.NDArray[np.float32], reduce_blocks(frequencies, frequency_block_size)
+        ),
+        dynamic_spectra,
+    )
@@ -0,0 +1,131 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Reuse figures between renders, rather than building a new figure for each one.
+
+Creating a figure and its axes, then tearing them down again, takes up much of the time
+spent rendering each plot. Pooled figures are drawn with the Agg backend, and are never
+registered with `pyplot`. Everything drawn onto them is removed explicitly when they're
+returned to the pool, so they hold no references to the data they were last drawn with.
+"""
+
+import typing
+import threading
+import collections
+
+import matplotlib.figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# The default number of idle figures kept in each pool.
+_MAX_FIGURES = 8
+
+
+def make_agg_figure(
+    num_axes: int, figsize: tuple[float, float]
+) -> matplotlib.figure.Figure:
+    """Make a figure with vertically stacked axes, which can only be drawn to files.
+
+    :param num_axes: The number of axes in the figure.
+    :param figsize: The size of the figure as (width, height), in inches.
+    :return: The figure, where `figure.axes` are the axes from top to bottom.
+    """
+    figure = matplotlib.figure.Figure(figsize=figsize, layout="constrained")
+    FigureCanvasAgg(figure)
+    figure.subplots(num_axes, 1, squeeze=False)
+    return figure
+
+
+def reset_figure(figure: matplotlib.figure.Figure, num_axes: int) -> None:
+    """Remove everything drawn onto a figure, keeping only its original axes.
+
+    :param figure: The figure to reset.
+    :param num_axes: The number of axes the figure was made with. Any axes added since,
+    such as colorbars, are removed.
+    """
+    axes = figure.axes[:num_axes]
+    for ax in axes:
+        for mappable in [*ax.images, *ax.collections]:
+            colorbar = getattr(mappable, "colorbar", None)
+            if colorbar is not None:
+                colorbar.remove()
+    for ax in figure.axes[num_axes:]:
+        ax.remove()
+    for ax in axes:
+        ax.cla()
+        # Undo the layout of the last render, so the next is laid out from scratch.
+        ax.set_subplotspec(ax.get_subplotspec())
+    figure.texts.clear()
+    figure.legends.clear()
+
+
+class FigurePool:
+    def __init__(self, max_figures: int = _MAX_FIGURES) -> None:
+        """Idle figures, ready to be drawn onto again, evicting the least recently used first.
+
+        :param max_figures: The maximum number of idle figures kept in the pool. If zero, figures
+        are never reused. Defaults to 8.
+        """
+        self._max_figures = max_figures
+        self._figures: collections.OrderedDict[
+            typing.Hashable, list[matplotlib.figure.Figure]
+        ] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def num_figures(self) -> int:
+        """The number of idle figures in the pool."""
+        with self._lock:
+            return sum(len(figures) for figures in self._figures.values())
+
+    def acquire(
+        self,
+        key: typing.Hashable,
+        num_axes: int,
+        figsize: tuple[float, float],
+    ) -> tuple[matplotlib.figure.Figure, bool]:
+        """Take an idle figure out of the pool, or make a new one if there are none.
+
+        Figures with the same key must have the same layout, so they can be drawn onto in the same way.
+
+        :param key: Identifies the layout of the figure.
+        :param num_axes: The number of axes in the figure, if a new one is made.
+        :param figsize: The size of the figure as (width, height), in inches, if a new one is made.
+        :return: The figure, and whether it was drawn onto before.
+        """
+        with self._lock:
+            figures = self._figures.get(key)
+            if figures:
+                figure = figures.pop()
+                if not figures:
+                    del self._figures[key]
+                return figure, True
+        return make_agg_figure(num_axes, figsize), False
+
+    def release(
+        self, key: typing.Hashable, figure: matplotlib.figure.Figure, num_axes: int
+    ) -> None:
+        """Reset a figure, then return it to the pool.
+
+        :param key: Identifies the layout of the figure, as passed to `acquire`.
+        :param figure: The figure to return.
+        :param num_axes: The number of axes the figure was made with.
+        """
+        reset_figure(figure, num_axes)
+        if self._max_figures < 1:
+            return
+        with self._lock:
+            self._figures.setdefault(key, []).append(figure)
+            self._figures.move_to_end(key)
+            num_figures = sum(len(figures) for figures in self._figures.values())
+            while num_figures > self._max_figures:
+                oldest_key, oldest_figures = next(iter(self._figures.items()))
+                oldest_figures.pop(0)
+                if not oldest_figures:
+                    del self._figures[oldest_key]
+                num_figures -= 1
+
+    def clear(self) -> None:
+        """Remove every idle figure from the pool."""
+        with self._lock:
+            self._figures.clear()
@@ -5,6 +5,7 @@
 import os
 import typing
 import datetime
+import dataclasses
 import gc
 
 import numpy as np
@@ -18,6 +19,11 @@ import spectre_server.core.config
 
 from ._base import BasePanel, XAxisType
 from ._format import PanelFormat
+from ._quicklook import get_plot_file_path
+from ._figure_pool import FigurePool
+
+# Figures saved to files are shared between all panel stacks, unless they're given their own pool.
+_FIGURE_POOL = FigurePool()
 
 
 class PanelStack:
@@ -29,16 +35,19 @@ class PanelStack:
         time_type: spectre_server.core.spectrograms.TimeType = spectre_server.core.spectrograms.TimeType.RELATIVE,
         figsize: tuple[int, int] = (15, 8),
         non_interactive: bool = False,
+        figure_pool: typing.Optional[FigurePool] = None,
     ) -> None:
         """Initialize an instance of `PanelStack`.
 
         :param panel_format: Formatting applied across all panels in the stack. Defaults to `PanelFormat()`.
         :param time_type: The type of time assigned to spectrograms, defaults to `spectre_server.core.spectrograms.TimeType.RELATIVE`.
         :param figsize: The size of the `matplotlib` figure as (width, height). Defaults to (15, 8).
+        :param figure_pool: Where figures are reused from when saving, defaults to a pool shared by all panel stacks.
         """
         self._panel_format = panel_format
         self._time_type = time_type
         self._figsize = figsize
+        self._figure_pool = figure_pool or _FIGURE_POOL
 
         if non_interactive:
             # Use a non-interactive matplotlib backend, which can only write files.
@@ -49,6 +58,7 @@ class PanelStack:
 
         self._fig: typing.Optional[matplotlib.figure.Figure] = None
         self._axs: typing.Optional[np.ndarray] = None
+        self._figure_key: typing.Optional[typing.Hashable] = None
 
     def _sort_by_xaxis_type(self, panels: list[BasePanel]) -> list[BasePanel]:
         return list(sorted(panels, key=lambda panel: panel.xaxis_type.value))
@@ -192,6 +202,26 @@ class PanelStack:
             self.num_panels, 1, figsize=self._figsize, layout="constrained"
         )
 
+    def _get_figure_key(self) -> typing.Hashable:
+        """Identify the layout of the figure, so figures are only reused for stacks which look alike."""
+        return (
+            self.num_panels,
+            tuple(self._figsize),
+            tuple(panel.name.value for panel in self.panels),
+            dataclasses.astuple(self._panel_format),
+        )
+
+    def _acquire_figure_and_axes(self) -> None:
+        """Take the figure and axes for the panel stack from the figure pool.
+
+        The figure is drawn with the Agg backend, so it can only be saved to a file.
+        """
+        self._figure_key = self._get_figure_key()
+        self._fig, _ = self._figure_pool.acquire(
+            self._figure_key, self.num_panels, self._figsize
+        )
+        self._axs = np.array(self._fig.axes)
+
     def _assign_axes(self) -> None:
         """Assign each axes in the figure to some panel in the stack.
 
@@ -222,13 +252,19 @@ class PanelStack:
                     super_panel.share_axes(panel)
                     super_panel.draw()
 
-    def _make_figure(self) -> None:
-        """Make the panel stack figure."""
+    def _make_figure(self, reuse: bool = False) -> None:
+        """Make the panel stack figure.
+
+        :param reuse: If True, reuse a figure from the figure pool. Defaults to False.
+        """
         if self.num_panels < 1:
             raise ValueError(f"There must be at least one panel in the stack.")
 
         self._init_plot_style()
-        self._create_figure_and_axes()
+        if reuse:
+            self._acquire_figure_and_axes()
+        else:
+            self._create_figure_and_axes()
         self._assign_axes()
 
         last_panel_per_axis = {panel.xaxis_type: panel for panel in self.panels}
@@ -246,6 +282,14 @@ class PanelStack:
 
     def _close(self) -> None:
         """Prevent memory leaks once a figure has been created, and successfully visualised."""
+        if self._figure_key is not None:
+            # Pooled figures are reset as they're released, so there's nothing left to collect.
+            self._figure_pool.release(
+                self._figure_key, self._get_fig(), self.num_panels
+            )
+            self._figure_key = None
+            self._fig, self._axs = None, None
+            return
         self._get_fig().clear()
         plt.close(self._fig)
         # Garbage collection seems to be required to prevent the memory leak.
@@ -263,25 +307,18 @@ class PanelStack:
 
         :return: The file path of the newly created batch file containing the figure.
         """
-        self._make_figure()
-        first_panel = self._panels[0]
+        self._make_figure(reuse=True)
+        try:
+            first_panel = self._panels[0]
 
-        start_dt = typing.cast(
-            datetime.datetime,
-            first_panel.spectrogram.start_datetime.astype(datetime.datetime),
-        )
-        batch_name = (
-            f"{start_dt.strftime(spectre_server.core.config.TimeFormat.DATETIME)}_{tag}"
-        )
-        batch_file_path = os.path.join(
-            batches_dir_path
-            or spectre_server.core.config.paths.get_batches_dir_path(
-                start_dt.year, start_dt.month, start_dt.day
-            ),
-            f"{batch_name}.png",
-        )
-        # If the parent directory does not exist, create it.
-        os.makedirs(os.path.dirname(batch_file_path), exist_ok=True)
-        self._get_fig().savefig(batch_file_path)
-        self._close()
+            start_dt = typing.cast(
+                datetime.datetime,
+                first_panel.spectrogram.start_datetime.astype(datetime.datetime),
+            )
+            batch_file_path = get_plot_file_path(start_dt, tag, batches_dir_path)
+            # If the parent directory does not exist, create it.
+            os.makedirs(os.path.dirname(batch_file_path), exist_ok=True)
+            self._get_fig().savefig(batch_file_path)
+        finally:
+            self._close()
         return batch_file_path
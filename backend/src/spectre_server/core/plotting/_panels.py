@@ -2,17 +2,21 @@
 # This file is part of SPECTRE
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import math
 import typing
 import datetime
 
 import matplotlib.colors
 import matplotlib.cm
+import matplotlib.dates
+import matplotlib.image
 import numpy as np
 import numpy.typing as npt
 
 import spectre_server.core.spectrograms
 from ._base import BasePanel, BaseTimeSeriesPanel, XAxisType
 from ._panel_names import PanelName
+from ._decimate import Reducer, decimate, is_uniform, get_edges
 
 T = typing.TypeVar("T")
 
@@ -70,9 +74,9 @@ class FrequencyCutsPanel(BasePanel):
 
         self._dBb = dBb
         self._peak_normalise = peak_normalise
-        self._frequency_cuts: dict[
-            float | datetime.datetime, spectre_server.core.spectrograms.FrequencyCut
-        ] = {}
+        self._frequency_cuts: typing.Optional[
+            spectre_server.core.spectrograms.FrequencyCuts
+        ] = None
 
     @property
     def xaxis_type(self) -> typing.Literal[XAxisType.FREQUENCY]:
@@ -87,23 +91,19 @@ class FrequencyCutsPanel(BasePanel):
         """Annotate the x-axis assuming frequency in units of Hz."""
         self._get_ax().set_xlabel("Frequency [Hz]")
 
-    def get_frequency_cuts(
-        self,
-    ) -> dict[float | datetime.datetime, spectre_server.core.spectrograms.FrequencyCut]:
+    def get_frequency_cuts(self) -> spectre_server.core.spectrograms.FrequencyCuts:
         """
         Get the frequency cuts for the specified times.
 
-        Computes and caches the spectrum for each requested time. The results are
-        stored as a mapping from time to the corresponding `FrequencyCut`.
+        Computes and caches the spectrums for every requested time at once, as a single block
+        with one row per cut.
 
-        :return: A dictionary mapping each time to its corresponding frequency cut.
+        :return: The frequency cuts, in the order their times were specified.
         """
-        if not self._frequency_cuts:
-            for time in self._times:
-                frequency_cut = self._spectrogram.get_frequency_cut(
-                    time, dBb=self._dBb, peak_normalise=self._peak_normalise
-                )
-                self._frequency_cuts[frequency_cut.time] = frequency_cut
+        if self._frequency_cuts is None:
+            self._frequency_cuts = self._spectrogram.get_frequency_cuts(
+                self._times, dBb=self._dBb, peak_normalise=self._peak_normalise
+            )
         return self._frequency_cuts
 
     def get_cut_times(self) -> list[float | datetime.datetime]:
@@ -114,17 +114,15 @@ class FrequencyCutsPanel(BasePanel):
 
         :return: A list of times corresponding to the stored frequency cuts.
         """
-        frequency_cuts = self.get_frequency_cuts()
-        return list(frequency_cuts.keys())
+        return list(self.get_frequency_cuts().times)
 
     def draw(self) -> None:
         """Draw the frequency cuts onto the panel."""
         frequency_cuts = self.get_frequency_cuts()
-        for time, color in self.bind_to_colors():
-            frequency_cut = frequency_cuts[time]
+        for cut, (_, color) in zip(frequency_cuts.cuts, self.bind_to_colors()):
             self._get_ax().step(
-                self.frequencies,  # convert to MHz
-                frequency_cut.cut,
+                self.frequencies,
+                cut,
                 where="mid",
                 color=color,
             )
@@ -197,27 +195,27 @@ class TimeCutsPanel(BaseTimeSeriesPanel):
         self._dBb = dBb
         self._peak_normalise = peak_normalise
         self._background_subtract = background_subtract
-        self._time_cuts: dict[float, spectre_server.core.spectrograms.TimeCut] = {}
+        self._time_cuts: typing.Optional[spectre_server.core.spectrograms.TimeCuts] = (
+            None
+        )
 
-    def get_time_cuts(self) -> dict[float, spectre_server.core.spectrograms.TimeCut]:
+    def get_time_cuts(self) -> spectre_server.core.spectrograms.TimeCuts:
         """
         Get the time cuts for the specified frequencies.
 
-        Computes and caches the time series for each requested frequency. The results
-        are stored as a mapping from frequency to `TimeCut`.
+        Computes and caches the time series for every requested frequency at once, as a
+        single block with one row per cut.
 
-        :return: A dictionary mapping each frequency to its corresponding time cut.
+        :return: The time cuts, in the order their frequencies were specified.
         """
-        if not self._time_cuts:
-            for frequency in self._frequencies:
-                time_cut = self._spectrogram.get_time_cut(
-                    frequency,
-                    dBb=self._dBb,
-                    peak_normalise=self._peak_normalise,
-                    correct_background=self._background_subtract,
-                    return_time_type=self.get_time_type(),
-                )
-                self._time_cuts[time_cut.frequency] = time_cut
+        if self._time_cuts is None:
+            self._time_cuts = self._spectrogram.get_time_cuts(
+                self._frequencies,
+                dBb=self._dBb,
+                peak_normalise=self._peak_normalise,
+                correct_background=self._background_subtract,
+                return_time_type=self.get_time_type(),
+            )
         return self._time_cuts
 
     def get_frequencies(self) -> list[float]:
@@ -226,15 +224,13 @@ class TimeCutsPanel(BaseTimeSeriesPanel):
 
         :return: A list of frequencies corresponding to the stored time cuts.
         """
-        time_cuts = self.get_time_cuts()
-        return list(time_cuts.keys())
+        return [float(frequency) for frequency in self.get_time_cuts().frequencies]
 
     def draw(self) -> None:
         """Draw the time series for each spectral component onto the panel."""
         time_cuts = self.get_time_cuts()
-        for frequency, color in self.bind_to_colors():
-            time_cut = time_cuts[frequency]
-            self._get_ax().step(self.times, time_cut.cut, where="mid", color=color)
+        for cut, (_, color) in zip(time_cuts.cuts, self.bind_to_colors()):
+            self._get_ax().step(self.times, cut, where="mid", color=color)
 
     def annotate_yaxis(self) -> None:
         """
@@ -317,6 +313,7 @@ class SpectrogramPanel(BaseTimeSeriesPanel):
         dBb: bool = False,
         vmin: typing.Optional[float] = None,
         vmax: typing.Optional[float] = None,
+        reducer: Reducer = Reducer.MEAN,
     ) -> None:
         """Initialise an instance of `SpectrogramPanel`.
 
@@ -325,12 +322,92 @@ class SpectrogramPanel(BaseTimeSeriesPanel):
         :param dBb: If True, plots the spectrogram in decibels above the background. Defaults to False.
         :param vmin: Minimum value for the colormap. Only applies if `dBb` is True. Defaults to None.
         :param vmax: Maximum value for the colormap. Only applies if `dBb` is True. Defaults to None.
+        :param reducer: If the spectrogram has more spectrums or spectral components than there are pixels
+        in the panel, how to combine them into each pixel. Defaults to `Reducer.MEAN`.
         """
         super().__init__(PanelName.SPECTROGRAM, spectrogram)
         self._log_norm = log_norm
         self._dBb = dBb
         self._vmin = vmin
         self._vmax = vmax
+        self._reducer = reducer
+
+    def _get_num_pixels(self) -> tuple[int, int]:
+        """Get the width and height of the panel, in pixels."""
+        bbox = self._get_ax().get_window_extent()
+        return max(1, math.ceil(bbox.width)), max(1, math.ceil(bbox.height))
+
+    def _to_xaxis_units(self, times: npt.NDArray[np.float32]) -> npt.NDArray:
+        """Convert times relative to the start of the spectrogram, to the units of the xaxis."""
+        if self.get_time_type() == spectre_server.core.spectrograms.TimeType.RELATIVE:
+            return times
+        datetimes = self._spectrogram.start_datetime + (1e6 * times).astype(
+            "timedelta64[us]"
+        )
+        return matplotlib.dates.date2num(datetimes)
+
+    def _draw_dynamic_spectra(
+        self,
+        dynamic_spectra: npt.NDArray[np.float32],
+        **kwargs: typing.Any,
+    ) -> matplotlib.cm.ScalarMappable:
+        """Draw the dynamic spectra, at no more than the resolution of the panel.
+
+        If there are fewer spectrums and spectral components than pixels, they're drawn
+        as they are. Otherwise, they're first reduced to the resolution of the panel, then
+        drawn as an image, which is much faster for large spectrograms.
+
+        :param dynamic_spectra: The values to draw, with the same shape as the spectrogram.
+        :param kwargs: Keyword arguments for the colormap, such as `cmap`, `norm`, `vmin` and `vmax`.
+        :return: The drawn artist, which can be used to create a colorbar.
+        """
+        ax = self._get_ax()
+        num_pixels_x, num_pixels_y = self._get_num_pixels()
+        if (
+            self._spectrogram.num_times <= num_pixels_x
+            and self._spectrogram.num_frequencies <= num_pixels_y
+        ):
+            return ax.pcolormesh(
+                self.times, self._spectrogram.frequencies, dynamic_spectra, **kwargs
+            )
+
+        times, frequencies, dynamic_spectra = decimate(
+            self._spectrogram.times,
+            self._spectrogram.frequencies,
+            dynamic_spectra,
+            num_pixels_x,
+            num_pixels_y,
+            reducer=self._reducer,
+        )
+        x = self._to_xaxis_units(times)
+        if self.get_time_type() == spectre_server.core.spectrograms.TimeType.DATETIMES:
+            ax.xaxis_date()
+
+        x_edges, y_edges = get_edges(x), get_edges(frequencies)
+        if is_uniform(x) and is_uniform(frequencies):
+            return ax.imshow(
+                dynamic_spectra,
+                extent=(*x_edges, *y_edges),
+                origin="lower",
+                aspect="auto",
+                interpolation="nearest",
+                **kwargs,
+            )
+
+        image = matplotlib.image.NonUniformImage(
+            ax,
+            interpolation="nearest",
+            extent=(*x_edges, *y_edges),
+            cmap=kwargs.get("cmap"),
+            norm=kwargs.get("norm"),
+        )
+        image.set_data(x, frequencies, dynamic_spectra)
+        if kwargs.get("vmin") is not None or kwargs.get("vmax") is not None:
+            image.set_clim(kwargs.get("vmin"), kwargs.get("vmax"))
+        ax.add_image(image)
+        ax.set_xlim(*x_edges)
+        ax.set_ylim(*y_edges)
+        return image
 
     def _draw_dBb(self) -> None:
         """Plot the spectrogram in decibels above the background (dBb).
@@ -346,9 +423,7 @@ class SpectrogramPanel(BaseTimeSeriesPanel):
 
         ax = self._get_ax()
         # Plot the spectrogram
-        pcm = ax.pcolormesh(
-            self.times,
-            self._spectrogram.frequencies,
+        pcm = self._draw_dynamic_spectra(
             dynamic_spectra,
             vmin=vmin,
             vmax=vmax,
@@ -377,9 +452,7 @@ class SpectrogramPanel(BaseTimeSeriesPanel):
             norm = None
 
         # Plot the spectrogram
-        self._get_ax().pcolormesh(
-            self.times,
-            self._spectrogram.frequencies,
+        self._draw_dynamic_spectra(
             dynamic_spectra,
             cmap=self.get_panel_format().spectrogram_cmap,
             norm=norm,
@@ -0,0 +1,311 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Render a single spectrogram as a PNG image quickly, without creating a Matplotlib figure.
+
+The spectrogram is reduced to one value per pixel, mapped through a colormap lookup table,
+then framed with minimal annotation: a title, time and frequency ticks, and a colorbar.
+"""
+
+import os
+import math
+import typing
+import datetime
+
+import numpy as np
+import numpy.typing as npt
+import matplotlib
+from matplotlib import ft2font
+
+import spectre_server.core.config
+import spectre_server.core.spectrograms
+from ._format import PanelFormat
+from ._decimate import Reducer
+from ._canvas import RasterCanvas, RasterScale, get_frequency_band
+from ._raster import get_lut, apply_lut, write_png
+
+# The font bundled with Matplotlib, so no font search is needed.
+_FONT_PATH = os.path.join(matplotlib.get_data_path(), "fonts", "ttf", "DejaVuSans.ttf")
+
+# Matching the "dark_background" style used by `PanelStack`.
+_BACKGROUND_COLOUR = (0, 0, 0, 255)
+_FOREGROUND_COLOUR = (255, 255, 255, 255)
+
+# The default colormap bounds, in decibels above the background. These match `SpectrogramPanel`.
+_DEFAULT_DBB_VMIN = -1
+_DEFAULT_DBB_VMAX = 2
+
+# The spacing between ticks, in seconds.
+_TIME_STEPS = (1, 2, 5, 10, 15, 30, 60, 120, 300, 600, 900, 1800, 3600, 7200, 10800)
+_TICK_LENGTH = 6
+# The minimum spacing between tick labels, in pixels.
+_MIN_TICK_SPACING = 100
+
+
+class _Image:
+    def __init__(self, width: int, height: int, font_size: int) -> None:
+        """An RGBA image, with a few drawing primitives."""
+        self.pixels = np.empty((height, width, 4), dtype=np.uint8)
+        self.pixels[:] = _BACKGROUND_COLOUR
+        # Each image has its own font, since fonts are not safe to share between threads.
+        self._font = ft2font.FT2Font(_FONT_PATH)
+        self._font.set_size(font_size, 72)
+
+    def fill(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """Fill a rectangle with the foreground colour."""
+        self.pixels[max(y0, 0) : max(y1, 0), max(x0, 0) : max(x1, 0)] = (
+            _FOREGROUND_COLOUR
+        )
+
+    def paste(self, rgba: npt.NDArray[np.uint8], x: int, y: int) -> None:
+        """Copy an image, with its top left corner at the pixel (x, y)."""
+        height, width, _ = rgba.shape
+        self.pixels[y : y + height, x : x + width] = rgba
+
+    def draw_text(
+        self,
+        text: str,
+        x: int,
+        y: int,
+        ha: str = "left",
+        va: str = "top",
+        rotate: bool = False,
+    ) -> None:
+        """Draw text in the foreground colour, aligned to the pixel (x, y).
+
+        :param ha: The horizontal alignment, one of 'left', 'center' or 'right'.
+        :param va: The vertical alignment, one of 'top', 'center' or 'bottom'.
+        :param rotate: If True, rotate the text a quarter turn anticlockwise.
+        """
+        self._font.set_text(text, 0.0, flags=ft2font.LOAD_FORCE_AUTOHINT)
+        self._font.draw_glyphs_to_bitmap(antialiased=True)
+        alpha = np.asarray(self._font.get_image())
+        if rotate:
+            alpha = np.rot90(alpha)
+        height, width = alpha.shape
+        x -= {"left": 0, "center": width // 2, "right": width}[ha]
+        y -= {"top": 0, "center": height // 2, "bottom": height}[va]
+
+        # Clip the text to the image.
+        x0, y0 = max(x, 0), max(y, 0)
+        x1 = min(x + width, self.pixels.shape[1])
+        y1 = min(y + height, self.pixels.shape[0])
+        if x0 >= x1 or y0 >= y1:
+            return
+        weight = alpha[y0 - y : y1 - y, x0 - x : x1 - x, np.newaxis] / 255
+        region = self.pixels[y0:y1, x0:x1]
+        blended = weight * np.array(_FOREGROUND_COLOUR) + (1 - weight) * region
+        region[:] = np.round(blended).astype(np.uint8)
+
+
+def _get_time_ticks(
+    start_datetime: datetime.datetime, duration: float, max_num_ticks: int
+) -> tuple[list[float], str]:
+    """Get evenly spaced ticks at round times, as seconds after the start, and a format for their labels."""
+    step = next(
+        (s for s in _TIME_STEPS if duration / s <= max_num_ticks), _TIME_STEPS[-1]
+    )
+    start_of_day = datetime.datetime.combine(start_datetime.date(), datetime.time())
+    offset = (start_datetime - start_of_day).total_seconds()
+    first_tick = math.ceil(offset / step) * step - offset
+    ticks = list(np.arange(first_tick, duration, step))
+    return ticks, "%H:%M:%S" if step < 60 else "%H:%M"
+
+
+def _get_frequency_ticks(lower: float, upper: float, max_num_ticks: int) -> list[float]:
+    """Get evenly spaced ticks at round frequencies, in Hz."""
+    span = upper - lower
+    if span <= 0:
+        return [lower]
+    magnitude = 10 ** math.floor(math.log10(span / max(max_num_ticks, 1)))
+    step = next(
+        m * magnitude for m in (1, 2, 5, 10) if span / (m * magnitude) <= max_num_ticks
+    )
+    return list(np.arange(math.ceil(lower / step) * step, upper, step))
+
+
+def render_quicklook(
+    spectrogram: spectre_server.core.spectrograms.Spectrogram,
+    width: int = 1500,
+    height: int = 800,
+    dBb: bool = False,
+    vmin: typing.Optional[float] = None,
+    vmax: typing.Optional[float] = None,
+    reducer: Reducer = Reducer.MEAN,
+    title: typing.Optional[str] = None,
+    panel_format: PanelFormat = PanelFormat(),
+) -> npt.NDArray[np.uint8]:
+    """Render a spectrogram as an image, without creating a Matplotlib figure.
+
+    :param spectrogram: The spectrogram, with its start time set.
+    :param width: The width of the image, in pixels. Defaults to 1500.
+    :param height: The height of the image, in pixels. Defaults to 800.
+    :param dBb: If True, use units of decibels above the background. Otherwise, use decibels. Defaults to False.
+    :param vmin: The value mapped to the bottom of the colormap. Defaults to -1 in units of dBb, otherwise the
+    first percentile of the data.
+    :param vmax: The value mapped to the top of the colormap. Defaults to 2 in units of dBb, otherwise the
+    99th percentile of the data.
+    :param reducer: How values sharing a pixel are reduced, defaults to `Reducer.MEAN`.
+    :param title: Optionally, a title for the image, defaults to None.
+    :param panel_format: Formatting for the image, of which only the font size and colormap are used.
+    Defaults to `PanelFormat()`.
+    :return: The image, with shape (height, width, 4).
+    """
+    font_size = panel_format.small_size * 2 // 3
+    margin_left = 4 * font_size + 2 * _TICK_LENGTH
+    margin_right = 6 * font_size
+    margin_top = 2 * font_size if title else font_size
+    margin_bottom = 3 * font_size + _TICK_LENGTH
+    plot_width = width - margin_left - margin_right
+    plot_height = height - margin_top - margin_bottom
+    if plot_width < 1 or plot_height < 1:
+        raise ValueError(f"The image is too small, at {width}x{height} pixels")
+
+    # Reduce the spectrogram to one value per pixel.
+    start_datetime = typing.cast(
+        datetime.datetime, spectrogram.start_datetime.astype(datetime.datetime)
+    )
+    duration = float(spectrogram.times[-1]) + (
+        spectrogram.time_resolution if spectrogram.num_times > 1 else 1
+    )
+    lower_frequency, upper_frequency = get_frequency_band(spectrogram)
+    canvas = RasterCanvas(
+        start_datetime,
+        duration,
+        (lower_frequency, upper_frequency),
+        plot_width,
+        plot_height,
+        scale=RasterScale.DBB if dBb else RasterScale.DB,
+        reducer=reducer,
+    )
+    canvas.draw(spectrogram)
+    values = canvas.get_values()
+
+    if dBb:
+        vmin = _DEFAULT_DBB_VMIN if vmin is None else vmin
+        vmax = _DEFAULT_DBB_VMAX if vmax is None else vmax
+    else:
+        finite = values[np.isfinite(values)]
+        if vmin is None:
+            vmin = float(np.percentile(finite, 1)) if finite.size else 0.0
+        if vmax is None:
+            vmax = float(np.percentile(finite, 99)) if finite.size else vmin + 1
+        if vmax <= vmin:
+            vmax = vmin + 1
+
+    lut = get_lut(panel_format.spectrogram_cmap)
+    plot = apply_lut(values, lut, vmin, vmax)
+    plot[plot[..., 3] == 0] = _BACKGROUND_COLOUR
+
+    image = _Image(width, height, font_size)
+    image.paste(plot, margin_left, margin_top)
+    left, top = margin_left, margin_top
+    right, bottom = margin_left + plot_width, margin_top + plot_height
+    # Frame the plot.
+    image.fill(left - 1, top - 1, right + 1, top)
+    image.fill(left - 1, bottom, right + 1, bottom + 1)
+    image.fill(left - 1, top - 1, left, bottom + 1)
+    image.fill(right, top - 1, right + 1, bottom + 1)
+
+    if title:
+        image.draw_text(title, left + plot_width // 2, font_size // 2, ha="center")
+
+    # Annotate the time axis.
+    time_ticks, time_format = _get_time_ticks(
+        start_datetime, duration, max(plot_width // _MIN_TICK_SPACING, 1)
+    )
+    for tick in time_ticks:
+        x = left + int(round(tick / duration * plot_width))
+        image.fill(x, bottom, x + 1, bottom + _TICK_LENGTH)
+        label = start_datetime + datetime.timedelta(seconds=float(tick))
+        image.draw_text(
+            label.strftime(time_format), x, bottom + _TICK_LENGTH + 2, ha="center"
+        )
+    image.draw_text(
+        f"Time [UTC] from {start_datetime.strftime('%Y-%m-%d %H:%M:%S')}",
+        left + plot_width // 2,
+        height - font_size // 2,
+        ha="center",
+        va="bottom",
+    )
+
+    # Annotate the frequency axis.
+    frequency_ticks = _get_frequency_ticks(
+        lower_frequency, upper_frequency, max(plot_height // _MIN_TICK_SPACING, 1)
+    )
+    for tick in frequency_ticks:
+        fraction = (tick - lower_frequency) / (upper_frequency - lower_frequency)
+        y = bottom - int(round(fraction * plot_height))
+        image.fill(left - _TICK_LENGTH, y, left, y + 1)
+        image.draw_text(
+            f"{tick * 1e-6:g}", left - _TICK_LENGTH - 2, y, ha="right", va="center"
+        )
+    image.draw_text(
+        "Frequency [MHz]",
+        font_size // 4,
+        top + plot_height // 2,
+        va="center",
+        rotate=True,
+    )
+
+    # Add a colorbar, with the colours running from vmin at the bottom to vmax at the top.
+    bar_left = right + font_size
+    bar_width = font_size
+    gradient = lut[np.linspace(len(lut) - 1, 0, plot_height).astype(np.intp)]
+    image.paste(np.repeat(gradient[:, np.newaxis], bar_width, axis=1), bar_left, top)
+    label_x = bar_left + bar_width + 4
+    image.draw_text(f"{vmax:.3g}", label_x, top, va="top")
+    image.draw_text(f"{vmin:.3g}", label_x, bottom, va="bottom")
+    image.draw_text(
+        "dBb" if dBb else "dB", label_x, top + plot_height // 2, va="center"
+    )
+    return image.pixels
+
+
+def get_plot_file_path(
+    start_datetime: datetime.datetime,
+    tag: str,
+    batches_dir_path: typing.Optional[str] = None,
+) -> str:
+    """Get the path of the batch file storing a plot.
+
+    :param start_datetime: The start time of the plot.
+    :param tag: The tag of the batch file.
+    :param batches_dir_path: Optionally override the directory of the batch file, defaults to None.
+    :return: The file path of the batch file.
+    """
+    batch_name = f"{start_datetime.strftime(spectre_server.core.config.TimeFormat.DATETIME)}_{tag}"
+    return os.path.join(
+        batches_dir_path
+        or spectre_server.core.config.paths.get_batches_dir_path(
+            start_datetime.year,
+            start_datetime.month,
+            start_datetime.day,
+            start_datetime.hour,
+            start_datetime.minute,
+        ),
+        f"{batch_name}.png",
+    )
+
+
+def save_quicklook(
+    spectrogram: spectre_server.core.spectrograms.Spectrogram,
+    tag: str,
+    batches_dir_path: typing.Optional[str] = None,
+    **kwargs: typing.Any,
+) -> str:
+    """Render a spectrogram with `render_quicklook`, then save it as a batch file under the input tag.
+
+    :param spectrogram: The spectrogram, with its start time set.
+    :param tag: The tag of the batch file.
+    :param batches_dir_path: Optionally override the directory of the batch file, defaults to None.
+    :param kwargs: Keyword arguments for `render_quicklook`.
+    :return: The file path of the newly created batch file containing the image.
+    """
+    start_datetime = typing.cast(
+        datetime.datetime, spectrogram.start_datetime.astype(datetime.datetime)
+    )
+    batch_file_path = get_plot_file_path(start_datetime, tag, batches_dir_path)
+    write_png(batch_file_path, render_quicklook(spectrogram, **kwargs))
+    return batch_file_path
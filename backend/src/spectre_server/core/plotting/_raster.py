@@ -0,0 +1,113 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Map arrays to colours through a lookup table, and encode them as PNG images, without a figure."""
+
+import os
+import zlib
+import struct
+import functools
+
+import numpy as np
+import numpy.typing as npt
+import matplotlib.cm
+
+from ._render_cache import _write_atomically
+
+# The number of colours in each lookup table.
+_LUT_SIZE = 256
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Eight bits per channel, with red, green, blue and alpha channels.
+_PNG_BIT_DEPTH = 8
+_PNG_COLOUR_TYPE_RGBA = 6
+
+
+@functools.lru_cache(maxsize=None)
+def get_lut(cmap: str) -> npt.NDArray[np.uint8]:
+    """Get the lookup table for a Matplotlib colormap.
+
+    :param cmap: The name of the colormap.
+    :return: The RGBA colours of the colormap, sampled evenly, with shape (256, 4).
+    """
+    colormap = matplotlib.cm.get_cmap(cmap)
+    lut = colormap(np.linspace(0, 1, _LUT_SIZE), bytes=True)
+    lut.flags.writeable = False
+    return lut
+
+
+def apply_lut(
+    values: npt.NDArray,
+    lut: npt.NDArray[np.uint8],
+    vmin: float,
+    vmax: float,
+) -> npt.NDArray[np.uint8]:
+    """Map values to colours, scaling linearly between `vmin` and `vmax`.
+
+    Values outside the range take the colour at the nearest end of the lookup table.
+    Missing values are fully transparent.
+
+    :param values: The values to map.
+    :param lut: The lookup table, with shape (num_colours, 4).
+    :param vmin: The value mapped to the first colour.
+    :param vmax: The value mapped to the last colour.
+    :raises ValueError: If `vmin` is not less than `vmax`.
+    :return: The RGBA colour of each value, with an extra trailing axis of size 4.
+    """
+    if vmin >= vmax:
+        raise ValueError(f"Expected vmin to be less than vmax, got {vmin} and {vmax}")
+    is_missing = np.isnan(values)
+    scaled = (np.where(is_missing, vmin, values) - vmin) * (len(lut) / (vmax - vmin))
+    indices = np.clip(scaled, 0, len(lut) - 1).astype(np.intp)
+    rgba = lut[indices]
+    rgba[is_missing] = 0
+    return rgba
+
+
+def _make_png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    crc = zlib.crc32(data, zlib.crc32(chunk_type))
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", crc)
+
+
+def encode_png(rgba: npt.NDArray[np.uint8], compression_level: int = 3) -> bytes:
+    """Encode an image as a PNG.
+
+    :param rgba: The image, with shape (height, width, 4). The first row is the top of the image.
+    :param compression_level: The `zlib` compression level, from 0 to 9. Defaults to 3, which is
+    several times faster than the `zlib` default for only slightly larger files.
+    :return: The contents of the PNG file.
+    """
+    height, width, num_channels = rgba.shape
+    if num_channels != 4:
+        raise ValueError(f"Expected RGBA pixels, got {num_channels} channels")
+    # Prefix each row with the filter type, which is zero for no filtering.
+    rows = np.zeros((height, 1 + 4 * width), dtype=np.uint8)
+    rows[:, 1:] = rgba.reshape(height, 4 * width)
+    header = struct.pack(
+        ">IIBBBBB", width, height, _PNG_BIT_DEPTH, _PNG_COLOUR_TYPE_RGBA, 0, 0, 0
+    )
+    return b"".join(
+        [
+            _PNG_SIGNATURE,
+            _make_png_chunk(b"IHDR", header),
+            _make_png_chunk(b"IDAT", zlib.compress(rows.tobytes(), compression_level)),
+            _make_png_chunk(b"IEND", b""),
+        ]
+    )
+
+
+def write_png(file_path: str, rgba: npt.NDArray[np.uint8]) -> None:
+    """Encode an image as a PNG, then write it to a file atomically.
+
+    :param file_path: The path of the PNG file.
+    :param rgba: The image, with shape (height, width, 4). The first row is the top of the image.
+    """
+    data = encode_png(rgba)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+    def write(temp_file_path: str) -> None:
+        with open(temp_file_path, "wb") as f:
+            f.write(data)
+
+    _write_atomically(file_path, write)
@@ -0,0 +1,212 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Cache rendered plots on disk, keyed by what went into them.
+
+Each entry is a copy of the rendered file, along with a small JSON record of where the
+rendered file was saved. Entries are shared between processes, so every file is written
+atomically, and locks are taken with `fcntl.flock`.
+"""
+
+import os
+import json
+import fcntl
+import shutil
+import typing
+import hashlib
+import logging
+import contextlib
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bump this whenever the way plots are rendered changes, so stale entries are never hit.
+_RENDER_CACHE_VERSION = 1
+
+# Renders with the same key are serialised by a lock, shared by all keys in the same stripe.
+_NUM_LOCK_STRIPES = 256
+
+_ENTRY_EXTENSION = ".png"
+_RECORD_EXTENSION = ".json"
+
+
+def get_file_stamp(file_path: str) -> tuple[str, int, int]:
+    """Identify the current version of a file, by its path, modification time and size."""
+    stat = os.stat(file_path)
+    return file_path, stat.st_mtime_ns, stat.st_size
+
+
+def _write_atomically(file_path: str, write: typing.Callable[[str], object]) -> None:
+    """Write a file under a temporary name, then rename it, so readers never see a partial file."""
+    temp_file_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        write(temp_file_path)
+        os.replace(temp_file_path, file_path)
+    finally:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+
+
+def _write_json(file_path: str, content: dict[str, typing.Any]) -> None:
+    def write(temp_file_path: str) -> None:
+        with open(temp_file_path, "w") as f:
+            json.dump(content, f)
+
+    _write_atomically(file_path, write)
+
+
+class RenderCache:
+    def __init__(self, dir_path: str, max_bytes: int) -> None:
+        """A cache of rendered plots on disk, evicting the least recently used first.
+
+        :param dir_path: The directory storing the cache.
+        :param max_bytes: The maximum disk space taken up by the cached plots, in bytes. If zero,
+        nothing is cached.
+        """
+        self._dir_path = dir_path
+        self._max_bytes = max_bytes
+
+    @property
+    def is_enabled(self) -> bool:
+        """Whether anything is cached."""
+        return self._max_bytes > 0
+
+    @staticmethod
+    def make_key(
+        parameters: dict[str, typing.Any],
+        file_stamps: typing.Iterable[tuple[str, int, int]],
+    ) -> str:
+        """Make a key identifying a plot, from everything which went into it.
+
+        :param parameters: The parameters used to render the plot. Must be JSON serialisable.
+        :param file_stamps: The path, modification time and size of every file read to render the plot.
+        :return: A hex digest, which changes if any of the parameters or files change.
+        """
+        content = json.dumps(
+            {
+                "version": _RENDER_CACHE_VERSION,
+                "parameters": parameters,
+                "files": sorted(file_stamps),
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self._dir_path, f"{key}{_ENTRY_EXTENSION}")
+
+    def _get_record_path(self, key: str) -> str:
+        return os.path.join(self._dir_path, f"{key}{_RECORD_EXTENSION}")
+
+    @contextlib.contextmanager
+    def _flock(self, name: str) -> typing.Iterator[None]:
+        """Hold an exclusive lock, shared between processes."""
+        locks_dir_path = os.path.join(self._dir_path, "locks")
+        os.makedirs(locks_dir_path, exist_ok=True)
+        with open(os.path.join(locks_dir_path, f"{name}.lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @contextlib.contextmanager
+    def lock(self, key: str) -> typing.Iterator[None]:
+        """Stop other processes rendering the same plot at the same time.
+
+        Hold this lock while checking for, then rendering and storing, a plot. Concurrent
+        identical requests then render the plot once, and the rest hit the cache.
+        """
+        if not self.is_enabled:
+            yield
+            return
+        stripe = int(key[:8], 16) % _NUM_LOCK_STRIPES
+        with self._flock(f"{stripe:02x}"):
+            yield
+
+    def restore(self, key: str) -> typing.Optional[str]:
+        """Put a cached plot back where it was originally rendered.
+
+        :param key: The key of the plot.
+        :return: The file path of the restored plot, or None if it isn't cached.
+        """
+        if not self.is_enabled:
+            return None
+        try:
+            with open(self._get_record_path(key), "r") as f:
+                record = json.load(f)
+            entry_path = self._get_entry_path(key)
+            # Mark the entry as recently used.
+            os.utime(entry_path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        file_path = record["file_path"]
+        try:
+            is_unchanged = list(get_file_stamp(file_path)[1:]) == record["stamp"]
+        except FileNotFoundError:
+            is_unchanged = False
+        if not is_unchanged:
+            # The rendered file was deleted, or overwritten by a different plot.
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            try:
+                _write_atomically(
+                    file_path, lambda temp: shutil.copyfile(entry_path, temp)
+                )
+            except FileNotFoundError:
+                # The plot was evicted since we last looked.
+                return None
+            record["stamp"] = list(get_file_stamp(file_path)[1:])
+            _write_json(self._get_record_path(key), record)
+        return file_path
+
+    def store(self, key: str, file_path: str) -> None:
+        """Cache a rendered plot, then evict the least recently used plots if the cache is too large.
+
+        :param key: The key of the plot.
+        :param file_path: Where the plot was rendered.
+        """
+        if not self.is_enabled:
+            return
+        os.makedirs(self._dir_path, exist_ok=True)
+        _write_atomically(
+            self._get_entry_path(key), lambda temp: shutil.copyfile(file_path, temp)
+        )
+        _write_json(
+            self._get_record_path(key),
+            {"file_path": file_path, "stamp": list(get_file_stamp(file_path)[1:])},
+        )
+        self.evict()
+
+    def evict(self) -> list[str]:
+        """Delete the least recently used plots, until the cache fits in its maximum size.
+
+        :return: The keys of the deleted plots.
+        """
+        with self._flock("evict"):
+            entries = []
+            with os.scandir(self._dir_path) as it:
+                for entry in it:
+                    if not entry.name.endswith(_ENTRY_EXTENSION):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.name))
+
+            num_bytes = sum(size for _, size, _ in entries)
+            evicted_keys = []
+            for _, size, name in sorted(entries):
+                if num_bytes <= self._max_bytes:
+                    break
+                key = name[: -len(_ENTRY_EXTENSION)]
+                for path in (self._get_record_path(key), self._get_entry_path(key)):
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(path)
+                num_bytes -= size
+                evicted_keys.append(key)
+
+        if evicted_keys:
+            _LOGGER.info(f"Evicted {len(evicted_keys)} plots from the render cache")
+        return evicted_keys
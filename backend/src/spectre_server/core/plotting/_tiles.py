@@ -0,0 +1,191 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Render spectrogram data onto fixed-size tiles, for browsing with a map-style viewer.
+
+Tiles are addressed by their zoom level `z`, and their column `x` and row `y`. At zoom
+level zero, each tile spans one day, and the whole frequency band. At each zoom level
+after that, tiles span half as much time, and half as much of the frequency band.
+
+Tile columns are counted from the Unix epoch, so the tiles at each zoom level run
+continuously across days. Tile rows are counted from the top of the frequency band.
+"""
+
+import os
+import json
+import typing
+import datetime
+import dataclasses
+
+import numpy as np
+import numpy.typing as npt
+
+from ._decimate import Reducer
+from ._canvas import RasterCanvas, RasterScale
+from ._render_cache import _write_atomically
+
+# The width and height of each tile, in pixels.
+TILE_SIZE = 256
+
+# The deepest zoom level, where each pixel spans a few milliseconds.
+MAX_ZOOM = 17
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_SECONDS_PER_DAY = 86400
+
+
+@dataclasses.dataclass(frozen=True)
+class Tile:
+    """The address of a tile.
+
+    :ivar z: The zoom level.
+    :ivar x: The tile column, counted from the Unix epoch.
+    :ivar y: The tile row, counted from the top of the frequency band.
+    """
+
+    z: int
+    x: int
+    y: int
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.z <= MAX_ZOOM:
+            raise ValueError(
+                f"Expected a zoom level between 0 and {MAX_ZOOM}, got {self.z}"
+            )
+        if self.x < 0:
+            raise ValueError(f"Expected a non-negative tile column, got {self.x}")
+        if not 0 <= self.y < 2**self.z:
+            raise ValueError(
+                f"Expected a tile row between 0 and {2**self.z - 1} at zoom level {self.z}, got {self.y}"
+            )
+
+    @property
+    def duration(self) -> float:
+        """The time spanned by the tile, in seconds."""
+        return _SECONDS_PER_DAY / 2**self.z
+
+    @property
+    def start_datetime(self) -> datetime.datetime:
+        """The time at the left edge of the tile."""
+        return _EPOCH + datetime.timedelta(seconds=self.x * self.duration)
+
+    @property
+    def end_datetime(self) -> datetime.datetime:
+        """The time at the right edge of the tile."""
+        return _EPOCH + datetime.timedelta(seconds=(self.x + 1) * self.duration)
+
+    def get_column(self, dt: datetime.datetime) -> int:
+        """Get the column of pixels containing a time, clipped to the tile."""
+        seconds = (dt - self.start_datetime).total_seconds()
+        column = int(np.floor(seconds * TILE_SIZE / self.duration))
+        return min(max(column, 0), TILE_SIZE)
+
+    def get_column_datetime(self, column: int) -> datetime.datetime:
+        """Get the time at the left edge of a column of pixels."""
+        return self.start_datetime + datetime.timedelta(
+            seconds=column * self.duration / TILE_SIZE
+        )
+
+    def get_frequency_range(
+        self, lower_frequency: float, upper_frequency: float
+    ) -> tuple[float, float]:
+        """Get the part of a frequency band spanned by the tile.
+
+        :param lower_frequency: The bottom of the band, in Hz.
+        :param upper_frequency: The top of the band, in Hz.
+        :return: The bottom and top of the tile, in Hz.
+        """
+        step = (upper_frequency - lower_frequency) / 2**self.z
+        upper = upper_frequency - self.y * step
+        return upper - step, upper
+
+
+def make_empty_tile() -> npt.NDArray[np.float32]:
+    """Make the pixel values of a tile with no data."""
+    return np.full((TILE_SIZE, TILE_SIZE), np.nan, dtype=np.float32)
+
+
+class TileCanvas(RasterCanvas):
+    def __init__(
+        self,
+        tile: Tile,
+        frequency_band: tuple[float, float],
+        scale: RasterScale = RasterScale.DBB,
+        reducer: Reducer = Reducer.MEAN,
+        start_column: int = 0,
+    ) -> None:
+        """Draw spectrograms onto a tile, one at a time.
+
+        :param tile: The tile to draw onto.
+        :param frequency_band: The bottom and top of the frequency band spanned by every tile, in Hz.
+        :param scale: How the spectrogram data is scaled, defaults to `RasterScale.DBB`.
+        :param reducer: How values sharing a pixel are reduced, defaults to `Reducer.MEAN`.
+        :param start_column: Only draw columns of pixels from this one onwards. Defaults to 0.
+        """
+        super().__init__(
+            tile.start_datetime,
+            tile.duration,
+            tile.get_frequency_range(*frequency_band),
+            TILE_SIZE,
+            TILE_SIZE,
+            scale=scale,
+            reducer=reducer,
+            start_column=start_column,
+        )
+        self._tile = tile
+        self._frequency_band = frequency_band
+
+    @property
+    def tile(self) -> Tile:
+        """The tile being drawn onto."""
+        return self._tile
+
+    @property
+    def frequency_band(self) -> tuple[float, float]:
+        """The bottom and top of the frequency band spanned by every tile, in Hz."""
+        return self._frequency_band
+
+
+@dataclasses.dataclass
+class TileState:
+    """The pixel values of a rendered tile, and the files they were rendered from.
+
+    :ivar values: The value of each pixel, where the first row is the top of the tile.
+    :ivar frequency_band: The bottom and top of the frequency band spanned by every tile, in Hz,
+    or None if the tile has no data.
+    :ivar file_stamps: The path, modification time and size of each file drawn onto the tile, in order of time.
+    """
+
+    values: npt.NDArray[np.float32]
+    frequency_band: typing.Optional[tuple[float, float]]
+    file_stamps: list[tuple[str, int, int]]
+
+    @classmethod
+    def load(cls, file_path: str) -> typing.Optional["TileState"]:
+        """Load a tile state, or return None if it doesn't exist or can't be read."""
+        try:
+            with np.load(file_path) as f:
+                values = f["values"]
+                metadata = json.loads(str(f["metadata"]))
+        except (OSError, KeyError, ValueError):
+            return None
+        frequency_band = metadata["frequency_band"]
+        return cls(
+            values,
+            tuple(frequency_band) if frequency_band is not None else None,
+            [tuple(stamp) for stamp in metadata["file_stamps"]],
+        )
+
+    def save(self, file_path: str) -> None:
+        """Save the tile state, replacing any existing state atomically."""
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        metadata = json.dumps(
+            {"frequency_band": self.frequency_band, "file_stamps": self.file_stamps}
+        )
+
+        def write(temp_file_path: str) -> None:
+            with open(temp_file_path, "wb") as f:
+                np.savez_compressed(f, values=self.values, metadata=np.array(metadata))
+
+        _write_atomically(file_path, write)
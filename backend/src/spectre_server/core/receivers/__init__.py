@@ -10,6 +10,8 @@ from ._config import (
     Config,
     read_config,
     write_config,
+    delete_config,
+    invalidate_config,
     get_config_file_path,
     parse_config_file_name,
 )
@@ -40,6 +42,8 @@ __all__ = [
     "Config",
     "read_config",
     "write_config",
+    "delete_config",
+    "invalidate_config",
     "Base",
     "Custom",
     "SignalGenerator",
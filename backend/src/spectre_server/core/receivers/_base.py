@@ -264,24 +264,31 @@ class Base:
         parameters: dict[str, typing.Any],
         skip_validation: bool = False,
         batches_dir_path: typing.Optional[str] = None,
+        quicklook_renderer: typing.Optional[
+            spectre_server.core.events.QuicklookRenderer
+        ] = None,
     ) -> None:
         """Activate post processing.
 
         :param config: The config used to configure post processing.
         :param skip_validation: If True, skip validating the parameters.
         :param batches_dir_path: Optionally override the directory which stores the runtime data, defaults to None
+        :param quicklook_renderer: If quicklooks are enabled, where each spectrogram is sent to be rendered
+        as it is saved. Defaults to None.
         """
 
         batches_dir_path = (
             batches_dir_path or spectre_server.core.config.paths.get_batches_dir_path()
         )
         observer = watchdog.observers.Observer()
+        event_handler = self.event_handler_cls(
+            tag,
+            self.model_validate(parameters, skip=skip_validation),
+            self.batch_cls,
+            quicklook_renderer=quicklook_renderer,
+        )
         observer.schedule(
-            self.event_handler_cls(
-                tag,
-                self.model_validate(parameters, skip=skip_validation),
-                self.batch_cls,
-            ),
+            event_handler,
             batches_dir_path,
             recursive=True,
             event_filter=[watchdog.events.FileCreatedEvent],
@@ -299,7 +306,11 @@ class Base:
                 )
             )
             observer.stop()
+            observer.join()
             _LOGGER.warning(("Post processing has been successfully stopped"))
+        finally:
+            # Don't lose any spectrograms which are still being written to the file system.
+            event_handler.close()
 
     def add_mode(
         self,
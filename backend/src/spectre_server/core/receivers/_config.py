@@ -4,8 +4,10 @@
 
 import dataclasses
 import os
+import copy
 import typing
 import json
+import threading
 
 import spectre_server.core.io
 import spectre_server.core.config
@@ -92,22 +94,51 @@ def get_config_file_path(
     return os.path.join(configs_dir_path, f"{tag}.json")
 
 
+# The parsed contents of each config read so far, by file path, along with the modification time
+# and size of the file when it was read.
+_config_cache: dict[str, tuple[tuple[int, int], dict[str, typing.Any]]] = {}
+_config_cache_lock = threading.Lock()
+
+
+def invalidate_config(tag: str, configs_dir_path: typing.Optional[str] = None) -> None:
+    """Forget the cached contents of a config, so it's read from the filesystem next time.
+
+    :param tag: The config tag.
+    :param configs_dir_path: Optionally override the directory containing the configs, defaults to None
+    """
+    config_file_path = get_config_file_path(tag, configs_dir_path)
+    with _config_cache_lock:
+        _config_cache.pop(config_file_path, None)
+
+
 def read_config(tag: str, configs_dir_path: typing.Optional[str] = None) -> Config:
     """Read any config data from the filesystem for any receiver, without validation.
 
+    The parsed contents are cached until the file is modified.
+
     :param tag: The config tag.
     :param configs_dir_path: Optionally override the directory containing the configs, defaults to None
     :return: A container storing the config data.
     """
     config_file_path = get_config_file_path(tag, configs_dir_path)
-    if not os.path.exists(config_file_path):
+    try:
+        stat = os.stat(config_file_path)
+    except FileNotFoundError:
         raise FileNotFoundError(f"A config with tag '{tag}' does not exist.")
-    return Config(
-        tag,
-        spectre_server.core.io.read_file(
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _config_cache_lock:
+        cached = _config_cache.get(config_file_path)
+    if cached is not None and cached[0] == stamp:
+        content = cached[1]
+    else:
+        content = spectre_server.core.io.read_file(
             config_file_path, spectre_server.core.io.FileFormat.JSON
-        ),
-    )
+        )
+        with _config_cache_lock:
+            _config_cache[config_file_path] = (stamp, content)
+    # Copy the contents, so callers can't modify the cache.
+    return Config(tag, copy.deepcopy(content))
 
 
 def parse_config_file_name(file_name: str) -> tuple[str, str]:
@@ -142,3 +173,17 @@ def write_config(
     file_path = os.path.join(configs_dir_path, f"{tag}.json")
     with open(file_path, "w") as f:
         json.dump(content, f, indent=4)
+    invalidate_config(tag, configs_dir_path)
+
+
+def delete_config(tag: str, configs_dir_path: typing.Optional[str] = None) -> None:
+    """Delete a config from the filesystem.
+
+    :param tag: The config tag.
+    :param configs_dir_path: Optionally override the directory containing the configs, defaults to None
+    :raises FileNotFoundError: If the config does not exist.
+    """
+    try:
+        os.remove(get_config_file_path(tag, configs_dir_path))
+    finally:
+        invalidate_config(tag, configs_dir_path)
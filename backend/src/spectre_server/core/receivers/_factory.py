@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import typing
+import functools
 
 import spectre_server.core.exceptions
 import spectre_server.core.batches
@@ -84,6 +85,14 @@ def get_receiver(receiver_name: str, mode: typing.Optional[str] = None) -> Base:
     return receiver_cls(receiver_name, mode=mode)
 
 
+@functools.lru_cache(maxsize=None)
+def _get_batch_cls(
+    receiver_name: str, receiver_mode: str
+) -> typing.Type[spectre_server.core.batches.Base]:
+    # The batch class depends only on the receiver and its mode, so the receiver is only created once.
+    return get_receiver(receiver_name, receiver_mode).batch_cls
+
+
 def get_batch_cls(
     tag: str, configs_dir_path: typing.Optional[str] = None
 ) -> typing.Type[spectre_server.core.batches.Base]:
@@ -93,5 +102,4 @@ def get_batch_cls(
     :param tag: The batch file tag.
     """
     config = read_config(tag, configs_dir_path)
-    receiver = get_receiver(config.receiver_name, config.receiver_mode)
-    return receiver.batch_cls
+    return _get_batch_cls(config.receiver_name, config.receiver_mode)
@@ -6,6 +6,7 @@ import typing
 
 import spectre_server.core.jobs
 import spectre_server.core.logs
+import spectre_server.core.events
 
 from ._factory import get_receiver
 from ._config import Config
@@ -29,12 +30,37 @@ def _make_post_processing_worker(
     config: Config,
     skip_validation: bool,
     spectre_data_dir_path: typing.Optional[str],
+    quicklook_renderer: typing.Optional[
+        spectre_server.core.events.QuicklookRenderer
+    ] = None,
 ) -> spectre_server.core.jobs.Worker:
     receiver = get_receiver(config.receiver_name, config.receiver_mode)
     return spectre_server.core.jobs.make_worker(
         "post_processing",
         receiver.activate_post_processing,
-        (config.tag, config.parameters, skip_validation),
+        (config.tag, config.parameters, skip_validation, None, quicklook_renderer),
+        spectre_data_dir_path=spectre_data_dir_path,
+    )
+
+
+def _make_quicklook_renderer(
+    config: Config, skip_validation: bool
+) -> typing.Optional[spectre_server.core.events.QuicklookRenderer]:
+    """Make a renderer for the quicklooks of a config, if they're enabled."""
+    receiver = get_receiver(config.receiver_name, config.receiver_mode)
+    model = receiver.model_validate(config.parameters, skip=skip_validation)
+    if not getattr(model, "quicklook", False):
+        return None
+    return spectre_server.core.events.QuicklookRenderer()
+
+
+def _make_quicklook_worker(
+    quicklook_renderer: spectre_server.core.events.QuicklookRenderer,
+    spectre_data_dir_path: typing.Optional[str],
+) -> spectre_server.core.jobs.Worker:
+    return spectre_server.core.jobs.make_worker(
+        "quicklook",
+        quicklook_renderer.run,
         spectre_data_dir_path=spectre_data_dir_path,
     )
 
@@ -47,6 +73,9 @@ def record_signal(
     max_restarts: int = 5,
     skip_validation: bool = False,
     spectre_data_dir_path: typing.Optional[str] = None,
+    on_poll: typing.Optional[
+        typing.Callable[[spectre_server.core.jobs.Job], None]
+    ] = None,
 ) -> int:
     """Capture data from SDRs in real time.
 
@@ -56,6 +85,7 @@ def record_signal(
     :param max_restarts: Maximum number of times the recording can be restarted before giving up.
     Only applies when force_restart is True. Defaults to 5.
     :param skip_validation: If True, skip validating the config parameters against the model.
+    :param on_poll: If specified, called with the job each time the workers are checked.
     :return: 0 exit code on success.
     """
     flowgraph_workers = [
@@ -63,7 +93,7 @@ def record_signal(
         for config in configs
     ]
     spectre_server.core.jobs.start_job(
-        flowgraph_workers, duration, force_restart, max_restarts
+        flowgraph_workers, duration, force_restart, max_restarts, on_poll
     )
 
     return 0
@@ -77,6 +107,9 @@ def record_spectrograms(
     max_restarts: int = 5,
     skip_validation: bool = False,
     spectre_data_dir_path: typing.Optional[str] = None,
+    on_poll: typing.Optional[
+        typing.Callable[[spectre_server.core.jobs.Job], None]
+    ] = None,
 ) -> int:
     """Capture data from SDRs and post-process it into spectrograms in real time.
 
@@ -86,21 +119,34 @@ def record_spectrograms(
     :param max_restarts: Maximum number of times the recording can be restarted before giving up.
     Only applies when force_restart is True. Defaults to 5.
     :param skip_validation: If True, skip validating the config parameters against the model.
+    :param on_poll: If specified, called with the job each time the workers are checked.
     :return: 0 exit code on success.
     """
     flowgraph_workers = [
         _make_flowgraph_worker(config, skip_validation, spectre_data_dir_path)
         for config in configs
     ]
+    # Quicklooks are rendered in their own process, so they never hold up the post processing.
+    quicklook_renderers = [
+        _make_quicklook_renderer(config, skip_validation) for config in configs
+    ]
     post_processing_workers = [
-        _make_post_processing_worker(config, skip_validation, spectre_data_dir_path)
-        for config in configs
+        _make_post_processing_worker(
+            config, skip_validation, spectre_data_dir_path, quicklook_renderer
+        )
+        for config, quicklook_renderer in zip(configs, quicklook_renderers)
+    ]
+    quicklook_workers = [
+        _make_quicklook_worker(quicklook_renderer, spectre_data_dir_path)
+        for quicklook_renderer in quicklook_renderers
+        if quicklook_renderer is not None
     ]
     spectre_server.core.jobs.start_job(
-        post_processing_workers + flowgraph_workers,
+        quicklook_workers + post_processing_workers + flowgraph_workers,
         duration=duration,
         force_restart=force_restart,
         max_restarts=max_restarts,
+        on_poll=on_poll,
     )
 
     return 0
@@ -4,7 +4,15 @@
 
 """Create and transform spectrogram data."""
 
-from ._spectrogram import Spectrogram, FrequencyCut, TimeCut, SpectrumUnit, TimeType
+from ._spectrogram import (
+    Spectrogram,
+    FrequencyCut,
+    FrequencyCuts,
+    TimeCut,
+    TimeCuts,
+    SpectrumUnit,
+    TimeType,
+)
 from ._transform import (
     frequency_chop,
     time_chop,
@@ -12,11 +20,27 @@ from ._transform import (
     time_average,
     join_spectrograms,
 )
+from ._lazy import (
+    LazySpectrogram,
+    SpectrogramAxes,
+    SpectrogramReader,
+    SpectrogramSource,
+)
+from ._fits import (
+    FitsContents,
+    FitsCompression,
+    read_fits,
+    read_fits_axes,
+    write_fits,
+    write_fits_with_astropy,
+)
 
 __all__ = [
     "Spectrogram",
     "FrequencyCut",
+    "FrequencyCuts",
     "TimeCut",
+    "TimeCuts",
     "SpectrumUnit",
     "frequency_chop",
     "time_chop",
@@ -24,4 +48,14 @@ __all__ = [
     "time_average",
     "join_spectrograms",
     "TimeType",
+    "LazySpectrogram",
+    "SpectrogramAxes",
+    "SpectrogramReader",
+    "SpectrogramSource",
+    "FitsContents",
+    "FitsCompression",
+    "read_fits",
+    "read_fits_axes",
+    "write_fits",
+    "write_fits_with_astropy",
 ]
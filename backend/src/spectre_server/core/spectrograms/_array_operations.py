@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import typing
+import warnings
 
 import numpy as np
 import numpy.typing as npt
@@ -90,14 +91,67 @@ def find_closest_index(
     return int(np.argmin(np.abs(array - target_value)))
 
 
-def normalise_peak_intensity(array: npt.NDArray[np.float32]) -> npt.NDArray[np.float32]:
+def find_closest_indices(
+    target_values: npt.NDArray[T],
+    array: npt.NDArray[T],
+    enforce_strict_bounds: bool = False,
+) -> npt.NDArray[np.intp]:
+    """
+    Finds the index of the closest value to each of several targets in a given array, with optional bounds enforcement.
+
+    Gives the same indices as calling `find_closest_index` for each target in turn, but the bounds are only
+    checked once. If the array is sorted in ascending order, every target is found with a single binary search.
+
+    :param target_values: The values to find the closest matches for.
+    :param array: The array to search within.
+    :param enforce_strict_bounds: If True, raises an error if any target value is outside the array bounds. Defaults to False.
+    :return: The index of the closest value in the array, for each target value.
+    :raises ValueError: If `enforce_strict_bounds` is True and any target value is outside the array bounds.
+    """
+    if enforce_strict_bounds and len(target_values):
+        max_value, min_value = np.nanmax(array), np.nanmin(array)
+        max_target_value, min_target_value = np.max(target_values), np.min(
+            target_values
+        )
+        if max_target_value > max_value:
+            raise ValueError(
+                f"Target value {max_target_value} exceeds max array value {max_value}"
+            )
+        if min_target_value < min_value:
+            raise ValueError(
+                f"Target value {min_target_value} is less than min array value {min_value}"
+            )
+
+    if not np.all(array[1:] >= array[:-1]):
+        # Fall back to a brute force search, when the array isn't sorted.
+        return np.argmin(
+            np.abs(array[np.newaxis, :] - target_values[:, np.newaxis]), axis=-1
+        )
+
+    # Compare each target with its neighbours on either side, preferring the lower on a tie.
+    upper = np.clip(np.searchsorted(array, target_values), 1, len(array) - 1)
+    lower = upper - 1
+    closest = np.where(
+        np.abs(target_values - array[lower]) <= np.abs(array[upper] - target_values),
+        lower,
+        upper,
+    )
+    # On repeated values, take the first occurrence.
+    return np.searchsorted(array, array[closest])
+
+
+def normalise_peak_intensity(
+    array: npt.NDArray[np.float32], axis: typing.Optional[int] = None
+) -> npt.NDArray[np.float32]:
     """
     Normalises an array by its peak intensity.
 
     :param array: Input array to normalise.
+    :param axis: If specified, normalise each slice along this axis by its own peak intensity.
+    Defaults to None, normalising the whole array by its peak intensity.
     :return: Array normalised such that its maximum value is 1. NaN values are ignored.
     """
-    return array / np.nanmax(array)
+    return array / np.nanmax(array, axis=axis, keepdims=True)
 
 
 def compute_resolution(array: npt.NDArray[np.float32]) -> float:
@@ -143,15 +197,82 @@ def subtract_background(
     """
     Subtracts the mean of a specified background range from all elements in an array.
 
+    If the array has more than one dimension, each slice along the last axis has its own
+    background mean subtracted.
+
     :param array: Input array from which the background mean will be subtracted.
     :param start_index: Start index of the background range (inclusive).
     :param end_index: End index of the background range (inclusive).
     :return: Array with the background mean subtracted.
     """
-    array -= np.nanmean(array[start_index : end_index + 1])
+    array -= np.nanmean(array[..., start_index : end_index + 1], axis=-1, keepdims=True)
     return array
 
 
+def compute_rolling_background(
+    dynamic_spectra: npt.NDArray[np.float32],
+    times: npt.NDArray[np.float32],
+    window: float,
+    quantile: float = 0.5,
+) -> npt.NDArray[np.float32]:
+    """
+    Computes a background which drifts in time, as a running quantile of each spectral component.
+
+    The running quantile is approximated in linear time. The spectrums are split into consecutive blocks
+    spanning `window` seconds, and the quantile of each spectral component is found in each block. The
+    background is then linearly interpolated between the centres of neighbouring blocks, and held constant
+    before the centre of the first block and after the centre of the last.
+
+    :param dynamic_spectra: A 2D array of spectrogram data, with one row per spectral component.
+    :param times: The elapsed time of each spectrum, in seconds, in ascending order.
+    :param window: The time spanned by each block, in seconds.
+    :param quantile: The quantile taken in each block, from 0 to 1. Defaults to 0.5, for the median.
+    :return: The background for each value, with the same shape as `dynamic_spectra`. NaN values are
+    ignored, and blocks where a spectral component is entirely NaN have a NaN background.
+    :raises ValueError: If `window` is not positive, or `quantile` is not between 0 and 1.
+    """
+    if window <= 0:
+        raise ValueError(f"The window must be positive, got {window}")
+    if not 0 <= quantile <= 1:
+        raise ValueError(f"The quantile must be between 0 and 1, got {quantile}")
+
+    # The index of the first spectrum in each block, along with one past the last spectrum.
+    block_numbers = np.floor((times - times[0]) / window).astype(np.int64)
+    bounds = np.flatnonzero(np.diff(block_numbers, prepend=-1, append=-1))
+
+    num_blocks = len(bounds) - 1
+    block_backgrounds = np.empty(
+        (dynamic_spectra.shape[0], num_blocks), dtype=np.float32
+    )
+    block_centres = np.empty(num_blocks, dtype=np.float64)
+    for i, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+        block = dynamic_spectra[:, start:stop]
+        # The NaN-aware quantile is much slower, so only use it where it's needed.
+        if np.isnan(block).any():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                block_backgrounds[:, i] = np.nanquantile(block, quantile, axis=-1)
+        else:
+            block_backgrounds[:, i] = np.quantile(block, quantile, axis=-1)
+        block_centres[i] = (times[start] + times[stop - 1]) / 2
+
+    if num_blocks == 1:
+        return np.repeat(block_backgrounds, len(times), axis=-1)
+
+    # Interpolate each spectrum between the blocks either side of it.
+    upper = np.clip(np.searchsorted(block_centres, times), 1, num_blocks - 1)
+    lower = upper - 1
+    weights = np.clip(
+        (times - block_centres[lower]) / (block_centres[upper] - block_centres[lower]),
+        0,
+        1,
+    ).astype(np.float32)
+    return (
+        block_backgrounds[:, lower] * (1 - weights)
+        + block_backgrounds[:, upper] * weights
+    )
+
+
 def time_elapsed(datetimes: npt.NDArray[np.datetime64]) -> npt.NDArray[np.float32]:
     """Convert an array of datetimes to seconds elapsed."""
     return (datetimes - datetimes[0]).astype("timedelta64[us]") / np.timedelta64(1, "s")
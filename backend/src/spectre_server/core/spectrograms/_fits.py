@@ -0,0 +1,587 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""A purpose-built FITS reader and writer for the layout of spectre's spectrogram files.
+
+Each file has a primary HDU containing a big-endian image of the dynamic spectra, followed by a
+binary table with a single row of variable-length TIME and FREQUENCY columns (mimicking the
+e-CALLISTO FITS files). Files written here are byte-for-byte identical to those written by
+`astropy`, which remains the fallback for anything outside of this layout.
+
+Optionally, the dynamic spectra can instead be stored in a tile-compressed image extension, either
+losslessly or quantised to 8 or 16-bit integers. These files are always written and read with `astropy`.
+"""
+
+import io
+import re
+import enum
+import typing
+import dataclasses
+
+import numpy as np
+import numpy.typing as npt
+import astropy.io.fits
+
+import spectre_server.core.exceptions
+
+HeaderValue = str | int | float | bool
+
+_BLOCK_SIZE = 2880
+_CARD_SIZE = 80
+_COMMENT_SIZE = 72
+
+# The BITPIX value for each supported data type in the primary HDU.
+_BITPIX: dict[np.dtype, int] = {np.dtype(np.float32): -32, np.dtype(np.float64): -64}
+
+# The number of spectrums in each compression tile, so that a time range can be read by
+# decompressing only the tiles which overlap it.
+_TILE_NUM_TIMES = 64
+
+_INT_PATTERN = re.compile(r"^[+-]?\d+$")
+_TFORM_PATTERN = re.compile(r"^PD\((\d+)\)$")
+
+
+class FitsCompression(enum.Enum):
+    """How to compress the dynamic spectra in a spectrogram FITS file.
+
+    :ivar NONE: Store the dynamic spectra uncompressed, in the primary HDU.
+    :ivar GZIP: Store the dynamic spectra in a losslessly GZIP tile-compressed image extension.
+    :ivar RICE: Store the dynamic spectra in a RICE tile-compressed image extension. RICE is
+    only lossless for integers, so should only be used to compress quantised dynamic spectra.
+    """
+
+    NONE = "none"
+    GZIP = "gzip"
+    RICE = "rice"
+
+
+# The astropy compression type for each compression.
+_COMPRESSION_TYPES = {FitsCompression.GZIP: "GZIP_2", FitsCompression.RICE: "RICE_1"}
+
+
+@dataclasses.dataclass
+class FitsContents:
+    """The contents of a spectrogram FITS file.
+
+    :ivar dynamic_spectra: The primary HDU data, with shape (num_frequencies, num_times).
+    :ivar times: The TIME column of the binary table.
+    :ivar frequencies: The FREQUENCY column of the binary table, in the units they were written in.
+    :ivar header: The header values of the image HDU, excluding commentary cards.
+    """
+
+    dynamic_spectra: npt.NDArray[np.float32]
+    times: npt.NDArray[np.float64]
+    frequencies: npt.NDArray[np.float64]
+    header: dict[str, HeaderValue]
+
+
+def _format_float(value: float | np.floating) -> str:
+    """Format a float for a header card, exactly as astropy does."""
+    value_str = str(value).replace("e", "E")
+
+    # Limit the value string to at most 20 characters.
+    if (str_len := len(value_str)) > 20:
+        idx = value_str.find("E")
+        if idx < 0:
+            value_str = value_str[:20]
+        else:
+            value_str = value_str[: 20 - (str_len - idx)] + value_str[idx:]
+    return value_str
+
+
+def _format_value(value: HeaderValue | np.number) -> str:
+    """Format a header card value, exactly as astropy does."""
+    if isinstance(value, str):
+        if value == "":
+            return "''"
+        escaped_value = value.replace("'", "''")
+        value_str = f"'{escaped_value:8}'"
+        return f"{value_str:20}"
+    elif isinstance(value, (bool, np.bool_)):
+        return f"{'T' if value else 'F':>20}"
+    elif isinstance(value, (int, np.integer)):
+        return f"{value:>20d}"
+    elif isinstance(value, (float, np.floating)):
+        if not np.isfinite(value):
+            raise spectre_server.core.exceptions.UnsupportedFitsLayoutError(
+                f"Cannot write non-finite value {value}"
+            )
+        return f"{_format_float(value):>20}"
+    raise spectre_server.core.exceptions.UnsupportedFitsLayoutError(
+        f"Unsupported header value {value!r}"
+    )
+
+
+def _make_card(
+    keyword: str, value: HeaderValue | np.number, comment: typing.Optional[str] = None
+) -> bytes:
+    """Make an 80-character header card.
+
+    :raises UnsupportedFitsLayoutError: If the card would need to be split over many cards, or
+    contains characters which are not printable ASCII.
+    """
+    card = f"{keyword:8}= {_format_value(value)}"
+    if comment:
+        card = f"{card} / {comment}"
+    if len(card) > _CARD_SIZE or not (card.isascii() and card.isprintable()):
+        raise spectre_server.core.exceptions.UnsupportedFitsLayoutError(
+            f"Cannot fit '{keyword}' in a single card"
+        )
+    return card.ljust(_CARD_SIZE).encode("ascii")
+
+
+def _make_comment_cards(comment: str) -> bytes:
+    """Split a comment over as many COMMENT cards as required."""
+    return b"".join(
+        f"COMMENT {comment[i : i + _COMMENT_SIZE]}".ljust(_CARD_SIZE).encode("ascii")
+        # An empty comment still gets a (blank) card.
+        for i in range(0, max(len(comment), 1), _COMMENT_SIZE)
+    )
+
+
+def _pad(data: bytes, fill: bytes) -> bytes:
+    """Pad the data to a whole number of FITS blocks."""
+    return data + fill * (-len(data) % _BLOCK_SIZE)
+
+
+def _make_header(*cards: bytes) -> bytes:
+    return _pad(b"".join(cards) + b"END".ljust(_CARD_SIZE), b" ")
+
+
+def _make_table(
+    times: npt.NDArray[np.floating], frequencies: npt.NDArray[np.floating]
+) -> bytes:
+    """Make the binary table HDU, with one row of variable-length TIME and FREQUENCY columns."""
+    # Each descriptor is the number of elements, and the offset into the heap.
+    row = np.array(
+        [len(times), 0, len(frequencies), 8 * len(times)], dtype=">i4"
+    ).tobytes()
+    heap = times.astype(">f8").tobytes() + frequencies.astype(">f8").tobytes()
+    header = _make_header(
+        _make_card("XTENSION", "BINTABLE", "binary table extension"),
+        _make_card("BITPIX", 8, "array data type"),
+        _make_card("NAXIS", 2, "number of array dimensions"),
+        _make_card("NAXIS1", len(row), "length of dimension 1"),
+        _make_card("NAXIS2", 1, "length of dimension 2"),
+        _make_card("PCOUNT", len(heap), "number of group parameters"),
+        _make_card("GCOUNT", 1, "number of groups"),
+        _make_card("TFIELDS", 2, "number of table fields"),
+        _make_card("TTYPE1", "TIME"),
+        _make_card("TFORM1", f"PD({len(times)})"),
+        _make_card("TTYPE2", "FREQUENCY"),
+        _make_card("TFORM2", f"PD({len(frequencies)})"),
+        _make_card("TSCAL1", 1),
+        _make_card("TZERO1", 0),
+        _make_card("TSCAL2", 1),
+        _make_card("TZERO2", 0),
+    )
+    return header + _pad(row + heap, b"\x00")
+
+
+def write_fits(
+    file_path: str,
+    dynamic_spectra: npt.NDArray[np.float32],
+    times: npt.NDArray[np.floating],
+    frequencies: npt.NDArray[np.floating],
+    header: dict[str, HeaderValue | np.number],
+    comment: str,
+) -> None:
+    """Write a spectrogram FITS file, without going through astropy.
+
+    :param file_path: Write the file here, overwriting any existing file.
+    :param dynamic_spectra: The primary HDU data, with shape (num_frequencies, num_times).
+    :param times: The TIME column of the binary table.
+    :param frequencies: The FREQUENCY column of the binary table.
+    :param header: Extra primary HDU header values, written in order after the mandatory keywords.
+    :param comment: A comment written at the end of the primary HDU header.
+    :raises UnsupportedFitsLayoutError: If the data or header can't be written in the fixed layout.
+    """
+    # Look up the data type independent of byte order, since it is always written big-endian.
+    native_dtype = dynamic_spectra.dtype.newbyteorder("=")
+    if native_dtype not in _BITPIX or dynamic_spectra.ndim != 2:
+        raise spectre_server.core.exceptions.UnsupportedFitsLayoutError(
+            f"Expected a 2D array of 32 or 64-bit floats, got {dynamic_spectra.dtype}"
+        )
+    num_frequencies, num_times = dynamic_spectra.shape
+
+    # Build everything before touching the filesystem, so a failure doesn't leave a partial file.
+    primary_header = _make_header(
+        _make_card("SIMPLE", True, "conforms to FITS standard"),
+        _make_card("BITPIX", _BITPIX[native_dtype], "array data type"),
+        _make_card("NAXIS", 2, "number of array dimensions"),
+        _make_card("NAXIS1", num_times),
+        _make_card("NAXIS2", num_frequencies),
+        _make_card("EXTEND", True),
+        *(_make_card(keyword, value) for keyword, value in header.items()),
+        _make_comment_cards(comment),
+    )
+    table = _make_table(times, frequencies)
+
+    data = np.ascontiguousarray(dynamic_spectra, dtype=native_dtype.newbyteorder(">"))
+    with open(file_path, "wb") as f:
+        f.write(primary_header)
+        f.write(data.data.cast("B"))
+        f.write(b"\x00" * (-data.nbytes % _BLOCK_SIZE))
+        f.write(table)
+
+
+def _quantise(
+    dynamic_spectra: npt.NDArray[np.float32], bits: int
+) -> tuple[npt.NDArray[np.uint8 | np.int16], float, float, int]:
+    """Linearly quantise the dynamic spectra to integers spanning their finite range.
+
+    Physical values are recovered as `BZERO + BSCALE * stored`, and non-finite values are stored
+    as the BLANK value (which is read back as NaN).
+
+    :param dynamic_spectra: The values to quantise.
+    :param bits: The number of bits in each quantised value, either 8 or 16.
+    :return: The quantised values, BSCALE, BZERO and BLANK.
+    """
+    dtype: npt.DTypeLike
+    if bits == 8:
+        dtype, qmin, qmax, blank = np.uint8, 0, 254, 255
+    elif bits == 16:
+        dtype, qmin, qmax, blank = np.int16, -32767, 32767, -32768
+    else:
+        raise ValueError(f"Expected 8 or 16 quantisation bits, got {bits}")
+
+    is_finite = np.isfinite(dynamic_spectra)
+    if np.any(is_finite):
+        lo = float(np.min(dynamic_spectra, where=is_finite, initial=np.inf))
+        hi = float(np.max(dynamic_spectra, where=is_finite, initial=-np.inf))
+    else:
+        lo, hi = 0.0, 0.0
+    bscale = (hi - lo) / (qmax - qmin) if hi > lo else 1.0
+    bzero = lo - qmin * bscale
+
+    with np.errstate(invalid="ignore"):
+        levels = np.rint((dynamic_spectra - bzero) / bscale)
+    quantised = typing.cast(
+        npt.NDArray[np.uint8 | np.int16],
+        np.where(is_finite, np.clip(levels, qmin, qmax), blank).astype(dtype),
+    )
+    return quantised, bscale, bzero, blank
+
+
+def write_fits_with_astropy(
+    file_path: str,
+    dynamic_spectra: npt.NDArray[np.float32],
+    times: npt.NDArray[np.floating],
+    frequencies: npt.NDArray[np.floating],
+    header: dict[str, HeaderValue | np.number],
+    comment: str,
+    compression: FitsCompression = FitsCompression.NONE,
+    quantisation_bits: int = 0,
+) -> None:
+    """Write a spectrogram FITS file using astropy. See `write_fits` for the other arguments.
+
+    :param compression: If not `NONE`, store the dynamic spectra in a tile-compressed image
+    extension following an empty primary HDU. Each tile spans every frequency, and a fixed number
+    of spectrums.
+    :param quantisation_bits: If 8 or 16, linearly quantise the dynamic spectra to integers
+    with this many bits, recording the scaling in the BSCALE, BZERO and BLANK keywords.
+    Defaults to 0, for no quantisation.
+    :raises ValueError: If RICE compression is requested for dynamic spectra which aren't quantised.
+    """
+    if compression == FitsCompression.RICE and not quantisation_bits:
+        raise ValueError(
+            "RICE compression is lossy, unless the dynamic spectra are quantised"
+        )
+
+    header = dict(header)
+    image_data: npt.NDArray[np.float32 | np.uint8 | np.int16] = dynamic_spectra
+    if quantisation_bits:
+        image_data, bscale, bzero, blank = _quantise(dynamic_spectra, quantisation_bits)
+        header.update({"BZERO": bzero, "BSCALE": bscale, "BLANK": blank})
+
+    if compression == FitsCompression.NONE:
+        image_hdu = astropy.io.fits.PrimaryHDU(image_data, do_not_scale_image_data=True)
+        hdus = [image_hdu]
+        image_hdu.header.set("SIMPLE", True)
+        image_hdu.header.set("BITPIX", -32)
+        image_hdu.header.set("NAXIS", 2)
+        image_hdu.header.set("NAXIS1", image_data.shape[1])
+        image_hdu.header.set("NAXIS2", image_data.shape[0])
+        image_hdu.header.set("EXTEND", True)
+    else:
+        num_frequencies, num_times = image_data.shape
+        image_hdu = astropy.io.fits.CompImageHDU(
+            image_data,
+            compression_type=_COMPRESSION_TYPES[compression],
+            # Tile shapes are in numpy (rather than FITS) axis order.
+            tile_shape=(num_frequencies, min(num_times, _TILE_NUM_TIMES)),
+            # Otherwise, floats are quantised by astropy, which is lossy.
+            quantize_level=0.0,
+            do_not_scale_image_data=True,
+        )
+        hdus = [astropy.io.fits.PrimaryHDU(), image_hdu]
+
+    image_hdu.header.add_comment(comment)
+    for keyword, value in header.items():
+        image_hdu.header.set(keyword, value)
+
+    # Create the Binary table HDU, wrapping the arrays to mimic the e-CALLISTO FITS files.
+    col1 = astropy.io.fits.Column(name="TIME", format="PD", array=np.array([times]))
+    col2 = astropy.io.fits.Column(
+        name="FREQUENCY", format="PD", array=np.array([frequencies])
+    )
+    bin_table_hdu = astropy.io.fits.BinTableHDU.from_columns(
+        astropy.io.fits.ColDefs([col1, col2])
+    )
+    bin_table_hdu.header.set("PCOUNT", 0)
+    bin_table_hdu.header.set("GCOUNT", 1)
+    bin_table_hdu.header.set("TFIELDS", 2)
+    bin_table_hdu.header.set("TTYPE1", "TIME")
+    bin_table_hdu.header.set("TFORM1", "D")
+    bin_table_hdu.header.set("TTYPE2", "FREQUENCY")
+    bin_table_hdu.header.set("TFORM2", "D")
+    bin_table_hdu.header.set("TSCAL1", 1, "")
+    bin_table_hdu.header.set("TZERO1", 0, "")
+    bin_table_hdu.header.set("TSCAL2", 1, "")
+    bin_table_hdu.header.set("TZERO2", 0, "")
+
+    hdul = astropy.io.fits.HDUList([*hdus, bin_table_hdu])
+    hdul.writeto(file_path, overwrite=True)
+
+
+def _parse_value(card: str) -> HeaderValue:
+    """Parse the value of a (fixed-format) header card."""
+    value = card[10:].strip()
+    if value.startswith("'"):
+        # Strings end at the first quote which isn't escaped by doubling.
+        match = re.match(r"'((?:[^']|'')*)'", value)
+        if match is None:
+            raise spectre_server.core.exceptions.UnsupportedFitsLayoutError(
+                f"Malformed string in card '{card}'"
+            )
+        return match.group(1).replace("''", "'").rstrip()
+
+    value = value.split("/", 1)[0].strip()
+    if value in ("T", "F"):
+        return value == "T"
+    if _INT_PATTERN.match(value):
+        return int(value)
+    try:
+        return float(value.replace("D", "E"))
+    except ValueError:
+        raise spectre_server.core.exceptions.UnsupportedFitsLayoutError(
+            f"Unsupported value in card '{card}'"
+        )
+
+
+def _read_header(f: typing.BinaryIO) -> dict[str, HeaderValue]:
+    """Read header blocks up to, and including, the block containing the END card."""
+    header: dict[str, HeaderValue] = {}
+    while True:
+        block = f.read(_BLOCK_SIZE)
+        if len(block) != _BLOCK_SIZE:
+            raise spectre_server.core.exceptions.UnsupportedFitsLayoutError(
+                "Unexpected end of file in header"
+            )
+        for i in range(0, _BLOCK_SIZE, _CARD_SIZE):
+            card = block[i : i + _CARD_SIZE].decode("ascii", errors="replace")
+            keyword = card[:8].rstrip()
+            if keyword == "END":
+                return header
+            if card[8:10] == "= ":
+                header[keyword] = _parse_value(card)
+
+
+def _expect(
+    header: dict[str, HeaderValue], keyword: str, expected: HeaderValue
+) -> None:
+    if header.get(keyword, expected) != expected:
+        raise spectre_server.core.exceptions.UnsupportedFitsLayoutError(
+            f"Expected {keyword} to be {expected}, got {header[keyword]}"
+        )
+
+
+def _read_fits(
+    file_path: str, time_slice: slice = slice(None), offset: int = 0
+) -> FitsContents:
+    """Read a spectrogram FITS file, without going through astropy.
+
+    :param file_path: The path of the FITS file.
+    :param time_slice: Read only the spectrums in this slice, defaults to all of them.
+    :param offset: The offset of the FITS file within the file at `file_path`, such as a member of an archive. Defaults to 0.
+    :raises UnsupportedFitsLayoutError: If the file does not have the fixed layout.
+    :return: The contents of the file.
+    """
+    with open(file_path, "rb") as f:
+        f.seek(offset)
+        header = _read_header(f)
+        if header.get("SIMPLE") is not True or header.get("NAXIS") != 2:
+            raise spectre_server.core.exceptions.UnsupportedFitsLayoutError(
+                "Expected a 2D primary image"
+            )
+        _expect(header, "BZERO", 0)
+        _expect(header, "BSCALE", 1)
+        bitpix = header.get("BITPIX")
+        dtypes = {v: k.newbyteorder(">") for k, v in _BITPIX.items()}
+        if bitpix not in dtypes:
+            raise spectre_server.core.exceptions.UnsupportedFitsLayoutError(
+                f"Unsupported BITPIX {bitpix}"
+            )
+        dtype = dtypes[typing.cast(int, bitpix)]
+        shape = (int(header["NAXIS2"]), int(header["NAXIS1"]))
+
+        data_offset = f.tell()
+        data_size = shape[0] * shape[1] * dtype.itemsize
+        if data_size == 0:
+            raise spectre_server.core.exceptions.UnsupportedFitsLayoutError(
+                "Expected a non-empty primary image"
+            )
+        f.seek(data_offset + data_size + (-data_size % _BLOCK_SIZE))
+
+        table_header = _read_header(f)
+        _expect(table_header, "XTENSION", "BINTABLE")
+        _expect(table_header, "NAXIS1", 16)
+        _expect(table_header, "NAXIS2", 1)
+        _expect(table_header, "TFIELDS", 2)
+        _expect(table_header, "TTYPE1", "TIME")
+        _expect(table_header, "TTYPE2", "FREQUENCY")
+        _expect(table_header, "TSCAL1", 1)
+        _expect(table_header, "TSCAL2", 1)
+        _expect(table_header, "TZERO1", 0)
+        _expect(table_header, "TZERO2", 0)
+        # The heap must directly follow the (single row) table.
+        _expect(table_header, "THEAP", 16)
+        for keyword in ("TFORM1", "TFORM2"):
+            if not _TFORM_PATTERN.match(str(table_header.get(keyword))):
+                raise spectre_server.core.exceptions.UnsupportedFitsLayoutError(
+                    f"Unsupported {keyword}"
+                )
+
+        table = f.read(16 + int(table_header.get("PCOUNT", 0)))
+        num_times, times_offset, num_frequencies, frequencies_offset = np.frombuffer(
+            table, dtype=">i4", count=4
+        )
+        times = np.frombuffer(
+            table, dtype=">f8", count=num_times, offset=16 + times_offset
+        ).astype(np.float64)
+        frequencies = np.frombuffer(
+            table, dtype=">f8", count=num_frequencies, offset=16 + frequencies_offset
+        ).astype(np.float64)
+
+    # Copy-on-write, so the array is writeable (without touching the file), as with astropy.
+    dynamic_spectra = np.memmap(
+        file_path, dtype=dtype, mode="c", offset=data_offset, shape=shape
+    ).view(np.ndarray)
+    return FitsContents(
+        dynamic_spectra[:, time_slice], times[time_slice], frequencies, header
+    )
+
+
+def _get_hdus(
+    hdulist: astropy.io.fits.HDUList,
+) -> tuple[
+    astropy.io.fits.PrimaryHDU | astropy.io.fits.CompImageHDU,
+    astropy.io.fits.BinTableHDU,
+]:
+    """Find the HDUs containing the dynamic spectra, and the binary table."""
+    # Compressed dynamic spectra are stored in an extension, following an empty primary HDU.
+    image_hdu = hdulist[0] if hdulist[0].header["NAXIS"] else hdulist[1]
+    bintable_hdu = next(
+        hdu
+        for hdu in hdulist
+        if isinstance(hdu, astropy.io.fits.BinTableHDU)
+        and not isinstance(hdu, astropy.io.fits.CompImageHDU)
+    )
+    return image_hdu, bintable_hdu
+
+
+def _get_header_values(header: astropy.io.fits.Header) -> dict[str, HeaderValue]:
+    return {
+        keyword: value
+        for keyword, value in header.items()
+        if keyword not in ("COMMENT", "HISTORY", "")
+    }
+
+
+def _open_with_astropy(
+    file_path: str, offset: int = 0, num_bytes: typing.Optional[int] = None
+) -> astropy.io.fits.HDUList:
+    """Open a FITS file with astropy, which may be stored within another file."""
+    if offset == 0 and num_bytes is None:
+        return astropy.io.fits.open(file_path, mode="readonly")
+    with open(file_path, "rb") as f:
+        f.seek(offset)
+        data = f.read(-1 if num_bytes is None else num_bytes)
+    return astropy.io.fits.open(io.BytesIO(data), mode="readonly")
+
+
+def _read_fits_with_astropy(
+    file_path: str,
+    time_slice: slice = slice(None),
+    offset: int = 0,
+    num_bytes: typing.Optional[int] = None,
+) -> FitsContents:
+    """Read a spectrogram FITS file using astropy. See `read_fits` for each argument."""
+    with _open_with_astropy(file_path, offset, num_bytes) as hdulist:
+        image_hdu, bintable_hdu = _get_hdus(hdulist)
+        if isinstance(image_hdu, astropy.io.fits.CompImageHDU):
+            # Only decompress the tiles overlapping the time slice.
+            dynamic_spectra = image_hdu.section[:, time_slice]
+        else:
+            dynamic_spectra = image_hdu.data[:, time_slice]
+        return FitsContents(
+            dynamic_spectra,
+            bintable_hdu.data["TIME"][0][time_slice],
+            bintable_hdu.data["FREQUENCY"][0],
+            _get_header_values(image_hdu.header),
+        )
+
+
+def read_fits(
+    file_path: str,
+    time_slice: slice = slice(None),
+    offset: int = 0,
+    num_bytes: typing.Optional[int] = None,
+) -> FitsContents:
+    """Read a spectrogram FITS file.
+
+    Files in spectre's fixed layout are read with a purpose-built codec, falling back to
+    `astropy` for any other file. Uncompressed dynamic spectra are memory-mapped, and
+    compressed dynamic spectra are decompressed transparently.
+
+    :param file_path: The path of the FITS file.
+    :param time_slice: Read only the spectrums in this slice, defaults to all of them. For
+    compressed files, only the tiles overlapping the slice are decompressed.
+    :param offset: The offset of the FITS file within the file at `file_path`, such as an uncompressed
+    member of an archive. Defaults to 0.
+    :param num_bytes: The size of the FITS file within the file at `file_path`. Defaults to None, in
+    which case it runs to the end of the file.
+    :return: The contents of the file.
+    """
+    try:
+        return _read_fits(file_path, time_slice, offset)
+    except spectre_server.core.exceptions.UnsupportedFitsLayoutError:
+        return _read_fits_with_astropy(file_path, time_slice, offset, num_bytes)
+
+
+def read_fits_axes(
+    file_path: str,
+    offset: int = 0,
+    num_bytes: typing.Optional[int] = None,
+) -> tuple[dict[str, HeaderValue], npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """Read the header values, and the TIME and FREQUENCY columns of a spectrogram FITS file,
+    without reading (or decompressing) the dynamic spectra.
+
+    :param file_path: The path of the FITS file.
+    :param offset: The offset of the FITS file within the file at `file_path`. Defaults to 0.
+    :param num_bytes: The size of the FITS file within the file at `file_path`. Defaults to None.
+    :return: The header values of the image HDU, and the TIME and FREQUENCY columns of the binary table.
+    """
+    try:
+        # The dynamic spectra are memory-mapped, so are never read.
+        fits_contents = _read_fits(file_path, offset=offset)
+        return fits_contents.header, fits_contents.times, fits_contents.frequencies
+    except spectre_server.core.exceptions.UnsupportedFitsLayoutError:
+        with _open_with_astropy(file_path, offset, num_bytes) as hdulist:
+            image_hdu, bintable_hdu = _get_hdus(hdulist)
+            return (
+                _get_header_values(image_hdu.header),
+                np.array(bintable_hdu.data["TIME"][0], dtype=np.float64),
+                np.array(bintable_hdu.data["FREQUENCY"][0], dtype=np.float64),
+            )
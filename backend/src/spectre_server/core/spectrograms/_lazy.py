@@ -0,0 +1,723 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import abc
+import math
+import typing
+import warnings
+import datetime
+import dataclasses
+
+import numpy as np
+import numpy.typing as npt
+
+import spectre_server.core.config
+import spectre_server.core.io
+from ._array_operations import (
+    find_closest_index,
+    find_closest_indices,
+    moving_average,
+    normalise_peak_intensity,
+    compute_resolution,
+    compute_range,
+    subtract_background,
+    time_elapsed,
+)
+from ._spectrogram import (
+    Spectrogram,
+    FrequencyCut,
+    FrequencyCuts,
+    TimeCut,
+    TimeCuts,
+    SpectrumUnit,
+    TimeType,
+    _find_cut_indices,
+    _to_dBb,
+)
+from ._transform import (
+    get_average_window_size,
+    get_frequency_chop_indices,
+    get_time_chop_indices,
+)
+
+# The (approximate) number of spectrums read at once when averaging the view.
+_AVERAGE_BLOCK_NUM_TIMES = 1024
+
+
+@dataclasses.dataclass(frozen=True)
+class SpectrogramAxes:
+    """The axes of a spectrogram, which can be read without its dynamic spectra.
+
+    :ivar datetimes: The datetimes associated with each spectrum.
+    :ivar frequencies: The physical frequencies assigned to each spectral component, in Hz.
+    :ivar spectrum_unit: The units associated with the dynamic spectra.
+    """
+
+    datetimes: npt.NDArray[np.datetime64]
+    frequencies: npt.NDArray[np.float32]
+    spectrum_unit: SpectrumUnit
+
+
+class SpectrogramReader(abc.ABC):
+    """An abstract interface to read parts of a spectrogram, such as one stored in a file."""
+
+    @abc.abstractmethod
+    def read_axes(self) -> SpectrogramAxes:
+        """Read the axes of the spectrogram, without reading the dynamic spectra."""
+
+    @abc.abstractmethod
+    def read_block(
+        self, rows: slice | npt.NDArray[np.intp], time_slice: slice
+    ) -> npt.NDArray[np.float32]:
+        """Read a block of the dynamic spectra, reading as little else as possible.
+
+        :param rows: The spectral components to read.
+        :param time_slice: The spectrums to read.
+        :return: A copy of the block, with shape (num_rows, num_times_in_slice).
+        """
+
+
+class _SpectrogramInMemory(SpectrogramReader):
+    def __init__(self, spectrogram: Spectrogram) -> None:
+        """Read parts of a spectrogram which is already in memory."""
+        self._spectrogram = spectrogram
+
+    def read_axes(self) -> SpectrogramAxes:
+        return SpectrogramAxes(
+            self._spectrogram.datetimes,
+            self._spectrogram.frequencies,
+            self._spectrogram.spectrum_unit,
+        )
+
+    def read_block(
+        self, rows: slice | npt.NDArray[np.intp], time_slice: slice
+    ) -> npt.NDArray[np.float32]:
+        return np.array(self._spectrogram.dynamic_spectra[rows, time_slice])
+
+
+SpectrogramSource = Spectrogram | SpectrogramReader
+
+
+@dataclasses.dataclass(frozen=True)
+class _Segment:
+    """A contiguous run of spectrums, taken from one source spectrogram.
+
+    :ivar reader: Reads the source spectrogram. Only the spectral components and spectrums in each block
+    are read, so the source data is never held in memory for the lifetime of the view.
+    :ivar datetimes: The datetimes of each spectrum in the segment.
+    :ivar time_offset: The index of the first spectrum of the segment in the source spectrogram.
+    """
+
+    reader: SpectrogramReader
+    datetimes: npt.NDArray[np.datetime64]
+    time_offset: int
+
+    @property
+    def num_times(self) -> int:
+        """The number of spectrums in the segment."""
+        return len(self.datetimes)
+
+    def read(
+        self,
+        frequency_slice: slice,
+        rows: slice | npt.NDArray[np.intp],
+        start: int,
+        stop: int,
+    ) -> npt.NDArray[np.float32]:
+        """Read a block of the dynamic spectra belonging to this segment.
+
+        :param frequency_slice: The spectral components of the source spectrogram in the view.
+        :param rows: The spectral components to read, relative to `frequency_slice`.
+        :param start: The first spectrum to read, relative to the start of the segment.
+        :param stop: One past the last spectrum to read, relative to the start of the segment.
+        :return: A copy of the requested block, with shape (num_rows, stop - start).
+        """
+        if isinstance(rows, slice):
+            row_start, row_stop, row_step = rows.indices(
+                frequency_slice.stop - frequency_slice.start
+            )
+            source_rows: slice | npt.NDArray[np.intp] = slice(
+                frequency_slice.start + row_start,
+                frequency_slice.start + row_stop,
+                row_step,
+            )
+        else:
+            source_rows = frequency_slice.start + rows
+        return self.reader.read_block(
+            source_rows,
+            slice(self.time_offset + start, self.time_offset + stop),
+        )
+
+
+class LazySpectrogram:
+    """A read-only view of many spectrograms joined along the time axis, which reads the
+    underlying dynamic spectra only when they are needed.
+
+    Unlike `join_spectrograms`, the dynamic spectra are never concatenated up front. Time and
+    frequency chops return another view, and cuts only read the rows or columns they need,
+    so operations over long time ranges run in memory proportional to the result.
+    """
+
+    def __init__(
+        self,
+        sources: typing.Sequence[SpectrogramSource],
+        max_workers: typing.Optional[int] = None,
+    ) -> None:
+        """Initialise a LazySpectrogram instance.
+
+        :param sources: The spectrograms to join, in time order. Each is either a spectrogram, or a
+        reader (for example, `SpectrogramBatch.spectrogram_file`), of which only the axes are read up front.
+        :param max_workers: Optionally override the number of threads used to read the sources,
+        defaults to None.
+        :raises ValueError: If the input sequence is empty.
+        :raises ValueError: If the sources have mismatched frequency ranges.
+        :raises ValueError: If the sources have differing spectrum units.
+        :raises ValueError: If any source lacks a defined start datetime.
+        """
+        if len(sources) == 0:
+            raise ValueError(f"Input list of spectrograms is empty!")
+
+        readers = [self._as_reader(source) for source in sources]
+        self._max_workers = max_workers
+
+        segments: list[_Segment] = []
+        first_axes: typing.Optional[SpectrogramAxes] = None
+        for reader, axes in zip(
+            readers,
+            spectre_server.core.io.imap_ordered(
+                lambda reader: reader.read_axes(), readers, max_workers
+            ),
+        ):
+            first_axes = first_axes or axes
+            if not np.all(np.equal(axes.frequencies, first_axes.frequencies)):
+                raise ValueError(
+                    f"All spectrograms must have identical frequency ranges"
+                )
+            if axes.spectrum_unit != first_axes.spectrum_unit:
+                raise ValueError(
+                    f"All units must be equal for each spectrogram in the input list!"
+                )
+            segments.append(_Segment(reader, axes.datetimes, 0))
+
+        frequencies = np.array(typing.cast(SpectrogramAxes, first_axes).frequencies)
+        self._initialise(
+            segments,
+            frequencies,
+            slice(0, len(frequencies)),
+            typing.cast(SpectrogramAxes, first_axes).spectrum_unit,
+        )
+
+    @staticmethod
+    def _as_reader(source: SpectrogramSource) -> SpectrogramReader:
+        if isinstance(source, Spectrogram):
+            if not source.start_datetime_is_set:
+                raise ValueError(
+                    f"All spectrograms must have their start datetime set."
+                )
+            return _SpectrogramInMemory(source)
+        return source
+
+    def _initialise(
+        self,
+        segments: list[_Segment],
+        frequencies: npt.NDArray[np.float32],
+        frequency_slice: slice,
+        spectrum_unit: SpectrumUnit,
+    ) -> None:
+        self._segments = segments
+        self._frequencies = frequencies
+        self._frequency_slice = frequency_slice
+        self._spectrum_unit = spectrum_unit
+
+        self._datetimes = np.concatenate([segment.datetimes for segment in segments])
+        self._times = time_elapsed(self._datetimes)
+        # The index of the first spectrum in each segment, along with one past the last spectrum.
+        self._offsets = np.cumsum([0] + [segment.num_times for segment in segments])
+
+        # by default, the background is evaluated over the whole spectrogram
+        self._start_background_index = 0
+        self._end_background_index = self.num_times
+        # the background interval can be set after instantiation
+        self._start_background: typing.Optional[str] = None
+        self._end_background: typing.Optional[str] = None
+        # read on demand, and cached until the background interval changes
+        self._background_spectrum: typing.Optional[npt.NDArray[np.float32]] = None
+
+    def _derive(
+        self,
+        segments: list[_Segment],
+        frequencies: npt.NDArray[np.float32],
+        frequency_slice: slice,
+    ) -> "LazySpectrogram":
+        """Create a new view over some subset of this one."""
+        view = LazySpectrogram.__new__(LazySpectrogram)
+        view._max_workers = self._max_workers
+        view._initialise(segments, frequencies, frequency_slice, self._spectrum_unit)
+        return view
+
+    @property
+    def dynamic_spectra(self) -> npt.NDArray[np.float32]:
+        """The dynamic spectra array, read in full from the sources."""
+        return self._read(slice(None), 0, self.num_times)
+
+    @property
+    def times(self) -> npt.NDArray[np.float32]:
+        """A 1D array representing the elapsed time of each spectrum, in seconds, relative to the first
+        in the spectrogram."""
+        return self._times
+
+    @property
+    def num_times(self) -> int:
+        """The number of spectrums in the spectrogram."""
+        return len(self._times)
+
+    @property
+    def time_resolution(self) -> float:
+        """The median spacing between consecutive time values."""
+        return compute_resolution(self._times)
+
+    @property
+    def time_range(self) -> float:
+        """The difference between the first and last time values."""
+        return compute_range(self._times)
+
+    @property
+    def frequencies(self) -> npt.NDArray[np.float32]:
+        """A 1D array representing the physical frequencies assigned to each spectral component, in Hz."""
+        return self._frequencies
+
+    @property
+    def num_frequencies(self) -> int:
+        """The number of spectral components in the spectrogram."""
+        return len(self._frequencies)
+
+    @property
+    def frequency_resolution(self) -> float:
+        """The median spacing between consecutive frequency values."""
+        return compute_resolution(self._frequencies)
+
+    @property
+    def frequency_range(self) -> float:
+        """The difference between the first and last frequency values."""
+        return compute_range(self._frequencies)
+
+    @property
+    def start_datetime_is_set(self) -> bool:
+        """Always True, since every source must have its start datetime set."""
+        return True
+
+    @property
+    def start_datetime(self) -> np.datetime64:
+        """The datetime assigned to the first spectrum."""
+        return self._datetimes[0]
+
+    @property
+    def datetimes(self) -> npt.NDArray[np.datetime64]:
+        """The datetimes associated with each spectrum."""
+        return self._datetimes
+
+    @property
+    def spectrum_unit(self) -> SpectrumUnit:
+        """The units associated with the dynamic spectra."""
+        return self._spectrum_unit
+
+    @property
+    def start_background(self) -> typing.Optional[str]:
+        """The start of the background interval, or None if it has not been set."""
+        return self._start_background
+
+    @property
+    def end_background(self) -> typing.Optional[str]:
+        """The end of the background interval, or None if it has not been set."""
+        return self._end_background
+
+    def format_start_time(self) -> str:
+        """Format the datetime assigned to the first spectrum in the dynamic spectra.
+
+        :return: A string representation of the `start_datetime`.
+        """
+        dt = self.start_datetime.astype(datetime.datetime)
+        return datetime.datetime.strftime(
+            dt, spectre_server.core.config.TimeFormat.DATETIME
+        )
+
+    def set_background(self, start_background: str, end_background: str) -> None:
+        """Set the background interval for computing the background spectrum, and doing
+        background subtractions.
+
+        :param start_background: The start time of the background interval, formatted as
+        a string in the format `TimeFormat.DATETIME`.
+        :param end_background: The end time of the background interval, formatted as
+        a string in the format `TimeFormat.DATETIME`.
+        """
+        self._start_background_index = find_closest_index(
+            np.datetime64(
+                datetime.datetime.strptime(
+                    start_background, spectre_server.core.config.TimeFormat.DATETIME
+                )
+            ),
+            self._datetimes,
+            enforce_strict_bounds=True,
+        )
+        self._end_background_index = find_closest_index(
+            np.datetime64(
+                datetime.datetime.strptime(
+                    end_background, spectre_server.core.config.TimeFormat.DATETIME
+                )
+            ),
+            self._datetimes,
+            enforce_strict_bounds=True,
+        )
+        self._start_background = start_background
+        self._end_background = end_background
+        self._background_spectrum = None
+
+    def _iter_blocks(
+        self, rows: slice | npt.NDArray[np.intp], start: int, stop: int
+    ) -> typing.Iterator[npt.NDArray[np.float32]]:
+        """Read the spectrums with indices in [start, stop), one block per overlapping segment.
+
+        :param rows: The spectral components to read.
+        :param start: The index of the first spectrum to read.
+        :param stop: One past the index of the last spectrum to read.
+        :return: An iterator over the blocks, in time order.
+        """
+        reads = []
+        for segment, offset in zip(self._segments, self._offsets[:-1]):
+            segment_start = max(start - offset, 0)
+            segment_stop = min(stop - offset, segment.num_times)
+            if segment_start < segment_stop:
+                reads.append((segment, segment_start, segment_stop))
+
+        return spectre_server.core.io.imap_ordered(
+            lambda read: read[0].read(self._frequency_slice, rows, read[1], read[2]),
+            reads,
+            self._max_workers,
+        )
+
+    def _read(
+        self, rows: slice | npt.NDArray[np.intp], start: int, stop: int
+    ) -> npt.NDArray[np.float32]:
+        """Read the spectrums with indices in [start, stop) into a single array."""
+        blocks = list(self._iter_blocks(rows, start, stop))
+        if not blocks:
+            num_rows = len(np.arange(self.num_frequencies)[rows])
+            return np.empty((num_rows, 0), dtype=np.float32)
+        return np.hstack(blocks)
+
+    def iter_time_blocks(
+        self, block_size: int
+    ) -> typing.Iterator[npt.NDArray[np.float32]]:
+        """Read the dynamic spectra in consecutive blocks of spectrums, in time order.
+
+        Each source is read in pieces of at most one block, however the blocks fall across them. So, a
+        source holding no more than a block of spectrums is read exactly once.
+
+        :param block_size: The number of spectrums in each block. The final block is shorter if the
+        number of spectrums is not a multiple of the block size.
+        :raises ValueError: If the block size is not positive.
+        :return: An iterator over the blocks, each with shape (num_frequencies, num_times_in_block).
+        """
+        if block_size < 1:
+            raise ValueError(f"The block size must be positive, got {block_size}")
+        reads = [
+            (segment, start, min(start + block_size, segment.num_times))
+            for segment in self._segments
+            for start in range(0, segment.num_times, block_size)
+        ]
+        pieces: list[npt.NDArray[np.float32]] = []
+        num_pending = 0
+        for piece in spectre_server.core.io.imap_ordered(
+            lambda read: read[0].read(
+                self._frequency_slice, slice(None), read[1], read[2]
+            ),
+            reads,
+            self._max_workers,
+        ):
+            pieces.append(piece)
+            num_pending += piece.shape[1]
+            # Each piece is at most one block, so at most one block is ever complete.
+            if num_pending >= block_size:
+                pending = np.hstack(pieces)
+                yield pending[:, :block_size]
+                pieces = [pending[:, block_size:]]
+                num_pending -= block_size
+        if num_pending:
+            yield np.hstack(pieces)
+
+    def compute_background_spectrum(self) -> npt.NDArray[np.float32]:
+        """Compute the background spectrum by averaging the dynamic spectra in time.
+
+        The background interval is read one segment at a time, so it is never held in
+        memory all at once. The background spectrum is cached until the background interval
+        is changed, so the returned array is read-only.
+
+        :return: A 1D array representing the time-averaged dynamic spectra over the
+        specified background interval.
+        """
+        if self._background_spectrum is not None:
+            return self._background_spectrum
+
+        total = np.zeros(self.num_frequencies, dtype=np.float64)
+        count = np.zeros(self.num_frequencies, dtype=np.int64)
+        for block in self._iter_blocks(
+            slice(None),
+            self._start_background_index,
+            min(self._end_background_index + 1, self.num_times),
+        ):
+            total += np.nansum(block, axis=-1)
+            count += np.count_nonzero(~np.isnan(block), axis=-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            background_spectrum = (total / count).astype(np.float32)
+        background_spectrum.flags.writeable = False
+        self._background_spectrum = background_spectrum
+        return background_spectrum
+
+    def integrate_over_frequency(
+        self, correct_background: bool = False, peak_normalise: bool = False
+    ) -> npt.NDArray[np.float32]:
+        """Numerically integrate the spectrogram over the frequency axis.
+
+        :param correct_background: Indicates whether to subtract the background after
+        computing the integral, defaults to False
+        :param peak_normalise: Indicates whether to normalise the integral such that
+        the peak value is equal to unity, defaults to False
+        :return: A 1D array containing each spectrum numerically integrated over the
+        frequency axis.
+        """
+        I = np.concatenate(
+            [
+                np.trapz(block, self._frequencies, axis=0)
+                for block in self._iter_blocks(slice(None), 0, self.num_times)
+            ]
+        )
+
+        if correct_background:
+            I = subtract_background(
+                I, self._start_background_index, self._end_background_index
+            )
+        if peak_normalise:
+            I = normalise_peak_intensity(I)
+        return I
+
+    def time_average(self, resolution: float) -> Spectrogram:
+        """Average the view in time to a desired resolution, reading the dynamic spectra a block at a time.
+
+        See `time_average` for the meaning of each argument.
+
+        :return: The averaged spectrogram, read into memory.
+        """
+        window_size = get_average_window_size(
+            resolution, self.time_resolution, self.time_range, "time"
+        )
+        # Each block holds a whole number of windows, so that no window is split over two blocks.
+        block_size = window_size * math.ceil(_AVERAGE_BLOCK_NUM_TIMES / window_size)
+        dynamic_spectra = np.hstack(
+            [
+                moving_average(block, min(window_size, block.shape[1]), axis=1)
+                for block in self.iter_time_blocks(block_size)
+            ]
+        )
+        return Spectrogram(
+            dynamic_spectra,
+            self._times[0::window_size],
+            self._frequencies,
+            self._spectrum_unit,
+            self.start_datetime,
+        )
+
+    def frequency_average(self, resolution: float) -> Spectrogram:
+        """Average the view in frequency to a desired resolution, reading the dynamic spectra a block at a time.
+
+        See `frequency_average` for the meaning of each argument.
+
+        :return: The averaged spectrogram, read into memory.
+        """
+        window_size = get_average_window_size(
+            resolution, self.frequency_resolution, self.frequency_range, "frequency"
+        )
+        dynamic_spectra = np.hstack(
+            [
+                moving_average(block, window_size, axis=0)
+                for block in self.iter_time_blocks(_AVERAGE_BLOCK_NUM_TIMES)
+            ]
+        )
+        return Spectrogram(
+            dynamic_spectra,
+            self._times,
+            moving_average(self._frequencies, window_size),
+            self._spectrum_unit,
+            self.start_datetime,
+        )
+
+    def get_frequency_cuts(
+        self,
+        at_times: typing.Sequence[float | str],
+        dBb: bool = False,
+        peak_normalise: bool = False,
+    ) -> FrequencyCuts:
+        """Retrieve cuts of the dynamic spectra at several times, reading only those spectrums.
+
+        See `Spectrogram.get_frequency_cuts` for the meaning of each argument.
+        """
+        indices, times_of_cuts = _find_cut_indices(
+            at_times, self._times, self._datetimes
+        )
+        spectrums = np.hstack(
+            [self._read(slice(None), index, index + 1) for index in indices]
+        )
+
+        if dBb:
+            if peak_normalise:
+                warnings.warn(
+                    "Ignoring frequency cut normalisation, since dBb units have been specified"
+                )
+            cuts = _to_dBb(
+                spectrums,
+                lambda: self.compute_background_spectrum()[:, np.newaxis],
+                self._spectrum_unit,
+            ).T
+        else:
+            cuts = spectrums.T
+            if peak_normalise:
+                cuts = normalise_peak_intensity(cuts, axis=-1)
+
+        return FrequencyCuts(
+            times_of_cuts, self._frequencies, cuts, self._spectrum_unit
+        )
+
+    def get_frequency_cut(
+        self, at_time: float | str, dBb: bool = False, peak_normalise: bool = False
+    ) -> FrequencyCut:
+        """Retrieve a cut of the dynamic spectra at a specific time, reading only that spectrum.
+
+        See `Spectrogram.get_frequency_cut` for the meaning of each argument.
+        """
+        return self.get_frequency_cuts(
+            [at_time], dBb=dBb, peak_normalise=peak_normalise
+        ).get_cut(0)
+
+    def get_time_cuts(
+        self,
+        at_frequencies: typing.Sequence[float],
+        dBb: bool = False,
+        peak_normalise=False,
+        correct_background=False,
+        return_time_type: TimeType = TimeType.RELATIVE,
+    ) -> TimeCuts:
+        """Retrieve cuts of the dynamic spectra at several frequencies, reading only those
+        spectral components in a single pass over the sources.
+
+        See `Spectrogram.get_time_cuts` for the meaning of each argument.
+        """
+        indices = find_closest_indices(
+            np.array(at_frequencies, dtype=np.float32),
+            self._frequencies,
+            enforce_strict_bounds=True,
+        )
+        rows = self._read(indices, 0, self.num_times)
+
+        # A spectrogram of just these rows gives identical results to the full spectrogram for these cuts.
+        spectrogram = Spectrogram(
+            rows,
+            self._times,
+            self._frequencies[indices],
+            self._spectrum_unit,
+            self.start_datetime,
+        )
+        if self._start_background is not None and self._end_background is not None:
+            spectrogram.set_background(self._start_background, self._end_background)
+        return spectrogram.get_time_cuts(
+            [float(frequency) for frequency in self._frequencies[indices]],
+            dBb=dBb,
+            peak_normalise=peak_normalise,
+            correct_background=correct_background,
+            return_time_type=return_time_type,
+        )
+
+    def get_time_cut(
+        self,
+        at_frequency: float,
+        dBb: bool = False,
+        peak_normalise=False,
+        correct_background=False,
+        return_time_type: TimeType = TimeType.RELATIVE,
+    ) -> TimeCut:
+        """Retrieve a cut of the dynamic spectra at a specific frequency, reading only that
+        spectral component.
+
+        See `Spectrogram.get_time_cut` for the meaning of each argument.
+        """
+        return self.get_time_cuts(
+            [at_frequency],
+            dBb=dBb,
+            peak_normalise=peak_normalise,
+            correct_background=correct_background,
+            return_time_type=return_time_type,
+        ).get_cut(0)
+
+    def time_chop(
+        self, start_datetime: datetime.datetime, end_datetime: datetime.datetime
+    ) -> "LazySpectrogram":
+        """Chop the view between two datetimes, without reading any dynamic spectra.
+
+        :param start_datetime: The start datetime of the chop.
+        :param end_datetime: The end datetime of the chop.
+        :return: A view over the spectrums in the (inclusive) time range.
+        """
+        start_index, end_index = get_time_chop_indices(
+            self._datetimes, start_datetime, end_datetime
+        )
+
+        segments = []
+        for segment, offset in zip(self._segments, self._offsets[:-1]):
+            segment_start = max(start_index - offset, 0)
+            segment_stop = min(end_index + 1 - offset, segment.num_times)
+            if segment_start < segment_stop:
+                segments.append(
+                    _Segment(
+                        segment.reader,
+                        segment.datetimes[segment_start:segment_stop],
+                        segment.time_offset + segment_start,
+                    )
+                )
+        return self._derive(segments, self._frequencies, self._frequency_slice)
+
+    def frequency_chop(
+        self, start_frequency: float, end_frequency: float
+    ) -> "LazySpectrogram":
+        """Chop the view between two frequencies, without reading any dynamic spectra.
+
+        :param start_frequency: The start frequency of the chop, in Hz.
+        :param end_frequency: The end frequency of the chop, in Hz.
+        :return: A view over the spectral components in the (inclusive) frequency range.
+        """
+        start_index, end_index = get_frequency_chop_indices(
+            self._frequencies, start_frequency, end_frequency
+        )
+        frequency_slice = slice(
+            self._frequency_slice.start + start_index,
+            self._frequency_slice.start + end_index + 1,
+        )
+        return self._derive(
+            self._segments,
+            self._frequencies[start_index : end_index + 1],
+            frequency_slice,
+        )
+
+    def materialise(self) -> Spectrogram:
+        """Read the whole view into memory.
+
+        :return: A spectrogram with the same data, and the same background interval, as this view.
+        """
+        spectrogram = Spectrogram(
+            self.dynamic_spectra,
+            self._times,
+            self._frequencies,
+            self._spectrum_unit,
+            self.start_datetime,
+        )
+        if self._start_background is not None and self._end_background is not None:
+            spectrogram.set_background(self._start_background, self._end_background)
+        return spectrogram
@@ -11,15 +11,24 @@ import os
 
 import numpy as np
 import numpy.typing as npt
-import astropy.io.fits
 
 import spectre_server.core.config
+import spectre_server.core.exceptions
 from ._array_operations import (
     find_closest_index,
+    find_closest_indices,
     normalise_peak_intensity,
     compute_resolution,
     compute_range,
     subtract_background,
+    compute_rolling_background,
+)
+from ._fits import write_fits, write_fits_with_astropy, FitsCompression, HeaderValue
+
+_FITS_COMMENT = (
+    "FITS (Flexible Image Transport System) format defined in Astronomy and Astrophysics "
+    "Supplement Series v44/p363, v44/p371, v73/p359, v73/p365. Contact the NASA Science Office "
+    "of Standards and Technology for the FITS Definition document #100 and other FITS information."
 )
 
 
@@ -27,9 +36,11 @@ class SpectrumUnit(enum.Enum):
     """A defined unit for dynamic spectra values.
 
     :ivar AMPLITUDE: DFT amplitude (see https://www.fftw.org/fftw3_doc/What-FFTW-Really-Computes.html)
+    :ivar DECIBELS_ABOVE_BACKGROUND: Decibels above the background spectrum.
     """
 
     AMPLITUDE = "amplitude"
+    DECIBELS_ABOVE_BACKGROUND = "dBb"
 
 
 @dataclasses.dataclass
@@ -68,6 +79,65 @@ class TimeCut:
     spectrum_unit: SpectrumUnit
 
 
+@dataclasses.dataclass
+class FrequencyCuts:
+    """Cuts of a dynamic spectra at several instants of time, as a single block. Equivalently,
+    some of the spectrums in the spectrogram.
+
+    :ivar times: The time of each frequency cut, either as relative times (if the elements
+    are floats) or as datetimes.
+    :ivar frequencies: The physical frequencies assigned to each spectral component, in Hz.
+    :ivar cuts: A 2D array with one row per cut, holding the spectrum values.
+    :ivar spectrum_unit: The unit of each spectrum value.
+    """
+
+    times: npt.NDArray[np.float32 | np.datetime64]
+    frequencies: npt.NDArray[np.float32]
+    cuts: npt.NDArray[np.float32]
+    spectrum_unit: SpectrumUnit
+
+    def get_cut(self, index: int) -> FrequencyCut:
+        """Get one of the cuts.
+
+        :param index: The position of the cut in the block.
+        :return: The cut, whose values are a view into the block.
+        """
+        return FrequencyCut(
+            self.times[index], self.frequencies, self.cuts[index], self.spectrum_unit
+        )
+
+
+@dataclasses.dataclass
+class TimeCuts:
+    """Cuts of a dynamic spectra at several fixed frequencies, as a single block. Equivalently,
+    the time series of some of the spectral components in the spectrogram.
+
+    :ivar frequencies: The physical frequency assigned to each spectral component, in Hz.
+    :ivar times: The time for each time series value, either as a relative time (if
+    the elements are floats) or as a datetimes.
+    :ivar cuts: A 2D array with one row per cut, holding the time series values.
+    :ivar spectrum_unit: The unit of each time series value.
+    """
+
+    frequencies: npt.NDArray[np.float32]
+    times: npt.NDArray[np.float32 | np.datetime64]
+    cuts: npt.NDArray[np.float32]
+    spectrum_unit: SpectrumUnit
+
+    def get_cut(self, index: int) -> TimeCut:
+        """Get one of the cuts.
+
+        :param index: The position of the cut in the block.
+        :return: The cut, whose values are a view into the block.
+        """
+        return TimeCut(
+            float(self.frequencies[index]),
+            self.times,
+            self.cuts[index],
+            self.spectrum_unit,
+        )
+
+
 class TimeType(enum.Enum):
     """The type of time we can assign to each spectrum in the dynamic spectra.
 
@@ -123,10 +193,27 @@ class Spectrogram:
         # the background interval can be set after instantiation
         self._start_background: typing.Optional[str] = None
         self._end_background: typing.Optional[str] = None
+        # alternatively, the background can drift with time
+        self._rolling_background_window: typing.Optional[float] = None
+        self._rolling_background_quantile = 0.5
+        # computed on demand, and cached until the background changes
+        self._background_spectrum: typing.Optional[npt.NDArray[np.float32]] = None
+        self._rolling_background: typing.Optional[npt.NDArray[np.float32]] = None
+        self._dynamic_spectra_dBb: typing.Optional[npt.NDArray[np.float32]] = None
 
         # finally check that the spectrogram arrays are matching in shape
         self._check_shapes()
 
+    def __getstate__(self) -> dict[str, typing.Any]:
+        # Leave out anything cached, so copies sent to other processes are no larger than the data.
+        state = self.__dict__.copy()
+        state.update(
+            _background_spectrum=None,
+            _rolling_background=None,
+            _dynamic_spectra_dBb=None,
+        )
+        return state
+
     @property
     def dynamic_spectra(self) -> npt.NDArray[np.float32]:
         """The dynamic spectra array.
@@ -243,45 +330,96 @@ class Spectrogram:
         """
         return self._end_background
 
+    @property
+    def rolling_background_window(self) -> typing.Optional[float]:
+        """The time spanned by each block of the rolling background, in seconds.
+
+        Returns None if the rolling background has not been set.
+        """
+        return self._rolling_background_window
+
     def compute_background_spectrum(self) -> npt.NDArray[np.float32]:
         """Compute the background spectrum by averaging the dynamic spectra in time.
 
         By default, the entire dynamic spectra is averaged. Use set_background to
         specify a custom background interval.
 
+        The background spectrum is cached until the background interval is changed, so
+        the returned array is read-only.
+
         :return: A 1D array representing the time-averaged dynamic spectra over the
         specified background interval.
         """
-        return np.nanmean(
-            self._dynamic_spectra[
-                :, self._start_background_index : self._end_background_index + 1
-            ],
-            axis=-1,
-        )
+        if self._background_spectrum is None:
+            background_spectrum = np.nanmean(
+                self._dynamic_spectra[
+                    :, self._start_background_index : self._end_background_index + 1
+                ],
+                axis=-1,
+            )
+            background_spectrum.flags.writeable = False
+            self._background_spectrum = background_spectrum
+        return self._background_spectrum
+
+    def compute_rolling_background(self) -> npt.NDArray[np.float32]:
+        """Compute the background which drifts in time, as set by `set_rolling_background`.
+
+        The rolling background is cached until the background is changed, so the returned
+        array is read-only.
+
+        :raises ValueError: If the rolling background has not been set.
+        :return: A 2D array with the same shape as `dynamic_spectra`, representing the
+        background for each value.
+        """
+        if self._rolling_background_window is None:
+            raise ValueError("A rolling background has not been set.")
+        if self._rolling_background is None:
+            rolling_background = compute_rolling_background(
+                self._dynamic_spectra,
+                self._times,
+                self._rolling_background_window,
+                self._rolling_background_quantile,
+            )
+            rolling_background.flags.writeable = False
+            self._rolling_background = rolling_background
+        return self._rolling_background
 
-    def compute_dynamic_spectra_dBb(self) -> npt.NDArray[np.float32]:
+    def compute_dynamic_spectra_dBb(
+        self,
+        frequency_indices: slice | npt.NDArray[np.intp] = slice(None),
+        time_indices: slice | npt.NDArray[np.intp] = slice(None),
+    ) -> npt.NDArray[np.float32]:
         """Compute the dynamic spectra in units of decibels above the background spectrum.
 
-        The computation applies logarithmic scaling based on the `spectrum_unit`.
+        The computation applies logarithmic scaling based on the `spectrum_unit`. If the dynamic spectra
+        are already in decibels above the background (for example, if they were saved as a quantised
+        product), they are returned unchanged.
+
+        If no indices are given, the whole array is computed, then cached until the background interval
+        is changed. Otherwise, only the selected values are computed, unless the whole array is already
+        cached. Either way, the returned array may be shared, so it must not be modified.
 
+        :param frequency_indices: Selects the spectral components to compute. Defaults to all of them.
+        :param time_indices: Selects the spectrums to compute. Defaults to all of them.
         :raises NotImplementedError: If the spectrum_unit is unrecognised.
-        :return: A 2D array with the same shape as `dynamic_spectra`, representing
-        the values in decibels above the background.
+        :return: A 2D array with one row per selected spectral component and one column per selected
+        spectrum, representing the values in decibels above the background.
         """
-        # Create a 'background' spectrogram where each spectrum is identically the background spectrum
-        background_spectrum = self.compute_background_spectrum()
-        background_spectra = background_spectrum[:, np.newaxis]
-        # Suppress divide by zero and invalid value warnings for this block of code
-        with np.errstate(divide="ignore", invalid="ignore"):
-            if self._spectrum_unit == SpectrumUnit.AMPLITUDE:
-                dynamic_spectra_dBb = 10 * np.log10(
-                    self._dynamic_spectra / background_spectra
-                )
-            else:
-                raise NotImplementedError(
-                    f"{self._spectrum_unit} is unrecognised; decibel conversion is uncertain!"
-                )
-        return dynamic_spectra_dBb.astype(np.float32)
+        selects_all = _selects_all(frequency_indices) and _selects_all(time_indices)
+        if self._dynamic_spectra_dBb is not None:
+            if selects_all:
+                return self._dynamic_spectra_dBb
+            return self._dynamic_spectra_dBb[frequency_indices][:, time_indices]
+
+        dynamic_spectra_dBb = _to_dBb(
+            self._dynamic_spectra[frequency_indices][:, time_indices],
+            lambda: self._compute_background(frequency_indices, time_indices),
+            self._spectrum_unit,
+        )
+        if selects_all:
+            dynamic_spectra_dBb.flags.writeable = False
+            self._dynamic_spectra_dBb = dynamic_spectra_dBb
+        return dynamic_spectra_dBb
 
     def format_start_time(self) -> str:
         """Format the datetime assigned to the first spectrum in the dynamic spectra.
@@ -307,6 +445,45 @@ class Spectrogram:
         self._update_background_indices_from_interval(
             self._start_background, self._end_background
         )
+        self._rolling_background_window = None
+        self._clear_background_caches()
+
+    def set_rolling_background(self, window: float, quantile: float = 0.5) -> None:
+        """Compute decibels above the background relative to a background which drifts in time,
+        rather than the background spectrum.
+
+        The background is a running quantile of each spectral component over a sliding time window,
+        approximated in linear time (see `compute_rolling_background`). Background subtractions, and
+        the background spectrum itself, are unaffected. Calling `set_background` reverts to the
+        background spectrum.
+
+        :param window: The time spanned by the sliding window, in seconds.
+        :param quantile: The quantile taken over the window, from 0 to 1. Defaults to 0.5, for
+        the running median.
+        :raises ValueError: If `window` is not positive, or `quantile` is not between 0 and 1.
+        """
+        if window <= 0:
+            raise ValueError(f"The window must be positive, got {window}")
+        if not 0 <= quantile <= 1:
+            raise ValueError(f"The quantile must be between 0 and 1, got {quantile}")
+        self._rolling_background_window = window
+        self._rolling_background_quantile = quantile
+        self._clear_background_caches()
+
+    def _clear_background_caches(self) -> None:
+        self._background_spectrum = None
+        self._rolling_background = None
+        self._dynamic_spectra_dBb = None
+
+    def _compute_background(
+        self,
+        frequency_indices: slice | npt.NDArray[np.intp],
+        time_indices: slice | npt.NDArray[np.intp],
+    ) -> npt.NDArray[np.float32]:
+        """Get the background of the selected values, broadcastable against them."""
+        if self._rolling_background_window is None:
+            return self.compute_background_spectrum()[frequency_indices][:, np.newaxis]
+        return self.compute_rolling_background()[frequency_indices][:, time_indices]
 
     def _update_background_indices_from_interval(
         self, start_background: str, end_background: str
@@ -371,6 +548,48 @@ class Spectrogram:
             I = normalise_peak_intensity(I)
         return I
 
+    def get_frequency_cuts(
+        self,
+        at_times: typing.Sequence[float | str],
+        dBb: bool = False,
+        peak_normalise: bool = False,
+    ) -> FrequencyCuts:
+        """Retrieve cuts of the dynamic spectra at several times, as a single block.
+
+        If a requested time does not match exactly with a time in `times`, the closest match
+        is selected. Each cut represents one of the spectrums in the spectrogram.
+
+        :param at_times: The requested times for the cuts. If strings, they are parsed
+        as datetimes. If floats, they are treated as elapsed time since the first spectrum.
+        :param dBb: If True, returns the cuts in decibels above the background,
+        defaults to False.
+        :param peak_normalise: If True, normalises each cut such that its peak value
+        is equal to 1. Ignored if dBb is True, defaults to False.
+        :raises ValueError: If at_times are not all floats, or all strings.
+        :return: A FrequencyCuts object containing the spectral values and associated metadata.
+        """
+        indices, times_of_cuts = _find_cut_indices(
+            at_times,
+            self._times,
+            self.datetimes if self.start_datetime_is_set else None,
+        )
+
+        # Fancy indexing makes a copy, which preserves the spectrums on transformations of the cuts
+        if dBb:
+            cuts = self.compute_dynamic_spectra_dBb(time_indices=indices).T
+            if peak_normalise:
+                warnings.warn(
+                    "Ignoring frequency cut normalisation, since dBb units have been specified"
+                )
+        else:
+            cuts = self._dynamic_spectra[:, indices].T
+            if peak_normalise:
+                cuts = normalise_peak_intensity(cuts, axis=-1)
+
+        return FrequencyCuts(
+            times_of_cuts, self._frequencies, cuts, self._spectrum_unit
+        )
+
     def get_frequency_cut(
         self, at_time: float | str, dBb: bool = False, peak_normalise: bool = False
     ) -> FrequencyCut:
@@ -388,47 +607,74 @@ class Spectrogram:
         :raises ValueError: If at_time is not a recognised type.
         :return: A FrequencyCut object containing the spectral values and associated metadata.
         """
+        return self.get_frequency_cuts(
+            [at_time], dBb=dBb, peak_normalise=peak_normalise
+        ).get_cut(0)
 
-        if isinstance(at_time, str):
-            _at_datetime = np.datetime64(
-                datetime.datetime.strptime(
-                    at_time, spectre_server.core.config.TimeFormat.DATETIME
-                )
-            )
-            index_of_cut = find_closest_index(
-                _at_datetime, self.datetimes, enforce_strict_bounds=True
-            )
-            time_of_cut = self.datetimes[index_of_cut]
-
-        elif isinstance(at_time, float):
-            _at_time = np.float32(at_time)
-            index_of_cut = find_closest_index(
-                _at_time, self._times, enforce_strict_bounds=True
-            )
-            time_of_cut = self.times[index_of_cut]
+    def get_time_cuts(
+        self,
+        at_frequencies: typing.Sequence[float],
+        dBb: bool = False,
+        peak_normalise=False,
+        correct_background=False,
+        return_time_type: TimeType = TimeType.RELATIVE,
+    ) -> TimeCuts:
+        """Retrieve cuts of the dynamic spectra at several frequencies, as a single block.
 
-        else:
-            raise ValueError(f"'at_time' type '{type(at_time)}' is unsupported.")
+        If a requested frequency does not exactly match a frequency in `frequencies`, the
+        closest match is selected. Each cut represents the time series of some spectral
+        component.
 
-        if dBb:
-            ds = self.compute_dynamic_spectra_dBb()
+        :param at_frequencies: The requested frequencies for the cuts, in Hz.
+        :param dBb: If True, returns the cuts in decibels above the background.
+        Defaults to False.
+        :param peak_normalise: If True, normalises each cut so its peak value is 1.
+        Ignored if dBb is True. Defaults to False.
+        :param correct_background: If True, subtracts the background from each cut.
+        Ignored if dBb is True. Defaults to False.
+        :param return_time_type: Specifies the type of time values in the cuts
+        (TimeType.RELATIVE or TimeType.DATETIMES). Defaults to TimeType.RELATIVE.
+        :raises ValueError: If return_time_type is not recognised.
+        :return: A TimeCuts object containing the temporal values and associated metadata.
+        """
+        times: npt.NDArray[np.float32] | npt.NDArray[np.datetime64]
+        if return_time_type == TimeType.DATETIMES:
+            times = self.datetimes
+        elif return_time_type == TimeType.RELATIVE:
+            times = self.times
         else:
-            ds = self._dynamic_spectra
+            raise ValueError(
+                f"Invalid return_time_type. Got {return_time_type}, "
+                f"expected one of 'datetimes' or 'seconds'"
+            )
 
-        cut = ds[
-            :, index_of_cut
-        ].copy()  # make a copy so to preserve the spectrum on transformations of the cut
+        indices = find_closest_indices(
+            np.array(at_frequencies, dtype=np.float32),
+            self._frequencies,
+            enforce_strict_bounds=True,
+        )
 
+        # Fancy indexing makes a copy, which preserves the spectrums on transformations of the cuts
         if dBb:
-            if peak_normalise:
+            cuts = self.compute_dynamic_spectra_dBb(frequency_indices=indices)
+            # Warn if dBb is used with background correction or peak normalisation
+            if correct_background or peak_normalise:
                 warnings.warn(
-                    "Ignoring frequency cut normalisation, since dBb units have been specified"
+                    "Ignoring time cut normalisation, since dBb units have been specified"
                 )
         else:
+            cuts = self._dynamic_spectra[indices]
+            # Apply background correction if required
+            if correct_background:
+                cuts = subtract_background(
+                    cuts, self._start_background_index, self._end_background_index
+                )
+
+            # Apply peak normalisation if required
             if peak_normalise:
-                cut = normalise_peak_intensity(cut)
+                cuts = normalise_peak_intensity(cuts, axis=-1)
 
-        return FrequencyCut(time_of_cut, self._frequencies, cut, self._spectrum_unit)
+        return TimeCuts(self._frequencies[indices], times, cuts, self._spectrum_unit)
 
     def get_time_cut(
         self,
@@ -456,48 +702,13 @@ class Spectrogram:
         :raises ValueError: If return_time_type is not recognised.
         :return: A TimeCut object containing the temporal values and associated metadata.
         """
-        _at_frequency = np.float32(at_frequency)
-        index_of_cut = find_closest_index(
-            _at_frequency, self._frequencies, enforce_strict_bounds=True
-        )
-        frequency_of_cut = float(self.frequencies[index_of_cut])
-
-        # dependent on the requested cut type, we return the dynamic spectra in the preferred units
-        if dBb:
-            ds = self.compute_dynamic_spectra_dBb()
-        else:
-            ds = self.dynamic_spectra
-
-        cut = ds[
-            index_of_cut, :
-        ].copy()  # make a copy so to preserve the spectrum on transformations of the cut
-
-        # Warn if dBb is used with background correction or peak normalisation
-        if dBb:
-            if correct_background or peak_normalise:
-                warnings.warn(
-                    "Ignoring time cut normalisation, since dBb units have been specified"
-                )
-        else:
-            # Apply background correction if required
-            if correct_background:
-                cut = subtract_background(
-                    cut, self._start_background_index, self._end_background_index
-                )
-
-            # Apply peak normalisation if required
-            if peak_normalise:
-                cut = normalise_peak_intensity(cut)
-
-        if return_time_type == TimeType.DATETIMES:
-            return TimeCut(frequency_of_cut, self.datetimes, cut, self.spectrum_unit)
-        elif return_time_type == TimeType.RELATIVE:
-            return TimeCut(frequency_of_cut, self.times, cut, self.spectrum_unit)
-        else:
-            raise ValueError(
-                f"Invalid return_time_type. Got {return_time_type}, "
-                f"expected one of 'datetimes' or 'seconds'"
-            )
+        return self.get_time_cuts(
+            [at_frequency],
+            dBb=dBb,
+            peak_normalise=peak_normalise,
+            correct_background=correct_background,
+            return_time_type=return_time_type,
+        ).get_cut(0)
 
     def save(
         self,
@@ -510,23 +721,25 @@ class Spectrogram:
         obs_lat: float,
         obs_lon: float,
         batches_dir_path: typing.Optional[str] = None,
+        compression: FitsCompression = FitsCompression.NONE,
+        quantisation_bits: int = 0,
     ) -> None:
-        """Write the spectrogram and its associated metadata to a batch file in the FITS format."""
-        # Create the primary HDU.
-        primary_hdu = astropy.io.fits.PrimaryHDU(self.dynamic_spectra)
-
-        primary_hdu.header.set("SIMPLE", True)
-        primary_hdu.header.set("BITPIX", -32)
-        primary_hdu.header.set("NAXIS", 2)
-        primary_hdu.header.set("NAXIS1", self.num_times)
-        primary_hdu.header.set("NAXIS2", self.num_frequencies)
-        primary_hdu.header.set("EXTEND", True)
-
-        comment = (
-            "FITS (Flexible Image Transport System) format defined in Astronomy and Astrophysics Supplement Series v44/p363, v44/p371, v73/p359, v73/p365. Contact the NASA Science Office of Standards and Technology for the FITS Definition document #100 and other FITS information."
-            ""
-        )
-        primary_hdu.header.add_comment(comment)
+        """Write the spectrogram and its associated metadata to a batch file in the FITS format.
+
+        By default, the file is written uncompressed with a purpose-built codec, falling back to `astropy`
+        if the spectrogram can't be written in spectre's fixed layout (for example, if the dynamic spectra
+        are integers).
+
+        :param compression: Optionally tile-compress the dynamic spectra, defaults to no compression.
+        :param quantisation_bits: If 8 or 16, instead save the dynamic spectra in decibels above the
+        background, quantised to integers with this many bits. Defaults to 0, for no quantisation.
+        """
+        if quantisation_bits:
+            dynamic_spectra = self.compute_dynamic_spectra_dBb()
+            spectrum_unit = SpectrumUnit.DECIBELS_ABOVE_BACKGROUND
+        else:
+            dynamic_spectra = self.dynamic_spectra
+            spectrum_unit = self.spectrum_unit
 
         start_datetime = typing.cast(
             datetime.datetime, self.datetimes[0].astype(datetime.datetime)
@@ -540,63 +753,36 @@ class Spectrogram:
         end_date = end_datetime.strftime("%Y-%m-%d")
         end_time = end_datetime.strftime("%H:%M:%S.%f")
 
-        primary_hdu.header.set("DATE", start_date)
-        primary_hdu.header.set("CONTENT", f"{start_date} dynamic spectrogram")
-        primary_hdu.header.set("ORIGIN", f"{origin}")
-        primary_hdu.header.set("TELESCOP", f"{telescope}")
-        primary_hdu.header.set("INSTRUME", f"{instrument}")
-        primary_hdu.header.set("OBJECT", f"{object}")
-
-        primary_hdu.header.set("DATE-OBS", f"{start_date}")
-        primary_hdu.header.set("TIME-OBS", f"{start_time}")
-        primary_hdu.header.set("DATE-END", f"{end_date}")
-        primary_hdu.header.set("TIME-END", f"{end_time}")
-
-        primary_hdu.header.set("BZERO", 0)
-        primary_hdu.header.set("BSCALE", 1)
-        primary_hdu.header.set("BUNIT", f"{self.spectrum_unit.value}")
-
-        primary_hdu.header.set("DATAMIN", np.nanmin(self.dynamic_spectra))
-        primary_hdu.header.set("DATAMAX", np.nanmax(self.dynamic_spectra))
-
-        primary_hdu.header.set("CRVAL1", f"{_seconds_of_day(start_datetime)}")
-        primary_hdu.header.set("CRPIX1", 0)
-        primary_hdu.header.set("CTYPE1", "TIME [UT]")
-        primary_hdu.header.set("CDELT1", self.time_resolution)
-
-        primary_hdu.header.set("CRVAL2", 0)
-        primary_hdu.header.set("CRPIX2", 0)
-        primary_hdu.header.set("CTYPE2", "Frequency [MHz]")
-        primary_hdu.header.set("CDELT2", self.frequency_resolution)
-
-        primary_hdu.header.set("OBS_LAT", f"{obs_lat}")
-        primary_hdu.header.set("OBS_LAC", "N")
-        primary_hdu.header.set("OBS_LON", f"{obs_lon}")
-        primary_hdu.header.set("OBS_LOC", "W")
-        primary_hdu.header.set("OBS_ALT", f"{obs_alt}")
-
-        # Create the Binary table HDU, wrapping the arrays to mimic the e-CALLISTO FITS files.
-        times = np.array([self.times])
-        frequencies_MHz = self.frequencies * 1e-6  # Convert to MHz
-        frequencies = np.array([frequencies_MHz])
-        col1 = astropy.io.fits.Column(name="TIME", format="PD", array=times)
-        col2 = astropy.io.fits.Column(name="FREQUENCY", format="PD", array=frequencies)
-        cols = astropy.io.fits.ColDefs([col1, col2])
-        bin_table_hdu = astropy.io.fits.BinTableHDU.from_columns(cols)
-        bin_table_hdu.header.set("PCOUNT", 0)
-        bin_table_hdu.header.set("GCOUNT", 1)
-        bin_table_hdu.header.set("TFIELDS", 2)
-        bin_table_hdu.header.set("TTYPE1", "TIME")
-        bin_table_hdu.header.set("TFORM1", "D")
-        bin_table_hdu.header.set("TTYPE2", "FREQUENCY")
-        bin_table_hdu.header.set("TFORM2", "D")
-        bin_table_hdu.header.set("TSCAL1", 1, "")
-        bin_table_hdu.header.set("TZERO1", 0, "")
-        bin_table_hdu.header.set("TSCAL2", 1, "")
-        bin_table_hdu.header.set("TZERO2", 0, "")
-
-        # Combine the HDUs, and write them to the filesystem as a file in the FITS format.
-        hdul = astropy.io.fits.HDUList([primary_hdu, bin_table_hdu])
+        header: dict[str, HeaderValue | np.number] = {
+            "DATE": start_date,
+            "CONTENT": f"{start_date} dynamic spectrogram",
+            "ORIGIN": f"{origin}",
+            "TELESCOP": f"{telescope}",
+            "INSTRUME": f"{instrument}",
+            "OBJECT": f"{object}",
+            "DATE-OBS": f"{start_date}",
+            "TIME-OBS": f"{start_time}",
+            "DATE-END": f"{end_date}",
+            "TIME-END": f"{end_time}",
+            "BZERO": 0,
+            "BSCALE": 1,
+            "BUNIT": f"{spectrum_unit.value}",
+            "DATAMIN": np.nanmin(dynamic_spectra),
+            "DATAMAX": np.nanmax(dynamic_spectra),
+            "CRVAL1": f"{_seconds_of_day(start_datetime)}",
+            "CRPIX1": 0,
+            "CTYPE1": "TIME [UT]",
+            "CDELT1": self.time_resolution,
+            "CRVAL2": 0,
+            "CRPIX2": 0,
+            "CTYPE2": "Frequency [MHz]",
+            "CDELT2": self.frequency_resolution,
+            "OBS_LAT": f"{obs_lat}",
+            "OBS_LAC": "N",
+            "OBS_LON": f"{obs_lon}",
+            "OBS_LOC": "W",
+            "OBS_ALT": f"{obs_alt}",
+        }
 
         dt = typing.cast(
             datetime.datetime, self.start_datetime.astype(datetime.datetime)
@@ -604,7 +790,7 @@ class Spectrogram:
         batch_parent_path = (
             batches_dir_path
             or spectre_server.core.config.paths.get_batches_dir_path(
-                year=dt.year, month=dt.month, day=dt.day
+                year=dt.year, month=dt.month, day=dt.day, hour=dt.hour, minute=dt.minute
             )
         )
         if not os.path.exists(batch_parent_path):
@@ -612,7 +798,112 @@ class Spectrogram:
         file_path = os.path.join(
             batch_parent_path, f"{self.format_start_time()}_{tag}.fits"
         )
-        hdul.writeto(file_path, overwrite=True)
+
+        frequencies = self.frequencies * 1e-6  # Convert to MHz
+        if compression == FitsCompression.NONE and not quantisation_bits:
+            try:
+                write_fits(
+                    file_path=file_path,
+                    dynamic_spectra=dynamic_spectra,
+                    times=self.times,
+                    frequencies=frequencies,
+                    header=header,
+                    comment=_FITS_COMMENT,
+                )
+                return
+            except spectre_server.core.exceptions.UnsupportedFitsLayoutError:
+                pass
+
+        # Compressed, quantised, or otherwise unsupported layouts are written with astropy.
+        write_fits_with_astropy(
+            file_path=file_path,
+            dynamic_spectra=dynamic_spectra,
+            times=self.times,
+            frequencies=frequencies,
+            header=header,
+            comment=_FITS_COMMENT,
+            compression=compression,
+            quantisation_bits=quantisation_bits,
+        )
+
+
+def _to_dBb(
+    dynamic_spectra: npt.NDArray[np.float32],
+    compute_background: typing.Callable[[], npt.NDArray[np.float32]],
+    spectrum_unit: SpectrumUnit,
+) -> npt.NDArray[np.float32]:
+    """Convert dynamic spectra to decibels above the background.
+
+    :param dynamic_spectra: The dynamic spectra to convert, in units of `spectrum_unit`.
+    :param compute_background: Returns the background of the dynamic spectra, broadcastable against
+    them. Only called if a conversion is required.
+    :param spectrum_unit: The unit of the dynamic spectra values.
+    :raises NotImplementedError: If the spectrum_unit is unrecognised.
+    :return: A new array of the values in decibels above the background.
+    """
+    if spectrum_unit == SpectrumUnit.DECIBELS_ABOVE_BACKGROUND:
+        return dynamic_spectra.astype(np.float32)
+
+    if spectrum_unit != SpectrumUnit.AMPLITUDE:
+        raise NotImplementedError(
+            f"{spectrum_unit} is unrecognised; decibel conversion is uncertain!"
+        )
+    background = compute_background()
+    # Suppress divide by zero and invalid value warnings for this block of code
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (10 * np.log10(dynamic_spectra / background)).astype(np.float32)
+
+
+def _find_cut_indices(
+    at_times: typing.Sequence[float | str],
+    times: npt.NDArray[np.float32],
+    datetimes: typing.Optional[npt.NDArray[np.datetime64]],
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.float32 | np.datetime64]]:
+    """Find the spectrum closest to each requested time.
+
+    :param at_times: The requested times. If strings, they are parsed as datetimes. If floats, they
+    are treated as elapsed time since the first spectrum.
+    :param times: The elapsed time of each spectrum.
+    :param datetimes: The datetime of each spectrum, or None if the start datetime is not set.
+    :raises ValueError: If at_times are not all floats, or all strings.
+    :return: The index of each closest spectrum, and its time, of the same type as requested.
+    """
+    at_strs = [at_time for at_time in at_times if isinstance(at_time, str)]
+    at_floats = [at_time for at_time in at_times if isinstance(at_time, float)]
+    if len(at_strs) == len(at_times):
+        if datetimes is None:
+            raise ValueError(f"A start time has not been set.")
+        at_datetimes = np.array(
+            [
+                np.datetime64(
+                    datetime.datetime.strptime(
+                        at_time, spectre_server.core.config.TimeFormat.DATETIME
+                    )
+                )
+                for at_time in at_strs
+            ],
+            dtype=datetimes.dtype,
+        )
+        indices = find_closest_indices(
+            at_datetimes, datetimes, enforce_strict_bounds=True
+        )
+        return indices, datetimes[indices]
+
+    if len(at_floats) == len(at_times):
+        indices = find_closest_indices(
+            np.array(at_floats, dtype=np.float32), times, enforce_strict_bounds=True
+        )
+        return indices, times[indices]
+
+    types = sorted({type(at_time).__name__ for at_time in at_times})
+    raise ValueError(
+        f"Expected the times of the cuts to be all floats or all strings, got '{types}'"
+    )
+
+
+def _selects_all(indices: slice | npt.NDArray[np.intp]) -> bool:
+    """Check whether indices are the slice selecting every element along an axis."""
+    return isinstance(indices, slice) and indices == slice(None)
 
 
 def _seconds_of_day(dt: datetime.datetime) -> float:
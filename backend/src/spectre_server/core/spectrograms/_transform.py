@@ -6,31 +6,43 @@ import datetime
 import math
 
 import numpy as np
+import numpy.typing as npt
 
 from ._array_operations import find_closest_index, moving_average, time_elapsed
 from ._spectrogram import Spectrogram
 
 
-def frequency_chop(
-    spectrogram: Spectrogram, start_frequency: float, end_frequency: float
-) -> Spectrogram:
-    """
-    Extracts a portion of the spectrogram within the specified frequency range.
+def _order_chop_indices(start_index: int, end_index: int) -> tuple[int, int]:
+    """Enforce distinct start and end indices, ordered such that `start_index < end_index`."""
+    # enforce distinct start and end indices
+    if start_index == end_index:
+        raise ValueError(
+            f"Start and end indices are equal! Got start_index: {start_index} and end_index: {end_index}"
+        )
 
-    :param spectrogram: The input spectrogram to process.
+    # if start index is more than end index, swap the ordering so to enforce start_index <= end_index
+    if start_index > end_index:
+        start_index, end_index = end_index, start_index
+    return start_index, end_index
+
+
+def get_frequency_chop_indices(
+    frequencies: npt.NDArray[np.float32], start_frequency: float, end_frequency: float
+) -> tuple[int, int]:
+    """Find the (inclusive) indices of the frequencies bounding a frequency range.
+
+    :param frequencies: The physical frequencies assigned to each spectral component, in Hz.
     :param start_frequency: The starting frequency of the desired range (Hz).
     :param end_frequency: The ending frequency of the desired range (Hz).
-    :raises ValueError: If the specified frequency range is entirely outside the spectrogram's frequency range.
+    :raises ValueError: If the specified frequency range is entirely outside the frequency range.
     :raises ValueError: If the start and end indices for the frequency range are identical.
-    :return: A new spectrogram containing only the specified frequency range.
+    :return: The start and end index, such that the start index is less than the end index.
     """
     is_entirely_below_frequency_range = (
-        start_frequency < spectrogram.frequencies[0]
-        and end_frequency < spectrogram.frequencies[0]
+        start_frequency < frequencies[0] and end_frequency < frequencies[0]
     )
     is_entirely_above_frequency_range = (
-        start_frequency > spectrogram.frequencies[-1]
-        and end_frequency > spectrogram.frequencies[-1]
+        start_frequency > frequencies[-1] and end_frequency > frequencies[-1]
     )
     if is_entirely_below_frequency_range or is_entirely_above_frequency_range:
         raise ValueError(
@@ -38,20 +50,61 @@ def frequency_chop(
         )
 
     # find the index of the nearest matching frequency bins in the spectrogram
-    start_index = find_closest_index(
-        np.float32(start_frequency), spectrogram.frequencies
-    )
-    end_index = find_closest_index(np.float32(end_frequency), spectrogram.frequencies)
+    start_index = find_closest_index(np.float32(start_frequency), frequencies)
+    end_index = find_closest_index(np.float32(end_frequency), frequencies)
+    return _order_chop_indices(start_index, end_index)
 
-    # enforce distinct start and end indices
-    if start_index == end_index:
+
+def get_time_chop_indices(
+    datetimes: npt.NDArray[np.datetime64],
+    start_datetime: datetime.datetime,
+    end_datetime: datetime.datetime,
+) -> tuple[int, int]:
+    """Find the (inclusive) indices of the spectrums bounding a time range.
+
+    :param datetimes: The datetimes associated with each spectrum.
+    :param start_datetime: The starting time of the desired range.
+    :param end_datetime: The ending time of the desired range.
+    :raises ValueError: If the specified time range is entirely outside the time range.
+    :raises ValueError: If the start and end indices for the time range are identical.
+    :return: The start and end index, such that the start index is less than the end index.
+    """
+    start_datetime64 = np.datetime64(start_datetime)
+    end_datetime64 = np.datetime64(end_datetime)
+
+    is_entirely_below_time_range = (
+        start_datetime64 < datetimes[0] and end_datetime64 < datetimes[0]
+    )
+    is_entirely_above_time_range = (
+        start_datetime64 > datetimes[-1] and end_datetime64 > datetimes[-1]
+    )
+    if is_entirely_below_time_range or is_entirely_above_time_range:
         raise ValueError(
-            f"Start and end indices are equal! Got start_index: {start_index} and end_index: {end_index}"
+            f"Requested time interval is entirely out of range of the input spectrogram."
         )
 
-    # if start index is more than end index, swap the ordering so to enforce start_index <= end_index
-    if start_index > end_index:
-        start_index, end_index = end_index, start_index
+    # find the index of the nearest matching spectrums in the spectrogram.
+    start_index = find_closest_index(start_datetime64, datetimes)
+    end_index = find_closest_index(end_datetime64, datetimes)
+    return _order_chop_indices(start_index, end_index)
+
+
+def frequency_chop(
+    spectrogram: Spectrogram, start_frequency: float, end_frequency: float
+) -> Spectrogram:
+    """
+    Extracts a portion of the spectrogram within the specified frequency range.
+
+    :param spectrogram: The input spectrogram to process.
+    :param start_frequency: The starting frequency of the desired range (Hz).
+    :param end_frequency: The ending frequency of the desired range (Hz).
+    :raises ValueError: If the specified frequency range is entirely outside the spectrogram's frequency range.
+    :raises ValueError: If the start and end indices for the frequency range are identical.
+    :return: A new spectrogram containing only the specified frequency range.
+    """
+    start_index, end_index = get_frequency_chop_indices(
+        spectrogram.frequencies, start_frequency, end_frequency
+    )
 
     # chop the spectrogram accordingly
     transformed_dynamic_spectra = spectrogram.dynamic_spectra[
@@ -83,35 +136,9 @@ def time_chop(
     :raises ValueError: If the start and end indices for the time range are identical.
     :return: A new spectrogram containing only the specified time range.
     """
-    start_datetime64 = np.datetime64(start_datetime)
-    end_datetime64 = np.datetime64(end_datetime)
-
-    is_entirely_below_time_range = (
-        start_datetime64 < spectrogram.datetimes[0]
-        and end_datetime64 < spectrogram.datetimes[0]
-    )
-    is_entirely_above_time_range = (
-        start_datetime64 > spectrogram.datetimes[-1]
-        and end_datetime64 > spectrogram.datetimes[-1]
+    start_index, end_index = get_time_chop_indices(
+        spectrogram.datetimes, start_datetime, end_datetime
     )
-    if is_entirely_below_time_range or is_entirely_above_time_range:
-        raise ValueError(
-            f"Requested time interval is entirely out of range of the input spectrogram."
-        )
-
-    # find the index of the nearest matching spectrums in the spectrogram.
-    start_index = find_closest_index(start_datetime64, spectrogram.datetimes)
-    end_index = find_closest_index(end_datetime64, spectrogram.datetimes)
-
-    # enforce distinct start and end indices
-    if start_index == end_index:
-        raise ValueError(
-            f"Start and end indices are equal! Got start_index: {start_index} and end_index: {end_index}"
-        )
-
-    # if start index is more than end index, swap the ordering so to enforce start_index <= end_index
-    if start_index > end_index:
-        start_index, end_index = end_index, start_index
 
     # chop the spectrogram accordingly
     transformed_dynamic_spectra = spectrogram.dynamic_spectra[
@@ -132,24 +159,42 @@ def time_chop(
     )
 
 
-def time_average(spectrogram: Spectrogram, resolution: float) -> Spectrogram:
-    """Average a spectrogram in time to a desired resolution by applying a moving average.
+def get_average_window_size(
+    resolution: float, current_resolution: float, current_range: float, axis_name: str
+) -> int:
+    """Find the number of items to average over in each window, to average an axis to a desired resolution.
 
-    :param spectrogram: The input spectrogram to process.
-    :param resolution: The desired time resolution.
+    :param resolution: The desired resolution.
+    :param current_resolution: The current resolution of the axis.
+    :param current_range: The current range of the axis.
+    :param axis_name: The name of the axis, used in error messages.
+    :raises ValueError: If the desired resolution is less than the current resolution.
+    :raises ValueError: If the desired resolution is not less than the range of the axis.
+    :return: The window size.
     """
-
-    if resolution < spectrogram.time_resolution:
+    if resolution < current_resolution:
         raise ValueError(
-            f"Desired time resolution {resolution} is less than the current {spectrogram.time_resolution}"
+            f"Desired {axis_name} resolution {resolution} is less than the current {current_resolution}"
         )
 
-    if resolution >= spectrogram.time_range:
+    if resolution >= current_range:
         raise ValueError(
-            f"Desired time resolution {resolution} must be less than the time range {spectrogram.time_range}"
+            f"Desired {axis_name} resolution {resolution} must be less than the {axis_name} range {current_range}"
         )
 
-    window_size = math.floor(resolution / spectrogram.time_resolution)
+    return math.floor(resolution / current_resolution)
+
+
+def time_average(spectrogram: Spectrogram, resolution: float) -> Spectrogram:
+    """Average a spectrogram in time to a desired resolution by applying a moving average.
+
+    :param spectrogram: The input spectrogram to process.
+    :param resolution: The desired time resolution.
+    """
+
+    window_size = get_average_window_size(
+        resolution, spectrogram.time_resolution, spectrogram.time_range, "time"
+    )
     transformed_dynamic_spectra = moving_average(
         spectrogram.dynamic_spectra, window_size, axis=1
     )
@@ -176,17 +221,12 @@ def frequency_average(spectrogram: Spectrogram, resolution: float) -> Spectrogra
     :param resolution: The desired frequency resolution.
     """
 
-    if resolution < spectrogram.frequency_resolution:
-        raise ValueError(
-            f"Desired frequency resolution {resolution} is less than the current {spectrogram.frequency_resolution}"
-        )
-
-    if resolution >= spectrogram.frequency_range:
-        raise ValueError(
-            f"Desired frequency resolution {resolution} must be less than the frequency range {spectrogram.time_range}"
-        )
-
-    window_size = math.floor(resolution / spectrogram.frequency_resolution)
+    window_size = get_average_window_size(
+        resolution,
+        spectrogram.frequency_resolution,
+        spectrogram.frequency_range,
+        "frequency",
+    )
     transformed_dynamic_spectra = moving_average(
         spectrogram.dynamic_spectra, window_size, axis=0
     )
@@ -6,10 +6,13 @@ import typing
 import functools
 import os
 import traceback
+import mimetypes
 import enum
 import http
+import zlib
 
 import flask
+import werkzeug.wsgi
 
 """This module implements the JSend specification. For more information, please refer
 to https://github.com/omniti-labs/jsend"""
@@ -113,7 +116,113 @@ def jsendify_response(
 
 def serve_from_directory(
     file_path: str,
+    max_age: typing.Optional[int] = None,
 ) -> flask.Response:
-    """Light wrapper for Flask's `send_from_directory`."""
+    """Light wrapper for Flask's `send_from_directory`.
+
+    :param file_path: The file to serve.
+    :param max_age: Optionally, how long clients may cache the file for, in seconds, defaults to None.
+    """
     parent_dir, file_name = os.path.split(file_path)
-    return flask.send_from_directory(parent_dir, file_name, as_attachment=True)
+    return flask.send_from_directory(
+        parent_dir, file_name, as_attachment=True, max_age=max_age
+    )
+
+
+class _FileRangeWrapper(werkzeug.wsgi.FileWrapper):
+    def __init__(
+        self, file: typing.IO[bytes], num_bytes: int, buffer_size: int = 8192
+    ) -> None:
+        """Iterate over a range of bytes in a file, starting from its current position.
+
+        :param file: The file, positioned at the start of the range.
+        :param num_bytes: The number of bytes in the range.
+        :param buffer_size: The maximum number of bytes in each chunk, defaults to 8192.
+        """
+        super().__init__(file, buffer_size)
+        self.__remaining = num_bytes
+
+    def __next__(self) -> bytes:
+        data = self.file.read(min(self.buffer_size, self.__remaining))
+        if not data:
+            raise StopIteration()
+        self.__remaining -= len(data)
+        return data
+
+
+def serve_file_range(
+    file_path: str, offset: int, num_bytes: int, download_name: str
+) -> flask.Response:
+    """Serve a range of bytes from a file as an attachment, without copying them where possible.
+
+    :param file_path: The path of the file.
+    :param offset: The offset of the first byte in the range.
+    :param num_bytes: The number of bytes in the range.
+    :param download_name: The name of the downloaded file.
+    """
+    file = open(file_path, "rb")
+    file.seek(offset)
+    if "wsgi.file_wrapper" in flask.request.environ:
+        # The server sends at most `Content-Length` bytes from the current position of the file,
+        # with `os.sendfile` where it's supported (such as gunicorn).
+        body: typing.Iterable[bytes] = werkzeug.wsgi.wrap_file(
+            flask.request.environ, file
+        )
+    else:
+        body = _FileRangeWrapper(file, num_bytes)
+    return flask.Response(
+        body,
+        mimetype=mimetypes.guess_type(download_name)[0] or "application/octet-stream",
+        headers={
+            "Content-Length": str(num_bytes),
+            "Content-Disposition": f'attachment; filename="{download_name}"',
+        },
+        # Pass the file wrapper straight through to the WSGI server.
+        direct_passthrough=True,
+    )
+
+
+# Compress streamed responses quickly, since numeric data compresses little at higher levels.
+_GZIP_COMPRESSION_LEVEL = 1
+
+
+def _gzip_chunks(chunks: typing.Iterable[bytes]) -> typing.Iterator[bytes]:
+    """Compress chunks of bytes into a single gzip stream, as they're produced."""
+    compressor = zlib.compressobj(
+        _GZIP_COMPRESSION_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+    )
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_chunks(
+    chunks: typing.Iterable[bytes],
+    num_bytes: int,
+    download_name: str,
+    headers: typing.Optional[dict[str, str]] = None,
+) -> flask.Response:
+    """Stream chunks of bytes as an attachment, compressed with gzip if the client accepts it.
+
+    :param chunks: The chunks to stream, produced lazily.
+    :param num_bytes: The total number of bytes in the chunks, before any compression.
+    :param download_name: The name of the downloaded file.
+    :param headers: Any additional headers for the response.
+    """
+    headers = {
+        **(headers or {}),
+        "Content-Disposition": f'attachment; filename="{download_name}"',
+        "Vary": "Accept-Encoding",
+    }
+    if flask.request.accept_encodings["gzip"]:
+        chunks = _gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    else:
+        headers["Content-Length"] = str(num_bytes)
+    return flask.Response(
+        flask.stream_with_context(iter(chunks)),
+        mimetype="application/octet-stream",
+        headers=headers,
+    )
@@ -5,6 +5,8 @@
 import datetime
 import typing
 
+import flask
+
 
 def validate_date(
     year: typing.Optional[int] = None,
@@ -46,3 +48,16 @@ def validate_date(
 def is_true(value: str):
     """Truthy callable for boolean query parameter values."""
     return value.lower() == "true"
+
+
+def get_required_arg(name: str) -> str:
+    """Get the value of a query parameter which must be specified.
+
+    :param name: The name of the query parameter.
+    :raises ValueError: If the query parameter is not specified.
+    :return: The value of the query parameter.
+    """
+    value = flask.request.args.get(name, type=str)
+    if value is None:
+        raise ValueError(f"The query parameter `{name}` must be specified.")
+    return value
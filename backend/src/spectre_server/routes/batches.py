@@ -3,12 +3,17 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 
+import typing
 import flask
 import os
 
 from ..services import batches as services
-from ._utils import validate_date, is_true
-from ._format_responses import jsendify_response, serve_from_directory
+from ._utils import validate_date, is_true, get_required_arg
+from ._format_responses import (
+    jsendify_response,
+    serve_from_directory,
+    serve_file_range,
+)
 
 batches_blueprint = flask.Blueprint(
     "batches", __name__, url_prefix="/spectre-data/batches"
@@ -33,7 +38,11 @@ def get_batch_file_endpoints(batch_file_paths: list[str]) -> list[str]:
 
 @batches_blueprint.route("/<string:file_name>", methods=["GET"])
 def get_batch_file(file_name: str) -> flask.Response:
-    return serve_from_directory(services.get_batch_file(file_name))
+    file_path, offset, num_bytes = services.get_batch_file_location(file_name)
+    if num_bytes is None:
+        return serve_from_directory(file_path)
+    # The batch file is packed in an archive.
+    return serve_file_range(file_path, offset, num_bytes, file_name)
 
 
 @batches_blueprint.route("/<string:file_name>", methods=["DELETE"])
@@ -59,6 +68,24 @@ def get_batch_files() -> list[str]:
     return get_batch_file_endpoints(batch_files)
 
 
+@batches_blueprint.route("/sizes", methods=["GET"])
+@jsendify_response
+def get_batch_file_sizes() -> dict[str, int]:
+    year = flask.request.args.get("year", type=int)
+    month = flask.request.args.get("month", type=int)
+    day = flask.request.args.get("day", type=int)
+    tags = flask.request.args.getlist("tag")
+    extensions = flask.request.args.getlist("extension")
+    validate_date(year, month, day)
+    batch_file_sizes = services.get_batch_file_sizes(
+        tags, extensions, year=year, month=month, day=day
+    )
+    return {
+        get_batch_file_endpoint(batch_file_path): num_bytes
+        for batch_file_path, num_bytes in batch_file_sizes.items()
+    }
+
+
 @batches_blueprint.route("/", methods=["DELETE"])
 @jsendify_response
 def delete_batch_files() -> list[str]:
@@ -75,6 +102,73 @@ def delete_batch_files() -> list[str]:
     return get_batch_file_endpoints(batch_files)
 
 
+@batches_blueprint.route("/iqz", methods=["PUT"])
+@jsendify_response
+def compress_iq_batch_files() -> list[str]:
+    year = flask.request.args.get("year", type=int)
+    month = flask.request.args.get("month", type=int)
+    day = flask.request.args.get("day", type=int)
+    tags = flask.request.args.getlist("tag")
+    codec = flask.request.args.get("codec", default="zlib")
+    dry_run = flask.request.args.get("dry_run", type=is_true, default=False)
+    validate_date(year, month, day)
+    iqz_files = services.compress_iq_batch_files(
+        tags, codec, year=year, month=month, day=day, dry_run=dry_run
+    )
+    return get_batch_file_endpoints(iqz_files)
+
+
+@batches_blueprint.route("/archives", methods=["PUT"])
+@jsendify_response
+def archive_batch_files() -> list[str]:
+    year = flask.request.args.get("year", type=int)
+    month = flask.request.args.get("month", type=int)
+    day = flask.request.args.get("day", type=int)
+    tags = flask.request.args.getlist("tag")
+    extensions = flask.request.args.getlist("extension")
+    dry_run = flask.request.args.get("dry_run", type=is_true, default=False)
+    validate_date(year, month, day)
+    batch_files = services.archive_batch_files(
+        tags, extensions, year=year, month=month, day=day, dry_run=dry_run
+    )
+    return get_batch_file_endpoints(batch_files)
+
+
+@batches_blueprint.route("/partitions", methods=["PUT"])
+@jsendify_response
+def migrate_batch_files() -> list[str]:
+    dry_run = flask.request.args.get("dry_run", type=is_true, default=False)
+    batch_files = services.migrate_batch_files(dry_run=dry_run)
+    return get_batch_file_endpoints(batch_files)
+
+
+@batches_blueprint.route("/retention", methods=["PUT"])
+@jsendify_response
+def sweep_retention() -> dict[str, typing.Any]:
+    json = flask.request.get_json()
+    policies = json.get("policies")
+    grace_period = json.get("grace_period", 60)
+    dry_run = json.get("dry_run", False)
+    report = services.sweep_retention(policies, grace_period, dry_run)
+    report["file_paths"] = get_batch_file_endpoints(report["file_paths"])
+    return report
+
+
+@batches_blueprint.route("/retention", methods=["POST"])
+@jsendify_response
+def enforce_retention() -> str:
+    json = flask.request.get_json()
+    policies = json.get("policies")
+    duration = json.get("duration")
+    interval = json.get("interval", 600)
+    grace_period = json.get("grace_period", 60)
+    force_restart = json.get("force_restart", False)
+    max_restarts = json.get("max_restarts", 5)
+    return services.enforce_retention(
+        policies, duration, interval, grace_period, force_restart, max_restarts
+    )
+
+
 @batches_blueprint.route(
     "/<string:file_name>/analytical-test-results",
     methods=["GET"],
@@ -99,14 +193,37 @@ def get_tags() -> list[str]:
     return services.get_tags(year, month, day)
 
 
+def _get_figsize(json: dict[str, typing.Any]) -> tuple[int, int]:
+    figsize_x = json.get("figsize_x")
+    figsize_y = json.get("figsize_y")
+    # Handle the edge cases for figsize being specified.
+    if figsize_x is None and figsize_y is None:
+        # If nothing is specified, set an arbitrary default value.
+        return (15, 8)
+    elif figsize_x is None or figsize_y is None:
+        raise ValueError(
+            "Either both of `figsize_x` and `figsize_y` must be specified, or neither."
+        )
+
+    try:
+        figsize = (int(figsize_x), int(figsize_y))
+    except (TypeError, ValueError):
+        raise ValueError(
+            f"Expected `figsize_x` and `figsize_y` to be integers, but got {figsize_x!r} and {figsize_y!r}"
+        )
+    if min(figsize) < 1:
+        raise ValueError(
+            f"Expected `figsize_x` and `figsize_y` to be positive, but got {figsize_x!r} and {figsize_y!r}"
+        )
+    return figsize
+
+
 @batches_blueprint.route("/plots", methods=["PUT"])
 @jsendify_response
 def create_plot() -> str:
     json = flask.request.get_json()
     # Data from multiple batch files can be compared, by passing extra `tags` through the request body.
     tags = json.get("tags")
-    figsize_x = json.get("figsize_x")
-    figsize_y = json.get("figsize_y")
     obs_date = json.get("obs_date")
     start_time = json.get("start_time")
     end_time = json.get("end_time")
@@ -116,19 +233,11 @@ def create_plot() -> str:
     dBb = json.get("dBb")
     vmin = json.get("vmin")
     vmax = json.get("vmax")
+    reducer = json.get("reducer", "mean")
+    quicklook = json.get("quicklook", False)
+    rolling_background_window = json.get("rolling_background_window")
 
-    # Handle the edge cases for figsize being specified.
-    figsize_x_specified = figsize_x is not None
-    figsize_y_specified = figsize_y is not None
-    if figsize_x_specified ^ figsize_y_specified:
-        raise ValueError(
-            "Either both of `figsize_x` and `figsize_y` must be specified, or neither."
-        )
-    elif figsize_x_specified and figsize_y_specified:
-        figsize = (figsize_x, figsize_y)
-    else:
-        # If nothing is specified, set an arbitrary default value.
-        figsize = (15, 8)
+    figsize = _get_figsize(json)
 
     # Create the plot and return the name of the batch file containing the plot.
     batch_file = services.create_plot(
@@ -143,5 +252,106 @@ def create_plot() -> str:
         dBb=dBb,
         vmin=vmin,
         vmax=vmax,
+        reducer=reducer,
+        quicklook=quicklook,
+        rolling_background_window=rolling_background_window,
     )
     return get_batch_file_endpoint(batch_file)
+
+
+@batches_blueprint.route("/plots/bulk", methods=["PUT"])
+def create_plots() -> flask.Response:
+    json = flask.request.get_json()
+    progress = services.create_plots(
+        json.get("tags"),
+        json.get("start_date"),
+        json.get("end_date"),
+        cadence=json.get("cadence", 1440),
+        figsize=_get_figsize(json),
+        lower_freq=json.get("lower_freq"),
+        upper_freq=json.get("upper_freq"),
+        log_norm=json.get("log_norm", False),
+        dBb=json.get("dBb", False),
+        vmin=json.get("vmin"),
+        vmax=json.get("vmax"),
+        reducer=json.get("reducer", "mean"),
+        quicklook=json.get("quicklook", False),
+        rolling_background_window=json.get("rolling_background_window"),
+        max_workers=json.get("max_workers"),
+    )
+
+    def stream() -> typing.Iterator[str]:
+        # Report the progress of each plot as it's finished, one JSON object per line.
+        for plot_progress in progress:
+            record = plot_progress.to_dict()
+            if plot_progress.file_path is not None:
+                record["file_path"] = get_batch_file_endpoint(plot_progress.file_path)
+            yield flask.json.dumps(record) + "\n"
+
+    return flask.Response(
+        flask.stream_with_context(stream()), mimetype="application/x-ndjson"
+    )
+
+
+def _get_time_range_args() -> tuple[str, str, str, str]:
+    return (
+        get_required_arg("start_date"),
+        get_required_arg("start_time"),
+        get_required_arg("end_date"),
+        get_required_arg("end_time"),
+    )
+
+
+@batches_blueprint.route("/light-curves/<string:tag>", methods=["GET"])
+def get_light_curves(tag: str) -> flask.Response:
+    frequencies = flask.request.args.getlist("frequency", type=float)
+    light_curve_format = services.LightCurveFormat(
+        flask.request.args.get("format", type=str, default="csv")
+    )
+    chunks = services.get_light_curves(
+        tag,
+        frequencies,
+        *_get_time_range_args(),
+        light_curve_format=light_curve_format,
+    )
+    mimetype = (
+        "text/csv"
+        if light_curve_format == services.LightCurveFormat.CSV
+        else "application/octet-stream"
+    )
+    return flask.Response(
+        flask.stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={
+            # So that binary records can be decoded without any other context.
+            "X-Spectre-Frequencies": ",".join(str(f) for f in frequencies),
+        },
+    )
+
+
+@batches_blueprint.route("/iq/<string:tag>", methods=["GET"])
+def get_iq(tag: str) -> flask.Response:
+    iq_slice = services.get_iq_slice(tag, *_get_time_range_args())
+    download_name = f"{tag}.sigmf-data"
+
+    # If the samples are a contiguous range in a single `.fc32` file, they're sent without copying.
+    byte_range = iq_slice.get_raw_byte_range()
+    if byte_range is not None:
+        return serve_file_range(*byte_range, download_name=download_name)
+
+    return flask.Response(
+        flask.stream_with_context(iq_slice.iter_bytes()),
+        mimetype="application/octet-stream",
+        headers={
+            "Content-Length": str(iq_slice.num_bytes),
+            "Content-Disposition": f'attachment; filename="{download_name}"',
+        },
+    )
+
+
+@batches_blueprint.route("/iq/<string:tag>/sigmf-meta", methods=["GET"])
+def get_iq_sigmf_meta(tag: str) -> flask.Response:
+    sigmf_meta = services.get_iq_sigmf_meta(tag, *_get_time_range_args())
+    response = flask.jsonify(sigmf_meta)
+    response.headers["Content-Disposition"] = f'attachment; filename="{tag}.sigmf-meta"'
+    return response
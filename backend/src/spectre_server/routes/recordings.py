@@ -1,7 +1,9 @@
-# SPDX-FileCopyrightText: © 2024-2025 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
 # This file is part of SPECTRE
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import typing
+
 import flask
 
 from ..services import recordings as services
@@ -12,23 +14,43 @@ recordings_blueprint = flask.Blueprint("recordings", __name__, url_prefix="/reco
 
 @recordings_blueprint.route("/signal", methods=["POST"])
 @jsendify_response
-def signal() -> int:
+def signal() -> str:
     json = flask.request.get_json()
     tags = json.get("tags")
     duration = json.get("duration")
     force_restart = json.get("force_restart")
     max_restarts = json.get("max_restarts")
     validate = json.get("validate")
-    return services.signal(tags, duration, force_restart, max_restarts, validate)
+    return services.start_signal(tags, duration, force_restart, max_restarts, validate)
 
 
 @recordings_blueprint.route("/spectrogram", methods=["POST"])
 @jsendify_response
-def spectrograms() -> int:
+def spectrograms() -> str:
     json = flask.request.get_json()
     tags = json.get("tags")
     duration = json.get("duration")
     force_restart = json.get("force_restart")
     max_restarts = json.get("max_restarts")
     validate = json.get("validate")
-    return services.spectrograms(tags, duration, force_restart, max_restarts, validate)
+    return services.start_spectrograms(
+        tags, duration, force_restart, max_restarts, validate
+    )
+
+
+@recordings_blueprint.route("/jobs", methods=["GET"])
+@jsendify_response
+def get_jobs() -> list[dict[str, typing.Any]]:
+    return services.get_jobs()
+
+
+@recordings_blueprint.route("/jobs/<string:job_id>", methods=["GET"])
+@jsendify_response
+def get_job(job_id: str) -> dict[str, typing.Any]:
+    return services.get_job(job_id)
+
+
+@recordings_blueprint.route("/jobs/<string:job_id>", methods=["DELETE"])
+@jsendify_response
+def cancel_job(job_id: str) -> dict[str, typing.Any]:
+    return services.cancel_job(job_id)
@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import typing
+
+import flask
+
+import spectre_server.core.plotting
+from ..services import batches as services
+from ._format_responses import jsendify_response, stream_chunks
+from ._utils import get_required_arg
+
+spectrograms_blueprint = flask.Blueprint(
+    "spectrograms", __name__, url_prefix="/spectre-data/spectrograms"
+)
+
+
+def _get_spectrogram_slice(tag: str) -> services.SpectrogramSlice:
+    return services.get_spectrogram_slice(
+        tag,
+        get_required_arg("start_date"),
+        get_required_arg("start_time"),
+        get_required_arg("end_date"),
+        get_required_arg("end_time"),
+        lower_freq=flask.request.args.get("lower_freq", type=float),
+        upper_freq=flask.request.args.get("upper_freq", type=float),
+        max_columns=flask.request.args.get("max_columns", type=int),
+        max_rows=flask.request.args.get("max_rows", type=int),
+        reducer=spectre_server.core.plotting.Reducer(
+            flask.request.args.get("reducer", type=str, default="mean")
+        ),
+    )
+
+
+@spectrograms_blueprint.route("/<string:tag>", methods=["GET"])
+def get_spectrogram(tag: str) -> flask.Response:
+    spectrogram_format = services.SpectrogramFormat(
+        flask.request.args.get("format", type=str, default="npy")
+    )
+    spectrogram_slice = _get_spectrogram_slice(tag)
+    extension = "npy" if spectrogram_format == services.SpectrogramFormat.NPY else "f32"
+    return stream_chunks(
+        spectrogram_slice.iter_bytes(spectrogram_format),
+        spectrogram_slice.get_num_bytes(spectrogram_format),
+        download_name=f"{tag}.{extension}",
+        headers={
+            # So that raw values can be decoded without any other context. The axes are served separately.
+            "X-Spectre-Array": json.dumps(spectrogram_slice.get_npy_header()),
+        },
+    )
+
+
+@spectrograms_blueprint.route("/<string:tag>/axes", methods=["GET"])
+@jsendify_response
+def get_spectrogram_axes(tag: str) -> dict[str, typing.Any]:
+    return _get_spectrogram_slice(tag).get_axes()
@@ -0,0 +1,34 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+import typing
+
+import flask
+
+from ..services import tiles as services
+from ._format_responses import serve_from_directory
+
+tiles_blueprint = flask.Blueprint("tiles", __name__, url_prefix="/spectre-data/tiles")
+
+
+@tiles_blueprint.route("/<string:tag>/<int:z>/<int:x>/<int:y>.png", methods=["GET"])
+def get_tile(tag: str, z: int, x: int, y: int) -> flask.Response:
+    # Leave out any which weren't specified, so the defaults are those of the service.
+    kwargs: dict[str, typing.Any] = {
+        name: flask.request.args[name]
+        for name in ("scale", "reducer", "cmap")
+        if name in flask.request.args
+    }
+    tile_path = services.get_tile(
+        tag,
+        z,
+        x,
+        y,
+        vmin=flask.request.args.get("vmin", type=float),
+        vmax=flask.request.args.get("vmax", type=float),
+        **kwargs,
+    )
+    # Tiles overlapping with batches still being recorded change, so clients must revalidate.
+    return serve_from_directory(tile_path, max_age=0)
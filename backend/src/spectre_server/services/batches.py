@@ -2,30 +2,54 @@
 # This file is part of SPECTRE
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import io
+import math
+import time
 import typing
+import functools
 import datetime
 import os
+import enum
+import dataclasses
+import concurrent.futures
+
+import numpy as np
+import numpy.typing as npt
 
 import spectre_server.core.batches
 import spectre_server.core.receivers
 import spectre_server.core.config
+import spectre_server.core.io
+import spectre_server.core.jobs
+import spectre_server.core.logs
 import spectre_server.core.spectrograms
 import spectre_server.core.plotting
 
 
 def _get_batch(
     file_name: str,
-    year: int,
-    month: int,
-    day: int,
+    dt: datetime.datetime,
 ) -> spectre_server.core.batches.Base:
     start_time, tag, _ = spectre_server.core.batches.parse_batch_file_name(file_name)
-    batches = spectre_server.core.batches.Batches(
-        tag,
-        spectre_server.core.receivers.get_batch_cls(tag),
-        spectre_server.core.config.paths.get_batches_dir_path(year, month, day),
-    )
-    return batches[start_time]
+    batch_cls = spectre_server.core.receivers.get_batch_cls(tag)
+    paths = spectre_server.core.config.paths
+    # Look in the partition for the batch first, then in its day, before searching the whole day.
+    for batches_dir_path, recursive in [
+        (
+            paths.get_batches_dir_path(dt.year, dt.month, dt.day, dt.hour, dt.minute),
+            False,
+        ),
+        (paths.get_batches_dir_path(dt.year, dt.month, dt.day), False),
+        (paths.get_batches_dir_path(dt.year, dt.month, dt.day), True),
+    ]:
+        batches = spectre_server.core.batches.Batches(
+            tag, batch_cls, batches_dir_path, recursive=recursive
+        )
+        try:
+            return batches[start_time]
+        except KeyError:
+            continue
+    raise KeyError(f"No batch found for start time '{start_time}'")
 
 
 def _get_batch_file(
@@ -37,7 +61,7 @@ def _get_batch_file(
     dt = datetime.datetime.strptime(
         start_time, spectre_server.core.config.TimeFormat.DATETIME
     )
-    batch = _get_batch(file_name, dt.year, dt.month, dt.day)
+    batch = _get_batch(file_name, dt)
     return batch.get_file(extension)
 
 
@@ -56,26 +80,31 @@ def get_batch_file(
 
 
 @spectre_server.core.logs.log_call
-def get_batch_files(
+def get_batch_file_location(
+    file_name: str,
+) -> tuple[str, int, typing.Optional[int]]:
+    """Find where the contents of a batch file are stored, which may be in an archive.
+
+    :param file_name: Look for any batch file with this file name.
+    :return: The path of the file storing the contents, the offset of the first byte, and the number of
+    bytes. If the number of bytes is None, the contents are the whole file.
+    """
+    batch_file = _get_batch_file(file_name)
+    return batch_file.location
+
+
+def _iter_batch_files(
     tags: list[str],
     extensions: list[str],
     year: typing.Optional[int] = None,
     month: typing.Optional[int] = None,
     day: typing.Optional[int] = None,
-) -> list[str]:
-    """Get the file paths of batch files which exist in the file system.
+) -> typing.Iterator[spectre_server.core.batches.BatchFile]:
+    """Iterate over the batch files which exist in the file system.
 
-    :param tags: Look for batch files with these tags. If no tags are specified, look for batch files with any tag.
-    :param extensions: Look for batch files with these extensions. If no extensions are specified, look for batch files with any extension.
-    :param year: Only look for batch files under this year, defaults to None. If year, month and day are unspecified, look for batch files under any year.
-    :param month: Only look for batch files under this month, defaults to None. If year is specified, but not month and day, look for batch files under that year.
-    :param day: Only look for batch files under this day, defaults to None. If year and month are specified, but not day, look for batch files under that month and year.
-    :return: The file paths of all batch files under the input tag which exist in the file system, as absolute paths within the container's file system.
+    Each directory is scanned once per tag, so checking whether each batch file exists doesn't touch
+    the file system again.
     """
-    if not tags:
-        tags = get_tags(year, month, day)
-
-    batch_files = []
     for tag in tags:
         batches = spectre_server.core.batches.Batches(
             tag,
@@ -94,9 +123,61 @@ def get_batch_files(
                     continue
 
                 if batch.has_file(extension):
-                    batch_file = batch.get_file(extension)
-                    batch_files.append(batch_file.file_path)
-    return sorted(batch_files)
+                    yield batch.get_file(extension)
+
+
+@spectre_server.core.logs.log_call
+def get_batch_files(
+    tags: list[str],
+    extensions: list[str],
+    year: typing.Optional[int] = None,
+    month: typing.Optional[int] = None,
+    day: typing.Optional[int] = None,
+) -> list[str]:
+    """Get the file paths of batch files which exist in the file system.
+
+    :param tags: Look for batch files with these tags. If no tags are specified, look for batch files with any tag.
+    :param extensions: Look for batch files with these extensions. If no extensions are specified, look for batch files with any extension.
+    :param year: Only look for batch files under this year, defaults to None. If year, month and day are unspecified, look for batch files under any year.
+    :param month: Only look for batch files under this month, defaults to None. If year is specified, but not month and day, look for batch files under that year.
+    :param day: Only look for batch files under this day, defaults to None. If year and month are specified, but not day, look for batch files under that month and year.
+    :return: The file paths of all batch files under the input tag which exist in the file system, as absolute paths within the container's file system.
+    """
+    if not tags:
+        tags = get_tags(year, month, day)
+
+    batch_files = _iter_batch_files(tags, extensions, year, month, day)
+    return sorted(batch_file.file_path for batch_file in batch_files)
+
+
+@spectre_server.core.logs.log_call
+def get_batch_file_sizes(
+    tags: list[str],
+    extensions: list[str],
+    year: typing.Optional[int] = None,
+    month: typing.Optional[int] = None,
+    day: typing.Optional[int] = None,
+) -> dict[str, int]:
+    """Get the size of each batch file which exists in the file system.
+
+    The sizes are found by the same directory scan used to find the batch files. For archived batch
+    files, this is the size of their contents in the archive.
+
+    :param tags: Look for batch files with these tags. If no tags are specified, look for batch files with any tag.
+    :param extensions: Look for batch files with these extensions. If no extensions are specified, look for batch files with any extension.
+    :param year: Only look for batch files under this year, defaults to None. If year, month and day are unspecified, look for batch files under any year.
+    :param month: Only look for batch files under this month, defaults to None. If year is specified, but not month and day, look for batch files under that year.
+    :param day: Only look for batch files under this day, defaults to None. If year and month are specified, but not day, look for batch files under that month and year.
+    :return: The size in bytes of each batch file, by its file path.
+    """
+    if not tags:
+        tags = get_tags(year, month, day)
+
+    batch_files = _iter_batch_files(tags, extensions, year, month, day)
+    return {
+        batch_file.file_path: batch_file.num_bytes
+        for batch_file in sorted(batch_files, key=lambda f: f.file_path)
+    }
 
 
 @spectre_server.core.logs.log_call
@@ -127,7 +208,8 @@ def delete_batch_files(
 ) -> list[str]:
     """Bulk remove batch files from the file system.
 
-    Use with caution, the current implementation contains little safeguarding.
+    Use with caution, the current implementation contains little safeguarding. Batch files packed in an
+    archive are skipped.
 
     :param tags: Only batch files with these tags will be deleted. If no tags are provided, no batch files will be deleted.
     :param extensions: Only batch files with these extensions will be deleted. If no extensions are provided, no batch files will be deleted.
@@ -137,27 +219,266 @@ def delete_batch_files(
     :param dry_run: If True, display which files would be deleted without actually deleting them. Defaults to False
     :return: The file paths of batch files which have been successfully deleted, as absolute paths within the container's file system.
     """
+    # Unlike `get_batch_files`, no batch files are deleted if no tags or extensions are provided.
+    if not tags or not extensions:
+        return []
+
     deleted_batch_files = []
+    for batch_file in _iter_batch_files(tags, extensions, year, month, day):
+        # Archived files can only be deleted along with their whole archive, by a retention policy.
+        if batch_file.is_archived:
+            continue
+        if not dry_run:
+            batch_file.delete()
+        deleted_batch_files.append(batch_file.file_path)
+    return deleted_batch_files
+
+
+@spectre_server.core.logs.log_call
+def migrate_batch_files(dry_run: bool = False) -> list[str]:
+    """Move existing batch files into the directories they belong in, under the current partitioning.
+
+    Use this after changing the `SPECTRE_BATCHES_PARTITION_MINUTES` environment variable.
+
+    :param dry_run: If True, display which files would be moved without actually moving them. Defaults to False
+    :return: The file paths of the moved batch files, as absolute paths within the container's file system.
+    """
+    moves = spectre_server.core.batches.migrate_batch_files(dry_run=dry_run)
+    return [moved_file_path for _, moved_file_path in moves]
+
+
+def _get_days(
+    year: typing.Optional[int], month: typing.Optional[int], day: typing.Optional[int]
+) -> list[datetime.date]:
+    """Find the days with a directory of batch files, under an optional year, month and day."""
+    batches_dir_path = spectre_server.core.config.paths.get_batches_dir_path()
+    days = []
+    for root, _, _ in os.walk(
+        spectre_server.core.config.paths.get_batches_dir_path(year, month, day)
+    ):
+        parts = os.path.relpath(root, batches_dir_path).split(os.sep)
+        if len(parts) != 3:
+            continue
+        try:
+            days.append(datetime.date(*(int(part) for part in parts)))
+        except ValueError:
+            continue
+    return sorted(days)
+
+
+@spectre_server.core.logs.log_call
+def archive_batch_files(
+    tags: list[str],
+    extensions: list[str],
+    year: typing.Optional[int] = None,
+    month: typing.Optional[int] = None,
+    day: typing.Optional[int] = None,
+    dry_run: bool = False,
+) -> list[str]:
+    """Pack the batch files for each completed day into a single uncompressed archive per tag.
+
+    Archived batch files are still found, and read, as usual. Days are archived concurrently.
+
+    :param tags: Only archive batch files with these tags. If no tags are provided, no batch files will be archived.
+    :param extensions: Only archive batch files with these extensions. If no extensions are provided, `.fits`, `.png` and `.hdr` files are archived.
+    :param year: Only archive batch files under this year. Defaults to None. If no year, month, or day is specified, every completed day is archived.
+    :param month: Only archive batch files under this month. Defaults to None. If a year is specified, but not a month, each completed day in that year is archived.
+    :param day: Only archive batch files under this day. Defaults to None. If both year and month are specified, but not the day, each completed day in that month is archived.
+    :param dry_run: If True, display which files would be archived without actually archiving them. Defaults to False
+    :return: The file paths of the archived batch files, as absolute paths within the container's file system.
+    """
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    pending = [
+        (tag, d) for tag in tags for d in _get_days(year, month, day) if d < today
+    ]
+    archived_batch_files = []
+    for file_paths in spectre_server.core.io.imap_ordered(
+        lambda item: spectre_server.core.batches.archive_batch_files(
+            item[0],
+            item[1].year,
+            item[1].month,
+            item[1].day,
+            extensions,
+            dry_run=dry_run,
+        ),
+        pending,
+    ):
+        archived_batch_files.extend(file_paths)
+    return archived_batch_files
+
+
+def _get_raw_iq_extension(
+    batch: spectre_server.core.batches.IQStreamBatch,
+) -> typing.Optional[str]:
+    """Find the extension of the raw I/Q samples in the batch, if there are any."""
+    for extension in [
+        spectre_server.core.batches.IQStreamBatchExtension.FC32,
+        spectre_server.core.batches.IQStreamBatchExtension.FC64,
+        spectre_server.core.batches.IQStreamBatchExtension.SC8,
+        spectre_server.core.batches.IQStreamBatchExtension.SC16,
+    ]:
+        if batch.has_file(extension):
+            return extension
+    return None
+
+
+@spectre_server.core.logs.log_call
+def compress_iq_batch_files(
+    tags: list[str],
+    codec: str = spectre_server.core.batches.IQZCodec.ZLIB.value,
+    year: typing.Optional[int] = None,
+    month: typing.Optional[int] = None,
+    day: typing.Optional[int] = None,
+    dry_run: bool = False,
+) -> list[str]:
+    """Bulk, losslessly compress raw I/Q samples into block-compressed I/Q files, deleting the raw samples.
+
+    The most recent batch for each tag is skipped, since the receiver may still be writing to it.
+    Batches are compressed concurrently.
+
+    :param tags: Only compress batches with these tags. If no tags are provided, no batches will be compressed.
+    :param codec: The compression applied to each block of samples, one of 'zlib' or 'lzma'. Defaults to 'zlib'.
+    :param year: Only compress batches under this year. Defaults to None. If no year, month, or day is specified, batches from any year will be compressed.
+    :param month: Only compress batches under this month. Defaults to None. If a year is specified, but not a month, all batches from that year will be compressed.
+    :param day: Only compress batches under this day. Defaults to None. If both year and month are specified, but not the day, all batches from that year and month will be compressed.
+    :param dry_run: If True, display which files would be created without actually compressing anything. Defaults to False
+    :return: The file paths of the block-compressed I/Q files, as absolute paths within the container's file system.
+    """
+    iqz_codec = spectre_server.core.batches.IQZCodec(codec)
+
+    pending: list[tuple[spectre_server.core.batches.IQStreamBatch, str]] = []
     for tag in tags:
         batches = spectre_server.core.batches.Batches(
             tag,
             spectre_server.core.receivers.get_batch_cls(tag),
             spectre_server.core.config.paths.get_batches_dir_path(year, month, day),
         )
+        finished_batches = list(batches)[:-1]
+        for batch in finished_batches:
+            if not isinstance(batch, spectre_server.core.batches.IQStreamBatch):
+                continue
+            extension = _get_raw_iq_extension(batch)
+            if extension is not None:
+                pending.append((batch, extension))
 
-        for batch in batches:
-            for extension in extensions:
+    if not dry_run:
+        # Exhaust the iterator, so that every batch is compressed.
+        for _ in spectre_server.core.io.imap_ordered(
+            lambda item: item[0].compress_iq(item[1], iqz_codec), pending
+        ):
+            pass
+    return [batch.iqz_file.file_path for batch, _ in pending]
 
-                # Just ignore undefined extensions.
-                if extension not in batch.extensions:
-                    continue
 
-                if batch.has_file(extension):
-                    batch_file = batch.get_file(extension)
-                    if not dry_run:
-                        batch_file.delete()
-                    deleted_batch_files.append(batch_file.file_path)
-    return deleted_batch_files
+def _make_retention_policies(
+    policies: list[dict[str, typing.Any]],
+) -> list[spectre_server.core.batches.RetentionPolicy]:
+    return [
+        spectre_server.core.batches.RetentionPolicy(**policy) for policy in policies
+    ]
+
+
+@spectre_server.core.logs.log_call
+def sweep_retention(
+    policies: list[dict[str, typing.Any]],
+    grace_period: float = 60,
+    dry_run: bool = False,
+) -> dict[str, typing.Any]:
+    """Delete the oldest batch files, according to retention policies.
+
+    The two newest batches for each tag are never deleted, since they may still be being written or waiting
+    to be post-processed. Neither are files modified within the grace period.
+
+    :param policies: The retention policies, each with a `tag`, and optionally `extensions`, `max_age` in seconds,
+    `max_bytes` and `min_free_bytes`.
+    :param grace_period: Never delete files modified within this many seconds. Defaults to 60.
+    :param dry_run: If True, report which files would be deleted without actually deleting them. Defaults to False
+    :return: A report of the sweep, including the file paths of the selected batch files and some metrics.
+    """
+    report = spectre_server.core.batches.sweep_retention(
+        _make_retention_policies(policies), grace_period=grace_period, dry_run=dry_run
+    )
+    return report.to_dict()
+
+
+def _sweep_retention_periodically(
+    policies: list[spectre_server.core.batches.RetentionPolicy],
+    interval: float,
+    grace_period: float,
+) -> None:
+    while True:
+        spectre_server.core.batches.sweep_retention(policies, grace_period=grace_period)
+        time.sleep(interval)
+
+
+@spectre_server.core.logs.log_call
+def retention(
+    policies: list[dict[str, typing.Any]],
+    duration: float,
+    interval: float = 600,
+    grace_period: float = 60,
+    force_restart: bool = False,
+    max_restarts: int = 5,
+    on_poll: typing.Optional[
+        typing.Callable[[spectre_server.core.jobs.Job], None]
+    ] = None,
+) -> None:
+    """Periodically delete the oldest batch files according to retention policies.
+
+    :param policies: The retention policies, as for `sweep_retention`.
+    :param duration: How long to enforce the policies for, in seconds.
+    :param interval: How long to wait between each sweep, in seconds. Defaults to 600.
+    :param grace_period: Never delete files modified within this many seconds. Defaults to 60.
+    :param force_restart: If specified, restart the worker if it dies unexpectedly.
+    :param max_restarts: Maximum number of times the worker can be restarted before giving up.
+    Only applies when force_restart is True. Defaults to 5.
+    :param on_poll: If specified, called with the job each time the worker is checked.
+    """
+    worker = spectre_server.core.jobs.make_worker(
+        "retention",
+        _sweep_retention_periodically,
+        (_make_retention_policies(policies), interval, grace_period),
+    )
+    spectre_server.core.jobs.start_job(
+        [worker], duration, force_restart, max_restarts, on_poll
+    )
+
+
+@spectre_server.core.logs.log_call
+def enforce_retention(
+    policies: list[dict[str, typing.Any]],
+    duration: float,
+    interval: float = 600,
+    grace_period: float = 60,
+    force_restart: bool = False,
+    max_restarts: int = 5,
+) -> str:
+    """Periodically delete the oldest batch files according to retention policies, as a job running in
+    the background.
+
+    :param policies: The retention policies, as for `sweep_retention`.
+    :param duration: How long to enforce the policies for, in seconds.
+    :param interval: How long to wait between each sweep, in seconds. Defaults to 600.
+    :param grace_period: Never delete files modified within this many seconds. Defaults to 60.
+    :param force_restart: If specified, restart the worker if it dies unexpectedly.
+    :param max_restarts: Maximum number of times the worker can be restarted before giving up.
+    Only applies when force_restart is True. Defaults to 5.
+    :return: The ID of the job, returned as soon as it's been submitted.
+    """
+    # Check the policies up front, rather than in the background.
+    _make_retention_policies(policies)
+    status = spectre_server.core.jobs.submit_job(
+        f"{__name__}:retention",
+        {
+            "policies": policies,
+            "duration": duration,
+            "interval": interval,
+            "grace_period": grace_period,
+            "force_restart": force_restart,
+            "max_restarts": max_restarts,
+        },
+    )
+    return status.job_id
 
 
 @spectre_server.core.logs.log_call
@@ -225,7 +546,18 @@ def get_tags(
     ]
     tags = set()
     for batch_file_name in batch_file_names:
-        _, tag, _ = spectre_server.core.batches.parse_batch_file_name(batch_file_name)
+        archive_tag = spectre_server.core.batches.parse_archive_file_name(
+            batch_file_name
+        )
+        if archive_tag is not None:
+            tags.add(archive_tag)
+            continue
+        try:
+            _, tag, _ = spectre_server.core.batches.parse_batch_file_name(
+                batch_file_name
+            )
+        except ValueError:
+            continue
         tags.add(tag)
     return sorted(list(tags))
 
@@ -271,6 +603,10 @@ def _get_spectrogram(
         return s
 
 
+# Pixels per inch for quicklooks, matching the default used by Matplotlib to save figures.
+_QUICKLOOK_DPI = 100
+
+
 @spectre_server.core.logs.log_call
 def create_plot(
     tags: list[str],
@@ -284,6 +620,9 @@ def create_plot(
     dBb: bool = False,
     vmin: typing.Optional[float] = None,
     vmax: typing.Optional[float] = None,
+    reducer: str = spectre_server.core.plotting.Reducer.MEAN.value,
+    quicklook: bool = False,
+    rolling_background_window: typing.Optional[float] = None,
 ) -> str:
     """
     Create a stacked plot of spectrogram data over a specified time interval, then save it to the
@@ -303,8 +642,21 @@ def create_plot(
     :param dBb: If True, use units of decibels above the background. Defaults to False.
     :param vmin: The minimum value for the colourmap. Applies only if `dBb` is True.
     :param vmax: The maximum value for the colourmap. Applies only if `dBb` is True.
+    :param reducer: How to combine spectrums or spectral components which share a pixel in the plot, one of
+    'mean' or 'max'. Use 'max' to preserve short-lived bursts. Defaults to 'mean'.
+    :param quicklook: If True, render a single spectrogram panel without Matplotlib, which is much faster. The
+    figure size is scaled by 100 pixels per inch, and `log_norm` is replaced by a logarithmic scale in decibels.
+    Only one tag can be plotted. Defaults to False.
+    :param rolling_background_window: If specified, `dBb` is relative to a running median background over a window
+    of this many seconds, rather than the mean spectrum. Use this for long plots, where the background drifts.
+    Defaults to None.
     :return: The file path of the newly created batch file containing the plot, as an absolute path in the container's file system.
     """
+    reducer_ = spectre_server.core.plotting.Reducer(reducer)
+    if quicklook and len(tags) != 1:
+        raise ValueError(f"Quicklooks plot exactly one tag, but got {len(tags)}")
+    _check_rolling_background_window(rolling_background_window)
+
     # Parse the datetimes
     obs_date_as_date = datetime.datetime.strptime(
         obs_date, spectre_server.core.config.TimeFormat.DATE
@@ -319,18 +671,169 @@ def create_plot(
     # Filter the batch files for each tag.
     batches = {tag: _make_batches(tag, obs_date_as_date) for tag in tags}
 
-    # Create the spectrograms.
-    spectrograms = []
-    for tag in tags:
-        spectrograms.append(
-            _get_spectrogram(
-                batches[tag],
+    # Identical requests over unchanged batch files render identical plots, so reuse them.
+    render_cache = spectre_server.core.plotting.RenderCache(
+        spectre_server.core.config.paths.get_plot_cache_dir_path(),
+        spectre_server.core.config.paths.get_plot_cache_max_bytes(),
+    )
+    key = render_cache.make_key(
+        _get_plot_parameters(
+            tags,
+            figsize,
+            obs_date,
+            start_time,
+            end_time,
+            lower_freq,
+            upper_freq,
+            log_norm,
+            dBb,
+            vmin,
+            vmax,
+            reducer_,
+            quicklook,
+            rolling_background_window,
+        ),
+        _get_spectrogram_file_stamps(
+            batches.values(),
+            datetime.datetime.combine(obs_date_as_date, start_time_as_time),
+            datetime.datetime.combine(obs_date_as_date, end_time_as_time),
+        ),
+    )
+    with render_cache.lock(key):
+        batch_file_path = render_cache.restore(key)
+        if batch_file_path is None:
+            batch_file_path = _render_plot(
+                tags,
+                batches,
+                figsize,
                 obs_date_as_date,
                 start_time_as_time,
                 end_time_as_time,
                 lower_freq,
                 upper_freq,
+                log_norm,
+                dBb,
+                vmin,
+                vmax,
+                reducer_,
+                quicklook,
+                rolling_background_window,
             )
+            render_cache.store(key, batch_file_path)
+    return batch_file_path
+
+
+def _check_rolling_background_window(
+    rolling_background_window: typing.Optional[float],
+) -> None:
+    """Check the rolling background window is positive, before reading any spectrogram data."""
+    if rolling_background_window is not None and rolling_background_window <= 0:
+        raise ValueError(
+            f"The rolling background window must be positive. Got {rolling_background_window}"
+        )
+
+
+def _get_plot_parameters(
+    tags: list[str],
+    figsize: tuple[int, int],
+    obs_date: str,
+    start_time: str,
+    end_time: str,
+    lower_freq: typing.Optional[float],
+    upper_freq: typing.Optional[float],
+    log_norm: bool,
+    dBb: bool,
+    vmin: typing.Optional[float],
+    vmax: typing.Optional[float],
+    reducer: spectre_server.core.plotting.Reducer,
+    quicklook: bool,
+    rolling_background_window: typing.Optional[float],
+) -> dict[str, typing.Any]:
+    """Get everything which went into a plot, besides the batch files, to key it in the render cache."""
+    return {
+        "tags": tags,
+        "figsize": list(figsize),
+        "obs_date": obs_date,
+        "start_time": start_time,
+        "end_time": end_time,
+        "lower_freq": lower_freq,
+        "upper_freq": upper_freq,
+        "log_norm": log_norm,
+        "dBb": dBb,
+        "vmin": vmin,
+        "vmax": vmax,
+        "reducer": reducer.value,
+        "quicklook": quicklook,
+        "rolling_background_window": rolling_background_window,
+        "partition_minutes": spectre_server.core.config.paths.get_batches_partition_minutes(),
+    }
+
+
+def _get_spectrogram_file_stamps(
+    batches: typing.Iterable[spectre_server.core.batches.Batches],
+    start_datetime: datetime.datetime,
+    end_datetime: datetime.datetime,
+) -> list[tuple[str, int, int]]:
+    """Identify the current version of every file storing spectrogram data in the time range."""
+    file_paths = {
+        batch.spectrogram_file.location[0]
+        for batches_for_tag in batches
+        for batch in batches_for_tag.get_batches_in_range(start_datetime, end_datetime)
+        if batch.spectrogram_file.exists
+    }
+    return [
+        spectre_server.core.plotting.get_file_stamp(file_path)
+        for file_path in sorted(file_paths)
+    ]
+
+
+def _render_plot(
+    tags: list[str],
+    batches: dict[str, spectre_server.core.batches.Batches],
+    figsize: tuple[int, int],
+    obs_date_as_date: datetime.date,
+    start_time_as_time: datetime.time,
+    end_time_as_time: datetime.time,
+    lower_freq: typing.Optional[float],
+    upper_freq: typing.Optional[float],
+    log_norm: bool,
+    dBb: bool,
+    vmin: typing.Optional[float],
+    vmax: typing.Optional[float],
+    reducer: spectre_server.core.plotting.Reducer,
+    quicklook: bool,
+    rolling_background_window: typing.Optional[float],
+) -> str:
+    """Render a stacked plot of the spectrogram data for each tag, then save it as a batch file."""
+    # Create the spectrograms, reading the data for each tag concurrently.
+    spectrograms = list(
+        spectre_server.core.io.imap_ordered(
+            lambda tag: _get_spectrogram(
+                batches[tag],
+                obs_date_as_date,
+                start_time_as_time,
+                end_time_as_time,
+                lower_freq,
+                upper_freq,
+            ),
+            tags,
+        )
+    )
+    if rolling_background_window is not None:
+        for spectrogram in spectrograms:
+            spectrogram.set_rolling_background(rolling_background_window)
+
+    if quicklook:
+        return spectre_server.core.plotting.save_quicklook(
+            spectrograms[0],
+            tags[0],
+            width=figsize[0] * _QUICKLOOK_DPI,
+            height=figsize[1] * _QUICKLOOK_DPI,
+            dBb=dBb,
+            vmin=vmin,
+            vmax=vmax,
+            reducer=reducer,
+            title=tags[0],
         )
 
     # Create the plot, and save it as a batch file.
@@ -343,7 +846,832 @@ def create_plot(
     for spectrogram in spectrograms:
         panel_stack.add_panel(
             spectre_server.core.plotting.SpectrogramPanel(
-                spectrogram, log_norm=log_norm, dBb=dBb, vmin=vmin, vmax=vmax
+                spectrogram,
+                log_norm=log_norm,
+                dBb=dBb,
+                vmin=vmin,
+                vmax=vmax,
+                reducer=reducer,
             )
         )
     return panel_stack.save(tags[0])
+
+
+_MINUTES_PER_DAY = 1440
+
+
+class PlotStatus(enum.Enum):
+    """The outcome of each plot in a bulk plotting job.
+
+    :ivar RENDERED: The plot was rendered.
+    :ivar SKIPPED: The plot was already rendered from the same batch files, with the same parameters.
+    :ivar EMPTY: There is no spectrogram data to plot.
+    :ivar FAILED: Rendering the plot raised an error.
+    """
+
+    RENDERED = "rendered"
+    SKIPPED = "skipped"
+    EMPTY = "empty"
+    FAILED = "failed"
+
+
+@dataclasses.dataclass(frozen=True)
+class PlotProgress:
+    """The outcome of one plot in a bulk plotting job, and how far through the job it is.
+
+    :ivar tag: The batch file tag.
+    :ivar obs_date: The observation date, in the format `%Y-%m-%d`.
+    :ivar start_time: The start time of the plot (UTC), in the format `%H:%M:%S`.
+    :ivar end_time: The end time of the plot (UTC), in the format `%H:%M:%S`.
+    :ivar status: The outcome of the plot.
+    :ivar file_path: The file path of the plot, if it was rendered or skipped.
+    :ivar error: Why the plot failed, if it did.
+    :ivar num_done: The number of plots finished so far, including this one.
+    :ivar num_plots: The total number of plots in the job.
+    """
+
+    tag: str
+    obs_date: str
+    start_time: str
+    end_time: str
+    status: PlotStatus
+    file_path: typing.Optional[str]
+    error: typing.Optional[str]
+    num_done: int
+    num_plots: int
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        """Summarise the progress in a JSON serialisable form."""
+        return {**dataclasses.asdict(self), "status": self.status.value}
+
+
+def _get_plot_intervals(
+    start_date: datetime.date, end_date: datetime.date, cadence: int
+) -> list[tuple[str, str, str]]:
+    """Split each day in the date range into intervals of `cadence` minutes.
+
+    :return: The observation date, start time and end time of each interval, formatted for `create_plot`.
+    """
+    if start_date > end_date:
+        raise ValueError(
+            f"The start date must not be after the end date. Got {start_date} and {end_date}"
+        )
+    if cadence < 1 or _MINUTES_PER_DAY % cadence != 0:
+        raise ValueError(
+            f"The cadence must be a whole number of minutes which divides a day. Got {cadence}"
+        )
+    intervals = []
+    for day in range((end_date - start_date).days + 1):
+        start_of_day = datetime.datetime.combine(
+            start_date + datetime.timedelta(days=day), datetime.time()
+        )
+        for minute in range(0, _MINUTES_PER_DAY, cadence):
+            start = start_of_day + datetime.timedelta(minutes=minute)
+            # `create_plot` can't span days, so stop one second short of the next interval.
+            end = start + datetime.timedelta(minutes=cadence, seconds=-1)
+            intervals.append(
+                (
+                    start.strftime(spectre_server.core.config.TimeFormat.DATE),
+                    start.strftime(spectre_server.core.config.TimeFormat.TIME),
+                    end.strftime(spectre_server.core.config.TimeFormat.TIME),
+                )
+            )
+    return intervals
+
+
+def _get_plot_outcome(
+    get_file_path: typing.Callable[[], str],
+) -> tuple[PlotStatus, typing.Optional[str], typing.Optional[str]]:
+    """Get the status, file path and error of a plot, once it has been rendered."""
+    try:
+        return PlotStatus.RENDERED, get_file_path(), None
+    except Exception as e:
+        return PlotStatus.FAILED, None, str(e)
+
+
+def _init_plot_worker(spectre_data_dir_path: str) -> None:
+    """Set up each process rendering plots in a bulk plotting job."""
+    spectre_server.core.config.paths.set_spectre_data_dir_path(spectre_data_dir_path)
+    spectre_server.core.logs.configure_root_logger(
+        spectre_server.core.logs.ProcessType.WORKER
+    )
+
+
+@spectre_server.core.logs.log_call
+def create_plots(
+    tags: list[str],
+    start_date: str,
+    end_date: str,
+    cadence: int = _MINUTES_PER_DAY,
+    figsize: tuple[int, int] = (15, 8),
+    lower_freq: typing.Optional[float] = None,
+    upper_freq: typing.Optional[float] = None,
+    log_norm: bool = False,
+    dBb: bool = False,
+    vmin: typing.Optional[float] = None,
+    vmax: typing.Optional[float] = None,
+    reducer: str = spectre_server.core.plotting.Reducer.MEAN.value,
+    quicklook: bool = False,
+    rolling_background_window: typing.Optional[float] = None,
+    max_workers: typing.Optional[int] = None,
+) -> typing.Iterator[PlotProgress]:
+    """Create a plot for each tag, over each interval of a date range, rendering them in a pool of processes.
+
+    Plots which were already rendered from the same batch files, with the same parameters, are skipped
+    without being rendered again. Like `create_plot`, this relies on the render cache, so nothing is
+    skipped if the render cache is disabled. Intervals with no spectrogram data are skipped too.
+
+    The arguments are checked before anything is returned, but the plots are created lazily, so that the
+    progress of the job can be streamed to the client.
+
+    :param tags: The batch file tags. Each tag is plotted on its own.
+    :param start_date: The first day to plot, in the format `%Y-%m-%d`.
+    :param end_date: The last day to plot, in the format `%Y-%m-%d`.
+    :param cadence: The time spanned by each plot, in minutes. Must divide a day. Defaults to 1440, for daily plots.
+    :param figsize: The `matplotlib` figure size as a tuple of (width, height). Defaults to (15, 8).
+    :param lower_freq: As for `create_plot`.
+    :param upper_freq: As for `create_plot`.
+    :param log_norm: As for `create_plot`.
+    :param dBb: As for `create_plot`.
+    :param vmin: As for `create_plot`.
+    :param vmax: As for `create_plot`.
+    :param reducer: As for `create_plot`.
+    :param quicklook: As for `create_plot`.
+    :param rolling_background_window: As for `create_plot`.
+    :param max_workers: The number of processes rendering plots at once. If None, use one per CPU. If one,
+    plots are rendered one at a time in this process. Defaults to None.
+    :raises ValueError: If no tags are specified, or the date range or cadence is invalid.
+    :return: An iterator over the progress of the job, yielding once as each plot is finished.
+    """
+    if not tags:
+        raise ValueError("At least one tag must be specified.")
+    reducer_ = spectre_server.core.plotting.Reducer(reducer)
+    _check_rolling_background_window(rolling_background_window)
+    intervals = _get_plot_intervals(
+        datetime.datetime.strptime(
+            start_date, spectre_server.core.config.TimeFormat.DATE
+        ).date(),
+        datetime.datetime.strptime(
+            end_date, spectre_server.core.config.TimeFormat.DATE
+        ).date(),
+        cadence,
+    )
+    # Check each tag has a config up front, rather than part way through the job.
+    for tag in tags:
+        spectre_server.core.receivers.get_batch_cls(tag)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers < 1:
+        raise ValueError(
+            f"The maximum number of workers must be at least one. Got {max_workers}"
+        )
+
+    plots = [(tag, *interval) for tag in tags for interval in intervals]
+
+    render_cache = spectre_server.core.plotting.RenderCache(
+        spectre_server.core.config.paths.get_plot_cache_dir_path(),
+        spectre_server.core.config.paths.get_plot_cache_max_bytes(),
+    )
+
+    def check(
+        tag: str, obs_date: str, start_time: str, end_time: str
+    ) -> tuple[typing.Optional[PlotStatus], typing.Optional[str]]:
+        """Check whether a plot can be skipped, returning its status and file path if so."""
+        obs_date_as_date = datetime.datetime.strptime(
+            obs_date, spectre_server.core.config.TimeFormat.DATE
+        ).date()
+        start_datetime, end_datetime = (
+            datetime.datetime.combine(
+                obs_date_as_date,
+                datetime.datetime.strptime(
+                    t, spectre_server.core.config.TimeFormat.TIME
+                ).time(),
+            )
+            for t in (start_time, end_time)
+        )
+        file_stamps = _get_spectrogram_file_stamps(
+            [_make_batches(tag, obs_date_as_date)], start_datetime, end_datetime
+        )
+        if not file_stamps:
+            return PlotStatus.EMPTY, None
+        key = render_cache.make_key(
+            _get_plot_parameters(
+                [tag],
+                figsize,
+                obs_date,
+                start_time,
+                end_time,
+                lower_freq,
+                upper_freq,
+                log_norm,
+                dBb,
+                vmin,
+                vmax,
+                reducer_,
+                quicklook,
+                rolling_background_window,
+            ),
+            file_stamps,
+        )
+        file_path = render_cache.restore(key)
+        return (PlotStatus.SKIPPED, file_path) if file_path else (None, None)
+
+    def stream() -> typing.Iterator[PlotProgress]:
+        executor = (
+            concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_plot_worker,
+                initargs=(
+                    spectre_server.core.config.paths.get_spectre_data_dir_path(),
+                ),
+            )
+            if max_workers > 1
+            else None
+        )
+        pending: dict[concurrent.futures.Future[str], tuple[str, str, str, str]] = {}
+        num_done = 0
+        try:
+            for plot in plots:
+                tag, obs_date, start_time, end_time = plot
+                status, file_path = check(*plot)
+                error = None
+                if status is None:
+                    render = functools.partial(
+                        create_plot,
+                        [tag],
+                        figsize,
+                        obs_date,
+                        start_time,
+                        end_time,
+                        lower_freq=lower_freq,
+                        upper_freq=upper_freq,
+                        log_norm=log_norm,
+                        dBb=dBb,
+                        vmin=vmin,
+                        vmax=vmax,
+                        reducer=reducer_.value,
+                        quicklook=quicklook,
+                        rolling_background_window=rolling_background_window,
+                    )
+                    if executor is not None:
+                        pending[executor.submit(render)] = plot
+                        continue
+                    status, file_path, error = _get_plot_outcome(render)
+                num_done += 1
+                yield PlotProgress(
+                    *plot, status, file_path, error, num_done, len(plots)
+                )
+
+            for future in concurrent.futures.as_completed(pending):
+                status, file_path, error = _get_plot_outcome(future.result)
+                num_done += 1
+                yield PlotProgress(
+                    *pending[future], status, file_path, error, num_done, len(plots)
+                )
+        finally:
+            if executor is not None:
+                # If the client goes away, don't render plots nobody wants.
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    return stream()
+
+
+class LightCurveFormat(enum.Enum):
+    """A defined format for streamed light curves.
+
+    :ivar CSV: One line per spectrum, with the datetime followed by the value at each frequency.
+    :ivar BINARY: One little-endian record per spectrum, with the microseconds since the Unix epoch
+    as a 64-bit integer, followed by the value at each frequency as a 32-bit float.
+    """
+
+    CSV = "csv"
+    BINARY = "binary"
+
+
+def _parse_datetime(date: str, time: str) -> datetime.datetime:
+    """Parse a date and a time, with optional fractional seconds."""
+    time_format = (
+        spectre_server.core.config.TimeFormat.FRACTIONAL_TIME
+        if "." in time
+        else spectre_server.core.config.TimeFormat.TIME
+    )
+    return datetime.datetime.strptime(
+        f"{date}T{time}",
+        f"{spectre_server.core.config.TimeFormat.DATE}T{time_format}",
+    )
+
+
+def _parse_time_range(
+    start_date: str, start_time: str, end_date: str, end_time: str
+) -> tuple[datetime.datetime, datetime.datetime]:
+    """Parse a time range, checking that the start time is before the end time."""
+    start_datetime = _parse_datetime(start_date, start_time)
+    end_datetime = _parse_datetime(end_date, end_time)
+    if start_datetime >= end_datetime:
+        raise ValueError(
+            f"The start time must be less than the end time. "
+            f"Got start time {start_datetime}, "
+            f"and end time {end_datetime}"
+        )
+    return start_datetime, end_datetime
+
+
+def _get_batches_over_days(
+    tag: str, start_datetime: datetime.datetime, end_datetime: datetime.datetime
+) -> list[spectre_server.core.batches.Base]:
+    """Get the batches which overlap with a time range, which can span many days."""
+    batches = spectre_server.core.batches.find_batches(
+        tag,
+        spectre_server.core.receivers.get_batch_cls(tag),
+        start_datetime,
+        end_datetime,
+    )
+    return spectre_server.core.batches.filter_batches_in_range(
+        batches, start_datetime, end_datetime
+    )
+
+
+def _get_frequency_indices(
+    frequencies: npt.NDArray[np.float32], at_frequencies: list[float]
+) -> npt.NDArray[np.intp]:
+    """Find the index of the closest spectral component to each requested frequency."""
+    indices = []
+    for at_frequency in at_frequencies:
+        if not frequencies[0] <= at_frequency <= frequencies[-1]:
+            raise ValueError(
+                f"The frequency {at_frequency} [Hz] is out of range of the spectrogram."
+            )
+        indices.append(int(np.argmin(np.abs(frequencies - at_frequency))))
+    return np.array(indices, dtype=np.intp)
+
+
+@dataclasses.dataclass(frozen=True)
+class _LightCurveRead:
+    """The part of one spectrogram file which is read for the light curves.
+
+    :ivar spectrogram_file: The spectrogram file of the batch.
+    :ivar datetimes: The datetimes of each spectrum in the time range.
+    :ivar rows: The index of the spectral component closest to each frequency.
+    :ivar time_slice: The spectrums in the time range.
+    """
+
+    spectrogram_file: spectre_server.core.batches.SpectrogramFile
+    datetimes: npt.NDArray[np.datetime64]
+    rows: npt.NDArray[np.intp]
+    time_slice: slice
+
+
+def _plan_light_curves(
+    batches: list[spectre_server.core.batches.Base],
+    frequencies: list[float],
+    start_datetime: datetime.datetime,
+    end_datetime: datetime.datetime,
+) -> list[_LightCurveRead]:
+    """Read the axes of each batch, and find which parts of the dynamic spectra are in the light curves.
+
+    The frequency indices are resolved once for each distinct frequency axis.
+    """
+    start_datetime64 = np.datetime64(start_datetime)
+    end_datetime64 = np.datetime64(end_datetime)
+    indices_by_axis: dict[bytes, npt.NDArray[np.intp]] = {}
+
+    spectrogram_files = [batch.spectrogram_file for batch in batches]
+    reads = []
+    for spectrogram_file, axes in zip(
+        spectrogram_files,
+        spectre_server.core.io.imap_ordered(
+            lambda spectrogram_file: spectrogram_file.read_axes(), spectrogram_files
+        ),
+    ):
+        axis = axes.frequencies.tobytes()
+        if axis not in indices_by_axis:
+            indices_by_axis[axis] = _get_frequency_indices(
+                axes.frequencies, frequencies
+            )
+
+        in_range = np.flatnonzero(
+            (axes.datetimes >= start_datetime64) & (axes.datetimes <= end_datetime64)
+        )
+        if in_range.size == 0:
+            continue
+        time_slice = slice(int(in_range[0]), int(in_range[-1]) + 1)
+        reads.append(
+            _LightCurveRead(
+                spectrogram_file,
+                axes.datetimes[time_slice],
+                indices_by_axis[axis],
+                time_slice,
+            )
+        )
+    return reads
+
+
+def _iter_light_curves(
+    reads: list[_LightCurveRead],
+) -> typing.Iterator[tuple[npt.NDArray[np.datetime64], npt.NDArray[np.float32]]]:
+    """Yield the time cuts at each frequency, one batch at a time.
+
+    Only the matching rows of each (memory-mapped) dynamic spectra are read.
+    """
+    for read, light_curves in zip(
+        reads,
+        spectre_server.core.io.imap_ordered(
+            lambda read: read.spectrogram_file.read_block(read.rows, read.time_slice),
+            reads,
+        ),
+    ):
+        yield read.datetimes, np.asarray(light_curves, dtype=np.float32)
+
+
+def _format_csv(
+    datetimes: npt.NDArray[np.datetime64], light_curves: npt.NDArray[np.float32]
+) -> bytes:
+    # Matches `TimeFormat.DATETIME`.
+    timestamps = np.char.add(np.datetime_as_string(datetimes, unit="us"), "Z")
+    values = np.char.mod("%.7g", light_curves.T)
+    rows = np.column_stack([timestamps, values])
+    return "".join(",".join(row) + "\n" for row in rows).encode()
+
+
+def _format_binary(
+    datetimes: npt.NDArray[np.datetime64], light_curves: npt.NDArray[np.float32]
+) -> bytes:
+    records = np.empty(
+        len(datetimes),
+        dtype=[("time", "<i8"), ("values", "<f4", (light_curves.shape[0],))],
+    )
+    records["time"] = datetimes.astype("datetime64[us]").astype(np.int64)
+    records["values"] = light_curves.T
+    return records.tobytes()
+
+
+@spectre_server.core.logs.log_call
+def get_light_curves(
+    tag: str,
+    frequencies: list[float],
+    start_date: str,
+    start_time: str,
+    end_date: str,
+    end_time: str,
+    light_curve_format: LightCurveFormat = LightCurveFormat.CSV,
+) -> typing.Iterator[bytes]:
+    """Extract time cuts at some frequencies, over a time range which can span many days.
+
+    Batch files are found, and the frequencies validated against their axes, before anything is
+    returned. The data is read and formatted lazily, one batch file at a time, so that it can be
+    streamed to the client.
+
+    :param tag: The batch file tag.
+    :param frequencies: The frequencies of each light curve, in Hz. The closest spectral component is used.
+    :param start_date: The start date, in the format `%Y-%m-%d`.
+    :param start_time: The start time (UTC), in the format `%H:%M:%S`.
+    :param end_date: The end date, in the format `%Y-%m-%d`.
+    :param end_time: The end time (UTC), in the format `%H:%M:%S`.
+    :param light_curve_format: The format of the streamed data, defaults to CSV.
+    :raises ValueError: If no frequencies are specified, or the start time is not before the end time.
+    :raises ValueError: If any frequency is out of range of the spectrogram data.
+    :raises FileNotFoundError: If no spectrogram data is available within the specified time range.
+    :return: An iterator over chunks of the formatted light curves.
+    """
+    if not frequencies:
+        raise ValueError("At least one frequency must be specified.")
+
+    start_datetime, end_datetime = _parse_time_range(
+        start_date, start_time, end_date, end_time
+    )
+
+    batches = [
+        batch
+        for batch in _get_batches_over_days(tag, start_datetime, end_datetime)
+        if batch.spectrogram_file.exists
+    ]
+    if not batches:
+        raise FileNotFoundError(
+            f"No spectrogram data found for the time range {start_datetime} to {end_datetime}."
+        )
+    reads = _plan_light_curves(batches, frequencies, start_datetime, end_datetime)
+
+    def stream() -> typing.Iterator[bytes]:
+        if light_curve_format == LightCurveFormat.CSV:
+            yield (
+                ",".join(["datetime"] + [str(f) for f in frequencies]) + "\n"
+            ).encode()
+            format_chunk = _format_csv
+        else:
+            format_chunk = _format_binary
+
+        for datetimes, light_curves in _iter_light_curves(reads):
+            yield format_chunk(datetimes, light_curves)
+
+    return stream()
+
+
+@dataclasses.dataclass(frozen=True)
+class IQSlice:
+    """The I/Q samples over a time range, stitched across batches.
+
+    :ivar output_type: The output type of the raw samples.
+    :ivar sample_rate: The sample rate of the receiver, in Hz.
+    :ivar center_frequency: The center frequency of the receiver in Hz, if it is fixed.
+    :ivar segments: The samples in each batch within the time range, in order.
+    """
+
+    output_type: str
+    sample_rate: float
+    center_frequency: typing.Optional[float]
+    segments: list[spectre_server.core.batches.IQSegment]
+
+    @property
+    def num_bytes(self) -> int:
+        """The number of bytes once stitched, as single-precision complex floats."""
+        return (
+            sum(segment.num_samples for segment in self.segments)
+            * np.dtype(np.complex64).itemsize
+        )
+
+    def get_raw_byte_range(self) -> typing.Optional[tuple[str, int, int]]:
+        """If every sample is in a single raw file which needs no conversion, locate them in that file.
+
+        :return: The file path, the byte offset and the number of bytes, or None.
+        """
+        if len(self.segments) != 1:
+            return None
+        return spectre_server.core.batches.get_raw_byte_range(
+            self.segments[0], self.output_type
+        )
+
+    def iter_bytes(self) -> typing.Iterator[bytes]:
+        """Iterate over the stitched samples, as little-endian single-precision complex floats."""
+        for chunk in spectre_server.core.batches.iter_iq_segments(
+            self.segments, self.output_type
+        ):
+            yield chunk.astype("<c8", copy=False).tobytes()
+
+
+@spectre_server.core.logs.log_call
+def get_iq_slice(
+    tag: str,
+    start_date: str,
+    start_time: str,
+    end_date: str,
+    end_time: str,
+) -> IQSlice:
+    """Find the I/Q samples over a time range, which can span many batches.
+
+    The time range is `[start, end)`, and times may include fractional seconds. Only
+    the requested samples are read from each batch, including from block-compressed I/Q files.
+
+    :param tag: The tag of the batches.
+    :param start_date: The start date, in the format `%Y-%m-%d`.
+    :param start_time: The start time, in the format `%H:%M:%S` or `%H:%M:%S.%f`.
+    :param end_date: The end date, in the format `%Y-%m-%d`.
+    :param end_time: The end time, in the format `%H:%M:%S` or `%H:%M:%S.%f`.
+    :raises ValueError: If the start time is not before the end time, or the config doesn't describe I/Q samples.
+    :raises FileNotFoundError: If no I/Q samples are available within the specified time range.
+    :return: The I/Q samples over the time range.
+    """
+    start_datetime, end_datetime = _parse_time_range(
+        start_date, start_time, end_date, end_time
+    )
+
+    parameters = spectre_server.core.receivers.read_config(tag).parameters
+    if "sample_rate" not in parameters or "output_type" not in parameters:
+        raise ValueError(f"The config with tag '{tag}' does not record I/Q samples.")
+    output_type = parameters["output_type"]
+    sample_rate = parameters["sample_rate"]
+
+    batches = [
+        batch
+        for batch in _get_batches_over_days(tag, start_datetime, end_datetime)
+        if isinstance(batch, spectre_server.core.batches.IQStreamBatch)
+    ]
+    segments = spectre_server.core.batches.get_iq_segments(
+        batches, output_type, sample_rate, start_datetime, end_datetime
+    )
+    if not segments:
+        raise FileNotFoundError(
+            f"No I/Q samples found for the time range {start_datetime} to {end_datetime}."
+        )
+    return IQSlice(
+        output_type, sample_rate, parameters.get("center_frequency"), segments
+    )
+
+
+@spectre_server.core.logs.log_call
+def get_iq_sigmf_meta(
+    tag: str,
+    start_date: str,
+    start_time: str,
+    end_date: str,
+    end_time: str,
+) -> dict[str, typing.Any]:
+    """Describe the I/Q samples over a time range in the SigMF metadata format.
+
+    See `get_iq_slice` for each argument.
+
+    :return: The contents of the `.sigmf-meta` file accompanying the samples.
+    """
+    iq_slice = get_iq_slice(tag, start_date, start_time, end_date, end_time)
+    return spectre_server.core.batches.make_sigmf_meta(
+        iq_slice.segments,
+        iq_slice.sample_rate,
+        iq_slice.center_frequency,
+        description=f"I/Q samples with tag '{tag}'",
+    )
+
+
+class SpectrogramFormat(enum.Enum):
+    """The format of a streamed spectrogram slice.
+
+    :ivar NPY: A `.npy` file, which can be read with `numpy.load`.
+    :ivar RAW: Only the values, as little-endian 32-bit floats, laid out as in the `.npy` file.
+    """
+
+    NPY = "npy"
+    RAW = "raw"
+
+
+# Read at most (about) this many values of the dynamic spectra at once, while streaming a slice.
+_MAX_VALUES_PER_CHUNK = 1 << 22
+
+
+@dataclasses.dataclass(frozen=True)
+class SpectrogramSlice:
+    """A spectrogram chopped in time and frequency, then reduced to at most some number of spectrums
+    and spectral components.
+
+    The dynamic spectra have shape (num_frequencies, num_times), and are laid out in Fortran order so
+    that each spectrum is contiguous. This way, they're streamed one chunk of spectrums at a time.
+
+    :ivar spectrogram: A view over the slice, at its full resolution.
+    :ivar time_block_size: The number of consecutive spectrums reduced to each spectrum in the slice.
+    :ivar frequency_block_size: The number of consecutive spectral components reduced to each one in the slice.
+    :ivar reducer: How each block of the dynamic spectra is reduced. The times and frequencies are always averaged.
+    """
+
+    spectrogram: spectre_server.core.spectrograms.LazySpectrogram
+    time_block_size: int
+    frequency_block_size: int
+    reducer: spectre_server.core.plotting.Reducer
+
+    @property
+    def times(self) -> npt.NDArray[np.float32]:
+        """The elapsed time of each spectrum in the slice, in seconds, relative to the first."""
+        return spectre_server.core.plotting.reduce_blocks(
+            self.spectrogram.times, self.time_block_size
+        )
+
+    @property
+    def frequencies(self) -> npt.NDArray[np.float32]:
+        """The frequency of each spectral component in the slice, in Hz."""
+        return spectre_server.core.plotting.reduce_blocks(
+            self.spectrogram.frequencies, self.frequency_block_size
+        )
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """The shape of the dynamic spectra, as (num_frequencies, num_times)."""
+        return (
+            math.ceil(self.spectrogram.num_frequencies / self.frequency_block_size),
+            math.ceil(self.spectrogram.num_times / self.time_block_size),
+        )
+
+    def get_npy_header(self) -> dict[str, typing.Any]:
+        """Describe the layout of the dynamic spectra, as in the header of the `.npy` file."""
+        return {"descr": "<f4", "fortran_order": True, "shape": self.shape}
+
+    def get_num_bytes(self, spectrogram_format: SpectrogramFormat) -> int:
+        """The number of bytes streamed in some format."""
+        num_rows, num_columns = self.shape
+        num_bytes = num_rows * num_columns * np.dtype(np.float32).itemsize
+        if spectrogram_format == SpectrogramFormat.NPY:
+            num_bytes += len(self._make_npy_header())
+        return num_bytes
+
+    def get_axes(self) -> dict[str, typing.Any]:
+        """Describe the axes of the dynamic spectra, so that the streamed values can be interpreted.
+
+        :return: A JSON serialisable dictionary.
+        """
+        return {
+            **self.get_npy_header(),
+            # Matches `TimeFormat.DATETIME`.
+            "start_datetime": f"{np.datetime_as_string(self.spectrogram.start_datetime, unit='us')}Z",
+            "spectrum_unit": self.spectrogram.spectrum_unit.value,
+            "times": self.times.tolist(),
+            "frequencies": self.frequencies.tolist(),
+            "time_block_size": self.time_block_size,
+            "frequency_block_size": self.frequency_block_size,
+            "reducer": self.reducer.value,
+        }
+
+    def _make_npy_header(self) -> bytes:
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(header, self.get_npy_header())
+        return header.getvalue()
+
+    def iter_bytes(
+        self, spectrogram_format: SpectrogramFormat
+    ) -> typing.Iterator[bytes]:
+        """Read, reduce and format the dynamic spectra, one chunk of spectrums at a time.
+
+        :param spectrogram_format: The format of the streamed data.
+        :return: An iterator over chunks of the formatted dynamic spectra.
+        """
+        if spectrogram_format == SpectrogramFormat.NPY:
+            yield self._make_npy_header()
+
+        # Each chunk holds whole blocks, so it is reduced exactly as if read all at once.
+        num_blocks_per_chunk = max(
+            1,
+            _MAX_VALUES_PER_CHUNK
+            // (self.spectrogram.num_frequencies * self.time_block_size),
+        )
+        for chunk in self.spectrogram.iter_time_blocks(
+            num_blocks_per_chunk * self.time_block_size
+        ):
+            chunk = spectre_server.core.plotting.reduce_blocks(
+                chunk, self.frequency_block_size, axis=0, reducer=self.reducer
+            )
+            chunk = spectre_server.core.plotting.reduce_blocks(
+                chunk, self.time_block_size, axis=1, reducer=self.reducer
+            )
+            yield chunk.astype("<f4", copy=False).tobytes(order="F")
+
+
+@spectre_server.core.logs.log_call
+def get_spectrogram_slice(
+    tag: str,
+    start_date: str,
+    start_time: str,
+    end_date: str,
+    end_time: str,
+    lower_freq: typing.Optional[float] = None,
+    upper_freq: typing.Optional[float] = None,
+    max_columns: typing.Optional[int] = None,
+    max_rows: typing.Optional[int] = None,
+    reducer: spectre_server.core.plotting.Reducer = spectre_server.core.plotting.Reducer.MEAN,
+) -> SpectrogramSlice:
+    """Slice the spectrogram over a time range, which can span many days, and a frequency range.
+
+    The batch files are found, and the axes read, up front. The dynamic spectra are only read
+    once the slice is streamed.
+
+    :param tag: The batch file tag.
+    :param start_date: The start date, in the format `%Y-%m-%d`.
+    :param start_time: The start time, in the format `%H:%M:%S` or `%H:%M:%S.%f`.
+    :param end_date: The end date, in the format `%Y-%m-%d`.
+    :param end_time: The end time, in the format `%H:%M:%S` or `%H:%M:%S.%f`.
+    :param lower_freq: The lower bound of the frequency range, in Hz. Defaults to the lowest frequency.
+    :param upper_freq: The upper bound of the frequency range, in Hz. Defaults to the highest frequency.
+    :param max_columns: If specified, reduce the slice to at most this many spectrums.
+    :param max_rows: If specified, reduce the slice to at most this many spectral components.
+    :param reducer: How each block of the dynamic spectra is reduced, defaults to `Reducer.MEAN`.
+    :raises ValueError: If the start time is not before the end time, or `max_columns` or `max_rows` are not positive.
+    :raises FileNotFoundError: If no spectrogram data is available within the specified time range.
+    :return: The slice of the spectrogram.
+    """
+    for name, value in [("max_columns", max_columns), ("max_rows", max_rows)]:
+        if value is not None and value < 1:
+            raise ValueError(f"{name} must be positive, got {value}")
+
+    start_datetime, end_datetime = _parse_time_range(
+        start_date, start_time, end_date, end_time
+    )
+    sources = [
+        batch.spectrogram_file
+        for batch in _get_batches_over_days(tag, start_datetime, end_datetime)
+        if batch.spectrogram_file.exists
+    ]
+    if not sources:
+        raise FileNotFoundError(
+            f"No spectrogram data found for the time range {start_datetime} to {end_datetime}."
+        )
+
+    spectrogram = spectre_server.core.spectrograms.LazySpectrogram(sources).time_chop(
+        start_datetime, end_datetime
+    )
+    if lower_freq is not None or upper_freq is not None:
+        spectrogram = spectrogram.frequency_chop(
+            lower_freq if lower_freq is not None else spectrogram.frequencies[0],
+            upper_freq if upper_freq is not None else spectrogram.frequencies[-1],
+        )
+
+    return SpectrogramSlice(
+        spectrogram,
+        time_block_size=(
+            spectre_server.core.plotting.get_block_size(
+                spectrogram.num_times, max_columns
+            )
+            if max_columns is not None
+            else 1
+        ),
+        frequency_block_size=(
+            spectre_server.core.plotting.get_block_size(
+                spectrogram.num_frequencies, max_rows
+            )
+            if max_rows is not None
+            else 1
+        ),
+        reducer=reducer,
+    )
@@ -210,5 +210,5 @@ def delete_config(file_name: str, dry_run: bool = False) -> str:
     if not dry_run:
         if not config_exists:
             raise FileNotFoundError(f"The config '{file_name}' does not exist.")
-        os.remove(config_file_path)
+        spectre_server.core.receivers.delete_config(tag)
     return config_file_path
@@ -1,8 +1,11 @@
-# SPDX-FileCopyrightText: © 2024-2025 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
 # This file is part of SPECTRE
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import typing
+
 import spectre_server.core.logs
+import spectre_server.core.jobs
 import spectre_server.core.receivers
 
 
@@ -13,6 +16,9 @@ def signal(
     force_restart: bool = False,
     max_restarts: int = 5,
     validate: bool = True,
+    on_poll: typing.Optional[
+        typing.Callable[[spectre_server.core.jobs.Job], None]
+    ] = None,
 ) -> int:
     """Capture data from an SDR in real time.
 
@@ -22,11 +28,17 @@ def signal(
     :param max_restarts: Maximum number of times workers can be restarted before giving up and killing all workers.
     Only applies when force_restart is True. Defaults to 5.
     :param validate: If True, validate the config parameters. Defaults to True.
+    :param on_poll: If specified, called with the job each time the workers are checked.
     :return: A string indicating the job has completed.
     """
     configs = [spectre_server.core.receivers.read_config(tag) for tag in tags]
     return spectre_server.core.receivers.record_signal(
-        configs, duration, force_restart, max_restarts, skip_validation=not validate
+        configs,
+        duration,
+        force_restart,
+        max_restarts,
+        skip_validation=not validate,
+        on_poll=on_poll,
     )
 
 
@@ -37,6 +49,9 @@ def spectrograms(
     force_restart: bool = False,
     max_restarts: int = 5,
     validate: bool = True,
+    on_poll: typing.Optional[
+        typing.Callable[[spectre_server.core.jobs.Job], None]
+    ] = None,
 ) -> int:
     """Capture data from an SDR and post-process it into spectrograms in real time.
 
@@ -46,9 +61,122 @@ def spectrograms(
     :param max_restarts: Maximum number of times workers can be restarted before giving up and killing all workers.
     Only applies when force_restart is True. Defaults to 5.
     :param validate: If True, validate the config parameters. Defaults to True.
+    :param on_poll: If specified, called with the job each time the workers are checked.
     :return: A string indicating the job has completed.
     """
     configs = [spectre_server.core.receivers.read_config(tag) for tag in tags]
     return spectre_server.core.receivers.record_spectrograms(
-        configs, duration, force_restart, max_restarts, skip_validation=not validate
+        configs,
+        duration,
+        force_restart,
+        max_restarts,
+        skip_validation=not validate,
+        on_poll=on_poll,
     )
+
+
+def _submit_recording(
+    target: str,
+    tags: list[str],
+    duration: float,
+    force_restart: bool,
+    max_restarts: int,
+    validate: bool,
+) -> str:
+    # Read the configs up front, so that a missing config is reported straight away.
+    for tag in tags:
+        spectre_server.core.receivers.read_config(tag)
+    status = spectre_server.core.jobs.submit_job(
+        target,
+        {
+            "tags": tags,
+            "duration": duration,
+            "force_restart": force_restart,
+            "max_restarts": max_restarts,
+            "validate": validate,
+        },
+    )
+    return status.job_id
+
+
+@spectre_server.core.logs.log_call
+def start_signal(
+    tags: list[str],
+    duration: float,
+    force_restart: bool = False,
+    max_restarts: int = 5,
+    validate: bool = True,
+) -> str:
+    """Capture data from an SDR in real time, as a job running in the background.
+
+    :param tags: A bundle of config tags.
+    :param duration: How long to record the signal for, in seconds.
+    :param force_restart: If specified, restart all workers if one dies unexpectedly.
+    :param max_restarts: Maximum number of times workers can be restarted before giving up and killing all workers.
+    Only applies when force_restart is True. Defaults to 5.
+    :param validate: If True, validate the config parameters. Defaults to True.
+    :return: The ID of the job, returned as soon as it's been submitted.
+    """
+    return _submit_recording(
+        f"{__name__}:signal", tags, duration, force_restart, max_restarts, validate
+    )
+
+
+@spectre_server.core.logs.log_call
+def start_spectrograms(
+    tags: list[str],
+    duration: float,
+    force_restart: bool = False,
+    max_restarts: int = 5,
+    validate: bool = True,
+) -> str:
+    """Capture data from an SDR and post-process it into spectrograms in real time, as a job running
+    in the background.
+
+    :param tags: A bundle of config tags.
+    :param duration: How long to record the spectrograms for, in seconds.
+    :param force_restart: If specified, restart all workers if one dies unexpectedly.
+    :param max_restarts: Maximum number of times workers can be restarted before giving up and killing all workers.
+    Only applies when force_restart is True. Defaults to 5.
+    :param validate: If True, validate the config parameters. Defaults to True.
+    :return: The ID of the job, returned as soon as it's been submitted.
+    """
+    return _submit_recording(
+        f"{__name__}:spectrograms",
+        tags,
+        duration,
+        force_restart,
+        max_restarts,
+        validate,
+    )
+
+
+@spectre_server.core.logs.log_call
+def get_jobs() -> list[dict[str, typing.Any]]:
+    """Get the status of every recording job, from the oldest to the most recently submitted."""
+    registry = spectre_server.core.jobs.JobRegistry()
+    return [status.to_dict() for status in registry.list()]
+
+
+@spectre_server.core.logs.log_call
+def get_job(job_id: str) -> dict[str, typing.Any]:
+    """Get the status of a recording job.
+
+    :param job_id: Uniquely identifies the job.
+    :return: The status of the job, including whether each of its workers are alive, and how many times
+    they've been restarted.
+    """
+    registry = spectre_server.core.jobs.JobRegistry()
+    return registry.read(job_id).to_dict()
+
+
+@spectre_server.core.logs.log_call
+def cancel_job(job_id: str) -> dict[str, typing.Any]:
+    """Cancel a recording job. The job stops the next time it reports its status.
+
+    :param job_id: Uniquely identifies the job.
+    :return: The status of the job, as of when it was cancelled.
+    """
+    registry = spectre_server.core.jobs.JobRegistry()
+    registry.request_cancel(job_id)
+    return registry.read(job_id).to_dict()
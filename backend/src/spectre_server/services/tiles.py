@@ -0,0 +1,176 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import typing
+
+import spectre_server.core.batches
+import spectre_server.core.receivers
+import spectre_server.core.config
+import spectre_server.core.logs
+import spectre_server.core.plotting
+
+# The default colormap bounds, in decibels above the background. These match `SpectrogramPanel`.
+_DEFAULT_DBB_VMIN = -1
+_DEFAULT_DBB_VMAX = 2
+
+
+def _get_tile_dir_path(
+    tag: str,
+    tile: spectre_server.core.plotting.Tile,
+    scale: spectre_server.core.plotting.RasterScale,
+    reducer: spectre_server.core.plotting.Reducer,
+) -> str:
+    return os.path.join(
+        spectre_server.core.config.paths.get_tiles_dir_path(tag),
+        f"{scale.value}_{reducer.value}",
+        str(tile.z),
+        str(tile.x),
+    )
+
+
+def _find_batches(
+    tag: str, tile: spectre_server.core.plotting.Tile
+) -> list[spectre_server.core.batches.Base]:
+    """Find the batches with spectrogram data overlapping with the tile, in order of time."""
+    batches = spectre_server.core.batches.find_batches(
+        tag,
+        spectre_server.core.receivers.get_batch_cls(tag),
+        tile.start_datetime,
+        tile.end_datetime,
+    )
+    batches = [batch for batch in batches if batch.spectrogram_file.exists]
+    return spectre_server.core.batches.filter_batches_in_range(
+        batches, tile.start_datetime, tile.end_datetime
+    )
+
+
+def _render_tile_state(
+    tile: spectre_server.core.plotting.Tile,
+    batches: list[spectre_server.core.batches.Base],
+    file_stamps: list[tuple[str, int, int]],
+    scale: spectre_server.core.plotting.RasterScale,
+    reducer: spectre_server.core.plotting.Reducer,
+    previous_state: typing.Optional[spectre_server.core.plotting.TileState],
+) -> spectre_server.core.plotting.TileState:
+    """Draw the batches onto the tile, redrawing only what has changed since the previous state.
+
+    While batches are still being recorded, only the newest batches change. So, only the
+    columns of pixels from the first changed batch onwards are redrawn.
+    """
+    start_column = 0
+    frequency_band = None
+    batches_to_draw = batches
+    if previous_state is not None and previous_state.frequency_band is not None:
+        num_unchanged = 0
+        for previous_stamp, stamp in zip(previous_state.file_stamps, file_stamps):
+            if previous_stamp != stamp:
+                break
+            num_unchanged += 1
+        # Batches which were deleted, or inserted before others, need a full redraw.
+        if (
+            0 < num_unchanged < len(file_stamps)
+            and num_unchanged >= len(previous_state.file_stamps) - 1
+        ):
+            frequency_band = previous_state.frequency_band
+            start_column = tile.get_column(batches[num_unchanged].start_datetime)
+            batches_to_draw = spectre_server.core.batches.filter_batches_in_range(
+                batches, tile.get_column_datetime(start_column), tile.end_datetime
+            )
+
+    canvas = None
+    for batch in batches_to_draw:
+        spectrogram = batch.read_spectrogram()
+        if canvas is None:
+            canvas = spectre_server.core.plotting.TileCanvas(
+                tile,
+                frequency_band
+                or spectre_server.core.plotting.get_frequency_band(spectrogram),
+                scale=scale,
+                reducer=reducer,
+                start_column=start_column,
+            )
+        canvas.draw(spectrogram)
+
+    if canvas is None:
+        return spectre_server.core.plotting.TileState(
+            spectre_server.core.plotting.make_empty_tile(), None, file_stamps
+        )
+    return spectre_server.core.plotting.TileState(
+        canvas.get_values(
+            previous_state.values
+            if previous_state is not None and start_column
+            else None
+        ),
+        canvas.frequency_band,
+        file_stamps,
+    )
+
+
+@spectre_server.core.logs.log_call
+def get_tile(
+    tag: str,
+    z: int,
+    x: int,
+    y: int,
+    scale: str = spectre_server.core.plotting.RasterScale.DBB.value,
+    vmin: typing.Optional[float] = None,
+    vmax: typing.Optional[float] = None,
+    reducer: str = spectre_server.core.plotting.Reducer.MEAN.value,
+    cmap: str = spectre_server.core.plotting.PanelFormat().spectrogram_cmap,
+) -> str:
+    """Render a tile of spectrogram data as a PNG image, for browsing with a map-style viewer.
+
+    At zoom level zero, each tile spans one day and the whole frequency band. Each zoom level
+    after that halves the time and frequency spanned by each tile. Tiles are cached, and only
+    redrawn where the batches they were rendered from have changed.
+
+    :param tag: The batch file tag.
+    :param z: The zoom level, from 0 to 17.
+    :param x: The tile column, counted from the Unix epoch at the current zoom level.
+    :param y: The tile row, counted from the top of the frequency band.
+    :param scale: How the data is scaled, one of 'dBb' (decibels above the background of each batch)
+    or 'dB'. Defaults to 'dBb'.
+    :param vmin: The value mapped to the bottom of the colormap. Defaults to -1 for 'dBb', and must be
+    specified for 'dB'.
+    :param vmax: The value mapped to the top of the colormap. Defaults to 2 for 'dBb', and must be
+    specified for 'dB'.
+    :param reducer: How to combine values which share a pixel, one of 'mean' or 'max'. Defaults to 'mean'.
+    :param cmap: The name of the Matplotlib colormap. Defaults to the colormap used for spectrogram plots.
+    :return: The file path of the rendered tile, as an absolute path in the container's file system.
+    """
+    tile = spectre_server.core.plotting.Tile(z, x, y)
+    scale_ = spectre_server.core.plotting.RasterScale(scale)
+    reducer_ = spectre_server.core.plotting.Reducer(reducer)
+    if scale_ == spectre_server.core.plotting.RasterScale.DBB:
+        vmin = _DEFAULT_DBB_VMIN if vmin is None else vmin
+        vmax = _DEFAULT_DBB_VMAX if vmax is None else vmax
+    elif vmin is None or vmax is None:
+        raise ValueError(f"Both vmin and vmax must be specified for '{scale}' tiles")
+    lut = spectre_server.core.plotting.get_lut(cmap)
+
+    batches = _find_batches(tag, tile)
+    file_stamps = [
+        spectre_server.core.plotting.get_file_stamp(batch.spectrogram_file.location[0])
+        for batch in batches
+    ]
+
+    tile_dir_path = _get_tile_dir_path(tag, tile, scale_, reducer_)
+    state_path = os.path.join(tile_dir_path, f"{tile.y}.npz")
+    tile_path = os.path.join(tile_dir_path, f"{tile.y}_{cmap}_{vmin:g}_{vmax:g}.png")
+
+    state = spectre_server.core.plotting.TileState.load(state_path)
+    if state is not None and state.file_stamps == file_stamps:
+        if (
+            os.path.exists(tile_path)
+            and os.stat(tile_path).st_mtime_ns >= os.stat(state_path).st_mtime_ns
+        ):
+            return tile_path
+    else:
+        state = _render_tile_state(tile, batches, file_stamps, scale_, reducer_, state)
+        state.save(state_path)
+
+    rgba = spectre_server.core.plotting.apply_lut(state.values, lut, vmin, vmax)
+    spectre_server.core.plotting.write_png(tile_path, rgba)
+    return tile_path
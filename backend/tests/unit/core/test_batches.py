@@ -4,6 +4,7 @@
 
 import typing
 import datetime
+import pathlib
 
 import pytest
 import numpy as np
@@ -206,6 +207,24 @@ class TestBatches:
         with pytest.raises(ValueError):
             _ = batches.get_batches_in_range(start_time, end_time)
 
+    def test_get_lazy_spectrogram(
+        self,
+        batches: spectre_server.core.batches.Batches[
+            spectre_server.core.batches.IQStreamBatch
+        ],
+    ) -> None:
+        """Check that the view over the batch files has the same data as the spectrogram read up front."""
+        start_datetime = TEST_START + datetime.timedelta(seconds=0.5)
+        end_datetime = TEST_START + datetime.timedelta(seconds=2.5)
+        spectrogram = batches.get_spectrogram(start_datetime, end_datetime)
+        lazy = batches.get_lazy_spectrogram(start_datetime, end_datetime)
+        np.testing.assert_array_equal(lazy.datetimes, spectrogram.datetimes)
+        np.testing.assert_array_equal(lazy.frequencies, spectrogram.frequencies)
+        np.testing.assert_array_equal(lazy.dynamic_spectra, spectrogram.dynamic_spectra)
+        np.testing.assert_array_equal(
+            lazy.get_time_cut(2e6).cut, spectrogram.get_time_cut(2e6).cut
+        )
+
     def test_get_spectrogram(
         self,
         batches: spectre_server.core.batches.Batches[
@@ -285,3 +304,459 @@ class TestBatches:
                 ],
             ],
         )
+
+    def test_scanned_batch_files(
+        self,
+        batches: spectre_server.core.batches.Batches[
+            spectre_server.core.batches.IQStreamBatch
+        ],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Check that whether each batch file exists, and its size, is answered by the directory scan."""
+
+        def fail(_: str) -> None:
+            raise AssertionError("The file system was checked again")
+
+        monkeypatch.setattr("os.path.exists", fail)
+        monkeypatch.setattr("os.path.getsize", fail)
+        for batch in batches:
+            assert batch.has_file("fits")
+            assert not batch.has_file("fc32")
+            assert batch.fits_file.num_bytes == 14400
+        monkeypatch.undo()
+
+        # Deleting a file through the batch is reflected straight away.
+        batch = next(iter(batches))
+        batch.fits_file.delete()
+        assert not batch.has_file("fits")
+
+
+def test_filter_batches_in_range(
+    batches: spectre_server.core.batches.Batches[
+        spectre_server.core.batches.IQStreamBatch
+    ],
+) -> None:
+    """Check that batches are assumed to end at the start of the next batch in the input sequence,
+    even if they were collected from different directories."""
+    first_batch, _, last_batch = list(batches)
+    batches_in_range = spectre_server.core.batches.filter_batches_in_range(
+        [first_batch, last_batch],
+        TEST_START + datetime.timedelta(seconds=1),
+        TEST_START + datetime.timedelta(seconds=1.5),
+    )
+    assert [batch.name for batch in batches_in_range] == [first_batch.name]
+
+
+@pytest.fixture
+def iq_batch(
+    tmp_path: pathlib.Path,
+) -> spectre_server.core.batches.IQStreamBatch:
+    """Create a batch containing 1000 raw `sc16` I/Q samples."""
+    batch = spectre_server.core.batches.IQStreamBatch(
+        str(tmp_path), "2025-01-01T00:00:00.000000Z", TAG
+    )
+    np.arange(2000, dtype=np.int16).tofile(batch.sc16_file.file_path)
+    return batch
+
+
+class TestIQZ:
+    @pytest.mark.parametrize("codec", list(spectre_server.core.batches.IQZCodec))
+    @pytest.mark.parametrize("shuffle", [True, False])
+    @pytest.mark.parametrize(
+        "dtype, output_type",
+        [
+            (np.float32, "fc32"),
+            (np.float64, "fc64"),
+            (np.int8, "sc8"),
+            (np.int16, "sc16"),
+        ],
+    )
+    def test_round_trip(
+        self,
+        tmp_path: pathlib.Path,
+        codec: spectre_server.core.batches.IQZCodec,
+        shuffle: bool,
+        dtype: type,
+        output_type: str,
+    ) -> None:
+        """Check that every sample is read back exactly, over many blocks."""
+        raw_file_path = str(tmp_path / f"samples.{output_type}")
+        iqz_file_path = str(tmp_path / "samples.iqz")
+        components = np.arange(-50, 50).astype(dtype)
+        components.tofile(raw_file_path)
+
+        index = spectre_server.core.batches.write_iqz(
+            raw_file_path,
+            iqz_file_path,
+            output_type,
+            codec=codec,
+            shuffle=shuffle,
+            block_num_samples=16,
+        )
+        assert index.num_samples == 50
+        assert index.num_blocks == 4
+        read_index = spectre_server.core.batches.read_iqz_index(iqz_file_path)
+        assert read_index.output_type == output_type
+        assert read_index.codec == codec
+        assert read_index.shuffle == shuffle
+        assert np.array_equal(read_index.offsets, index.offsets)
+        assert np.array_equal(read_index.sizes, index.sizes)
+
+        expected = (components[0::2] + 1j * components[1::2]).astype(np.complex64)
+        assert np.array_equal(
+            spectre_server.core.batches.read_iqz(iqz_file_path), expected
+        )
+        assert np.array_equal(
+            spectre_server.core.batches.read_iqz(iqz_file_path, 10, 40),
+            expected[10:40],
+        )
+        assert [
+            len(chunk)
+            for chunk in spectre_server.core.batches.iter_iqz(iqz_file_path, 10, 40)
+        ] == [6, 16, 8]
+
+    def test_truncated(self, tmp_path: pathlib.Path) -> None:
+        """Check that a partially written file is refused."""
+        raw_file_path = str(tmp_path / "samples.fc32")
+        iqz_file_path = str(tmp_path / "samples.iqz")
+        np.zeros(64, dtype=np.float32).tofile(raw_file_path)
+        spectre_server.core.batches.write_iqz(raw_file_path, iqz_file_path, "fc32")
+        with open(iqz_file_path, "r+b") as f:
+            f.truncate(f.seek(0, 2) - 1)
+        with pytest.raises(ValueError):
+            spectre_server.core.batches.read_iqz(iqz_file_path)
+
+    def test_compress_iq(
+        self, iq_batch: spectre_server.core.batches.IQStreamBatch
+    ) -> None:
+        """Check that the batch reads I/Q samples transparently, once they're compressed."""
+        extension = spectre_server.core.batches.IQStreamBatchExtension.SC16
+        expected = iq_batch.read_iq(extension)
+        assert np.array_equal(
+            iq_batch.read_iq_samples(extension, 100, 200), expected[100:200]
+        )
+
+        iq_batch.compress_iq(extension)
+        assert not iq_batch.sc16_file.exists
+        assert iq_batch.iqz_file.exists
+        assert np.array_equal(iq_batch.read_iq(extension), expected)
+        assert np.array_equal(
+            iq_batch.read_iq_samples(extension, 100, 200), expected[100:200]
+        )
+
+        iq_batch.delete_iq(extension)
+        assert not iq_batch.iqz_file.exists
+
+
+class TestIQSlice:
+    def test_get_iq_segments(self, tmp_path: pathlib.Path) -> None:
+        """Check that a time range is stitched across batches, with a gap between the last two."""
+        sample_rate = 100.0
+        extension = spectre_server.core.batches.IQStreamBatchExtension.FC32
+        batches = []
+        for seconds in [0, 1, 3]:
+            start_time = (TEST_START + datetime.timedelta(seconds=seconds)).strftime(
+                spectre_server.core.config.TimeFormat.DATETIME
+            )
+            batch = spectre_server.core.batches.IQStreamBatch(
+                str(tmp_path), start_time, TAG
+            )
+            np.full(100, seconds, dtype=np.complex64).tofile(batch.fc32_file.file_path)
+            batches.append(batch)
+
+        segments = spectre_server.core.batches.get_iq_segments(
+            batches,
+            extension,
+            sample_rate,
+            TEST_START + datetime.timedelta(seconds=0.5),
+            TEST_START + datetime.timedelta(seconds=3.25),
+        )
+        assert [(s.start, s.stop) for s in segments] == [(50, 100), (0, 100), (0, 25)]
+        assert segments[0].start_datetime == TEST_START + datetime.timedelta(
+            seconds=0.5
+        )
+
+        samples = np.concatenate(
+            list(spectre_server.core.batches.iter_iq_segments(segments, extension))
+        )
+        assert np.array_equal(
+            samples, np.repeat(np.array([0, 1, 3], dtype=np.complex64), [50, 100, 25])
+        )
+
+        sigmf_meta = spectre_server.core.batches.make_sigmf_meta(
+            segments, sample_rate, center_frequency=1e6
+        )
+        # A new capture starts after the gap.
+        assert [c["core:sample_start"] for c in sigmf_meta["captures"]] == [0, 150]
+        assert (
+            sigmf_meta["captures"][1]["core:datetime"] == "2000-01-01T00:00:03.000000Z"
+        )
+        assert sigmf_meta["global"]["core:datatype"] == "cf32_le"
+
+
+class TestRetention:
+    @pytest.fixture
+    def batch_files(self, tmp_path: pathlib.Path) -> list[pathlib.Path]:
+        """Create five consecutive batches, each with a 100 byte `.fc32` and `.fits` file."""
+        paths = []
+        for seconds in range(5):
+            start_time = (TEST_START + datetime.timedelta(seconds=seconds)).strftime(
+                spectre_server.core.config.TimeFormat.DATETIME
+            )
+            for extension in ["fc32", "fits"]:
+                path = tmp_path / f"{start_time}_{TAG}.{extension}"
+                path.write_bytes(bytes(100))
+                paths.append(path)
+        return paths
+
+    def _plan(
+        self, tmp_path: pathlib.Path, **kwargs
+    ) -> spectre_server.core.batches.RetentionReport:
+        return spectre_server.core.batches.plan_retention(
+            [spectre_server.core.batches.RetentionPolicy(TAG, **kwargs)],
+            str(tmp_path),
+            now=TEST_START + datetime.timedelta(seconds=5),
+            grace_period=0,
+            free_bytes=0,
+        )
+
+    def test_max_age(
+        self, tmp_path: pathlib.Path, batch_files: list[pathlib.Path]
+    ) -> None:
+        """Check that old files are selected, oldest first, but never the two newest batches."""
+        report = self._plan(tmp_path, extensions=["fc32"], max_age=0)
+        assert [f.file_path for f in report.files] == [
+            str(p) for p in batch_files[:6:2]
+        ]
+        assert report.num_files_protected == 2
+
+    def test_max_bytes(
+        self, tmp_path: pathlib.Path, batch_files: list[pathlib.Path]
+    ) -> None:
+        """Check that the oldest files are selected until the rest fit within the limit."""
+        report = self._plan(tmp_path, max_bytes=700)
+        assert [f.file_path for f in report.files] == [str(p) for p in batch_files[:3]]
+        assert report.to_dict()["reasons"] == {"max_bytes": 3}
+
+    def test_min_free_bytes(
+        self, tmp_path: pathlib.Path, batch_files: list[pathlib.Path]
+    ) -> None:
+        """Check that the oldest files are selected until enough of the disk would be free."""
+        report = self._plan(tmp_path, min_free_bytes=150)
+        assert report.num_bytes == 200
+
+    def test_apply(
+        self, tmp_path: pathlib.Path, batch_files: list[pathlib.Path]
+    ) -> None:
+        """Check that only the selected files are deleted."""
+        report = self._plan(tmp_path, max_age=0)
+        spectre_server.core.batches.apply_retention(report)
+        assert report.num_files_deleted == 6
+        assert [p.exists() for p in batch_files] == [False] * 6 + [True] * 4
+
+
+class TestPartitions:
+    @pytest.fixture(autouse=True)
+    def partitioned_paths(
+        self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("SPECTRE_DATA_DIR_PATH", str(tmp_path))
+        monkeypatch.setenv("SPECTRE_BATCHES_PARTITION_MINUTES", "60")
+
+    def _make_batch_files(self, hours: list[int]) -> list[pathlib.Path]:
+        """Create one `.fc32` batch file per hour, all in the directory for their day."""
+        day_dir_path = pathlib.Path(
+            spectre_server.core.config.paths.get_batches_dir_path(
+                TEST_START.year, TEST_START.month, TEST_START.day
+            )
+        )
+        day_dir_path.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for hour in hours:
+            start_time = (TEST_START + datetime.timedelta(hours=hour)).strftime(
+                spectre_server.core.config.TimeFormat.DATETIME
+            )
+            path = day_dir_path / f"{start_time}_{TAG}.fc32"
+            path.write_bytes(bytes(8))
+            paths.append(path)
+        return paths
+
+    def test_migrate_batch_files(self) -> None:
+        """Check that batch files are moved into their partitions, except the newest two batches."""
+        paths = self._make_batch_files([0, 1, 2, 3])
+        moves = spectre_server.core.batches.migrate_batch_files()
+        assert moves == [
+            (str(paths[0]), str(paths[0].parent / "00" / paths[0].name)),
+            (str(paths[1]), str(paths[1].parent / "01" / paths[1].name)),
+        ]
+        assert [p.exists() for p in paths] == [False, False, True, True]
+
+    def test_find_batches(self) -> None:
+        """Check that only the partitions which could overlap the time range are searched."""
+        self._make_batch_files([0, 1, 2, 3, 4])
+        spectre_server.core.batches.migrate_batch_files()
+        batches = spectre_server.core.batches.find_batches(
+            TAG,
+            spectre_server.core.batches.IQStreamBatch,
+            TEST_START + datetime.timedelta(hours=2, minutes=30),
+            TEST_START + datetime.timedelta(hours=3, minutes=30),
+        )
+        # The first partition is never searched, but batches not yet moved into their partition are.
+        assert [b.start_datetime.hour for b in batches] == [1, 2, 3, 4]
+
+    def test_partition_batch(self) -> None:
+        """Check that every file in a batch is moved into its partition."""
+        (path,) = self._make_batch_files([5])
+        path.with_suffix(".hdr").write_bytes(bytes(8))
+        start_time, tag, _ = spectre_server.core.batches.parse_batch_file_name(
+            path.name
+        )
+        batch = spectre_server.core.batches.IQStreamBatch(
+            str(path.parent), start_time, tag
+        )
+        moved_file_paths = spectre_server.core.batches.partition_batch(batch)
+        assert sorted(moved_file_paths) == [
+            str(path.parent / "05" / path.with_suffix(".fc32").name),
+            str(path.parent / "05" / path.with_suffix(".hdr").name),
+        ]
+
+    def test_find_partly_moved_batch(self) -> None:
+        """Check that a batch is found whole while only some of its files have been moved into its partition."""
+        (path,) = self._make_batch_files([5])
+        partition_dir_path = path.parent / "05"
+        partition_dir_path.mkdir()
+        path.with_suffix(".hdr").write_bytes(bytes(8))
+        path.rename(partition_dir_path / path.name)
+
+        (batch,) = spectre_server.core.batches.Batches(
+            TAG, spectre_server.core.batches.IQStreamBatch, str(path.parent)
+        )
+        assert batch.fc32_file.file_path == str(partition_dir_path / path.name)
+        assert batch.has_file("fc32") and batch.has_file("hdr")
+
+        (batch,) = spectre_server.core.batches.find_batches(
+            TAG,
+            spectre_server.core.batches.IQStreamBatch,
+            TEST_START + datetime.timedelta(hours=5),
+            TEST_START + datetime.timedelta(hours=6),
+        )
+        assert batch.has_file("fc32") and batch.has_file("hdr")
+        assert batch.hdr_file.read_bytes() == bytes(8)
+
+
+class TestArchive:
+    @pytest.fixture(autouse=True)
+    def data_dir_path(
+        self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("SPECTRE_DATA_DIR_PATH", str(tmp_path))
+
+    @pytest.fixture
+    def day_dir_path(
+        self, spectrograms: list[spectre_server.core.spectrograms.Spectrogram]
+    ) -> pathlib.Path:
+        """Save the spectrograms, along with a loose `.fc32` file, in the directory for their day."""
+        for spectrogram in spectrograms:
+            spectrogram.save(
+                TAG, ORIGIN, INSTRUMENT, TELESCOPE, OBJECT, OBS_ALT, OBS_LAT, OBS_LON
+            )
+        day_dir_path = pathlib.Path(
+            spectre_server.core.config.paths.get_batches_dir_path(
+                TEST_START.year, TEST_START.month, TEST_START.day
+            )
+        )
+        start_time = TEST_START.strftime(spectre_server.core.config.TimeFormat.DATETIME)
+        (day_dir_path / f"{start_time}_{TAG}.fc32").write_bytes(bytes(8))
+        return day_dir_path
+
+    def _archive(self, **kwargs: typing.Any) -> list[str]:
+        return spectre_server.core.batches.archive_batch_files(
+            TAG, TEST_START.year, TEST_START.month, TEST_START.day, **kwargs
+        )
+
+    def test_archive_batch_files(
+        self,
+        day_dir_path: pathlib.Path,
+        spectrograms: list[spectre_server.core.spectrograms.Spectrogram],
+    ) -> None:
+        """Check that archived batch files are removed from the file system, but can still be read."""
+        file_paths = self._archive()
+        assert len(file_paths) == 3
+        assert sorted(p.name for p in day_dir_path.iterdir()) == [
+            "2000-01-01T00:00:00.000000Z_tag.fc32",
+            "tag.zip",
+        ]
+
+        batches = spectre_server.core.batches.Batches(
+            TAG, spectre_server.core.batches.IQStreamBatch, str(day_dir_path)
+        )
+        assert len(batches) == 3
+        for batch, spectrogram in zip(batches, spectrograms):
+            assert batch.spectrogram_file.is_archived
+            np.testing.assert_array_equal(
+                batch.read_spectrogram().dynamic_spectra, spectrogram.dynamic_spectra
+            )
+        lazy = batches.get_lazy_spectrogram(
+            TEST_START, TEST_START + datetime.timedelta(seconds=3)
+        )
+        np.testing.assert_array_equal(
+            lazy.dynamic_spectra,
+            spectre_server.core.spectrograms.join_spectrograms(
+                spectrograms
+            ).dynamic_spectra,
+        )
+        # The I/Q samples are never archived.
+        first_batch = next(iter(batches))
+        assert not first_batch.fc32_file.is_archived
+        with pytest.raises(PermissionError):
+            first_batch.spectrogram_file.delete()
+
+    def test_archive_merge(self, day_dir_path: pathlib.Path) -> None:
+        """Check that archiving more batch files keeps those already in the archive."""
+        self._archive()
+        path = day_dir_path / "2000-01-01T00:00:03.000000Z_tag.png"
+        path.write_bytes(b"png")
+        assert self._archive() == [str(path)]
+
+        index = spectre_server.core.batches.read_archive_index(
+            str(day_dir_path / "tag.zip")
+        )
+        assert len(index) == 4
+        assert index[path.name].read_bytes() == b"png"
+
+    def test_retention(self, day_dir_path: pathlib.Path) -> None:
+        """Check that archives are reclaimed whole, once the newest batch they contain is too old."""
+        self._archive()
+        archive_path = day_dir_path / "tag.zip"
+
+        def plan(max_age: float) -> spectre_server.core.batches.RetentionReport:
+            return spectre_server.core.batches.plan_retention(
+                [spectre_server.core.batches.RetentionPolicy(TAG, max_age=max_age)],
+                now=TEST_START + datetime.timedelta(seconds=3),
+                grace_period=0,
+                free_bytes=0,
+            )
+
+        report = plan(max_age=1.5)
+        assert report.files == []
+        assert report.num_bytes_scanned == archive_path.stat().st_size + 8
+
+        report = plan(max_age=0.5)
+        assert [f.file_path for f in report.files] == [str(archive_path)]
+        spectre_server.core.batches.apply_retention(report)
+        assert not archive_path.exists()
+
+    def test_dry_run(self, day_dir_path: pathlib.Path) -> None:
+        """Check that nothing is archived in a dry run."""
+        assert len(self._archive(dry_run=True)) == 3
+        assert not (day_dir_path / "tag.zip").exists()
+
+    def test_invalid(self, day_dir_path: pathlib.Path) -> None:
+        """Check that I/Q samples, and days which haven't completed, cannot be archived."""
+        with pytest.raises(ValueError):
+            self._archive(extensions=["fc32"])
+        today = datetime.datetime.now(datetime.timezone.utc)
+        with pytest.raises(ValueError):
+            spectre_server.core.batches.archive_batch_files(
+                TAG, today.year, today.month, today.day
+            )
@@ -59,6 +59,56 @@ def test_get_batches_dir_path(
     assert result == expected_dir_path
 
 
+@pytest.mark.parametrize(
+    ["partition_minutes", "hour", "minute", "expected_partition"],
+    [
+        ("0", 13, 45, None),
+        ("60", 13, 45, "13"),
+        ("15", 13, 45, "1345"),
+        ("10", 13, 59, "1350"),
+        ("360", 13, 45, "12"),
+    ],
+)
+def test_get_batches_partition_dir_path(
+    monkeypatch: pytest.MonkeyPatch,
+    partition_minutes: str,
+    hour: int,
+    minute: int,
+    expected_partition: str,
+) -> None:
+    """Check that batch files are partitioned within each day, when configured."""
+    monkeypatch.setenv("SPECTRE_BATCHES_PARTITION_MINUTES", partition_minutes)
+    day_dir_path = os.path.join("/tmp", ".spectre-data", "batches", "2025", "02", "13")
+    result = spectre_server.core.config.paths.get_batches_dir_path(
+        2025, 2, 13, hour, minute
+    )
+    if expected_partition is None:
+        assert result == day_dir_path
+    else:
+        assert result == os.path.join(day_dir_path, expected_partition)
+
+
+@pytest.mark.parametrize("partition_minutes", ["-1", "7", "90", "1441"])
+def test_invalid_batches_partition_minutes(
+    monkeypatch: pytest.MonkeyPatch, partition_minutes: str
+) -> None:
+    """Check that partitions which do not evenly divide the day are rejected."""
+    monkeypatch.setenv("SPECTRE_BATCHES_PARTITION_MINUTES", partition_minutes)
+    with pytest.raises(ValueError):
+        spectre_server.core.config.paths.get_batches_dir_path(2025, 2, 13, 0)
+
+
+def test_get_plot_cache_max_bytes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that the plot cache size is read from the environment, and must be non-negative."""
+    monkeypatch.delenv("SPECTRE_PLOT_CACHE_MAX_BYTES", raising=False)
+    assert spectre_server.core.config.paths.get_plot_cache_max_bytes() > 0
+    monkeypatch.setenv("SPECTRE_PLOT_CACHE_MAX_BYTES", "0")
+    assert spectre_server.core.config.paths.get_plot_cache_max_bytes() == 0
+    monkeypatch.setenv("SPECTRE_PLOT_CACHE_MAX_BYTES", "-1")
+    with pytest.raises(ValueError):
+        spectre_server.core.config.paths.get_plot_cache_max_bytes()
+
+
 @pytest.mark.parametrize(
     ["year", "month", "day", "expected_dir_path"],
     [
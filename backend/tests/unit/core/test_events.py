@@ -2,12 +2,21 @@
 # This file is part of SPECTRE
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import time
+import threading
+import datetime
+
 import pytest
 
 import numpy as np
+import watchdog.events
 
 import spectre_server.core.events
 import spectre_server.core.fields
+import spectre_server.core.batches
+import spectre_server.core.config
+import spectre_server.core.spectrograms
+import spectre_server.core.plotting
 
 
 def is_close(a, b, atol=1e-5, rtol=0):
@@ -238,3 +247,186 @@ class TestSTFFT:
         )
 
         assert is_close(dynamic_spectra, expected_dynamic_spectra)
+
+
+class _EventHandler(spectre_server.core.events.Base):
+    def process(
+        self, batch: spectre_server.core.batches.IQStreamBatch
+    ) -> spectre_server.core.spectrograms.Spectrogram:
+        return spectre_server.core.spectrograms.Spectrogram(
+            np.ones((2, 2), dtype=np.float32),
+            np.array([0.0, 1.0]),
+            np.array([1e6, 2e6]),
+            spectre_server.core.spectrograms.SpectrumUnit.AMPLITUDE,
+            batch.start_datetime,
+        )
+
+    @property
+    def _watch_extension(self) -> str:
+        return "bin"
+
+
+class _CompressingEventHandler(_EventHandler):
+    def __init__(self, *args, **kwargs) -> None:
+        """Compress each batch in the background, blocking every compression until released."""
+        super().__init__(*args, **kwargs)
+        self.release = threading.Event()
+        self.queued: list[bool] = []
+        self.compressed: list[str] = []
+
+    def process(
+        self, batch: spectre_server.core.batches.IQStreamBatch
+    ) -> spectre_server.core.spectrograms.Spectrogram:
+        def compress() -> None:
+            self.release.wait()
+            self.compressed.append(batch.start_time)
+
+        self.queued.append(
+            self._compress_in_background(compress, f"compressing {batch.name}")
+        )
+        return super().process(batch)
+
+
+def _notify(handler: _EventHandler, num_batches: int) -> None:
+    """Notify the handler of some consecutive batch files being created."""
+    start = datetime.datetime(2025, 1, 1)
+    for i in range(num_batches):
+        start_time = (start + datetime.timedelta(seconds=i)).strftime(
+            spectre_server.core.config.TimeFormat.DATETIME
+        )
+        handler.on_created(
+            watchdog.events.FileCreatedEvent(f"/tmp/{start_time}_tag.bin")
+        )
+
+
+class TestBase:
+    def test_flush_in_background(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Check that spectrograms are written in order, and that closing waits for pending writes."""
+        saved = []
+
+        def slow_save(
+            spectrogram: spectre_server.core.spectrograms.Spectrogram, *args, **kwargs
+        ) -> None:
+            time.sleep(0.05)
+            saved.append(spectrogram.start_datetime)
+
+        monkeypatch.setattr(
+            spectre_server.core.spectrograms.Spectrogram, "save", slow_save
+        )
+        handler = _EventHandler(
+            "tag",
+            spectre_server.core.events.FixedCenterFrequencyModel(),
+            spectre_server.core.batches.IQStreamBatch,
+        )
+        # Each batch is only processed once the next is created.
+        _notify(handler, 4)
+        handler.close()
+        assert saved == [
+            np.datetime64(datetime.datetime(2025, 1, 1, 0, 0, i)) for i in range(3)
+        ]
+
+    def test_flush_errors_are_reported(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Check that an error writing a spectrogram is raised back in the caller."""
+
+        def failing_save(*args, **kwargs) -> None:
+            raise OSError("Disk full")
+
+        monkeypatch.setattr(
+            spectre_server.core.spectrograms.Spectrogram, "save", failing_save
+        )
+        handler = _EventHandler(
+            "tag",
+            spectre_server.core.events.FixedCenterFrequencyModel(),
+            spectre_server.core.batches.IQStreamBatch,
+        )
+        _notify(handler, 2)
+        with pytest.raises(OSError):
+            handler.close()
+
+    def test_quicklooks_are_dropped_when_behind(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Check that flushed spectrograms are sent for rendering, without waiting on the renderer."""
+        monkeypatch.setattr(
+            spectre_server.core.spectrograms.Spectrogram, "save", lambda *_, **__: None
+        )
+        rendered = []
+
+        def save_quicklook(
+            spectrogram: spectre_server.core.spectrograms.Spectrogram,
+            tag: str,
+            **kwargs,
+        ) -> str:
+            if not rendered:
+                rendered.append(None)
+                raise ValueError("Failed to render")
+            rendered.append((spectrogram.start_datetime, tag))
+            return "quicklook.png"
+
+        monkeypatch.setattr(
+            spectre_server.core.plotting, "save_quicklook", save_quicklook
+        )
+        quicklook_renderer = spectre_server.core.events.QuicklookRenderer(max_pending=1)
+        handler = _EventHandler(
+            "tag",
+            spectre_server.core.events.FixedCenterFrequencyModel(quicklook=True),
+            spectre_server.core.batches.IQStreamBatch,
+            quicklook_renderer=quicklook_renderer,
+        )
+        # The first spectrogram is queued, and the rest are dropped since nothing is rendering them.
+        _notify(handler, 4)
+        handler.close()
+        spectrogram = spectre_server.core.spectrograms.Spectrogram(
+            np.ones((2, 2), dtype=np.float32),
+            np.array([0.0, 1.0]),
+            np.array([1e6, 2e6]),
+            spectre_server.core.spectrograms.SpectrumUnit.AMPLITUDE,
+            datetime.datetime(2025, 1, 1),
+        )
+        assert not quicklook_renderer.submit(spectrogram, "tag")
+
+        # An error rendering one quicklook doesn't stop the renderer.
+        quicklook_renderer.render_next()
+        assert quicklook_renderer.submit(spectrogram, "tag")
+        quicklook_renderer.render_next()
+        assert rendered == [None, (spectrogram.start_datetime, "tag")]
+
+    def test_compression_is_skipped_when_behind(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Check that a slow compression holds up neither the post processing, nor flushing the spectrograms."""
+        saved = []
+        monkeypatch.setattr(
+            spectre_server.core.spectrograms.Spectrogram,
+            "save",
+            lambda spectrogram, *_, **__: saved.append(spectrogram.start_datetime),
+        )
+        handler = _CompressingEventHandler(
+            "tag",
+            spectre_server.core.events.FixedCenterFrequencyModel(),
+            spectre_server.core.batches.IQStreamBatch,
+        )
+        _notify(handler, 5)
+
+        # Every spectrogram is flushed, while the first compression is still running.
+        deadline = time.time() + 5
+        while len(saved) < 4 and time.time() < deadline:
+            time.sleep(0.01)
+        assert len(saved) == 4
+        assert handler.compressed == []
+        assert handler.queued[0]
+        assert handler.queued.count(False) >= 2
+
+        handler.release.set()
+        handler.close()
+        start_times = [
+            (datetime.datetime(2025, 1, 1) + datetime.timedelta(seconds=i)).strftime(
+                spectre_server.core.config.TimeFormat.DATETIME
+            )
+            for i in range(4)
+        ]
+        assert handler.compressed == [
+            start_time
+            for start_time, queued in zip(start_times, handler.queued)
+            if queued
+        ]
@@ -7,6 +7,8 @@ import base64
 import pytest
 import os
 import tempfile
+import time
+import random
 
 import spectre_server.core.io
 
@@ -112,3 +114,48 @@ class TestRead:
         )
 
         assert result == base64.b64encode(content).decode("ascii")
+
+
+class TestImapOrdered:
+    @pytest.mark.parametrize("max_workers", [1, 2, 8])
+    def test_preserves_order(self, max_workers: int) -> None:
+        """Check that results are yielded in input order, even when they complete out of order."""
+
+        def slow_square(x: int) -> int:
+            time.sleep(random.uniform(0, 0.01))
+            return x * x
+
+        items = list(range(50))
+        result = list(
+            spectre_server.core.io.imap_ordered(
+                slow_square, items, max_workers=max_workers
+            )
+        )
+        assert result == [x * x for x in items]
+
+    def test_propagates_errors(self) -> None:
+        """Check that an error raised in a worker thread is re-raised to the caller."""
+
+        def fail_on_three(x: int) -> int:
+            if x == 3:
+                raise ValueError("Bad item.")
+            return x
+
+        with pytest.raises(ValueError):
+            list(
+                spectre_server.core.io.imap_ordered(
+                    fail_on_three, range(10), max_workers=4
+                )
+            )
+
+    @pytest.mark.parametrize("max_workers", [0, -1])
+    def test_invalid_max_workers(self, max_workers: int) -> None:
+        """Check that an explicit number of workers must be positive, rather than falling back to the default."""
+        with pytest.raises(ValueError):
+            spectre_server.core.io.imap_ordered(abs, range(10), max_workers=max_workers)
+
+    def test_invalid_max_io_workers(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Check that the number of workers set by the environment must be positive."""
+        monkeypatch.setenv("SPECTRE_MAX_IO_WORKERS", "0")
+        with pytest.raises(ValueError):
+            spectre_server.core.io.get_max_io_workers()
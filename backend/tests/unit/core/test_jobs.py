@@ -3,6 +3,10 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import pytest
+import pathlib
+import time
+import typing
+import threading
 from time import sleep
 
 import spectre_server.core.jobs
@@ -257,3 +261,128 @@ class TestJobs:
 
         # Kill the workers, since otherwise they would keep running until the parent process terminates.
         successful_runtime_job.kill()
+
+
+def _record_briefly(
+    duration: float,
+    on_poll: typing.Optional[
+        typing.Callable[[spectre_server.core.jobs.Job], None]
+    ] = None,
+) -> None:
+    spectre_server.core.jobs.start_job(
+        [_make_successful_runtime_worker()], duration, on_poll=on_poll
+    )
+
+
+def _fail_to_record(
+    on_poll: typing.Optional[
+        typing.Callable[[spectre_server.core.jobs.Job], None]
+    ] = None,
+) -> None:
+    spectre_server.core.jobs.start_job(
+        [_make_instantly_failing_runtime_worker()],
+        spectre_server.core.jobs.Duration.ONE_SECOND,
+        on_poll=on_poll,
+    )
+
+
+@pytest.fixture
+def registry(tmp_path: pathlib.Path) -> spectre_server.core.jobs.JobRegistry:
+    """A job registry in a temporary directory."""
+    return spectre_server.core.jobs.JobRegistry(str(tmp_path))
+
+
+class TestJobRegistry:
+    def test_create(self, registry: spectre_server.core.jobs.JobRegistry) -> None:
+        """Check that a new job is pending, and can be read back."""
+        status = registry.create(f"{__name__}:_record_briefly", {"duration": 1})
+        assert status.state == spectre_server.core.jobs.JobState.PENDING
+        assert registry.read(status.job_id).to_dict() == status.to_dict()
+
+    def test_list(self, registry: spectre_server.core.jobs.JobRegistry) -> None:
+        """Check that jobs are listed from the oldest to the most recently submitted."""
+        job_ids = [
+            registry.create(f"{__name__}:_record_briefly", {"duration": 1}).job_id
+            for _ in range(3)
+        ]
+        assert [status.job_id for status in registry.list()] == job_ids
+
+    def test_unknown_job(self, registry: spectre_server.core.jobs.JobRegistry) -> None:
+        """Check that reading a job which doesn't exist raises an error."""
+        with pytest.raises(FileNotFoundError):
+            registry.read("0" * 32)
+
+    def test_invalid_job_id(
+        self, registry: spectre_server.core.jobs.JobRegistry
+    ) -> None:
+        """Check that job IDs can't be used to read files outside the registry."""
+        with pytest.raises(ValueError):
+            registry.read("../jobs")
+
+    def test_lost_job(self, registry: spectre_server.core.jobs.JobRegistry) -> None:
+        """Check that a job which has stopped reporting is assumed to have failed."""
+        status = registry.create(f"{__name__}:_record_briefly", {"duration": 1})
+        status.state = spectre_server.core.jobs.JobState.RUNNING
+        status.updated_at = time.time() - 3600
+        registry.write(status)
+        assert (
+            registry.read(status.job_id).state
+            == spectre_server.core.jobs.JobState.FAILED
+        )
+
+
+class TestSupervise:
+    def test_completed(self, registry: spectre_server.core.jobs.JobRegistry) -> None:
+        """Check that a job which runs for its full duration is completed, and its workers reported."""
+        job_id = registry.create(
+            f"{__name__}:_record_briefly",
+            {"duration": spectre_server.core.jobs.Duration.ONE_DECISECOND},
+        ).job_id
+        spectre_server.core.jobs.supervise(registry, job_id)
+
+        status = registry.read(job_id)
+        assert status.state == spectre_server.core.jobs.JobState.COMPLETED
+        assert status.workers == [("successful_runtime_worker", False)]
+        assert status.num_restarts == 0
+
+    def test_failed(self, registry: spectre_server.core.jobs.JobRegistry) -> None:
+        """Check that a job whose worker exits unexpectedly has failed, with the error recorded."""
+        job_id = registry.create(f"{__name__}:_fail_to_record", {}).job_id
+        spectre_server.core.jobs.supervise(registry, job_id)
+
+        status = registry.read(job_id)
+        assert status.state == spectre_server.core.jobs.JobState.FAILED
+        assert "unexpectedly exited" in status.error
+
+    def test_cancelled(self, registry: spectre_server.core.jobs.JobRegistry) -> None:
+        """Check that a job cancelled while running stops well before its full duration."""
+        job_id = registry.create(
+            f"{__name__}:_record_briefly",
+            {"duration": spectre_server.core.jobs.Duration.TEN_SECONDS},
+        ).job_id
+        cancel = threading.Timer(
+            spectre_server.core.jobs.Duration.ONE_DECISECOND,
+            registry.request_cancel,
+            [job_id],
+        )
+        cancel.start()
+        start_time = time.time()
+        spectre_server.core.jobs.supervise(registry, job_id)
+        cancel.join()
+
+        assert time.time() - start_time < spectre_server.core.jobs.Duration.TEN_SECONDS
+        status = registry.read(job_id)
+        assert status.state == spectre_server.core.jobs.JobState.CANCELLED
+        assert status.workers == [("successful_runtime_worker", False)]
+
+    def test_cancelled_before_starting(
+        self, registry: spectre_server.core.jobs.JobRegistry
+    ) -> None:
+        """Check that a job cancelled while pending never runs."""
+        job_id = registry.create(f"{__name__}:_fail_to_record", {}).job_id
+        registry.request_cancel(job_id)
+        spectre_server.core.jobs.supervise(registry, job_id)
+
+        status = registry.read(job_id)
+        assert status.state == spectre_server.core.jobs.JobState.CANCELLED
+        assert status.workers == []
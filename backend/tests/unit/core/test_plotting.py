@@ -4,6 +4,7 @@
 
 import pytest
 import os
+import pathlib
 import datetime
 
 import numpy as np
@@ -443,6 +444,75 @@ class TestSpectrogramPanel:
         spectrogram_panel.annotate_yaxis()
         assert spectrogram_panel.get_ylabel() == "Frequency [Hz]"
 
+    def _draw(
+        self,
+        panel: spectre_server.core.plotting.SpectrogramPanel,
+        axes: matplotlib.axes.Axes,
+        time_type: spectre_server.core.spectrograms.TimeType = spectre_server.core.spectrograms.TimeType.RELATIVE,
+    ) -> None:
+        panel.set_ax(axes)
+        panel.set_panel_format(spectre_server.core.plotting.PanelFormat())
+        panel.set_time_type(time_type)
+        panel.draw()
+
+    def test_small_spectrogram_unchanged(
+        self,
+        spectrogram_panel: spectre_server.core.plotting.SpectrogramPanel,
+        axes: matplotlib.axes.Axes,
+    ) -> None:
+        """Check that a spectrogram with fewer values than pixels is drawn as it is."""
+        self._draw(spectrogram_panel, axes)
+        assert not axes.images
+        (mesh,) = axes.collections
+        np.testing.assert_array_equal(
+            mesh.get_array().reshape(64, 20),
+            spectrogram_panel.spectrogram.dynamic_spectra,
+        )
+
+    @pytest.mark.parametrize(
+        "time_type",
+        [
+            spectre_server.core.spectrograms.TimeType.RELATIVE,
+            spectre_server.core.spectrograms.TimeType.DATETIMES,
+        ],
+    )
+    @pytest.mark.parametrize(
+        ("reducer", "preserves_burst"),
+        [
+            (spectre_server.core.plotting.Reducer.MEAN, False),
+            (spectre_server.core.plotting.Reducer.MAX, True),
+        ],
+    )
+    def test_large_spectrogram_decimated(
+        self,
+        axes: matplotlib.axes.Axes,
+        time_type: spectre_server.core.spectrograms.TimeType,
+        reducer: spectre_server.core.plotting.Reducer,
+        preserves_burst: bool,
+    ) -> None:
+        """Check that a spectrogram with more spectrums than pixels is reduced to the width of the panel."""
+        num_spectrums = 100000
+        dynamic_spectra = np.zeros((8, num_spectrums), dtype=np.float32)
+        # A burst lasting a single spectrum.
+        dynamic_spectra[4, 5000] = 1.0
+        spectrogram = spectre_server.core.spectrograms.Spectrogram(
+            dynamic_spectra,
+            np.arange(num_spectrums, dtype=np.float32) * 0.1,
+            np.linspace(90e6, 110e6, 8).astype(np.float32),
+            spectre_server.core.spectrograms.SpectrumUnit.AMPLITUDE,
+            ARBITRARY_DATETIME,
+        )
+        panel = spectre_server.core.plotting.SpectrogramPanel(
+            spectrogram, reducer=reducer
+        )
+        self._draw(panel, axes, time_type)
+
+        (image,) = axes.images
+        num_pixels = axes.get_window_extent().width
+        assert image.get_array().shape[0] == 8
+        assert image.get_array().shape[1] <= num_pixels
+        assert (image.get_array().max() == 1.0) == preserves_burst
+
 
 class TestPanelStack:
     def test_time_type_getter_setters(
@@ -580,3 +650,354 @@ class TestPanelStack:
         """Check that trying to show a plot with no panels raises an error."""
         with pytest.raises(ValueError):
             panel_stack.show()
+
+
+class TestFigurePool:
+    def _save(
+        self,
+        figure_pool: spectre_server.core.plotting.FigurePool,
+        spectrogram: spectre_server.core.spectrograms.Spectrogram,
+        dir_path: str,
+    ) -> bytes:
+        panel_stack = spectre_server.core.plotting.PanelStack(
+            non_interactive=True, figure_pool=figure_pool
+        )
+        panel_stack.add_panel(
+            spectre_server.core.plotting.SpectrogramPanel(spectrogram, dBb=True)
+        )
+        panel_stack.add_panel(
+            spectre_server.core.plotting.TimeCutsPanel(spectrogram, 100e6)
+        )
+        with open(panel_stack.save(TAG, dir_path), "rb") as f:
+            return f.read()
+
+    def test_reused_figure_matches_new_figure(
+        self,
+        tmp_path: pathlib.Path,
+        spectrogram: spectre_server.core.spectrograms.Spectrogram,
+    ) -> None:
+        """Check that a figure reused from the pool is drawn exactly like a new figure."""
+        figure_pool = spectre_server.core.plotting.FigurePool()
+        first = self._save(figure_pool, spectrogram, str(tmp_path / "first"))
+        assert figure_pool.num_figures == 1
+
+        spectrogram.dynamic_spectra[:] = np.random.uniform(
+            -1, 1, spectrogram.dynamic_spectra.shape
+        )
+        reused = self._save(figure_pool, spectrogram, str(tmp_path / "reused"))
+        assert figure_pool.num_figures == 1
+
+        new = self._save(
+            spectre_server.core.plotting.FigurePool(max_figures=0),
+            spectrogram,
+            str(tmp_path / "new"),
+        )
+        assert reused == new
+        assert reused != first
+
+    def test_release_removes_artists(self) -> None:
+        """Check that released figures hold nothing drawn onto them, including colorbars."""
+        figure_pool = spectre_server.core.plotting.FigurePool()
+        figure, is_reused = figure_pool.acquire("key", 2, (4, 3))
+        assert not is_reused
+        ax = figure.axes[0]
+        figure.colorbar(ax.imshow(np.ones((4, 4))), ax=ax)
+        figure.axes[1].plot([0, 1], [0, 1])
+
+        figure_pool.release("key", figure, 2)
+        assert len(figure.axes) == 2
+        assert all(not ax.images and not ax.lines for ax in figure.axes)
+
+        assert figure_pool.acquire("key", 2, (4, 3)) == (figure, True)
+        assert figure_pool.num_figures == 0
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Check that the pool keeps no more than its maximum number of idle figures."""
+        figure_pool = spectre_server.core.plotting.FigurePool(max_figures=1)
+        first, _ = figure_pool.acquire("first", 1, (4, 3))
+        second, _ = figure_pool.acquire("second", 1, (4, 3))
+        figure_pool.release("first", first, 1)
+        figure_pool.release("second", second, 1)
+        assert figure_pool.num_figures == 1
+        assert figure_pool.acquire("first", 1, (4, 3))[1] is False
+        assert figure_pool.acquire("second", 1, (4, 3)) == (second, True)
+
+
+class TestRenderCache:
+    def _render(self, file_path: str, content: bytes) -> str:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "wb") as f:
+            f.write(content)
+        return file_path
+
+    def test_make_key(self) -> None:
+        """Check that the key changes if any of the parameters or files change."""
+        make_key = spectre_server.core.plotting.RenderCache.make_key
+        key = make_key({"tags": ["foo"]}, [("a.npy", 1, 10)])
+        assert key == make_key({"tags": ["foo"]}, [("a.npy", 1, 10)])
+        assert key != make_key({"tags": ["bar"]}, [("a.npy", 1, 10)])
+        assert key != make_key({"tags": ["foo"]}, [("a.npy", 2, 10)])
+        assert key != make_key({"tags": ["foo"]}, [])
+
+    def test_store_and_restore(self, tmp_path) -> None:
+        """Check that a cached plot is restored, even after the rendered file is deleted or overwritten."""
+        cache = spectre_server.core.plotting.RenderCache(str(tmp_path / "cache"), 1024)
+        file_path = self._render(str(tmp_path / "plots" / "plot.png"), b"plot")
+        key = cache.make_key({}, [])
+        assert cache.restore(key) is None
+
+        with cache.lock(key):
+            cache.store(key, file_path)
+        assert cache.restore(key) == file_path
+
+        os.remove(file_path)
+        assert cache.restore(key) == file_path
+        self._render(file_path, b"another plot")
+        assert cache.restore(key) == file_path
+        with open(file_path, "rb") as f:
+            assert f.read() == b"plot"
+
+    def test_restore_evicted(self, tmp_path, monkeypatch) -> None:
+        """Check that a plot evicted while it's being restored is treated as a cache miss."""
+        cache = spectre_server.core.plotting.RenderCache(str(tmp_path / "cache"), 1024)
+        file_path = self._render(str(tmp_path / "plots" / "plot.png"), b"plot")
+        key = cache.make_key({}, [])
+        cache.store(key, file_path)
+        os.remove(file_path)
+
+        utime = os.utime
+
+        def utime_then_evict(path, *args, **kwargs) -> None:
+            utime(path, *args, **kwargs)
+            os.remove(path)
+
+        monkeypatch.setattr(os, "utime", utime_then_evict)
+        assert cache.restore(key) is None
+        assert not os.path.exists(file_path)
+
+    def test_disabled(self, tmp_path) -> None:
+        """Check that nothing is cached if the maximum size is zero."""
+        cache = spectre_server.core.plotting.RenderCache(str(tmp_path / "cache"), 0)
+        file_path = self._render(str(tmp_path / "plot.png"), b"plot")
+        key = cache.make_key({}, [])
+        cache.store(key, file_path)
+        assert cache.restore(key) is None
+        assert not os.path.exists(tmp_path / "cache")
+
+    def test_evict_least_recently_used(self, tmp_path) -> None:
+        """Check that the least recently used plots are evicted once the cache is full."""
+        # Each plot takes up four bytes, so all three plots fit until the cache is shrunk.
+        cache = spectre_server.core.plotting.RenderCache(str(tmp_path / "cache"), 12)
+        keys = [cache.make_key({"n": n}, []) for n in range(3)]
+        for n, key in enumerate(keys):
+            file_path = self._render(str(tmp_path / f"plot{n}.png"), b"plot")
+            cache.store(key, file_path)
+            # Make sure each entry has a distinct modification time.
+            os.utime(tmp_path / "cache" / f"{key}.png", ns=(n * 10**9, n * 10**9))
+        # Use the first plot, so the second is now the least recently used.
+        assert cache.restore(keys[0]) is not None
+        cache = spectre_server.core.plotting.RenderCache(str(tmp_path / "cache"), 10)
+        assert cache.evict() == [keys[1]]
+        assert cache.restore(keys[1]) is None
+        assert cache.restore(keys[2]) is not None
+
+
+def _make_tile_spectrogram(
+    start_datetime: datetime.datetime,
+    num_spectrums: int,
+    time_resolution: float,
+    values: float,
+) -> spectre_server.core.spectrograms.Spectrogram:
+    """Make a spectrogram with constant values, spanning the FM band."""
+    num_spectral_components = 64
+    return spectre_server.core.spectrograms.Spectrogram(
+        np.full((num_spectral_components, num_spectrums), values, dtype=np.float32),
+        np.arange(num_spectrums, dtype=np.float32) * time_resolution,
+        np.linspace(90e6, 110e6, num_spectral_components).astype(np.float32),
+        spectre_server.core.spectrograms.SpectrumUnit.AMPLITUDE,
+        start_datetime,
+    )
+
+
+class TestTiles:
+    TILE = spectre_server.core.plotting.Tile(9, 2**9 * 20000, 0)
+    COLUMN_SECONDS = TILE.duration / spectre_server.core.plotting.TILE_SIZE
+
+    def test_tile_extent(self) -> None:
+        """Check the time and frequency spanned by tiles at different zoom levels."""
+        tile = spectre_server.core.plotting.Tile(0, 20000, 0)
+        assert tile.start_datetime == datetime.datetime(2024, 10, 4)
+        assert tile.end_datetime == datetime.datetime(2024, 10, 5)
+        assert tile.get_frequency_range(0, 2) == (0, 2)
+
+        tile = spectre_server.core.plotting.Tile(1, 40001, 1)
+        assert tile.start_datetime == datetime.datetime(2024, 10, 4, 12)
+        assert tile.get_frequency_range(0, 2) == (0, 1)
+
+    @pytest.mark.parametrize(
+        ["z", "x", "y"], [(-1, 0, 0), (18, 0, 0), (0, -1, 0), (1, 0, 2)]
+    )
+    def test_invalid_tile(self, z: int, x: int, y: int) -> None:
+        """Check that tiles outside the valid range are rejected."""
+        with pytest.raises(ValueError):
+            spectre_server.core.plotting.Tile(z, x, y)
+
+    @pytest.mark.parametrize("spectrums_per_column", [4, 0.25])
+    def test_draw(self, spectrums_per_column: float) -> None:
+        """Check that spectrograms are drawn over the columns they span, whether they are
+        decimated or repeated to fill the pixels."""
+        spectrogram = _make_tile_spectrogram(
+            self.TILE.start_datetime,
+            int(128 * spectrums_per_column),
+            self.COLUMN_SECONDS / spectrums_per_column,
+            100,
+        )
+        canvas = spectre_server.core.plotting.TileCanvas(
+            self.TILE,
+            spectre_server.core.plotting.get_frequency_band(spectrogram),
+            scale=spectre_server.core.plotting.RasterScale.DB,
+        )
+        canvas.draw(spectrogram)
+        values = canvas.get_values()
+        assert values.shape == (256, 256)
+        np.testing.assert_allclose(values[:, :128], 20)
+        assert np.all(np.isnan(values[:, 129:]))
+
+    @pytest.mark.parametrize(
+        ["reducer", "expected_value"],
+        [
+            (spectre_server.core.plotting.Reducer.MEAN, 0),
+            (spectre_server.core.plotting.Reducer.MAX, 2),
+        ],
+    )
+    def test_draw_reducer(
+        self, reducer: spectre_server.core.plotting.Reducer, expected_value: float
+    ) -> None:
+        """Check that values sharing a pixel are reduced as requested."""
+        spectrogram = _make_tile_spectrogram(
+            self.TILE.start_datetime, 1024, self.COLUMN_SECONDS / 4, 1
+        )
+        # Add a short burst to every other spectrum, with the same dynamic range below the background.
+        spectrogram.dynamic_spectra[:, ::2] = 10
+        spectrogram.dynamic_spectra[:, 1::2] = 0.1
+        canvas = spectre_server.core.plotting.TileCanvas(
+            self.TILE,
+            spectre_server.core.plotting.get_frequency_band(spectrogram),
+            scale=spectre_server.core.plotting.RasterScale.DB,
+            reducer=reducer,
+        )
+        canvas.draw(spectrogram)
+        np.testing.assert_allclose(
+            canvas.get_values()[:, 1:-1], 10 * expected_value / 2, atol=1e-4
+        )
+
+    @pytest.mark.parametrize("num_columns", [100, 100.5])
+    def test_redraw_from_column(self, num_columns: float) -> None:
+        """Check that redrawing only the columns after a new spectrogram matches drawing everything again."""
+        # The first spectrogram ends where the second starts, which may be part way through a column.
+        first = _make_tile_spectrogram(
+            self.TILE.start_datetime,
+            int(4 * num_columns),
+            self.COLUMN_SECONDS / 4,
+            10,
+        )
+        second_start = self.TILE.start_datetime + datetime.timedelta(
+            seconds=num_columns * self.COLUMN_SECONDS
+        )
+        second = _make_tile_spectrogram(
+            second_start, 400, self.COLUMN_SECONDS / 4, 1000
+        )
+
+        def draw(*spectrograms, start_column=0, previous_values=None):
+            canvas = spectre_server.core.plotting.TileCanvas(
+                self.TILE,
+                (90e6, 110e6),
+                scale=spectre_server.core.plotting.RasterScale.DB,
+                start_column=start_column,
+            )
+            for s in spectrograms:
+                canvas.draw(s)
+            return canvas.get_values(previous_values)
+
+        start_column = self.TILE.get_column(second_start)
+        assert start_column == 100
+        # Only redraw the spectrograms overlapping with the redrawn columns.
+        redrawn = [second] if num_columns == start_column else [first, second]
+        values = draw(*redrawn, start_column=start_column, previous_values=draw(first))
+        np.testing.assert_array_equal(values, draw(first, second))
+        assert not np.any(np.isnan(values[:, :200]))
+
+    def test_apply_lut(self) -> None:
+        """Check that values are mapped to colours between the bounds, and missing values are transparent."""
+        lut = spectre_server.core.plotting.get_lut("gnuplot2")
+        rgba = spectre_server.core.plotting.apply_lut(
+            np.array([[-10, 0, 1, 10, np.nan]]), lut, 0, 1
+        )
+        np.testing.assert_array_equal(rgba[0, :4], [lut[0], lut[0], lut[-1], lut[-1]])
+        np.testing.assert_array_equal(rgba[0, 4], [0, 0, 0, 0])
+        with pytest.raises(ValueError):
+            spectre_server.core.plotting.apply_lut(np.zeros((1, 1)), lut, 1, 1)
+
+    def test_encode_png(self, tmp_path) -> None:
+        """Check that images are encoded as valid PNGs."""
+        import matplotlib.image
+
+        rgba = np.random.randint(0, 256, (16, 32, 4), dtype=np.uint8)
+        file_path = str(tmp_path / "tiles" / "image.png")
+        spectre_server.core.plotting.write_png(file_path, rgba)
+        decoded = matplotlib.image.imread(file_path)
+        np.testing.assert_array_equal(np.round(decoded * 255).astype(np.uint8), rgba)
+
+    def test_tile_state(self, tmp_path) -> None:
+        """Check that tile states can be saved and loaded."""
+        file_path = str(tmp_path / "state.npz")
+        assert spectre_server.core.plotting.TileState.load(file_path) is None
+        state = spectre_server.core.plotting.TileState(
+            spectre_server.core.plotting.make_empty_tile(),
+            (90e6, 110e6),
+            [("a.fits", 1, 2)],
+        )
+        state.save(file_path)
+        loaded = spectre_server.core.plotting.TileState.load(file_path)
+        assert loaded is not None
+        assert loaded.frequency_band == state.frequency_band
+        assert loaded.file_stamps == state.file_stamps
+        np.testing.assert_array_equal(loaded.values, state.values)
+
+
+class TestQuicklook:
+    @pytest.mark.parametrize("dBb", [True, False])
+    def test_render_quicklook(
+        self, spectrogram: spectre_server.core.spectrograms.Spectrogram, dBb: bool
+    ) -> None:
+        """Check that quicklooks are rendered at the requested size, and are fully opaque."""
+        spectrogram.dynamic_spectra[:] = np.abs(spectrogram.dynamic_spectra) + 0.1
+        image = spectre_server.core.plotting.render_quicklook(
+            spectrogram, width=400, height=300, dBb=dBb, title=TAG
+        )
+        assert image.shape == (300, 400, 4)
+        assert image.dtype == np.uint8
+        assert np.all(image[..., 3] == 255)
+
+    def test_too_small(
+        self, spectrogram: spectre_server.core.spectrograms.Spectrogram
+    ) -> None:
+        """Check that an image too small to fit the annotation is rejected."""
+        with pytest.raises(ValueError):
+            spectre_server.core.plotting.render_quicklook(
+                spectrogram, width=50, height=50
+            )
+
+    def test_save_quicklook(
+        self, spectrogram: spectre_server.core.spectrograms.Spectrogram, tmp_path
+    ) -> None:
+        """Check that quicklooks are saved as PNG batch files, named after the start of the spectrogram."""
+        spectrogram.dynamic_spectra[:] = np.abs(spectrogram.dynamic_spectra) + 0.1
+        file_path = spectre_server.core.plotting.save_quicklook(
+            spectrogram, TAG, str(tmp_path), width=400, height=300
+        )
+        assert file_path == os.path.join(
+            str(tmp_path), f"2025-02-13T06:00:00.000000Z_{TAG}.png"
+        )
+        with open(file_path, "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
@@ -128,6 +128,34 @@ class TestReceiver:
         assert "sample_rate" in config.parameters
         assert config.parameters["sample_rate"] == 256000
 
+    def test_config_cache(
+        self,
+        signal_generator: spectre_server.core.receivers.Base,
+        spectre_config_paths: spectre_server.core.config.Paths,
+    ) -> None:
+        """Check that cached configs are refreshed when they're written or deleted."""
+        tag = "foobar"
+        configs_dir_path = spectre_config_paths.get_configs_dir_path()
+        signal_generator.write_config(
+            tag, {"sample_rate": 256000}, configs_dir_path=configs_dir_path
+        )
+        config = spectre_server.core.receivers.read_config(tag, configs_dir_path)
+
+        # Modifying the config we read back doesn't modify the cache.
+        config.parameters["sample_rate"] = 0
+        config = spectre_server.core.receivers.read_config(tag, configs_dir_path)
+        assert config.parameters["sample_rate"] == 256000
+
+        signal_generator.write_config(
+            tag, {"sample_rate": 128000}, configs_dir_path=configs_dir_path
+        )
+        config = spectre_server.core.receivers.read_config(tag, configs_dir_path)
+        assert config.parameters["sample_rate"] == 128000
+
+        spectre_server.core.receivers.delete_config(tag, configs_dir_path)
+        with pytest.raises(FileNotFoundError):
+            spectre_server.core.receivers.read_config(tag, configs_dir_path)
+
 
 class TestReceivers:
     @pytest.mark.parametrize(
@@ -2,10 +2,15 @@
 # This file is part of SPECTRE
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import datetime
+import pathlib
+
 import pytest
 import numpy as np
+import numpy.typing as npt
 
 import spectre_server.core.spectrograms
+import spectre_server.core.exceptions
 
 
 @pytest.fixture
@@ -194,3 +199,546 @@ class TestFrequencyAverage:
             np.array(expected_frequencies, dtype=np.float32),
         )
         assert np.allclose(averaged_s.times, spectrogram.times)
+
+
+class TestDecibelsAboveBackground:
+    def test_selections_match_whole_array(
+        self, spectrogram: spectre_server.core.spectrograms.Spectrogram
+    ) -> None:
+        """Check that computing dBb for some rows or columns matches the whole array."""
+        rows = np.array([1, 3])
+        columns = slice(2, 5)
+        selected = spectrogram.compute_dynamic_spectra_dBb(rows, columns)
+        # Compute the whole array on a copy, so the selection above wasn't read from the cache.
+        dynamic_spectra_dBb = spectre_server.core.spectrograms.Spectrogram(
+            spectrogram.dynamic_spectra,
+            spectrogram.times,
+            spectrogram.frequencies,
+            spectrogram.spectrum_unit,
+        ).compute_dynamic_spectra_dBb()
+        assert np.array_equal(selected, dynamic_spectra_dBb[rows][:, columns])
+        assert np.array_equal(
+            spectrogram.compute_dynamic_spectra_dBb(rows, columns), selected
+        )
+
+    def test_cached_until_background_changes(
+        self, spectrogram: spectre_server.core.spectrograms.Spectrogram
+    ) -> None:
+        """Check that the background and the whole dBb array are reused, until the background interval is set."""
+        spectrogram = spectre_server.core.spectrograms.Spectrogram(
+            spectrogram.dynamic_spectra,
+            spectrogram.times,
+            spectrogram.frequencies,
+            spectrogram.spectrum_unit,
+            datetime.datetime(2025, 1, 1),
+        )
+        background_spectrum = spectrogram.compute_background_spectrum()
+        dynamic_spectra_dBb = spectrogram.compute_dynamic_spectra_dBb()
+        assert spectrogram.compute_background_spectrum() is background_spectrum
+        assert spectrogram.compute_dynamic_spectra_dBb() is dynamic_spectra_dBb
+        assert not dynamic_spectra_dBb.flags.writeable
+
+        spectrogram.set_background(
+            "2025-01-01T00:00:00.000000Z", "2025-01-01T00:00:00.200000Z"
+        )
+        assert np.array_equal(
+            spectrogram.compute_background_spectrum(), [0.5, 6.5, 12.5, 18.5]
+        )
+        assert np.allclose(
+            spectrogram.get_frequency_cut(0.2, dBb=True).cut,
+            10 * np.log10(np.array([1, 7, 13, 19]) / np.array([0.5, 6.5, 12.5, 18.5])),
+        )
+
+    def test_rolling_background(
+        self, spectrogram: spectre_server.core.spectrograms.Spectrogram
+    ) -> None:
+        """Check that the rolling background interpolates between the median of each block of spectrums."""
+        spectrogram = spectre_server.core.spectrograms.Spectrogram(
+            spectrogram.dynamic_spectra,
+            spectrogram.times,
+            spectrogram.frequencies,
+            spectrogram.spectrum_unit,
+            datetime.datetime(2025, 1, 1),
+        )
+        # The blocks are [0.0, 0.2, 0.4] and [0.6, 0.8, 1.0], centred on 0.2 and 0.8 seconds.
+        spectrogram.set_rolling_background(0.55)
+        expected_background = (
+            np.array([[1, 1, 2, 3, 4, 4]]) + 6 * np.arange(4)[:, np.newaxis]
+        )
+        assert np.allclose(
+            spectrogram.compute_rolling_background(), expected_background
+        )
+        with np.errstate(divide="ignore"):
+            expected_dBb = 10 * np.log10(
+                spectrogram.dynamic_spectra / expected_background
+            )
+        assert np.allclose(spectrogram.compute_dynamic_spectra_dBb(), expected_dBb)
+        assert np.allclose(spectrogram.get_time_cut(2e6, dBb=True).cut, expected_dBb[1])
+
+        # Setting the background interval reverts to the background spectrum.
+        spectrogram.set_background(
+            "2025-01-01T00:00:00.000000Z", "2025-01-01T00:00:01.000000Z"
+        )
+        assert spectrogram.rolling_background_window is None
+        with pytest.raises(ValueError):
+            spectrogram.compute_rolling_background()
+
+    @pytest.mark.parametrize(("window", "quantile"), [(0.0, 0.5), (1.0, 1.5)])
+    def test_invalid_rolling_background(
+        self,
+        spectrogram: spectre_server.core.spectrograms.Spectrogram,
+        window: float,
+        quantile: float,
+    ) -> None:
+        """Check that the window must be positive, and the quantile between 0 and 1."""
+        with pytest.raises(ValueError):
+            spectrogram.set_rolling_background(window, quantile)
+
+
+class TestCuts:
+    @pytest.mark.parametrize(
+        ("dBb", "peak_normalise"), [(False, False), (False, True), (True, False)]
+    )
+    def test_frequency_cuts_match_single_cuts(
+        self,
+        spectrogram: spectre_server.core.spectrograms.Spectrogram,
+        dBb: bool,
+        peak_normalise: bool,
+    ) -> None:
+        """Check that each row of the frequency cuts matches the corresponding single cut."""
+        at_times = [0.95, 0.0, 0.35]
+        frequency_cuts = spectrogram.get_frequency_cuts(
+            at_times, dBb=dBb, peak_normalise=peak_normalise
+        )
+        assert np.allclose(frequency_cuts.times, [1.0, 0.0, 0.4])
+        assert frequency_cuts.cuts.shape == (3, spectrogram.num_frequencies)
+        for at_time, time, cut in zip(
+            at_times, frequency_cuts.times, frequency_cuts.cuts
+        ):
+            frequency_cut = spectrogram.get_frequency_cut(
+                at_time, dBb=dBb, peak_normalise=peak_normalise
+            )
+            assert frequency_cut.time == time
+            assert np.array_equal(frequency_cut.cut, cut)
+
+    @pytest.mark.parametrize(
+        ("dBb", "peak_normalise", "correct_background"),
+        [(False, False, False), (False, True, True), (True, False, False)],
+    )
+    def test_time_cuts_match_single_cuts(
+        self,
+        spectrogram: spectre_server.core.spectrograms.Spectrogram,
+        dBb: bool,
+        peak_normalise: bool,
+        correct_background: bool,
+    ) -> None:
+        """Check that each row of the time cuts matches the corresponding single cut."""
+        at_frequencies = [4e6, 1.2e6]
+        time_cuts = spectrogram.get_time_cuts(
+            at_frequencies,
+            dBb=dBb,
+            peak_normalise=peak_normalise,
+            correct_background=correct_background,
+        )
+        assert np.array_equal(time_cuts.frequencies, [4e6, 1e6])
+        for at_frequency, frequency, cut in zip(
+            at_frequencies, time_cuts.frequencies, time_cuts.cuts
+        ):
+            time_cut = spectrogram.get_time_cut(
+                at_frequency,
+                dBb=dBb,
+                peak_normalise=peak_normalise,
+                correct_background=correct_background,
+            )
+            assert time_cut.frequency == frequency
+            assert np.array_equal(time_cut.cut, cut)
+
+    def test_cuts_are_copies(
+        self, spectrogram: spectre_server.core.spectrograms.Spectrogram
+    ) -> None:
+        """Check that transforming the cuts leaves the spectrogram untouched."""
+        spectrogram.get_time_cuts([1e6], correct_background=True).cuts[0, 0] = -1
+        spectrogram.get_frequency_cuts([0.0]).cuts[0, 0] = -1
+        assert spectrogram.dynamic_spectra[0, 0] == 0
+
+    @pytest.mark.parametrize("at_times", [[0.0, "2025-01-01T00:00:00.000000Z"], [1]])
+    def test_unsupported_times(
+        self,
+        spectrogram: spectre_server.core.spectrograms.Spectrogram,
+        at_times: list,
+    ) -> None:
+        """Check that the times of the cuts must be all floats, or all strings."""
+        with pytest.raises(ValueError):
+            spectrogram.get_frequency_cuts(at_times)
+
+    def test_out_of_bounds(
+        self, spectrogram: spectre_server.core.spectrograms.Spectrogram
+    ) -> None:
+        """Check that every requested frequency must be within the spectrogram."""
+        with pytest.raises(ValueError):
+            spectrogram.get_time_cuts([2e6, 5e6])
+
+
+@pytest.fixture
+def spectrograms() -> list[spectre_server.core.spectrograms.Spectrogram]:
+    """Create three consecutive spectrograms, each with three spectrums spaced 0.2s apart."""
+    start_datetime = datetime.datetime(2025, 1, 1)
+    frequencies = np.array([1e6, 2e6, 3e6, 4e6])
+    times = np.array([0.0, 0.2, 0.4])
+    return [
+        spectre_server.core.spectrograms.Spectrogram(
+            np.arange(12, dtype=np.float32).reshape(4, 3) + 12 * i + 1,
+            times,
+            frequencies,
+            spectre_server.core.spectrograms.SpectrumUnit.AMPLITUDE,
+            start_datetime + datetime.timedelta(seconds=0.6 * i),
+        )
+        for i in range(3)
+    ]
+
+
+class _RecordingReader(spectre_server.core.spectrograms.SpectrogramReader):
+    def __init__(
+        self, spectrogram: spectre_server.core.spectrograms.Spectrogram
+    ) -> None:
+        """Read parts of a spectrogram, recording the shape of each block that's read."""
+        self._spectrogram = spectrogram
+        self.block_shapes: list[tuple[int, ...]] = []
+
+    def read_axes(self) -> spectre_server.core.spectrograms.SpectrogramAxes:
+        return spectre_server.core.spectrograms.SpectrogramAxes(
+            self._spectrogram.datetimes,
+            self._spectrogram.frequencies,
+            self._spectrogram.spectrum_unit,
+        )
+
+    def read_block(
+        self, rows: slice | npt.NDArray[np.intp], time_slice: slice
+    ) -> npt.NDArray[np.float32]:
+        block = np.array(self._spectrogram.dynamic_spectra[rows, time_slice])
+        self.block_shapes.append(block.shape)
+        return block
+
+
+class TestLazySpectrogram:
+    def test_matches_join(
+        self, spectrograms: list[spectre_server.core.spectrograms.Spectrogram]
+    ) -> None:
+        """Check that the view has the same data as the joined spectrogram."""
+        joined = spectre_server.core.spectrograms.join_spectrograms(spectrograms)
+        lazy = spectre_server.core.spectrograms.LazySpectrogram(spectrograms)
+        assert np.array_equal(lazy.dynamic_spectra, joined.dynamic_spectra)
+        assert np.allclose(lazy.times, joined.times)
+        assert np.array_equal(
+            lazy.compute_background_spectrum(), joined.compute_background_spectrum()
+        )
+        assert np.allclose(
+            lazy.integrate_over_frequency(correct_background=True),
+            joined.integrate_over_frequency(correct_background=True),
+        )
+
+    def test_reads_only_blocks(
+        self, spectrograms: list[spectre_server.core.spectrograms.Spectrogram]
+    ) -> None:
+        """Check that only the axes are read up front, and a cut reads only its spectral component."""
+        readers = [_RecordingReader(s) for s in spectrograms]
+        lazy = spectre_server.core.spectrograms.LazySpectrogram(readers)
+        assert all(reader.block_shapes == [] for reader in readers)
+
+        lazy.frequency_chop(2e6, 4e6).get_time_cut(3e6)
+        assert all(reader.block_shapes == [(1, 3)] for reader in readers)
+
+    @pytest.mark.parametrize("resolution", [0.4, 0.6, 0.8])
+    def test_time_average_matches(
+        self,
+        spectrograms: list[spectre_server.core.spectrograms.Spectrogram],
+        resolution: float,
+    ) -> None:
+        """Check that averaging the view in time agrees with averaging the joined spectrogram."""
+        joined = spectre_server.core.spectrograms.time_average(
+            spectre_server.core.spectrograms.join_spectrograms(spectrograms), resolution
+        )
+        lazy = spectre_server.core.spectrograms.LazySpectrogram(
+            spectrograms
+        ).time_average(resolution)
+        assert np.allclose(lazy.dynamic_spectra, joined.dynamic_spectra)
+        assert np.allclose(lazy.times, joined.times)
+
+    def test_frequency_average_matches(
+        self, spectrograms: list[spectre_server.core.spectrograms.Spectrogram]
+    ) -> None:
+        """Check that averaging the view in frequency agrees with averaging the joined spectrogram."""
+        joined = spectre_server.core.spectrograms.frequency_average(
+            spectre_server.core.spectrograms.join_spectrograms(spectrograms), 2e6
+        )
+        lazy = spectre_server.core.spectrograms.LazySpectrogram(
+            spectrograms
+        ).frequency_average(2e6)
+        assert np.allclose(lazy.dynamic_spectra, joined.dynamic_spectra)
+        assert np.allclose(lazy.frequencies, joined.frequencies)
+
+    def test_iter_time_blocks(
+        self, spectrograms: list[spectre_server.core.spectrograms.Spectrogram]
+    ) -> None:
+        """Check that blocks of spectrums are read across the boundaries between spectrograms."""
+        joined = spectre_server.core.spectrograms.join_spectrograms(spectrograms)
+        lazy = spectre_server.core.spectrograms.LazySpectrogram(spectrograms)
+        blocks = list(lazy.iter_time_blocks(4))
+        assert [block.shape[1] for block in blocks] == [4, 4, 1]
+        assert np.array_equal(np.hstack(blocks), joined.dynamic_spectra)
+
+    def test_iter_time_blocks_reads_once(
+        self, spectrograms: list[spectre_server.core.spectrograms.Spectrogram]
+    ) -> None:
+        """Check that each source is read once, even when the blocks straddle them."""
+        readers = [_RecordingReader(s) for s in spectrograms]
+        lazy = spectre_server.core.spectrograms.LazySpectrogram(readers)
+        list(lazy.iter_time_blocks(4))
+        assert all(reader.block_shapes == [(4, 3)] for reader in readers)
+        for reader in readers:
+            reader.block_shapes.clear()
+        list(lazy.iter_time_blocks(2))
+        assert all(reader.block_shapes == [(4, 2), (4, 1)] for reader in readers)
+
+    def test_chops_match(
+        self, spectrograms: list[spectre_server.core.spectrograms.Spectrogram]
+    ) -> None:
+        """Check that chopping the view agrees with chopping the joined spectrogram."""
+        start_datetime = datetime.datetime(2025, 1, 1, 0, 0, 0, 400000)
+        end_datetime = datetime.datetime(2025, 1, 1, 0, 0, 1, 400000)
+        joined = spectre_server.core.spectrograms.frequency_chop(
+            spectre_server.core.spectrograms.time_chop(
+                spectre_server.core.spectrograms.join_spectrograms(spectrograms),
+                start_datetime,
+                end_datetime,
+            ),
+            2e6,
+            3e6,
+        )
+        lazy = (
+            spectre_server.core.spectrograms.LazySpectrogram(spectrograms)
+            .time_chop(start_datetime, end_datetime)
+            .frequency_chop(2e6, 3e6)
+        )
+        assert np.array_equal(lazy.dynamic_spectra, joined.dynamic_spectra)
+        assert np.array_equal(lazy.frequencies, joined.frequencies)
+        assert lazy.start_datetime == joined.start_datetime
+        assert np.allclose(lazy.times, joined.times)
+
+    @pytest.mark.parametrize("dBb", [False, True])
+    def test_cuts_match(
+        self,
+        spectrograms: list[spectre_server.core.spectrograms.Spectrogram],
+        dBb: bool,
+    ) -> None:
+        """Check that cuts of the view agree with cuts of the joined spectrogram."""
+        joined = spectre_server.core.spectrograms.join_spectrograms(spectrograms)
+        lazy = spectre_server.core.spectrograms.LazySpectrogram(spectrograms)
+        for s in (joined, lazy):
+            s.set_background(
+                "2025-01-01T00:00:00.200000Z", "2025-01-01T00:00:01.000000Z"
+            )
+
+        assert np.allclose(
+            lazy.get_time_cut(3e6, dBb=dBb).cut, joined.get_time_cut(3e6, dBb=dBb).cut
+        )
+        assert np.allclose(
+            lazy.get_frequency_cut(0.8, dBb=dBb).cut,
+            joined.get_frequency_cut(0.8, dBb=dBb).cut,
+        )
+        assert np.allclose(
+            lazy.get_time_cuts([4e6, 1e6], dBb=dBb).cuts,
+            joined.get_time_cuts([4e6, 1e6], dBb=dBb).cuts,
+        )
+        assert np.allclose(
+            lazy.get_frequency_cuts([1.0, 0.2], dBb=dBb).cuts,
+            joined.get_frequency_cuts([1.0, 0.2], dBb=dBb).cuts,
+        )
+
+    def test_mismatched_frequencies(
+        self, spectrograms: list[spectre_server.core.spectrograms.Spectrogram]
+    ) -> None:
+        """Check that joining spectrograms with different frequencies is rejected."""
+        other = spectre_server.core.spectrograms.frequency_chop(
+            spectrograms[1], 1e6, 2e6
+        )
+        with pytest.raises(ValueError):
+            spectre_server.core.spectrograms.LazySpectrogram([spectrograms[0], other])
+
+
+FITS_HEADER = {
+    "DATE-OBS": "2025-01-01",
+    "TIME-OBS": "00:00:00.000000",
+    "ORIGIN": "O'Brien",
+    "BUNIT": "amplitude",
+    "DATAMIN": np.float32(0.1),
+    "CDELT1": 0.2,
+    "CRPIX1": 0,
+}
+
+
+class TestFits:
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64, ">f4"])
+    def test_byte_compatible_with_astropy(
+        self,
+        spectrogram: spectre_server.core.spectrograms.Spectrogram,
+        tmp_path: pathlib.Path,
+        dtype: str,
+    ) -> None:
+        """Check that the native codec writes exactly the same bytes as astropy."""
+        args = (
+            spectrogram.dynamic_spectra.astype(dtype),
+            spectrogram.times,
+            spectrogram.frequencies * 1e-6,
+            FITS_HEADER,
+            "A comment which is long enough to be split over more than one card, "
+            "so that we check the COMMENT cards are wrapped identically.",
+        )
+        spectre_server.core.spectrograms.write_fits(
+            str(tmp_path / "native.fits"), *args
+        )
+        spectre_server.core.spectrograms.write_fits_with_astropy(
+            str(tmp_path / "astropy.fits"), *args
+        )
+        assert (tmp_path / "native.fits").read_bytes() == (
+            tmp_path / "astropy.fits"
+        ).read_bytes()
+
+    def test_round_trip(
+        self,
+        spectrogram: spectre_server.core.spectrograms.Spectrogram,
+        tmp_path: pathlib.Path,
+    ) -> None:
+        """Check that reading a file gives back what was written."""
+        file_path = str(tmp_path / "spectrogram.fits")
+        spectre_server.core.spectrograms.write_fits(
+            file_path,
+            spectrogram.dynamic_spectra,
+            spectrogram.times,
+            spectrogram.frequencies,
+            FITS_HEADER,
+            "",
+        )
+        fits_contents = spectre_server.core.spectrograms.read_fits(file_path)
+        assert np.array_equal(
+            fits_contents.dynamic_spectra, spectrogram.dynamic_spectra
+        )
+        assert np.array_equal(fits_contents.times, spectrogram.times)
+        assert np.array_equal(fits_contents.frequencies, spectrogram.frequencies)
+        assert fits_contents.header["ORIGIN"] == "O'Brien"
+        assert fits_contents.header["DATAMIN"] == pytest.approx(0.1)
+        assert fits_contents.header["CRPIX1"] == 0
+
+    def test_falls_back_to_astropy(
+        self,
+        spectrogram: spectre_server.core.spectrograms.Spectrogram,
+        tmp_path: pathlib.Path,
+    ) -> None:
+        """Check that files outside of the fixed layout are written and read with astropy."""
+        file_path = str(tmp_path / "spectrogram.fits")
+        args = (
+            spectrogram.dynamic_spectra.astype(np.int32),
+            spectrogram.times,
+            spectrogram.frequencies,
+            FITS_HEADER,
+            "",
+        )
+        with pytest.raises(spectre_server.core.exceptions.UnsupportedFitsLayoutError):
+            spectre_server.core.spectrograms.write_fits(file_path, *args)
+
+        spectre_server.core.spectrograms.write_fits_with_astropy(file_path, *args)
+        fits_contents = spectre_server.core.spectrograms.read_fits(file_path)
+        assert np.array_equal(
+            fits_contents.dynamic_spectra, spectrogram.dynamic_spectra
+        )
+        assert fits_contents.header["BUNIT"] == "amplitude"
+
+    def test_compressed_round_trip(
+        self,
+        spectrogram: spectre_server.core.spectrograms.Spectrogram,
+        tmp_path: pathlib.Path,
+    ) -> None:
+        """Check that GZIP compression is lossless, and that a time slice can be read."""
+        file_path = str(tmp_path / "spectrogram.fits")
+        spectre_server.core.spectrograms.write_fits_with_astropy(
+            file_path,
+            spectrogram.dynamic_spectra,
+            spectrogram.times,
+            spectrogram.frequencies,
+            FITS_HEADER,
+            "",
+            compression=spectre_server.core.spectrograms.FitsCompression.GZIP,
+        )
+        fits_contents = spectre_server.core.spectrograms.read_fits(
+            file_path, slice(2, 5)
+        )
+        assert np.array_equal(
+            fits_contents.dynamic_spectra, spectrogram.dynamic_spectra[:, 2:5]
+        )
+        assert np.array_equal(fits_contents.times, spectrogram.times[2:5])
+        assert np.array_equal(fits_contents.frequencies, spectrogram.frequencies)
+        assert fits_contents.header["BUNIT"] == "amplitude"
+
+        header, times, frequencies = spectre_server.core.spectrograms.read_fits_axes(
+            file_path
+        )
+        assert header["ORIGIN"] == "O'Brien"
+        assert np.array_equal(times, spectrogram.times)
+        assert np.array_equal(frequencies, spectrogram.frequencies)
+
+    @pytest.mark.parametrize(
+        ("compression", "bits"),
+        [
+            (spectre_server.core.spectrograms.FitsCompression.NONE, 8),
+            (spectre_server.core.spectrograms.FitsCompression.RICE, 16),
+        ],
+    )
+    def test_quantised_round_trip(
+        self,
+        spectrogram: spectre_server.core.spectrograms.Spectrogram,
+        tmp_path: pathlib.Path,
+        compression: spectre_server.core.spectrograms.FitsCompression,
+        bits: int,
+    ) -> None:
+        """Check that quantised values are read back to within the quantisation step, and
+        that non-finite values are read back as NaN."""
+        dynamic_spectra = spectrogram.dynamic_spectra.copy()
+        dynamic_spectra[0, 0] = np.nan
+        file_path = str(tmp_path / "spectrogram.fits")
+        spectre_server.core.spectrograms.write_fits_with_astropy(
+            file_path,
+            dynamic_spectra,
+            spectrogram.times,
+            spectrogram.frequencies,
+            FITS_HEADER,
+            "",
+            compression=compression,
+            quantisation_bits=bits,
+        )
+        fits_contents = spectre_server.core.spectrograms.read_fits(file_path)
+        # The finite values span 1 to 23, over 2**bits - 2 quantisation steps.
+        step = (23 - 1) / (2**bits - 2)
+        assert np.isnan(fits_contents.dynamic_spectra[0, 0])
+        assert np.allclose(
+            fits_contents.dynamic_spectra,
+            dynamic_spectra,
+            atol=step / 2,
+            equal_nan=True,
+        )
+
+    def test_rice_requires_quantisation(
+        self,
+        spectrogram: spectre_server.core.spectrograms.Spectrogram,
+        tmp_path: pathlib.Path,
+    ) -> None:
+        """Check that RICE compression, which is lossy for floats, is refused for unquantised data."""
+        with pytest.raises(ValueError):
+            spectre_server.core.spectrograms.write_fits_with_astropy(
+                str(tmp_path / "spectrogram.fits"),
+                spectrogram.dynamic_spectra,
+                spectrogram.times,
+                spectrogram.frequencies,
+                FITS_HEADER,
+                "",
+                compression=spectre_server.core.spectrograms.FitsCompression.RICE,
+            )
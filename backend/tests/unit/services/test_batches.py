@@ -0,0 +1,245 @@
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# This file is part of SPECTRE
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import io
+import pathlib
+import datetime
+
+import pytest
+import numpy as np
+
+import spectre_server.core.batches
+import spectre_server.core.plotting
+import spectre_server.core.receivers
+import spectre_server.core.spectrograms
+import spectre_server.services.batches as services
+
+
+@pytest.mark.parametrize(
+    ("start_date", "end_date", "cadence"),
+    [
+        ("2025-01-02", "2025-01-01", 1440),
+        ("2025-01-01", "2025-01-01", 0),
+        ("2025-01-01", "2025-01-01", 7),
+    ],
+)
+def test_create_plots_invalid_arguments(
+    start_date: str, end_date: str, cadence: int
+) -> None:
+    """Ensure bulk plotting jobs are rejected before anything is plotted, if the date range or cadence is invalid."""
+    with pytest.raises(ValueError):
+        services.create_plots(["tag"], start_date, end_date, cadence=cadence)
+
+
+def test_plot_progress_to_dict() -> None:
+    """Ensure the progress of bulk plotting jobs is JSON serialisable."""
+    progress = services.PlotProgress(
+        "tag",
+        "2025-01-01",
+        "00:00:00",
+        "23:59:59",
+        services.PlotStatus.SKIPPED,
+        "/path/to/plot.png",
+        None,
+        1,
+        2,
+    )
+    assert progress.to_dict() == {
+        "tag": "tag",
+        "obs_date": "2025-01-01",
+        "start_time": "00:00:00",
+        "end_time": "23:59:59",
+        "status": "skipped",
+        "file_path": "/path/to/plot.png",
+        "error": None,
+        "num_done": 1,
+        "num_plots": 2,
+    }
+
+
+@pytest.fixture
+def spectrogram_slice() -> services.SpectrogramSlice:
+    """A slice of two consecutive spectrograms, reduced by blocks of 3 spectral components and 4 spectrums."""
+    spectrograms = [
+        spectre_server.core.spectrograms.Spectrogram(
+            np.random.default_rng(i).random((8, 10), dtype=np.float32),
+            np.arange(10) * 0.5,
+            np.arange(1, 9) * 1e6,
+            spectre_server.core.spectrograms.SpectrumUnit.AMPLITUDE,
+            datetime.datetime(2025, 1, 1, 0, 0, 5 * i),
+        )
+        for i in range(2)
+    ]
+    return services.SpectrogramSlice(
+        spectre_server.core.spectrograms.LazySpectrogram(spectrograms),
+        time_block_size=4,
+        frequency_block_size=3,
+        reducer=spectre_server.core.plotting.Reducer.MAX,
+    )
+
+
+@pytest.mark.parametrize("max_values_per_chunk", [1, 24, 1 << 22])
+def test_stream_spectrogram_slice(
+    spectrogram_slice: services.SpectrogramSlice,
+    max_values_per_chunk: int,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensure streamed slices are reduced as if they were read all at once, however they're chunked."""
+    monkeypatch.setattr(services, "_MAX_VALUES_PER_CHUNK", max_values_per_chunk)
+    expected = spectre_server.core.plotting.reduce_blocks(
+        spectre_server.core.plotting.reduce_blocks(
+            spectrogram_slice.spectrogram.dynamic_spectra,
+            3,
+            axis=0,
+            reducer=spectre_server.core.plotting.Reducer.MAX,
+        ),
+        4,
+        axis=1,
+        reducer=spectre_server.core.plotting.Reducer.MAX,
+    )
+
+    data = b"".join(spectrogram_slice.iter_bytes(services.SpectrogramFormat.NPY))
+    assert len(data) == spectrogram_slice.get_num_bytes(services.SpectrogramFormat.NPY)
+    dynamic_spectra = np.load(io.BytesIO(data))
+    assert dynamic_spectra.shape == spectrogram_slice.shape == (3, 5)
+    assert np.array_equal(dynamic_spectra, expected)
+
+    raw = b"".join(spectrogram_slice.iter_bytes(services.SpectrogramFormat.RAW))
+    assert len(raw) == spectrogram_slice.get_num_bytes(services.SpectrogramFormat.RAW)
+    assert np.array_equal(
+        np.frombuffer(raw, "<f4").reshape(spectrogram_slice.shape, order="F"), expected
+    )
+
+
+def test_spectrogram_slice_axes(spectrogram_slice: services.SpectrogramSlice) -> None:
+    """Ensure the axes of a slice match the shape of its dynamic spectra."""
+    axes = spectrogram_slice.get_axes()
+    assert axes["shape"] == (len(axes["frequencies"]), len(axes["times"]))
+    assert axes["frequencies"] == [2e6, 5e6, 7.5e6]
+    assert axes["start_datetime"] == "2025-01-01T00:00:00.000000Z"
+
+
+@pytest.mark.parametrize(("max_columns", "max_rows"), [(0, None), (None, -1)])
+def test_get_spectrogram_slice_invalid_arguments(
+    max_columns: int, max_rows: int
+) -> None:
+    """Ensure slices are rejected before any batches are found, if the resolution is not positive."""
+    with pytest.raises(ValueError):
+        services.get_spectrogram_slice(
+            "tag",
+            "2025-01-01",
+            "00:00:00",
+            "2025-01-01",
+            "00:01:00",
+            max_columns=max_columns,
+            max_rows=max_rows,
+        )
+
+
+@pytest.fixture
+def light_curve_spectrograms(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> list[spectre_server.core.spectrograms.Spectrogram]:
+    """Save two consecutive spectrograms as batch files, each with four spectrums spaced 0.5s apart."""
+    monkeypatch.setenv("SPECTRE_DATA_DIR_PATH", str(tmp_path))
+    monkeypatch.setattr(
+        spectre_server.core.receivers,
+        "get_batch_cls",
+        lambda tag: spectre_server.core.batches.IQStreamBatch,
+    )
+    spectrograms = [
+        spectre_server.core.spectrograms.Spectrogram(
+            np.random.default_rng(i).random((3, 4), dtype=np.float32),
+            np.arange(4) * 0.5,
+            np.array([1e6, 2e6, 3e6]),
+            spectre_server.core.spectrograms.SpectrumUnit.AMPLITUDE,
+            datetime.datetime(2025, 1, 1, 0, 0, 2 * i),
+        )
+        for i in range(2)
+    ]
+    for spectrogram in spectrograms:
+        spectrogram.save("tag", "origin", "instrument", "telescope", "object", 0, 0, 0)
+    return spectrograms
+
+
+def _get_light_curves(
+    frequencies: list[float],
+    light_curve_format: services.LightCurveFormat = services.LightCurveFormat.CSV,
+) -> bytes:
+    return b"".join(
+        services.get_light_curves(
+            "tag",
+            frequencies,
+            "2025-01-01",
+            "00:00:00.500000",
+            "2025-01-01",
+            "00:00:03",
+            light_curve_format=light_curve_format,
+        )
+    )
+
+
+def test_get_light_curves_csv(
+    light_curve_spectrograms: list[spectre_server.core.spectrograms.Spectrogram],
+) -> None:
+    """Ensure the light curves are streamed as CSV, over the time range and across batches."""
+    lines = _get_light_curves([3e6, 1.1e6]).decode().splitlines()
+    assert lines[0] == "datetime,3000000.0,1100000.0"
+    rows = [line.split(",") for line in lines[1:]]
+    assert [row[0] for row in rows] == [
+        "2025-01-01T00:00:00.500000Z",
+        "2025-01-01T00:00:01.000000Z",
+        "2025-01-01T00:00:01.500000Z",
+        "2025-01-01T00:00:02.000000Z",
+        "2025-01-01T00:00:02.500000Z",
+        "2025-01-01T00:00:03.000000Z",
+    ]
+    joined = spectre_server.core.spectrograms.join_spectrograms(
+        light_curve_spectrograms
+    )
+    expected = joined.dynamic_spectra[[2, 0], 1:7].T
+    assert np.allclose([[float(v) for v in row[1:]] for row in rows], expected)
+
+
+def test_get_light_curves_binary(
+    light_curve_spectrograms: list[spectre_server.core.spectrograms.Spectrogram],
+) -> None:
+    """Ensure the light curves are streamed as binary records, of a timestamp and a value per frequency."""
+    data = _get_light_curves([2e6], services.LightCurveFormat.BINARY)
+    records = np.frombuffer(data, dtype=[("time", "<i8"), ("values", "<f4", (1,))])
+    assert len(records) == 6
+    assert records["time"][0] == np.datetime64(
+        "2025-01-01T00:00:00.500000", "us"
+    ).astype(np.int64)
+    joined = spectre_server.core.spectrograms.join_spectrograms(
+        light_curve_spectrograms
+    )
+    assert np.array_equal(records["values"][:, 0], joined.dynamic_spectra[1, 1:7])
+
+
+def test_get_light_curves_out_of_range(
+    light_curve_spectrograms: list[spectre_server.core.spectrograms.Spectrogram],
+) -> None:
+    """Ensure an out of range frequency is rejected before anything is streamed."""
+    with pytest.raises(ValueError):
+        services.get_light_curves(
+            "tag",
+            [5e6],
+            "2025-01-01",
+            "00:00:00",
+            "2025-01-01",
+            "00:00:03",
+        )
+
+
+def test_delete_batch_files_skips_archived(
+    light_curve_spectrograms: list[spectre_server.core.spectrograms.Spectrogram],
+) -> None:
+    """Ensure batch files packed in an archive are skipped, rather than aborting the delete."""
+    spectre_server.core.batches.archive_batch_files("tag", 2025, 1, 1)
+    assert services.delete_batch_files(["tag"], ["fits"], 2025, 1, 1) == []
+    batches = spectre_server.core.batches.Batches(
+        "tag", spectre_server.core.batches.IQStreamBatch
+    )
+    assert all(batch.spectrogram_file.is_archived for batch in batches)
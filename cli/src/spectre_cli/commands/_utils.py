@@ -7,6 +7,7 @@
 # TODO: Refactor later, when it makes sense to do so.
 
 import typing
+import json as jsonlib
 import requests
 import os
 import contextlib
@@ -86,6 +87,84 @@ def safe_request(
         )
 
 
+def stream_request(
+    route_url: str,
+    file: typing.BinaryIO,
+    params: typing.Optional[dict] = None,
+    chunk_size: int = 1 << 16,
+) -> None:
+    """Send a GET request to the `spectre-server`, and write the streamed response body to a file.
+
+    Unlike `safe_request`, the response is not a jsend-style response, so is never held in memory all at once.
+
+    :param route_url: Endpoint path to append to the `spectre-server` base URL.
+    :param file: Write the response body to this binary file object.
+    :param params: typer.Optional query parameters for the request.
+    :param chunk_size: The number of bytes to read from the response at a time.
+    """
+    if route_url.startswith("/"):
+        route_url = route_url.lstrip("/")
+
+    full_url = os.path.join(SPECTRE_SERVER, route_url)
+
+    try:
+        with requests.get(full_url, params=params, stream=True) as response:
+            if not response.ok:
+                typer.secho(
+                    f"Error: The request failed with status code {response.status_code}. "
+                    f"Use `spectre get log` for more information.",
+                    fg="yellow",
+                )
+                raise typer.Exit(1)
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                file.write(chunk)
+    except requests.exceptions.ConnectionError:
+        typer.secho(
+            "Error: Unable to connect to the spectre-server. Is the container running?",
+            fg="yellow",
+        )
+        raise typer.Exit(1)
+
+
+def stream_json_lines(
+    route_url: str,
+    method: str,
+    json: typing.Optional[dict] = None,
+) -> typing.Iterator[dict]:
+    """Send a request to the `spectre-server`, and parse each line of the streamed response body as it arrives.
+
+    Unlike `safe_request`, the response is not a jsend-style response, but a JSON object per line.
+
+    :param route_url: Endpoint path to append to the `spectre-server` base URL.
+    :param method: HTTP method to use for the request (e.g., 'GET', 'PUT').
+    :param json: typer.Optional JSON payload for the request body.
+    :return: An iterator over the parsed JSON object on each line.
+    """
+    if route_url.startswith("/"):
+        route_url = route_url.lstrip("/")
+
+    full_url = os.path.join(SPECTRE_SERVER, route_url)
+
+    try:
+        with requests.request(method, full_url, json=json, stream=True) as response:
+            if not response.ok:
+                typer.secho(
+                    f"Error: The request failed with status code {response.status_code}. "
+                    f"Use `spectre get log` for more information.",
+                    fg="yellow",
+                )
+                raise typer.Exit(1)
+            for line in response.iter_lines():
+                if line:
+                    yield jsonlib.loads(line)
+    except requests.exceptions.ConnectionError:
+        typer.secho(
+            "Error: Unable to connect to the spectre-server. Is the container running?",
+            fg="yellow",
+        )
+        raise typer.Exit(1)
+
+
 def get_config_file_name(
     file_name: typing.Optional[str], tag: typing.Optional[str]
 ) -> str:
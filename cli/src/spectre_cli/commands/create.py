@@ -4,8 +4,13 @@
 
 import typer
 
-from ._secho_resources import secho_new_resource
-from ._utils import safe_request, get_config_file_name, spinner
+from ._secho_resources import (
+    secho_new_resource,
+    secho_new_resources,
+    secho_existing_resource,
+    secho_existing_resources,
+)
+from ._utils import safe_request, stream_json_lines, get_config_file_name, spinner
 
 create_typer = typer.Typer(help="Create resources.")
 
@@ -163,6 +168,24 @@ def plot(
     figsize_y: int = typer.Option(
         None, "--figsize-y", help="The vertical size of the plot."
     ),
+    reducer: str = typer.Option(
+        "mean",
+        "--reducer",
+        help="How to combine values which share a pixel in the plot, one of 'mean' or 'max'. "
+        "Use 'max' to preserve short-lived bursts.",
+    ),
+    quicklook: bool = typer.Option(
+        False,
+        "--quicklook",
+        help="If specified, quickly render a single spectrogram panel without Matplotlib. "
+        "Only one tag can be plotted.",
+    ),
+    rolling_background_window: float = typer.Option(
+        None,
+        "--rolling-background-window",
+        help="If specified, `dBb` is relative to a running median background over a window of this many seconds, "
+        "rather than the mean spectrum. Only applies if `dBb` is specified.",
+    ),
 ) -> None:
     json = {
         "tags": tags,
@@ -177,9 +200,228 @@ def plot(
         "vmax": vmax,
         "figsize_x": figsize_x,
         "figsize_y": figsize_y,
+        "reducer": reducer,
+        "quicklook": quicklook,
+        "rolling_background_window": rolling_background_window,
     }
     with spinner():
         jsend_dict = safe_request(f"spectre-data/batches/plots", "PUT", json=json)
     endpoint = jsend_dict["data"]
     secho_new_resource(endpoint)
     raise typer.Exit()
+
+
+@create_typer.command(
+    help="Create a plot for each tag, over each interval of a date range, rendering them in parallel."
+)
+def plots(
+    tags: list[str] = typer.Option(
+        ...,
+        "--tag",
+        "-t",
+        help="The file tag. Each tag is plotted on its own.",
+    ),
+    start_date: str = typer.Option(
+        ..., "--start-date", help="The first day to plot, in the format `%Y-%m-%d`."
+    ),
+    end_date: str = typer.Option(
+        ..., "--end-date", help="The last day to plot, in the format `%Y-%m-%d`."
+    ),
+    cadence: int = typer.Option(
+        1440,
+        "--cadence",
+        help="The time spanned by each plot, in minutes. Must divide a day. Defaults to daily plots.",
+    ),
+    lower_freq: float = typer.Option(
+        None,
+        "--lower-freq",
+        help="The lower bound of the frequency range in Hz. If unspecified, the minimum frequency "
+        "available in each spectrogram is used.",
+    ),
+    upper_freq: float = typer.Option(
+        None,
+        "--upper-freq",
+        help="The upper bound of the frequency range in Hz. If unspecified, the maximum frequency "
+        "available in each spectrogram is used.",
+    ),
+    log_norm: bool = typer.Option(
+        False,
+        "--log-norm",
+        help="If specified, normalise all values to the 0-1 range on a logarithmic scale.",
+    ),
+    dBb: bool = typer.Option(
+        False,
+        "--dBb",
+        help="If specified, use units of decibels above the background.",
+    ),
+    vmin: float = typer.Option(
+        None,
+        "--vmin",
+        help="The minimum value for the colormap. Only applies if `dBb` is specified.",
+    ),
+    vmax: float = typer.Option(
+        None,
+        "--vmax",
+        help="The maximum value for the colormap. Only applies if `dBb` is specified.",
+    ),
+    figsize_x: int = typer.Option(
+        None, "--figsize-x", help="The horizontal size of each plot."
+    ),
+    figsize_y: int = typer.Option(
+        None, "--figsize-y", help="The vertical size of each plot."
+    ),
+    reducer: str = typer.Option(
+        "mean",
+        "--reducer",
+        help="How to combine values which share a pixel in the plot, one of 'mean' or 'max'. "
+        "Use 'max' to preserve short-lived bursts.",
+    ),
+    quicklook: bool = typer.Option(
+        False,
+        "--quicklook",
+        help="If specified, quickly render a single spectrogram panel without Matplotlib.",
+    ),
+    rolling_background_window: float = typer.Option(
+        None,
+        "--rolling-background-window",
+        help="If specified, `dBb` is relative to a running median background over a window of this many seconds, "
+        "rather than the mean spectrum. Only applies if `dBb` is specified.",
+    ),
+    max_workers: int = typer.Option(
+        None,
+        "--max-workers",
+        help="The number of processes rendering plots at once. If unspecified, use one per CPU.",
+    ),
+) -> None:
+    json = {
+        "tags": tags,
+        "start_date": start_date,
+        "end_date": end_date,
+        "cadence": cadence,
+        "lower_freq": lower_freq,
+        "upper_freq": upper_freq,
+        "log_norm": log_norm,
+        "dBb": dBb,
+        "vmin": vmin,
+        "vmax": vmax,
+        "figsize_x": figsize_x,
+        "figsize_y": figsize_y,
+        "reducer": reducer,
+        "quicklook": quicklook,
+        "rolling_background_window": rolling_background_window,
+        "max_workers": max_workers,
+    }
+    for progress in stream_json_lines("spectre-data/batches/plots/bulk", "PUT", json):
+        typer.echo(
+            f"[{progress['num_done']}/{progress['num_plots']}] {progress['tag']} "
+            f"{progress['obs_date']} {progress['start_time']}-{progress['end_time']}: "
+            f"{progress['status']}",
+            nl=False,
+        )
+        if progress["status"] == "rendered":
+            typer.echo(" ", nl=False)
+            secho_new_resource(progress["file_path"])
+        elif progress["status"] == "skipped":
+            typer.echo(" ", nl=False)
+            secho_existing_resource(progress["file_path"])
+        elif progress["status"] == "failed":
+            typer.secho(f" {progress['error']}", fg="yellow")
+        else:
+            typer.echo()
+    raise typer.Exit()
+
+
+@create_typer.command(
+    help="Losslessly compress raw I/Q samples, replacing them with block-compressed `.iqz` files."
+)
+def iqz(
+    tags: list[str] = typer.Option(
+        [],
+        "--tag",
+        "-t",
+        help="Compress batches with this tag. If not provided, nothing will be compressed.",
+    ),
+    codec: str = typer.Option(
+        "zlib",
+        "--codec",
+        help="The compression applied to each block of samples, one of 'zlib' or 'lzma'.",
+    ),
+    year: int = typer.Option(
+        None, "--year", "-y", help="Only compress batches under this year."
+    ),
+    month: int = typer.Option(
+        None, "--month", "-m", help="Only compress batches under this month."
+    ),
+    day: int = typer.Option(
+        None, "--day", "-d", help="Only compress batches under this day."
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Display which files would be created without actually compressing anything.",
+    ),
+) -> None:
+    params = {
+        "tag": tags,
+        "codec": codec,
+        "dry_run": dry_run,
+        "year": year,
+        "month": month,
+        "day": day,
+    }
+    with spinner():
+        jsend_dict = safe_request(f"spectre-data/batches/iqz", "PUT", params=params)
+    endpoints = jsend_dict["data"]
+    if not dry_run:
+        secho_new_resources(endpoints)
+    else:
+        secho_existing_resources(endpoints)
+    raise typer.Exit()
+
+
+@create_typer.command(
+    help="Pack the files for each completed day into a single uncompressed archive, which can still be read as usual."
+)
+def archive(
+    tags: list[str] = typer.Option(
+        [],
+        "--tag",
+        "-t",
+        help="Archive files with this tag. If not provided, nothing will be archived.",
+    ),
+    extensions: list[str] = typer.Option(
+        [],
+        "--extension",
+        "-e",
+        help="Only archive files with this file extension. If not provided, archive `.fits`, `.png` and `.hdr` files.",
+    ),
+    year: int = typer.Option(
+        None, "--year", "-y", help="Only archive files under this year."
+    ),
+    month: int = typer.Option(
+        None, "--month", "-m", help="Only archive files under this month."
+    ),
+    day: int = typer.Option(
+        None, "--day", "-d", help="Only archive files under this day."
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Display which files would be archived without actually archiving anything.",
+    ),
+) -> None:
+    params = {
+        "tag": tags,
+        "extension": extensions,
+        "dry_run": dry_run,
+        "year": year,
+        "month": month,
+        "day": day,
+    }
+    with spinner():
+        jsend_dict = safe_request(
+            f"spectre-data/batches/archives", "PUT", params=params
+        )
+    endpoints = jsend_dict["data"]
+    secho_existing_resources(endpoints)
+    raise typer.Exit()
@@ -10,9 +10,9 @@ from ._secho_resources import (
     secho_stale_resources,
     secho_existing_resource,
     secho_existing_resources,
+    pprint_dict,
 )
 
-
 delete_typer = typer.Typer(help="Delete resources.")
 
 
@@ -124,6 +124,101 @@ def files(
     raise typer.Exit()
 
 
+@delete_typer.command(
+    help="Delete the oldest files according to a retention policy, keeping any which may still be in use."
+)
+def retention(
+    tags: list[str] = typer.Option(
+        [],
+        "--tag",
+        "-t",
+        help="Apply the policy to files with this tag. If not provided, nothing will be deleted.",
+    ),
+    extensions: list[str] = typer.Option(
+        [],
+        "--extension",
+        "-e",
+        help="Only apply the policy to files with this file extension. If not provided, apply it to any extension.",
+    ),
+    max_age: float = typer.Option(
+        None,
+        "--max-age",
+        help="Delete files which started more than this many seconds ago.",
+    ),
+    max_bytes: int = typer.Option(
+        None,
+        "--max-bytes",
+        help="Delete the oldest files until those remaining for each tag take up at most this many bytes.",
+    ),
+    min_free_bytes: int = typer.Option(
+        None,
+        "--min-free-bytes",
+        help="Delete the oldest files until at least this many bytes are free on the disk.",
+    ),
+    grace_period: float = typer.Option(
+        60,
+        "--grace-period",
+        help="Never delete files modified within this many seconds.",
+    ),
+    non_interactive: bool = typer.Option(
+        False, "--non-interactive", help="Suppress any interactive prompts."
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Display which files would be deleted without actually deleting them.",
+    ),
+) -> None:
+    if dry_run:
+        non_interactive = True
+    json = {
+        "policies": [
+            {
+                "tag": tag,
+                "extensions": extensions,
+                "max_age": max_age,
+                "max_bytes": max_bytes,
+                "min_free_bytes": min_free_bytes,
+            }
+            for tag in tags
+        ],
+        "grace_period": grace_period,
+        "dry_run": dry_run,
+    }
+    jsend_dict = safe_request(
+        f"spectre-data/batches/retention",
+        "PUT",
+        json=json,
+        require_confirmation=True,
+        non_interactive=non_interactive,
+    )
+    report = jsend_dict["data"]
+    endpoints = report.pop("file_paths")
+    if not dry_run:
+        secho_stale_resources(endpoints)
+    else:
+        secho_existing_resources(endpoints)
+    pprint_dict(report)
+    raise typer.Exit()
+
+
+@delete_typer.command(help="Cancel a recording job.")
+def job(
+    job_id: str = typer.Option(..., "--job-id", "-j", help="The ID of the job."),
+    non_interactive: bool = typer.Option(
+        False, "--non-interactive", help="Suppress any interactive prompts."
+    ),
+) -> None:
+    jsend_dict = safe_request(
+        f"recordings/jobs/{job_id}",
+        "DELETE",
+        require_confirmation=True,
+        non_interactive=non_interactive,
+    )
+    pprint_dict(jsend_dict["data"])
+    raise typer.Exit()
+
+
 @delete_typer.command(help="Delete a config.")
 def config(
     tag: str = typer.Option(None, "--tag", "-t", help="The unique identifier."),
@@ -4,9 +4,11 @@
 
 import typer
 import os
+import json
+import sys
 import requests
 
-from ._utils import safe_request, get_config_file_name
+from ._utils import safe_request, stream_request, get_config_file_name
 from ._secho_resources import (
     pprint_dict,
     secho_existing_resource,
@@ -99,6 +101,9 @@ def files(
         "--export",
         help="Bulk download files to your local filesystem inside this directory.",
     ),
+    sizes: bool = typer.Option(
+        False, "--sizes", help="Also list the size of each file, in bytes."
+    ),
 ) -> None:
     params = {
         "extension": extensions,
@@ -107,6 +112,11 @@ def files(
         "month": month,
         "day": day,
     }
+    if sizes and export is None:
+        jsend_dict = safe_request(f"spectre-data/batches/sizes", "GET", params=params)
+        pprint_dict(jsend_dict["data"])
+        raise typer.Exit()
+
     jsend_dict = safe_request(
         f"spectre-data/batches",
         "GET",
@@ -220,6 +230,23 @@ def tags(
     raise typer.Exit()
 
 
+@get_typer.command(help="List recording jobs.")
+def jobs() -> None:
+    jsend_dict = safe_request("recordings/jobs", "GET")
+    for job in jsend_dict["data"]:
+        typer.secho(f"{job['job_id']} {job['state']} {job['created_at']}")
+    raise typer.Exit()
+
+
+@get_typer.command(help="Print the status of a recording job.")
+def job(
+    job_id: str = typer.Option(..., "--job-id", "-j", help="The ID of the job."),
+) -> None:
+    jsend_dict = safe_request(f"recordings/jobs/{job_id}", "GET")
+    pprint_dict(jsend_dict["data"])
+    raise typer.Exit()
+
+
 @get_typer.command(help="Print a model.")
 def model(
     receiver_name: str = typer.Option(
@@ -237,3 +264,167 @@ def model(
     model = jsend_dict["data"]
     pprint_dict(model)
     typer.Exit()
+
+
+@get_typer.command(
+    help="Get the time series at some frequencies, over a time range which can span many days."
+)
+def light_curves(
+    tag: str = typer.Option(..., "--tag", "-t", help="The file tag."),
+    frequencies: list[float] = typer.Option(
+        ...,
+        "--frequency",
+        "-f",
+        help="Get the time series at this frequency, in Hz. The closest spectral component is used.",
+    ),
+    start_date: str = typer.Option(
+        ..., "--start-date", help="The start date, in the format `%Y-%m-%d`."
+    ),
+    start_time: str = typer.Option(
+        ..., "--start-time", help="The start time (UTC), in the format `%H:%M:%S`."
+    ),
+    end_date: str = typer.Option(
+        ..., "--end-date", help="The end date, in the format `%Y-%m-%d`."
+    ),
+    end_time: str = typer.Option(
+        ..., "--end-time", help="The end time (UTC), in the format `%H:%M:%S`."
+    ),
+    format: str = typer.Option(
+        "csv",
+        "--format",
+        help="Either 'csv', or 'binary' for little-endian records of an int64 timestamp "
+        "(microseconds since the Unix epoch) followed by a float32 per frequency.",
+    ),
+    output: str = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Write the light curves to this file. If not provided, write to standard output.",
+    ),
+) -> None:
+    params = {
+        "frequency": frequencies,
+        "start_date": start_date,
+        "start_time": start_time,
+        "end_date": end_date,
+        "end_time": end_time,
+        "format": format,
+    }
+    route_url = f"spectre-data/batches/light-curves/{tag}"
+    if output is None:
+        stream_request(route_url, sys.stdout.buffer, params=params)
+    else:
+        with open(output, "wb") as file:
+            stream_request(route_url, file, params=params)
+    raise typer.Exit()
+
+
+@get_typer.command(
+    help="Get the spectrogram over a time range which can span many days, as a `.npy` file."
+)
+def spectrogram(
+    tag: str = typer.Option(..., "--tag", "-t", help="The file tag."),
+    start_date: str = typer.Option(
+        ..., "--start-date", help="The start date, in the format `%Y-%m-%d`."
+    ),
+    start_time: str = typer.Option(
+        ...,
+        "--start-time",
+        help="The start time (UTC), in the format `%H:%M:%S` or `%H:%M:%S.%f`.",
+    ),
+    end_date: str = typer.Option(
+        ..., "--end-date", help="The end date, in the format `%Y-%m-%d`."
+    ),
+    end_time: str = typer.Option(
+        ...,
+        "--end-time",
+        help="The end time (UTC), in the format `%H:%M:%S` or `%H:%M:%S.%f`.",
+    ),
+    lower_freq: float = typer.Option(
+        None, "--lower-freq", help="The lower bound of the frequency range, in Hz."
+    ),
+    upper_freq: float = typer.Option(
+        None, "--upper-freq", help="The upper bound of the frequency range, in Hz."
+    ),
+    max_columns: int = typer.Option(
+        None,
+        "--max-columns",
+        help="Reduce the spectrogram to at most this many spectrums.",
+    ),
+    max_rows: int = typer.Option(
+        None,
+        "--max-rows",
+        help="Reduce the spectrogram to at most this many spectral components.",
+    ),
+    reducer: str = typer.Option(
+        "mean",
+        "--reducer",
+        help="How blocks of the spectrogram are reduced. Either 'mean', or 'max'.",
+    ),
+    output: str = typer.Option(
+        ...,
+        "--output",
+        "-o",
+        help="Write the dynamic spectra to `<output>.npy`, and the axes to `<output>.json`.",
+    ),
+) -> None:
+    params = {
+        "start_date": start_date,
+        "start_time": start_time,
+        "end_date": end_date,
+        "end_time": end_time,
+        "lower_freq": lower_freq,
+        "upper_freq": upper_freq,
+        "max_columns": max_columns,
+        "max_rows": max_rows,
+        "reducer": reducer,
+    }
+    jsend_dict = safe_request(
+        f"spectre-data/spectrograms/{tag}/axes", "GET", params=params
+    )
+    with open(f"{output}.json", "w") as file:
+        json.dump(jsend_dict["data"], file)
+    with open(f"{output}.npy", "wb") as file:
+        stream_request(f"spectre-data/spectrograms/{tag}", file, params=params)
+    raise typer.Exit()
+
+
+@get_typer.command(
+    help="Get the I/Q samples over a time range which can span many batches, as a SigMF recording."
+)
+def iq(
+    tag: str = typer.Option(..., "--tag", "-t", help="The file tag."),
+    start_date: str = typer.Option(
+        ..., "--start-date", help="The start date, in the format `%Y-%m-%d`."
+    ),
+    start_time: str = typer.Option(
+        ...,
+        "--start-time",
+        help="The start time (UTC), in the format `%H:%M:%S` or `%H:%M:%S.%f`.",
+    ),
+    end_date: str = typer.Option(
+        ..., "--end-date", help="The end date, in the format `%Y-%m-%d`."
+    ),
+    end_time: str = typer.Option(
+        ...,
+        "--end-time",
+        help="The end time (UTC), in the format `%H:%M:%S` or `%H:%M:%S.%f`. Excluded from the range.",
+    ),
+    output: str = typer.Option(
+        ...,
+        "--output",
+        "-o",
+        help="Write the recording to `<output>.sigmf-data` and `<output>.sigmf-meta`.",
+    ),
+) -> None:
+    params = {
+        "start_date": start_date,
+        "start_time": start_time,
+        "end_date": end_date,
+        "end_time": end_time,
+    }
+    with open(f"{output}.sigmf-meta", "wb") as file:
+        stream_request(f"spectre-data/batches/iq/{tag}/sigmf-meta", file, params=params)
+    with open(f"{output}.sigmf-data", "wb") as file:
+        stream_request(f"spectre-data/batches/iq/{tag}", file, params=params)
+    raise typer.Exit()
@@ -1,17 +1,48 @@
-# SPDX-FileCopyrightText: © 2024-2025 Jimmy Fitzpatrick <jimmy@spectregrams.org>
+# SPDX-FileCopyrightText: © 2024-2026 Jimmy Fitzpatrick <jimmy@spectregrams.org>
 # This file is part of SPECTRE
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import time
+
 import typer
 
 from ._utils import safe_request, spinner
 
-
 record_typer = typer.Typer(help="Start recording data.")
 
 _DEFAULT_MAX_RESTARTS = 5
 _DEFAULT_FORCE_RESTART = False
 _DEFAULT_SKIP_VALIDATION = False
+_DEFAULT_DETACH = False
+# How often to check whether a recording has finished, in seconds.
+_POLL_INTERVAL = 1
+_FINISHED_STATES = ("completed", "failed", "cancelled")
+
+
+def _wait_for_job(job_id: str) -> None:
+    """Wait for a recording job to finish, exiting with an error if it didn't complete."""
+    with spinner():
+        while True:
+            jsend_dict = safe_request(f"recordings/jobs/{job_id}", "GET")
+            job = jsend_dict["data"]
+            if job["state"] in _FINISHED_STATES:
+                break
+            time.sleep(_POLL_INTERVAL)
+
+    if job["state"] == "failed":
+        typer.secho(f"The recording has failed: {job['error']}", fg="yellow")
+        raise typer.Exit(1)
+    elif job["state"] == "cancelled":
+        typer.secho("The recording was cancelled.", fg="yellow")
+        raise typer.Exit(1)
+
+
+def _start_recording(route_url: str, json: dict, detach: bool) -> None:
+    jsend_dict = safe_request(route_url, "POST", json=json)
+    job_id = jsend_dict["data"]
+    typer.secho(job_id, fg="green")
+    if not detach:
+        _wait_for_job(job_id)
 
 
 @record_typer.command(help="Capture data from an SDR in real time.")
@@ -38,6 +69,11 @@ def signal(
         "--skip-validation",
         help="If specified, do not validate config parameters.",
     ),
+    detach: bool = typer.Option(
+        _DEFAULT_DETACH,
+        "--detach",
+        help="If specified, return as soon as the recording has started, rather than waiting for it to finish.",
+    ),
 ) -> None:
     json = {
         "tags": tags,
@@ -46,8 +82,7 @@ def signal(
         "max_restarts": max_restarts,
         "validate": not skip_validation,
     }
-    with spinner():
-        _ = safe_request("recordings/signal", "POST", json=json)
+    _start_recording("recordings/signal", json, detach)
     raise typer.Exit()
 
 
@@ -77,6 +112,11 @@ def spectrograms(
         "--skip-validation",
         help="If specified, do not validate config parameters.",
     ),
+    detach: bool = typer.Option(
+        _DEFAULT_DETACH,
+        "--detach",
+        help="If specified, return as soon as the recording has started, rather than waiting for it to finish.",
+    ),
 ) -> None:
     json = {
         "tags": tags,
@@ -85,6 +125,5 @@ def spectrograms(
         "max_restarts": max_restarts,
         "validate": not skip_validation,
     }
-    with spinner():
-        _ = safe_request("recordings/spectrogram", "POST", json=json)
+    _start_recording("recordings/spectrogram", json, detach)
     raise typer.Exit()
@@ -5,9 +5,12 @@
 import typer
 from typing import List
 
-from ._utils import safe_request, get_config_file_name
-from ._secho_resources import secho_new_resource
-
+from ._utils import safe_request, get_config_file_name, spinner
+from ._secho_resources import (
+    secho_new_resource,
+    secho_new_resources,
+    secho_existing_resources,
+)
 
 update_typer = typer.Typer(help="Update resources.")
 
@@ -44,3 +47,26 @@ def config(
     endpoint = jsend_dict["data"]
     secho_new_resource(endpoint)
     raise typer.Exit()
+
+
+@update_typer.command(
+    help="Move existing files into the directories they belong in, after changing how they are partitioned."
+)
+def partitions(
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Display which files would be moved without actually moving them.",
+    ),
+) -> None:
+    params = {"dry_run": dry_run}
+    with spinner():
+        jsend_dict = safe_request(
+            f"spectre-data/batches/partitions", "PUT", params=params
+        )
+    endpoints = jsend_dict["data"]
+    if not dry_run:
+        secho_new_resources(endpoints)
+    else:
+        secho_existing_resources(endpoints)
+    raise typer.Exit()